@@ -0,0 +1,297 @@
+"""
+Performance benchmarks for the MODFLOW 6 autotest models.
+
+Benchmark mode is enabled by passing --benchmark on the command line or by
+defining the MF6_BENCHMARK environment variable as the path to the
+benchmark history file (default is benchmark_history.json in the autotest
+directory). In benchmark mode Simulation.run records the following for
+each MODFLOW 6 run:
+
+    wall time (seconds)
+    peak resident set size of the mf6 process (bytes, if available)
+    number of outer and inner iterations (from the IMS CSV output files
+        or, if CSV output is not saved, the simulation listing file)
+    total memory manager storage (bytes, from the simulation listing file)
+
+The benchmark history can be compared to a stored baseline using
+
+    python benchmark.py compare baseline.json benchmark_history.json
+
+which reports the tests where the most recent result exceeds the baseline
+by more than a threshold (default is 10 percent). The most recent results
+in a history file can be saved as a baseline using
+
+    python benchmark.py baseline benchmark_history.json baseline.json
+
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import datetime
+import subprocess
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+default_history = 'benchmark_history.json'
+
+# metrics compared with the baseline
+metrics = ('wall_time', 'peak_rss', 'outer_iterations', 'inner_iterations',
+           'memory_total')
+
+outer_csv_header = 'total_inner_iterations,totim,kper,kstp,nouter,' + \
+                   'inner_iterations'
+
+memory_units = {'BYTES': 1., 'KILOBYTES': 1024., 'MEGABYTES': 1024. ** 2,
+                'GIGABYTES': 1024. ** 3}
+
+
+def get_history_path():
+    """
+    Return the path to the benchmark history file if benchmark mode is
+    enabled, otherwise return None.
+
+    """
+    fpth = os.environ.get('MF6_BENCHMARK')
+    enabled = fpth is not None
+    for arg in sys.argv:
+        if arg.lower() == '--benchmark':
+            enabled = True
+    if not enabled:
+        return None
+    if fpth is None or fpth == '':
+        fpth = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                            default_history)
+    return fpth
+
+
+def run_model(exe, model_ws, silent=False):
+    """
+    Run exe in model_ws and measure the wall time and the peak resident set
+    size of the process.
+
+    Returns
+    -------
+    success : bool
+    buff : list
+        lines written to standard output
+    results : dict
+        wall_time and peak_rss (None if it cannot be determined on this
+        platform)
+
+    """
+    buff = []
+    t0 = time.perf_counter()
+    proc = subprocess.Popen([exe], stdout=subprocess.PIPE,
+                            stderr=subprocess.STDOUT, cwd=model_ws)
+    for line in iter(proc.stdout.readline, b''):
+        line = line.decode('utf-8', errors='replace').rstrip('\r\n')
+        buff.append(line)
+        if not silent:
+            print(line)
+    proc.stdout.close()
+
+    peak_rss = None
+    if hasattr(os, 'wait4'):
+        pid, status, rusage = os.wait4(proc.pid, 0)
+        returncode = os.waitstatus_to_exitcode(status) \
+            if hasattr(os, 'waitstatus_to_exitcode') else status
+        # ru_maxrss is in kilobytes on linux and bytes on macOS
+        peak_rss = rusage.ru_maxrss
+        if sys.platform.lower() != 'darwin':
+            peak_rss *= 1024
+        proc.returncode = returncode
+    else:
+        returncode = proc.wait()
+    wall_time = time.perf_counter() - t0
+
+    success = returncode == 0
+    if success:
+        success = any(['normal termination' in line.lower()
+                       for line in buff])
+    return success, buff, {'wall_time': wall_time, 'peak_rss': peak_rss}
+
+
+def get_ims_iterations(model_ws):
+    """
+    Return the number of outer and inner iterations from the IMS outer
+    iteration CSV files in model_ws. None is returned if CSV output was not
+    saved.
+
+    """
+    outer = None
+    inner = None
+    for f in sorted(os.listdir(model_ws)):
+        fpth = os.path.join(model_ws, f)
+        if not f.lower().endswith('.csv') or not os.path.isfile(fpth):
+            continue
+        with open(fpth) as fcsv:
+            header = fcsv.readline().strip().lower()
+            if not header.startswith(outer_csv_header):
+                continue
+            nouter = 0
+            ninner = 0
+            for line in fcsv:
+                ll = line.strip().split(',')
+                if len(ll) < 5:
+                    continue
+                nouter += 1
+                ninner = int(ll[0])
+        if outer is None:
+            outer = inner = 0
+        outer += nouter
+        inner += ninner
+    return outer, inner
+
+
+def parse_listing_file(fpth):
+    """
+    Return the number of outer iterations, inner iterations, and the total
+    memory manager storage (in bytes) from the simulation listing file.
+
+    """
+    outer = None
+    inner = None
+    memory_total = None
+    if not os.path.isfile(fpth):
+        return outer, inner, memory_total
+    units = 1.
+    with open(fpth) as f:
+        for line in f:
+            ll = line.split()
+            if 'CALLS TO NUMERICAL SOLUTION IN TIME STEP' in line:
+                outer = int(ll[0]) + (outer or 0)
+            elif len(ll) == 3 and ll[1] == 'TOTAL' and \
+                    ll[2] == 'ITERATIONS':
+                inner = int(ll[0]) + (inner or 0)
+            elif 'MEMORY MANAGER TOTAL STORAGE BY DATA TYPE' in line:
+                units = memory_units.get(ll[-1].upper(), 1.)
+            elif len(ll) == 2 and ll[0] == 'Total':
+                try:
+                    memory_total = float(ll[1]) * units
+                except ValueError:
+                    pass
+    return outer, inner, memory_total
+
+
+def get_results(model_ws, results):
+    """
+    Add the iteration counts and memory manager storage for the
+    simulation in model_ws to results.
+
+    """
+    outer, inner, memory_total = \
+        parse_listing_file(os.path.join(model_ws, 'mfsim.lst'))
+    csv_outer, csv_inner = get_ims_iterations(model_ws)
+    if csv_outer is not None:
+        outer, inner = csv_outer, csv_inner
+    results['outer_iterations'] = outer
+    results['inner_iterations'] = inner
+    results['memory_total'] = memory_total
+    return results
+
+
+def load_history(fpth):
+    if os.path.isfile(fpth):
+        with open(fpth) as f:
+            return json.load(f)
+    return {}
+
+
+def add_to_history(fpth, name, results):
+    """
+    Append the results for test name to the history file. The history file
+    is locked while it is updated so concurrent tests can share it.
+
+    """
+    results = dict(results)
+    results['date'] = datetime.datetime.now().isoformat()
+    with open(fpth + '.lock', 'w') as flock:
+        if fcntl is not None:
+            fcntl.flock(flock, fcntl.LOCK_EX)
+        history = load_history(fpth)
+        history.setdefault(name, []).append(results)
+        tpth = fpth + '.tmp'
+        with open(tpth, 'w') as f:
+            json.dump(history, f, indent=1, sort_keys=True)
+        os.replace(tpth, fpth)
+        if fcntl is not None:
+            fcntl.flock(flock, fcntl.LOCK_UN)
+    return
+
+
+def compare(baseline, history, threshold=0.1):
+    """
+    Compare the most recent result for each test in history to the
+    baseline.
+
+    Returns
+    -------
+    regressions : list
+        (test name, metric, baseline value, current value) for every metric
+        that exceeds the baseline value by more than threshold
+
+    """
+    regressions = []
+    for name in sorted(history):
+        if name not in baseline or len(history[name]) < 1:
+            continue
+        base = baseline[name]
+        if isinstance(base, list):
+            base = base[-1]
+        current = history[name][-1]
+        for metric in metrics:
+            v0 = base.get(metric)
+            v1 = current.get(metric)
+            if v0 is None or v1 is None or v0 <= 0:
+                continue
+            if (v1 - v0) / v0 > threshold:
+                regressions.append((name, metric, v0, v1))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Compare MODFLOW 6 benchmark results')
+    sub = parser.add_subparsers(dest='command')
+    p = sub.add_parser('compare',
+                       help='flag regressions relative to a baseline')
+    p.add_argument('baseline', help='baseline file')
+    p.add_argument('history', nargs='?', default=default_history,
+                   help='benchmark history file')
+    p.add_argument('--threshold', type=float, default=0.1,
+                   help='relative increase flagged as a regression')
+    p = sub.add_parser('baseline',
+                       help='save the most recent results as a baseline')
+    p.add_argument('history', help='benchmark history file')
+    p.add_argument('baseline', help='baseline file')
+    args = parser.parse_args()
+
+    if args.command == 'baseline':
+        history = load_history(args.history)
+        baseline = {name: v[-1] for name, v in history.items() if len(v) > 0}
+        with open(args.baseline, 'w') as f:
+            json.dump(baseline, f, indent=1, sort_keys=True)
+        return 0
+    elif args.command == 'compare':
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare(baseline, load_history(args.history),
+                              threshold=args.threshold)
+        for name, metric, v0, v1 in regressions:
+            print('{:40s} {:18s} {:15.6g} -> {:15.6g} ({:+.1f}%)'.format(
+                name, metric, v0, v1, 100. * (v1 - v0) / v0))
+        print('{} regression(s) exceeding {:.1f}%'.format(
+            len(regressions), 100. * args.threshold))
+        return len(regressions) > 0
+    parser.print_help()
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,172 @@
+"""
+Benchmark the memory manager lookups for a model with many packages.
+
+A GWF model with npackages single-well WEL packages is written to the
+benchmark directory and run with mf6. The setup time (from the start of
+the run to the first time step) and the total run time are reported.
+Setup creates and looks up the variables of every package, so it shows
+how the lookups scale with the number of variables in the memory manager.
+
+The model is then initialized with libmf6 and get_value_ptr is called for
+the well rates (BOUND) of the first, middle, and last WEL package, and the
+number of lookups per second is reported.
+
+The input files are written directly instead of with flopy because flopy
+takes much longer than MODFLOW 6 to write 10,000 packages.
+
+    python benchmark_memory_manager.py --npackages 10000
+
+"""
+
+import os
+import sys
+import time
+import shutil
+import argparse
+import subprocess
+
+default_ws = os.path.join('temp', 'benchmark_memory_manager')
+
+nrow = ncol = 100
+
+
+def write_model(model_ws, npackages):
+    """
+    Write a simulation with one GWF model and npackages WEL packages.
+
+    """
+    if os.path.isdir(model_ws):
+        shutil.rmtree(model_ws)
+    os.makedirs(model_ws)
+
+    def write(fname, lines):
+        with open(os.path.join(model_ws, fname), 'w') as f:
+            f.write('\n'.join(lines) + '\n')
+
+    write('mfsim.nam', ['BEGIN options', 'END options',
+                        'BEGIN timing', '  TDIS6 bench.tdis', 'END timing',
+                        'BEGIN models', '  gwf6 bench.nam bench',
+                        'END models',
+                        'BEGIN exchanges', 'END exchanges',
+                        'BEGIN solutiongroup 1', '  ims6 bench.ims bench',
+                        'END solutiongroup'])
+    write('bench.tdis', ['BEGIN options', '  TIME_UNITS days', 'END options',
+                         'BEGIN dimensions', '  NPER 1', 'END dimensions',
+                         'BEGIN perioddata', '  1.0 1 1.0',
+                         'END perioddata'])
+    write('bench.ims', ['BEGIN options', 'END options',
+                        'BEGIN nonlinear', '  OUTER_DVCLOSE 1e-6',
+                        '  OUTER_MAXIMUM 10', 'END nonlinear',
+                        'BEGIN linear', '  INNER_MAXIMUM 200',
+                        '  INNER_DVCLOSE 1e-6', '  INNER_RCLOSE 1e-3',
+                        'END linear'])
+    lines = ['BEGIN options', 'END options', 'BEGIN packages',
+             '  DIS6 bench.dis', '  IC6 bench.ic', '  NPF6 bench.npf',
+             '  CHD6 bench.chd']
+    lines += ['  WEL6 bench_{0}.wel wel{0}'.format(i)
+              for i in range(npackages)]
+    lines += ['END packages']
+    write('bench.nam', lines)
+    write('bench.dis', ['BEGIN options', 'END options',
+                        'BEGIN dimensions', '  NLAY 1',
+                        '  NROW {}'.format(nrow), '  NCOL {}'.format(ncol),
+                        'END dimensions',
+                        'BEGIN griddata',
+                        '  delr', '    CONSTANT 1.0',
+                        '  delc', '    CONSTANT 1.0',
+                        '  top', '    CONSTANT 0.0',
+                        '  botm', '    CONSTANT -10.0',
+                        'END griddata'])
+    write('bench.ic', ['BEGIN griddata', '  strt', '    CONSTANT 0.0',
+                       'END griddata'])
+    write('bench.npf', ['BEGIN griddata', '  icelltype', '    CONSTANT 0',
+                        '  k', '    CONSTANT 1.0', 'END griddata'])
+    write('bench.chd', ['BEGIN dimensions', '  MAXBOUND 1', 'END dimensions',
+                        'BEGIN period 1', '  1 1 1 0.0', 'END period'])
+    for i in range(npackages):
+        irow, icol = divmod(i % (nrow * ncol - 1) + 1, ncol)
+        write('bench_{}.wel'.format(i),
+              ['BEGIN dimensions', '  MAXBOUND 1', 'END dimensions',
+               'BEGIN period 1',
+               '  1 {} {} -0.00001'.format(irow + 1, icol + 1),
+               'END period'])
+    return
+
+
+def run_mf6(exe, model_ws):
+    """
+    Run mf6 and return the setup time (to the first time step) and the
+    total run time.
+
+    """
+    t0 = time.perf_counter()
+    t_setup = None
+    proc = subprocess.Popen([os.path.abspath(exe)], stdout=subprocess.PIPE,
+                            stderr=subprocess.STDOUT, cwd=model_ws)
+    success = False
+    for line in iter(proc.stdout.readline, b''):
+        line = line.decode('utf-8', errors='replace').lower()
+        if t_setup is None and 'solving:' in line:
+            t_setup = time.perf_counter() - t0
+        if 'normal termination' in line:
+            success = True
+    proc.stdout.close()
+    proc.wait()
+    t_total = time.perf_counter() - t0
+    if not success:
+        raise RuntimeError('mf6 did not terminate normally in ' + model_ws)
+    return t_setup, t_total
+
+
+def bmi_lookups(lib, model_ws, npackages, nlookups):
+    """
+    Return the number of get_value_ptr lookups per second.
+
+    """
+    from xmipy import XmiWrapper
+
+    init_wd = os.getcwd()
+    os.chdir(model_ws)
+    mf6 = XmiWrapper(os.path.abspath(os.path.join(init_wd, lib)))
+    mf6.initialize(os.path.join(os.getcwd(), 'mfsim.nam'))
+    try:
+        names = ['BENCH WEL{}/BOUND'.format(i)
+                 for i in (0, npackages // 2, npackages - 1)]
+        t0 = time.perf_counter()
+        for i in range(nlookups):
+            mf6.get_value_ptr(names[i % len(names)])
+        t = time.perf_counter() - t0
+    finally:
+        mf6.finalize()
+        os.chdir(init_wd)
+    return nlookups / t
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Benchmark the MODFLOW 6 memory manager lookups')
+    parser.add_argument('--npackages', type=int, default=10000,
+                        help='number of WEL packages')
+    parser.add_argument('--nlookups', type=int, default=100000,
+                        help='number of BMI get_value_ptr lookups')
+    parser.add_argument('--exe', default=os.path.join('..', 'bin', 'mf6'),
+                        help='path to mf6')
+    parser.add_argument('--lib', default=None,
+                        help='path to libmf6, the BMI lookups are not '
+                             'benchmarked if it is not given')
+    parser.add_argument('--ws', default=default_ws,
+                        help='directory for the benchmark model')
+    args = parser.parse_args()
+
+    write_model(args.ws, args.npackages)
+    t_setup, t_total = run_mf6(args.exe, args.ws)
+    print('{} WEL packages: setup {:.2f} s, total {:.2f} s'.format(
+        args.npackages, t_setup, t_total))
+    if args.lib is not None:
+        rate = bmi_lookups(args.lib, args.ws, args.npackages, args.nlookups)
+        print('BMI get_value_ptr: {:.0f} lookups/s'.format(rate))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,20 +1,295 @@
+import itertools
 import numpy as np
 
+
+class BinaryFileWriter(object):
+    """
+    Write head and budget records to a binary file that is opened once.
+
+    Record data can be passed as a single array or as an iterable (for
+    example, a generator) of array chunks so large files can be written
+    without holding all of the data in memory. Each chunk is written
+    directly to the file and is only copied if it is not a contiguous array
+    of the required type.
+
+    Parameters
+    ----------
+    f : str or file
+        path to the binary file or a file object opened in binary write
+        mode
+    precision : str
+        'double' or 'single'
+
+    Examples
+    --------
+    >>> with BinaryFileWriter('flow.bud') as bfw:
+    ...     for kstp in range(nstp):
+    ...         bfw.write_budget(flowja_chunks(), text='    FLOW-JA-FACE',
+    ...                          ndim1=nja, kstp=kstp + 1)
+
+    """
+
+    def __init__(self, f, precision='double'):
+        if hasattr(f, 'write'):
+            self.f = f
+            self.close_file = False
+        else:
+            self.f = open(f, 'wb')
+            self.close_file = True
+        if precision == 'single':
+            self.realtype = np.float32
+        else:
+            self.realtype = np.float64
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        if self.close_file:
+            self.f.close()
+
+    def _write_scalars(self, dt, values):
+        np.array(tuple(values), dtype=dt).tofile(self.f)
+
+    def _write_text(self, text):
+        self._write_scalars(np.dtype([('text', 'S16')]), (text,))
+
+    def _write_chunks(self, data, dtype, n, text):
+        """
+        Write data as a single array or an iterable of arrays and confirm
+        that n items were written.
+
+        """
+        if isinstance(data, np.ndarray):
+            data = (data,)
+        count = 0
+        for chunk in data:
+            chunk = np.ascontiguousarray(chunk)
+            if chunk.dtype != dtype:
+                if chunk.dtype.names is not None:
+                    chunk = chunk.astype(dtype)
+                else:
+                    chunk = chunk.astype(dtype, copy=False)
+            chunk.tofile(self.f)
+            count += chunk.size
+        if count != n:
+            msg = '{} items were written for {} '.format(count,
+                                                         text.strip()) + \
+                  'but the record header specifies {} items'.format(n)
+            raise ValueError(msg)
+
+    @staticmethod
+    def _first_chunk(data):
+        """
+        Return the first chunk and an iterable with all of the chunks.
+
+        """
+        if isinstance(data, np.ndarray):
+            return data, (data,)
+        data = iter(data)
+        chunk = next(data)
+        return chunk, itertools.chain((chunk,), data)
+
+    @staticmethod
+    def _size(data):
+        if isinstance(data, np.ndarray):
+            return data.size
+        return None
+
+    def write_head(self, data, kstp=1, kper=1, pertim=1.0, totim=1.0,
+                   text='            HEAD', ilay=1, ncol=None, nrow=None):
+        """
+        Write a head (or other dependent variable) record. ncol and nrow
+        are required if data is not a two-dimensional array.
+
+        """
+        if ncol is None or nrow is None:
+            if isinstance(data, np.ndarray) and data.ndim == 2:
+                nrow, ncol = data.shape
+            elif isinstance(data, np.ndarray):
+                nrow, ncol = 1, data.size
+            else:
+                raise ValueError('ncol and nrow must be specified for '
+                                 'chunked head data')
+        dt = np.dtype([('kstp', np.int32),
+                       ('kper', np.int32),
+                       ('pertim', self.realtype),
+                       ('totim', self.realtype),
+                       ('text', 'S16'),
+                       ('ncol', np.int32),
+                       ('nrow', np.int32),
+                       ('ilay', np.int32)])
+        self._write_scalars(dt, (kstp, kper, pertim, totim, text, ncol,
+                                 nrow, ilay))
+        self._write_chunks(data, np.dtype(self.realtype), ncol * nrow, text)
+        return
+
+    def write_budget(self, data, kstp=1, kper=1, text='    FLOW-JA-FACE',
+                     imeth=1, delt=1., pertim=1., totim=1., ndim1=None,
+                     ndim2=1, ndim3=1, nlist=None, auxnames=None,
+                     text1id1='           GWF-1',
+                     text2id1='           GWF-1',
+                     text1id2='           GWF-1',
+                     text2id2='             NPF'):
+        """
+        Write a budget record using any of the budget methods (imeth).
+
+        imeth 0 - array of ndim1 * ndim2 * ndim3 values (no time record)
+        imeth 1 - array of ndim1 * ndim2 * ndim3 values
+        imeth 2 - list of (icell, q) with nlist entries
+        imeth 3 - (ndim1 * ndim2) layer indicator array followed by
+                  (ndim1 * ndim2) values. data is a tuple (ilay, values)
+        imeth 4 - array of ndim1 * ndim2 values for layer 1
+        imeth 5 - list of (icell, q, aux...) with nlist entries
+        imeth 6 - MODFLOW 6 list of (id1, id2, q, aux...) with nlist entries
+
+        List data are structured arrays (or iterables of structured arrays)
+        with the auxiliary variables in the columns after q. If the list data
+        are not an array, nlist and, if there are auxiliary variables,
+        auxnames must be specified. ndim1 defaults to the number of values
+        for imeth 1 (for example, nja for FLOW-JA-FACE).
+
+        """
+        if imeth in (0, 1, 4):
+            if ndim1 is None:
+                ndim1 = self._size(data)
+                if ndim1 is None:
+                    raise ValueError('ndim1 must be specified for chunked '
+                                     'budget data')
+                ndim2 = ndim3 = 1
+            n = ndim1 * ndim2
+            if imeth != 4:
+                n *= ndim3
+            self._write_header(kstp, kper, text, ndim1, ndim2, ndim3, imeth,
+                               delt, pertim, totim)
+            self._write_chunks(data, np.dtype(self.realtype), n, text)
+
+        elif imeth == 3:
+            ilay, values = data
+            n = ndim1 * ndim2
+            self._write_header(kstp, kper, text, ndim1, ndim2, ndim3, imeth,
+                               delt, pertim, totim)
+            self._write_chunks(ilay, np.dtype(np.int32), n, text)
+            self._write_chunks(values, np.dtype(self.realtype), n, text)
+
+        elif imeth in (2, 5, 6):
+            if ndim1 is None:
+                ndim1 = 1
+            if nlist is None:
+                nlist = self._size(data)
+                if nlist is None:
+                    raise ValueError('nlist must be specified for chunked '
+                                     'budget data')
+            first, data = self._first_chunk(data)
+            if auxnames is None:
+                names = first.dtype.names
+                if names is None:
+                    auxnames = []
+                elif imeth == 6:
+                    auxnames = list(names[3:])
+                else:
+                    auxnames = list(names[2:])
+            naux = len(auxnames)
+
+            if imeth == 6:
+                fields = [('id1', np.int32), ('id2', np.int32)]
+            else:
+                fields = [('icell', np.int32)]
+            fields.append(('q', self.realtype))
+            fields += [('aux{}'.format(i + 1), self.realtype)
+                       for i in range(naux)]
+            if imeth == 2:
+                fields = fields[:2]
+            dt = np.dtype(fields)
+
+            self._write_header(kstp, kper, text, ndim1, ndim2, ndim3, imeth,
+                               delt, pertim, totim)
+            if imeth == 6:
+                for txt in (text1id1, text2id1, text1id2, text2id2):
+                    self._write_text(txt)
+            if imeth in (5, 6):
+                self._write_scalars(np.dtype([('ndat', np.int32)]),
+                                    (naux + 1,))
+                for auxname in auxnames:
+                    self._write_text('{:16}'.format(auxname))
+            self._write_scalars(np.dtype([('nlist', np.int32)]), (nlist,))
+            chunks = (self._as_list_dtype(chunk, dt) for chunk in data)
+            self._write_chunks(chunks, dt, nlist, text)
+
+        else:
+            raise Exception('unknown method code {}'.format(imeth))
+        return
+
+    def write_flowja(self, data, nja=None, **kwargs):
+        """
+        Write a FLOW-JA-FACE record (imeth 1) with nja values.
+
+        """
+        self.write_budget(data, text='    FLOW-JA-FACE', imeth=1, ndim1=nja,
+                          **kwargs)
+        return
+
+    def write_spdis(self, data, nodes=None, **kwargs):
+        """
+        Write a DATA-SPDIS record (imeth 6) with (id1, id2, q, qx, qy, qz)
+        for nodes cells.
+
+        """
+        self.write_budget(data, text='      DATA-SPDIS', imeth=6, nlist=nodes,
+                          auxnames=['qx', 'qy', 'qz'], **kwargs)
+        return
+
+    @staticmethod
+    def _as_list_dtype(chunk, dt):
+        """
+        Return chunk as a structured array with dtype dt. Columns are
+        matched by position so data with any column names can be written.
+
+        """
+        chunk = np.ascontiguousarray(chunk)
+        if chunk.dtype == dt:
+            return chunk
+        if chunk.dtype.names is None or \
+                len(chunk.dtype.names) != len(dt.names):
+            msg = 'list data must have {} columns'.format(len(dt.names))
+            raise ValueError(msg)
+        # columns with the same layout only need to be renamed
+        if chunk.dtype.itemsize == dt.itemsize and \
+                all([chunk.dtype[i] == dt[i] for i in range(len(dt))]):
+            return chunk.view(dt)
+        v = np.empty(chunk.shape, dtype=dt)
+        for src, dst in zip(chunk.dtype.names, dt.names):
+            v[dst] = chunk[src]
+        return v
+
+    def _write_header(self, kstp, kper, text, ndim1, ndim2, ndim3, imeth,
+                      delt, pertim, totim):
+        dt = np.dtype([('kstp', np.int32),
+                       ('kper', np.int32),
+                       ('text', 'S16'),
+                       ('ndim1', np.int32),
+                       ('ndim2', np.int32),
+                       ('ndim3', np.int32)])
+        if imeth == 0:
+            self._write_scalars(dt, (kstp, kper, text, ndim1, ndim2, ndim3))
+            return
+        self._write_scalars(dt, (kstp, kper, text, ndim1, ndim2, -ndim3))
+        dt = np.dtype([('imeth', np.int32),
+                       ('delt', self.realtype),
+                       ('pertim', self.realtype),
+                       ('totim', self.realtype)])
+        self._write_scalars(dt, (imeth, delt, pertim, totim))
+        return
+
+
 def write_head(fbin, data, kstp=1, kper=1, pertim=1.0, totim=1.0,
                text='            HEAD', ilay=1):
-    dt = np.dtype([('kstp', np.int32),
-                   ('kper', np.int32),
-                   ('pertim', np.float64),
-                   ('totim', np.float64),
-                   ('text', 'S16'),
-                   ('ncol', np.int32),
-                   ('nrow', np.int32),
-                   ('ilay', np.int32)])
-    nrow = data.shape[0]
-    ncol = data.shape[1]
-    h = np.array((kstp, kper, pertim, totim, text, ncol, nrow, ilay), dtype=dt)
-    h.tofile(fbin)
-    data.tofile(fbin)
+    BinaryFileWriter(fbin).write_head(data, kstp=kstp, kper=kper,
+                                      pertim=pertim, totim=totim, text=text,
+                                      ilay=ilay)
     return
 
 
@@ -24,80 +299,153 @@ def write_budget(fbin, data, kstp=1, kper=1, text='    FLOW-JA-FACE',
                  text2id1='           GWF-1',
                  text1id2='           GWF-1',
                  text2id2='             NPF'):
-    dt = np.dtype([('kstp', np.int32),
-                   ('kper', np.int32),
-                   ('text', 'S16'),
-                   ('ndim1', np.int32),
-                   ('ndim2', np.int32),
-                   ('ndim3', np.int32),
-                   ('imeth', np.int32),
-                   ('delt', np.float64),
-                   ('pertim', np.float64),
-                   ('totim', np.float64), ])
-
-    if imeth == 1:
-        ndim1 = data.shape[0]
-        ndim2 = 1
-        ndim3 = -1
-        h = np.array((kstp, kper, text,
-                      ndim1, ndim2, ndim3,
-                      imeth, delt, pertim, totim), dtype=dt)
-        h.tofile(fbin)
-        data.tofile(fbin)
-
-    elif imeth == 6:
-        ndim1 = 1
-        ndim2 = 1
-        ndim3 = -1
-        h = np.array((kstp, kper, text,
-                      ndim1, ndim2, ndim3,
-                      imeth, delt, pertim, totim), dtype=dt)
-        h.tofile(fbin)
-
-        # write text1id1, ...
-        dt = np.dtype([('text1id1', 'S16'),
-                       ('text1id2', 'S16'),
-                       ('text2id1', 'S16'),
-                       ('text2id2', 'S16'), ])
-        h = np.array((text1id1, text1id2, text2id1, text2id2), dtype=dt)
-        h.tofile(fbin)
-
-        # write ndat (number of floating point columns)
-        colnames = data.dtype.names
-        ndat = len(colnames) - 2
-        dt = np.dtype([('ndat', np.int32)])
-        h = np.array([(ndat,)], dtype=dt)
-        h.tofile(fbin)
-
-        # write auxiliary column names
-        naux = ndat - 1
-        if naux > 0:
-            auxtxt = ['{:16}'.format(colname) for colname in colnames[3:]]
-            auxtxt = tuple(auxtxt)
-            dt = np.dtype([(colname, 'S16') for colname in colnames[3:]])
-            h = np.array(auxtxt, dtype=dt)
-            h.tofile(fbin)
-
-        # write nlist
-        nlist = data.shape[0]
-        dt = np.dtype([('nlist', np.int32)])
-        h = np.array([(nlist,)], dtype=dt)
-        h.tofile(fbin)
-
-        # write the data
-        data.tofile(fbin)
-
-        pass
-    else:
-        raise Exception('unknown method code {}'.format(imeth))
+    BinaryFileWriter(fbin).write_budget(data, kstp=kstp, kper=kper,
+                                        text=text, imeth=imeth, delt=delt,
+                                        pertim=pertim, totim=totim,
+                                        text1id1=text1id1, text2id1=text2id1,
+                                        text1id2=text1id2, text2id2=text2id2)
     return
 
 
-def uniform_flow_field(qx, qy, qz, shape):
+def get_csr_connectivity(nodes, n, m):
+    """
+    Build the compressed sparse row connectivity used by MODFLOW 6 from
+    undirected cell pairs (n, m). The diagonal is the first entry for each
+    cell and the remaining connections are in increasing cell order.
+
+    Returns
+    -------
+    ia : numpy.ndarray
+        int32 array (nodes + 1) with the position of the first connection
+        for each cell (zero-based)
+    ja : numpy.ndarray
+        int32 array (nja) with the connected cell numbers (zero-based)
+
+    """
+    n = np.asarray(n, dtype=np.int64)
+    m = np.asarray(m, dtype=np.int64)
+    diag = np.arange(nodes, dtype=np.int64)
+    row = np.concatenate((diag, n, m))
+    col = np.concatenate((diag, m, n))
+    isort = np.lexsort((col, row != col, row))
+    row = row[isort]
+    ja = col[isort].astype(np.int32)
+    ia = np.zeros(nodes + 1, dtype=np.int32)
+    np.cumsum(np.bincount(row, minlength=nodes), out=ia[1:])
+    return ia, ja
+
+
+def get_structured_connectivity(nlay, nrow, ncol):
+    """
+    Return the CSR connectivity (ia, ja) and the cell centers (in units of
+    cells) for a structured (DIS) grid.
+
+    """
+    nodes = nlay * nrow * ncol
+    idx = np.arange(nodes, dtype=np.int64).reshape((nlay, nrow, ncol))
+    n = np.concatenate((idx[:, :, :-1].ravel(), idx[:, :-1, :].ravel(),
+                        idx[:-1, :, :].ravel()))
+    m = np.concatenate((idx[:, :, 1:].ravel(), idx[:, 1:, :].ravel(),
+                        idx[1:, :, :].ravel()))
+    ia, ja = get_csr_connectivity(nodes, n, m)
+    k, i, j = np.unravel_index(np.arange(nodes), (nlay, nrow, ncol))
+    xc = j.astype(np.float64)
+    yc = -i.astype(np.float64)
+    zc = -k.astype(np.float64)
+    return ia, ja, (xc, yc, zc)
+
+
+def get_disv_connectivity(nlay, cell2d, xc, yc, zc=None):
+    """
+    Return the CSR connectivity (ia, ja) and the cell centers for a DISV
+    grid. Cells in a layer are connected if they share an edge and cells
+    are connected vertically to the same cell in adjacent layers.
+
+    Parameters
+    ----------
+    nlay : int
+        number of layers
+    cell2d : list
+        list with the vertex numbers (zero-based) for each cell in a layer
+    xc, yc : numpy.ndarray
+        cell center coordinates for the cells in a layer (ncpl)
+    zc : numpy.ndarray
+        cell center elevations (nlay, ncpl). If zc is None, the layer
+        number is used.
+
+    """
+    ncpl = len(cell2d)
+    nvert = np.array([len(iv) for iv in cell2d], dtype=np.int64)
+    v0 = np.concatenate([np.asarray(iv, dtype=np.int64) for iv in cell2d])
+    istart = np.concatenate(([0], np.cumsum(nvert)[:-1]))
+    # next vertex in each cell, wrapping to the first vertex
+    v1 = np.roll(v0, -1)
+    v1[istart + nvert - 1] = v0[istart]
+    icell = np.repeat(np.arange(ncpl, dtype=np.int64), nvert)
+    edges = np.sort(np.column_stack((v0, v1)), axis=1)
+    keep = edges[:, 0] != edges[:, 1]
+    edges, icell = edges[keep], icell[keep]
 
-    nlay, nrow, ncol = shape
+    # cells that share an edge
+    iedge = np.lexsort((icell, edges[:, 1], edges[:, 0]))
+    edges, icell = edges[iedge], icell[iedge]
+    shared = np.all(edges[1:] == edges[:-1], axis=1) & \
+        (icell[1:] != icell[:-1])
+    n2 = icell[:-1][shared]
+    m2 = icell[1:][shared]
+    pairs = np.unique(np.column_stack((np.minimum(n2, m2),
+                                       np.maximum(n2, m2))), axis=0)
+
+    nodes = nlay * ncpl
+    offset = (np.arange(nlay, dtype=np.int64) * ncpl)[:, None]
+    n = np.concatenate(((pairs[:, 0] + offset).ravel(),
+                        np.arange(nodes - ncpl, dtype=np.int64)))
+    m = np.concatenate(((pairs[:, 1] + offset).ravel(),
+                        np.arange(ncpl, nodes, dtype=np.int64)))
+    ia, ja = get_csr_connectivity(nodes, n, m)
+
+    xc = np.tile(np.asarray(xc, dtype=np.float64), nlay)
+    yc = np.tile(np.asarray(yc, dtype=np.float64), nlay)
+    if zc is None:
+        zc = -np.repeat(np.arange(nlay, dtype=np.float64), ncpl)
+    else:
+        zc = np.asarray(zc, dtype=np.float64).ravel()
+    return ia, ja, (xc, yc, zc)
+
+
+def flow_field(ia, ja, centers, qx, qy, qz, area=1.):
+    """
+    Create the DATA-SPDIS and FLOW-JA-FACE arrays for a specific discharge
+    field on a grid with CSR connectivity (DIS, DISV, or DISU).
+
+    The flow across each connection is the specific discharge averaged for
+    the two cells projected onto the unit vector between the cell centers
+    and multiplied by area. Flows are positive into a cell and the diagonal
+    position for each cell is zero.
+
+    Parameters
+    ----------
+    ia, ja : numpy.ndarray
+        zero-based CSR connectivity (see get_csr_connectivity)
+    centers : tuple
+        cell center coordinates (xc, yc, zc)
+    qx, qy, qz : float or numpy.ndarray
+        specific discharge components (scalars or one value per cell)
+    area : float or numpy.ndarray
+        flow area for each connection (nja)
+
+    Returns
+    -------
+    spdis : numpy.ndarray
+        DATA-SPDIS structured array
+    flowja : numpy.ndarray
+        FLOW-JA-FACE array (nja)
+
+    """
+    nodes = ia.shape[0] - 1
+    q = np.empty((3, nodes), dtype=np.float64)
+    q[0], q[1], q[2] = qx, qy, qz
 
-    # create spdis array for the uniform flow field
     dt = np.dtype([('ID1', np.int32),
                    ('ID2', np.int32),
                    ('FLOW', np.float64),
@@ -105,35 +453,31 @@ def uniform_flow_field(qx, qy, qz, shape):
                    ('QY', np.float64),
                    ('QZ', np.float64),
                    ])
-    spdis = np.array([(id1, id1, 0., qx, qy, qz) for id1 in
-                      range(nlay * nrow * ncol)],
-                     dtype=dt)
-
-    # create the flowja array for the uniform flow field (assume top-bot = 1)
-    flowja = []
-    for k in range(nlay):
-        for i in range(nrow):
-            for j in range(ncol):
-                # diagonal
-                flowja.append(0.)
-                # up
-                if k > 0:
-                    flowja.append(-qz)
-                # back
-                if i > 0:
-                    flowja.append(-qy)
-                # left
-                if j > 0:
-                    flowja.append(qx)
-                # right
-                if j < ncol - 1:
-                    flowja.append(-qx)
-                # front
-                if i < nrow - 1:
-                    flowja.append(qy)
-                # bottom
-                if k < nlay - 1:
-                    flowja.append(qz)
-    flowja = np.array(flowja, dtype=np.float64)
+    spdis = np.empty(nodes, dtype=dt)
+    spdis['ID1'] = np.arange(nodes, dtype=np.int32)
+    spdis['ID2'] = spdis['ID1']
+    spdis['FLOW'] = 0.
+    spdis['QX'], spdis['QY'], spdis['QZ'] = q
+
+    row = np.repeat(np.arange(nodes, dtype=np.int32), np.diff(ia))
+    xyz = np.asarray(centers, dtype=np.float64)
+    d = xyz[:, ja] - xyz[:, row]
+    dist = np.sqrt((d * d).sum(axis=0))
+    offdiag = dist > 0.
+    d[:, offdiag] /= dist[offdiag]
+    qface = 0.5 * (q[:, row] + q[:, ja])
+    flowja = -(qface * d).sum(axis=0) * area
+    flowja[~offdiag] = 0.
     return spdis, flowja
 
+
+def uniform_flow_field(qx, qy, qz, shape):
+    """
+    Create the DATA-SPDIS and FLOW-JA-FACE arrays for a uniform flow field
+    on a structured grid (assumes unit face areas).
+
+    """
+    ia, ja, centers = get_structured_connectivity(*shape)
+    return flow_field(ia, ja, centers, qx, qy, qz)
+
+
@@ -0,0 +1,368 @@
+"""
+Indexed random access to MODFLOW binary budget files.
+
+The record headers in a binary budget file are scanned once and the
+position of every record is saved in a sidecar index file (the budget file
+name with .idx.npz appended). The index is reused as long as the size and
+modification time of the budget file have not changed. Records are returned
+as read-only numpy views into the memory-mapped budget file, so reading one
+term for one time step does not require reading the rest of the file.
+
+The record layouts are the layouts written by ubdsv1 (full and compact
+arrays), ubdsv06 (imeth 6 lists with source and destination names), and
+the other compact budget methods (imeth 2 to 5) used by earlier versions of
+MODFLOW.
+
+Records are identified by (kstp, kper, text, paknam), where paknam is the
+name of the package the flows are reported for (paknam2 in the imeth 6
+header). paknam is blank for records that do not include package names.
+If paknam is not specified, the record is found from (kstp, kper, text) as
+long as only one package reports that term.
+
+"""
+
+import os
+import struct
+import numpy as np
+
+index_version = 1
+
+index_dtype = np.dtype([('kstp', np.int32),
+                        ('kper', np.int32),
+                        ('text', 'S16'),
+                        ('ndim1', np.int32),
+                        ('ndim2', np.int32),
+                        ('ndim3', np.int32),
+                        ('imeth', np.int32),
+                        ('delt', np.float64),
+                        ('pertim', np.float64),
+                        ('totim', np.float64),
+                        ('modelnam1', 'S16'),
+                        ('paknam1', 'S16'),
+                        ('modelnam2', 'S16'),
+                        ('paknam2', 'S16'),
+                        ('naux', np.int32),
+                        ('nlist', np.int32),
+                        ('header_offset', np.int64),
+                        ('offset', np.int64),
+                        ('nbytes', np.int64)])
+
+
+def _is_text(b):
+    return all([32 <= c <= 126 for c in b])
+
+
+def _key_text(text):
+    if isinstance(text, bytes):
+        text = text.decode()
+    return text.strip().upper()
+
+
+class BinaryBudgetIndex(object):
+    """
+    Index of the records in a memory-mapped binary budget file.
+
+    Parameters
+    ----------
+    fpth : str
+        path to the binary budget file
+    precision : str
+        'auto', 'single', or 'double'
+    index_file : str
+        path to the sidecar index file. The default is fpth with .idx.npz
+        appended.
+    save : bool
+        save the index to index_file if it was built by scanning the file
+
+    """
+
+    def __init__(self, fpth, precision='auto', index_file=None, save=True):
+        self.fpth = fpth
+        if index_file is None:
+            index_file = fpth + '.idx.npz'
+        self.index_file = index_file
+        self.mm = np.memmap(fpth, dtype=np.uint8, mode='r')
+
+        st = os.stat(fpth)
+        self._file_state = (st.st_size, st.st_mtime_ns)
+        records = self._load(precision)
+        if records is None:
+            if precision == 'auto':
+                precisions = ('double', 'single')
+            else:
+                precisions = (precision,)
+            for precision in precisions:
+                records = self._scan(precision)
+                if records is not None:
+                    break
+            if records is None:
+                msg = 'could not read the records in {}'.format(self.fpth)
+                raise ValueError(msg)
+            self.precision = precision
+            if save:
+                self._save(records)
+        self.records = records
+        self.realtype = np.float32 if self.precision == 'single' \
+            else np.float64
+
+        # record numbers for each (kstp, kper, text, paknam) and package
+        # names for each (kstp, kper, text)
+        self.keys = {}
+        self.paknams = {}
+        for irec, r in enumerate(records):
+            key = (int(r['kstp']), int(r['kper']), _key_text(r['text']))
+            paknam = _key_text(r['paknam2'])
+            self.keys.setdefault(key + (paknam,), []).append(irec)
+            paknams = self.paknams.setdefault(key, [])
+            if paknam not in paknams:
+                paknams.append(paknam)
+
+    def _load(self, precision):
+        """
+        Return the records in the sidecar index file or None if the index
+        file does not exist or does not match the budget file.
+
+        """
+        if not os.path.isfile(self.index_file):
+            return None
+        try:
+            with np.load(self.index_file) as f:
+                meta = f['meta']
+                records = f['records']
+        except (OSError, KeyError, ValueError):
+            return None
+        if meta.size != 4 or meta[0] != index_version or \
+                (meta[1], meta[2]) != self._file_state or \
+                records.dtype != index_dtype:
+            return None
+        idx_precision = 'single' if meta[3] == 4 else 'double'
+        if precision != 'auto' and precision != idx_precision:
+            return None
+        self.precision = idx_precision
+        return records
+
+    def _save(self, records):
+        vsize = 4 if self.precision == 'single' else 8
+        meta = np.array((index_version,) + self._file_state + (vsize,),
+                        dtype=np.int64)
+        tpth = self.index_file + '.tmp.npz'
+        try:
+            np.savez(tpth, meta=meta, records=records)
+            os.replace(tpth, self.index_file)
+        except OSError:
+            # the index is only a cache, so an unwritable location is not
+            # an error
+            if os.path.isfile(tpth):
+                os.remove(tpth)
+        return
+
+    def _scan(self, precision):
+        """
+        Walk the record headers assuming precision. None is returned if the
+        headers are not valid or the records do not end at the end of the
+        file.
+
+        """
+        if precision == 'single':
+            rfmt, vsize = 'f', 4
+        else:
+            rfmt, vsize = 'd', 8
+        mm = self.mm
+        nbytes = mm.size
+        records = []
+        pos = 0
+        try:
+            while pos < nbytes:
+                hpos = pos
+                kstp, kper, text, ndim1, ndim2, ndim3 = \
+                    struct.unpack_from('<2i16s3i', mm, pos)
+                pos += 36
+                if not _is_text(text) or ndim1 < 1 or ndim2 < 1 or \
+                        ndim3 == 0:
+                    return None
+                imeth = 0
+                delt = pertim = totim = 0.
+                if ndim3 < 0:
+                    imeth, delt, pertim, totim = \
+                        struct.unpack_from('<i3' + rfmt, mm, pos)
+                    pos += 4 + 3 * vsize
+                names = 4 * (b'',)
+                naux = 0
+                nlist = 0
+                n = ndim1 * ndim2 * abs(ndim3)
+                n2 = ndim1 * ndim2
+                if imeth in (0, 1):
+                    size = n * vsize
+                elif imeth == 2:
+                    nlist, = struct.unpack_from('<i', mm, pos)
+                    pos += 4
+                    size = nlist * (4 + vsize)
+                elif imeth == 3:
+                    size = n2 * (4 + vsize)
+                elif imeth == 4:
+                    size = n2 * vsize
+                elif imeth in (5, 6):
+                    if imeth == 6:
+                        names = struct.unpack_from('<16s16s16s16s', mm, pos)
+                        pos += 64
+                        if not all([_is_text(s) for s in names]):
+                            return None
+                    ndat, = struct.unpack_from('<i', mm, pos)
+                    naux = ndat - 1
+                    pos += 4 + 16 * naux
+                    nlist, = struct.unpack_from('<i', mm, pos)
+                    pos += 4
+                    nid = 2 if imeth == 6 else 1
+                    size = nlist * (4 * nid + vsize * ndat)
+                    if naux < 0:
+                        return None
+                else:
+                    return None
+                if nlist < 0 or pos + size > nbytes:
+                    return None
+                records.append((kstp, kper, text, ndim1, ndim2, ndim3,
+                                imeth, delt, pertim, totim) + tuple(names) +
+                               (naux, nlist, hpos, pos, size))
+                pos += size
+        except struct.error:
+            return None
+        if pos != nbytes:
+            return None
+        return np.array(records, dtype=index_dtype)
+
+    def get_aux_names(self, irec):
+        """
+        Return the auxiliary variable names for record irec.
+
+        """
+        r = self.records[irec]
+        naux = int(r['naux'])
+        if naux < 1:
+            return []
+        # auxiliary names are immediately before nlist
+        pos = int(r['offset']) - 4 - 16 * naux
+        return [_key_text(s)
+                for s in struct.unpack_from('<' + naux * '16s', self.mm, pos)]
+
+    def get_list_dtype(self, irec):
+        """
+        Return the dtype of the list for an imeth 2, 5, or 6 record.
+
+        """
+        r = self.records[irec]
+        if r['imeth'] == 6:
+            fields = [('node', np.int32), ('node2', np.int32)]
+        else:
+            fields = [('node', np.int32)]
+        fields.append(('q', self.realtype))
+        for name in self.get_aux_names(irec):
+            fields.append((name, self.realtype))
+        return np.dtype(fields)
+
+    def get_record(self, irec):
+        """
+        Return a read-only view of the data for record irec.
+
+        Arrays (imeth 0, 1, and 4) are returned as one-dimensional arrays,
+        lists (imeth 2, 5, and 6) are returned as structured arrays, and
+        imeth 3 records are returned as a tuple with the layer and value
+        arrays.
+
+        """
+        r = self.records[irec]
+        imeth = r['imeth']
+        offset = int(r['offset'])
+        if imeth in (2, 5, 6):
+            dt = self.get_list_dtype(irec)
+            n = int(r['nlist'])
+        else:
+            dt = np.dtype(self.realtype)
+            n = int(r['nbytes']) // dt.itemsize
+        if imeth == 3:
+            n2 = int(r['ndim1'] * r['ndim2'])
+            ilay = np.ndarray(shape=(n2,), dtype=np.int32, buffer=self.mm,
+                              offset=offset)
+            v = np.ndarray(shape=(n2,), dtype=self.realtype, buffer=self.mm,
+                           offset=offset + 4 * n2)
+            return ilay, v
+        return np.ndarray(shape=(n,), dtype=dt, buffer=self.mm,
+                          offset=offset)
+
+    def find(self, kstp=None, kper=None, text=None, paknam=None,
+             totim=None):
+        """
+        Return the record numbers that match all of the specified values.
+
+        """
+        r = self.records
+        select = np.ones(r.shape[0], dtype=bool)
+        if kstp is not None:
+            select &= r['kstp'] == kstp
+        if kper is not None:
+            select &= r['kper'] == kper
+        if totim is not None:
+            select &= np.isclose(r['totim'], totim)
+        if text is not None:
+            text = _key_text(text)
+            select &= np.array([_key_text(s) == text for s in r['text']],
+                               dtype=bool)
+        if paknam is not None:
+            paknam = _key_text(paknam)
+            select &= np.array([_key_text(s) == paknam
+                                for s in r['paknam2']], dtype=bool)
+        return np.nonzero(select)[0]
+
+    def get_data(self, kstp, kper, text, paknam=None):
+        """
+        Return a list of views of the records for (kstp, kper, text,
+        paknam). paknam is blank for records without package names. If
+        paknam is None, the records for the only package that reports text
+        are returned and a ValueError is raised if several packages report
+        text.
+
+        """
+        key = (kstp, kper, _key_text(text))
+        if paknam is None:
+            paknams = self.paknams.get(key, [])
+            if len(paknams) > 1:
+                msg = '{} is reported by several packages '.format(key[2]) + \
+                      'for kstp {} and kper {}: '.format(kstp, kper) + \
+                      ', '.join(paknams) + '. Specify paknam.'
+                raise ValueError(msg)
+            paknam = paknams[0] if len(paknams) > 0 else ''
+        key += (_key_text(paknam),)
+        return [self.get_record(irec) for irec in self.keys.get(key, [])]
+
+    def get_kstpkper(self):
+        """
+        Return the unique (kstp, kper) values in file order.
+
+        """
+        values = []
+        for kstp, kper in zip(self.records['kstp'], self.records['kper']):
+            v = (int(kstp), int(kper))
+            if v not in values:
+                values.append(v)
+        return values
+
+    def get_times(self):
+        """
+        Return the unique simulation times in file order.
+
+        """
+        totim = self.records['totim']
+        idx = np.unique(totim, return_index=True)[1]
+        return totim[np.sort(idx)]
+
+    def get_unique_text(self):
+        """
+        Return the unique (text, paknam) values in file order.
+
+        """
+        values = []
+        for text, paknam in zip(self.records['text'],
+                                self.records['paknam2']):
+            v = (_key_text(text), _key_text(paknam))
+            if v not in values:
+                values.append(v)
+        return values
@@ -0,0 +1,226 @@
+"""
+Content-addressed cache for the output of comparison model runs.
+
+The comparison models (MODFLOW-2005, MODFLOW-NWT, MODFLOW-USG, MODFLOW-LGR,
+and the MODFLOW 6 .cmp runs) produce the same output every time they are run
+with the same input files and executable. The cache key is a hash of the
+contents of all of the files in the comparison directory before the model is
+run and a hash of the executable. The files created or modified by a
+successful run are stored in the cache and are restored on subsequent runs
+instead of running the comparison model.
+
+The cache is disabled by default. It is enabled by passing --cmp-cache on the
+command line or by defining the MF6_CMP_CACHE environment variable as the
+path to the cache directory. The maximum size (in GB) and maximum age (in
+days) of the cache can be defined using the MF6_CMP_CACHE_SIZE and
+MF6_CMP_CACHE_AGE environment variables. The least recently used entries are
+removed first when the cache exceeds its maximum size.
+
+"""
+
+import os
+import sys
+import json
+import time
+import shutil
+import hashlib
+
+default_cache_dir = os.path.join(os.path.expanduser('~'), '.cache',
+                                 'mf6-autotest')
+default_max_size = 5.  # GB
+default_max_age = 30.  # days
+
+manifest_name = 'manifest.json'
+_exe_hashes = {}
+
+
+def get_comparison_cache():
+    """
+    Return a ComparisonCache if caching is enabled on the command line or
+    with the MF6_CMP_CACHE environment variable, otherwise return None.
+
+    """
+    cache_dir = os.environ.get('MF6_CMP_CACHE')
+    enabled = cache_dir is not None
+    for arg in sys.argv:
+        if arg.lower() == '--cmp-cache':
+            enabled = True
+    if not enabled:
+        return None
+    if cache_dir is None or cache_dir == '':
+        cache_dir = default_cache_dir
+    max_size = float(os.environ.get('MF6_CMP_CACHE_SIZE', default_max_size))
+    max_age = float(os.environ.get('MF6_CMP_CACHE_AGE', default_max_age))
+    return ComparisonCache(cache_dir, max_size=max_size, max_age=max_age)
+
+
+def hash_file(fpth, hsh=None):
+    """
+    Update hsh (or a new sha256 hash) with the contents of fpth.
+
+    """
+    if hsh is None:
+        hsh = hashlib.sha256()
+    with open(fpth, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            hsh.update(chunk)
+    return hsh
+
+
+def hash_executable(exe):
+    """
+    Return the sha256 hash of an executable. Hashes are reused until the
+    size or modification time of the executable changes.
+
+    """
+    st = os.stat(exe)
+    key = (os.path.abspath(exe), st.st_size, st.st_mtime)
+    if key not in _exe_hashes:
+        _exe_hashes[key] = hash_file(exe).hexdigest()
+    return _exe_hashes[key]
+
+
+def get_file_states(pth):
+    """
+    Return a dictionary of relative file path: (size, mtime) for all of the
+    files in pth.
+
+    """
+    states = {}
+    for root, dirs, files in os.walk(pth):
+        for f in files:
+            fpth = os.path.join(root, f)
+            st = os.stat(fpth)
+            states[os.path.relpath(fpth, pth)] = (st.st_size, st.st_mtime)
+    return states
+
+
+class ComparisonCache(object):
+    """
+    Content-addressed store of comparison model output files.
+
+    Parameters
+    ----------
+    cache_dir : str
+        path to the cache directory
+    max_size : float
+        maximum size of the cache in GB
+    max_age : float
+        maximum number of days since an entry was last used
+
+    """
+
+    def __init__(self, cache_dir, max_size=default_max_size,
+                 max_age=default_max_age):
+        self.cache_dir = cache_dir
+        self.max_size = max_size * 1024 ** 3
+        self.max_age = max_age * 86400.
+        if not os.path.isdir(cache_dir):
+            os.makedirs(cache_dir, exist_ok=True)
+
+    def get_key(self, pth, exe):
+        """
+        Return the cache key for the comparison model in pth run with exe.
+
+        """
+        hsh = hashlib.sha256()
+        hsh.update(hash_executable(exe).encode())
+        for rpth in sorted(get_file_states(pth)):
+            hsh.update(rpth.replace(os.sep, '/').encode())
+            hash_file(os.path.join(pth, rpth), hsh)
+        return hsh.hexdigest()
+
+    def _entry_path(self, key):
+        return os.path.join(self.cache_dir, key[:2], key)
+
+    def restore(self, key, pth):
+        """
+        Copy the cached output files for key to pth. Returns True if the
+        key was found in the cache.
+
+        """
+        epth = self._entry_path(key)
+        fpth = os.path.join(epth, manifest_name)
+        if not os.path.isfile(fpth):
+            return False
+        with open(fpth) as f:
+            manifest = json.load(f)
+        for rpth in manifest['files']:
+            dst = os.path.join(pth, rpth)
+            ddir = os.path.dirname(dst)
+            if ddir != '' and not os.path.isdir(ddir):
+                os.makedirs(ddir)
+            shutil.copy2(os.path.join(epth, 'files', rpth), dst)
+
+        # update the last access time used for eviction
+        os.utime(fpth, None)
+        return True
+
+    def store(self, key, pth, states):
+        """
+        Store the files in pth that were created or modified since states
+        were determined using get_file_states().
+
+        """
+        epth = self._entry_path(key)
+        if os.path.isdir(epth):
+            return
+
+        files = []
+        for rpth, state in get_file_states(pth).items():
+            if states.get(rpth) != state:
+                files.append(rpth)
+
+        # copy to a temporary directory and rename so concurrent test
+        # processes never see a partial entry
+        tpth = '{}.{}.tmp'.format(epth, os.getpid())
+        size = 0
+        for rpth in files:
+            dst = os.path.join(tpth, 'files', rpth)
+            os.makedirs(os.path.dirname(dst), exist_ok=True)
+            shutil.copy2(os.path.join(pth, rpth), dst)
+            size += os.path.getsize(dst)
+        manifest = {'files': files, 'size': size, 'created': time.time()}
+        os.makedirs(tpth, exist_ok=True)
+        with open(os.path.join(tpth, manifest_name), 'w') as f:
+            json.dump(manifest, f)
+        try:
+            os.rename(tpth, epth)
+        except OSError:
+            shutil.rmtree(tpth, ignore_errors=True)
+
+        self.evict()
+        return
+
+    def evict(self):
+        """
+        Remove entries that have not been used within max_age days and
+        the least recently used entries until the cache is smaller than
+        max_size.
+
+        """
+        entries = []
+        for prefix in os.listdir(self.cache_dir):
+            ppth = os.path.join(self.cache_dir, prefix)
+            if not os.path.isdir(ppth):
+                continue
+            for key in os.listdir(ppth):
+                fpth = os.path.join(ppth, key, manifest_name)
+                if not os.path.isfile(fpth):
+                    continue
+                try:
+                    with open(fpth) as f:
+                        size = json.load(f)['size']
+                    atime = os.path.getmtime(fpth)
+                except (OSError, ValueError, KeyError):
+                    continue
+                entries.append((atime, size, os.path.join(ppth, key)))
+
+        now = time.time()
+        entries.sort()
+        total = sum([size for atime, size, epth in entries])
+        for atime, size, epth in entries:
+            if now - atime > self.max_age or total > self.max_size:
+                shutil.rmtree(epth, ignore_errors=True)
+                total -= size
+        return
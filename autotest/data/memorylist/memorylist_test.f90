@@ -0,0 +1,129 @@
+! Unit test of the hash table and the memory list that index the 
+! variables in the memory manager. The program stops with a nonzero
+! return code if a test fails.
+program memorylist_test
+  use KindModule, only: I4B
+  use MemoryTypeModule, only: MemoryType
+  use MemoryListModule, only: MemoryListType
+  use HashTableModule, only: HashTableType, hash_table_cr, hash_table_da
+  
+  implicit none
+  
+  ! -- number of entries, large enough to resize the hash table twice
+  integer(I4B), parameter :: NENTRY = 25000
+  integer(I4B) :: nerr
+  
+  nerr = 0
+  call test_hash_table()
+  call test_memory_list()
+  if (nerr > 0) then
+    write(*, '(i0,a)') nerr, ' memory list unit test(s) failed'
+    stop 1
+  end if
+  write(*, '(a)') 'memory list unit tests passed'
+  
+contains
+
+  subroutine check(condition, msg)
+    logical, intent(in) :: condition
+    character(len=*), intent(in) :: msg
+    if (.not. condition) then
+      write(*, '(a,a)') 'FAILED: ', msg
+      nerr = nerr + 1
+    end if
+  end subroutine check
+
+  function get_key(i) result(key)
+    integer(I4B), intent(in) :: i
+    character(len=20) :: key
+    write(key, '(a,i0)') 'PKG', i
+  end function get_key
+
+  subroutine test_hash_table()
+    type(HashTableType), pointer :: ht
+    integer(I4B) :: i
+    integer(I4B) :: nfound
+    !
+    ! -- find every key after the hash lists have been resized
+    call hash_table_cr(ht)
+    do i = 1, NENTRY
+      call ht%add_entry(trim(get_key(i)), i)
+    end do
+    call check(ht%count_entries() == NENTRY, 'hash table entry count')
+    nfound = 0
+    do i = 1, NENTRY
+      if (ht%get_index(trim(get_key(i))) == i) nfound = nfound + 1
+    end do
+    call check(nfound == NENTRY, 'hash table get_index after resize')
+    call check(ht%get_index('PKG0') == 0, 'hash table missing key')
+    !
+    ! -- adding an existing key replaces the index
+    call ht%add_entry('PKG1', -1)
+    call check(ht%get_index('PKG1') == -1, 'hash table replaced index')
+    call check(ht%count_entries() == NENTRY,                                  &
+               'hash table entry count after replacing an index')
+    call hash_table_da(ht)
+  end subroutine test_hash_table
+
+  subroutine test_memory_list()
+    type(MemoryListType) :: memorylist
+    type(MemoryType), pointer :: mt
+    type(MemoryType), pointer :: mtdup
+    type(MemoryType), pointer :: mtfirst
+    integer(I4B) :: i
+    integer(I4B) :: nfound
+    !
+    ! -- add more entries than the initial size of the entry array
+    do i = 1, NENTRY
+      allocate(mt)
+      mt%name = 'BOUND'
+      mt%path = 'MODEL ' // get_key(i)
+      mt%id = i
+      call memorylist%add(mt)
+    end do
+    call check(memorylist%count() == NENTRY, 'memory list count')
+    !
+    ! -- find every entry
+    nfound = 0
+    do i = 1, NENTRY
+      mt => memorylist%find('MODEL ' // get_key(i), 'BOUND')
+      if (associated(mt)) then
+        if (mt%id == i .and. associated(mt, memorylist%get(i))) then
+          nfound = nfound + 1
+        end if
+      end if
+    end do
+    call check(nfound == NENTRY, 'memory list find')
+    mt => memorylist%find('MODEL PKG1', 'NOTAVAR')
+    call check(.not. associated(mt), 'memory list missing variable')
+    mt => memorylist%find('MODEL PKG0', 'BOUND')
+    call check(.not. associated(mt), 'memory list missing path')
+    !
+    ! -- the first entry with an address is found
+    mtfirst => memorylist%get(1)
+    allocate(mtdup)
+    mtdup%name = mtfirst%name
+    mtdup%path = mtfirst%path
+    mtdup%id = 0
+    call memorylist%add(mtdup)
+    call check(memorylist%count() == NENTRY + 1,                              &
+               'memory list count with a duplicate address')
+    call check(associated(memorylist%get(NENTRY + 1), mtdup),                &
+               'memory list get duplicate entry')
+    mt => memorylist%find(mtfirst%path, mtfirst%name)
+    call check(associated(mt, mtfirst), 'memory list first entry found')
+    !
+    ! -- clear the list
+    do i = 1, memorylist%count()
+      mt => memorylist%get(i)
+      deallocate(mt)
+    end do
+    call memorylist%clear()
+    call check(memorylist%count() == 0, 'memory list count after clear')
+    mt => memorylist%find('MODEL PKG1', 'BOUND')
+    call check(.not. associated(mt), 'memory list find after clear')
+    mt => memorylist%get(1)
+    call check(.not. associated(mt), 'memory list get after clear')
+  end subroutine test_memory_list
+
+end program memorylist_test
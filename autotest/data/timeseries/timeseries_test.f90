@@ -0,0 +1,178 @@
+! Unit test of the time-series record search and interpolation. A time
+! series file with one record per unit of time is written and read with
+! and without AUTODEALLOCATE. The program stops with a nonzero return code
+! if a test fails. If the program is run with the argument PAST, a value
+! is requested after the last record, which must stop the program with
+! the time-series integration error.
+program timeseries_test
+  use KindModule, only: DP, I4B
+  use TimeSeriesModule, only: TimeSeriesType, TimeSeriesFileType,            &
+                              ConstructTimeSeriesFile
+  
+  implicit none
+  
+  ! -- number of records, larger than the initial size of the record arrays
+  integer(I4B), parameter :: NREC = 1000
+  character(len=*), parameter :: FNAME = 'timeseries_test.ts'
+  integer(I4B) :: nerr
+  integer(I4B) :: iout
+  character(len=20) :: arg
+  
+  nerr = 0
+  call write_ts_file()
+  open(newunit=iout, file='timeseries_test.lst', status='replace')
+  call get_command_argument(1, arg)
+  if (arg == 'PAST') then
+    call test_past_last_record()
+  end if
+  call test_in_order()
+  call test_out_of_order()
+  if (nerr > 0) then
+    write(*, '(i0,a)') nerr, ' time series unit test(s) failed'
+    stop 1
+  end if
+  write(*, '(a)') 'time series unit tests passed'
+  
+contains
+
+  subroutine write_ts_file()
+    integer(I4B) :: iu
+    integer(I4B) :: i
+    !
+    ! -- the linear series are 2t + 1 and the stepwise series is the
+    !    integer part of t
+    open(newunit=iu, file=FNAME, status='replace')
+    write(iu, '(a)') 'BEGIN ATTRIBUTES'
+    write(iu, '(a)') '  NAMES lin step lend'
+    write(iu, '(a)') '  METHODS linear stepwise linearend'
+    write(iu, '(a)') 'END ATTRIBUTES'
+    write(iu, '(a)') 'BEGIN TIMESERIES'
+    do i = 0, NREC - 1
+      write(iu, '(2x,i0,1x,i0,1x,i0,1x,i0)') i, 2 * i + 1, i, 2 * i + 1
+    end do
+    write(iu, '(a)') 'END TIMESERIES'
+    close(iu)
+  end subroutine write_ts_file
+
+  subroutine check(value, expected, msg, time0, time1)
+    real(DP), intent(in) :: value
+    real(DP), intent(in) :: expected
+    character(len=*), intent(in) :: msg
+    real(DP), intent(in) :: time0
+    real(DP), intent(in) :: time1
+    if (abs(value - expected) > 1.d-9 * max(1.d0, abs(expected))) then
+      write(*, '(a,a,a,g0,a,g0,a,g0,a,g0)') 'FAILED: ', msg, ' from ',      &
+        time0, ' to ', time1, ': ', value, ' expected ', expected
+      nerr = nerr + 1
+    end if
+  end subroutine check
+
+  function step_average(time0, time1) result(value)
+    ! -- average of the stepwise series from time0 to time1
+    real(DP), intent(in) :: time0
+    real(DP), intent(in) :: time1
+    real(DP) :: value
+    real(DP) :: t0
+    real(DP) :: t1
+    real(DP) :: area
+    area = 0.d0
+    t0 = time0
+    do while (t0 < time1)
+      t1 = min(aint(t0) + 1.d0, time1)
+      area = area + aint(t0) * (t1 - t0)
+      t0 = t1
+    end do
+    value = area / (time1 - time0)
+  end function step_average
+
+  subroutine check_span(tsfile, time0, time1)
+    type(TimeSeriesFileType), intent(inout) :: tsfile
+    real(DP), intent(in) :: time0
+    real(DP), intent(in) :: time1
+    type(TimeSeriesType), pointer :: ts
+    real(DP) :: v
+    !
+    ts => tsfile%GetTimeSeries(1)
+    v = ts%GetValue(time0, time1)
+    call check(v, time0 + time1 + 1.d0, 'linear', time0, time1)
+    !
+    ! -- the cached value is returned for the same time span
+    v = ts%GetValue(time0, time1)
+    call check(v, time0 + time1 + 1.d0, 'linear (cached)', time0, time1)
+    !
+    ts => tsfile%GetTimeSeries(2)
+    v = ts%GetValue(time0, time1)
+    call check(v, step_average(time0, time1), 'stepwise', time0, time1)
+    !
+    ts => tsfile%GetTimeSeries(3)
+    v = ts%GetValue(time0, time1)
+    call check(v, 2.d0 * time1 + 1.d0, 'linearend', time0, time1)
+  end subroutine check_span
+
+  subroutine test_in_order()
+    type(TimeSeriesFileType), pointer :: tsfile
+    integer(I4B) :: k
+    real(DP) :: time0
+    real(DP) :: time1
+    !
+    ! -- records are discarded and the record arrays are compacted as the
+    !    spans advance through the series
+    call ConstructTimeSeriesFile(tsfile)
+    call tsfile%Initializetsfile(FNAME, iout, .true.)
+    time1 = 0.d0
+    k = 0
+    do while (time1 < NREC - 1)
+      k = k + 1
+      time0 = time1
+      time1 = min(time0 + 0.25d0 * mod(k, 11), real(NREC - 1, DP))
+      if (time1 == time0) cycle
+      call check_span(tsfile, time0, time1)
+    end do
+    close(tsfile%inunit)
+    call tsfile%da()
+    deallocate(tsfile)
+  end subroutine test_in_order
+
+  subroutine test_out_of_order()
+    type(TimeSeriesFileType), pointer :: tsfile
+    type(TimeSeriesType), pointer :: ts
+    real(DP) :: v
+    !
+    ! -- records are bisected when a span is not next to the last span
+    call ConstructTimeSeriesFile(tsfile)
+    call tsfile%Initializetsfile(FNAME, iout, .false.)
+    call check_span(tsfile, 900.d0, 901.d0)
+    call check_span(tsfile, 10.25d0, 13.75d0)
+    call check_span(tsfile, 500.5d0, 500.75d0)
+    call check_span(tsfile, 13.75d0, 14.d0)
+    call check_span(tsfile, 0.d0, 0.5d0)
+    call check_span(tsfile, 998.5d0, 999.d0)
+    call check_span(tsfile, 250.d0, 750.d0)
+    !
+    ! -- value at a time
+    ts => tsfile%GetTimeSeries(1)
+    v = ts%GetValue(321.5d0, 321.5d0)
+    call check(v, 644.d0, 'linear at a time', 321.5d0, 321.5d0)
+    v = ts%GetValue(17.d0, 17.d0)
+    call check(v, 35.d0, 'linear at a record', 17.d0, 17.d0)
+    close(tsfile%inunit)
+    call tsfile%da()
+    deallocate(tsfile)
+  end subroutine test_out_of_order
+
+  subroutine test_past_last_record()
+    type(TimeSeriesFileType), pointer :: tsfile
+    type(TimeSeriesType), pointer :: ts
+    real(DP) :: v
+    !
+    call ConstructTimeSeriesFile(tsfile)
+    call tsfile%Initializetsfile(FNAME, iout, .true.)
+    ts => tsfile%GetTimeSeries(1)
+    v = ts%GetValue(998.d0, 999.d0)
+    call check(v, 1998.d0, 'linear', 998.d0, 999.d0)
+    v = ts%GetValue(999.d0, 1000.d0)
+    write(*, '(a)') 'FAILED: value returned after the last record'
+    stop 1
+  end subroutine test_past_last_record
+
+end program timeseries_test
@@ -1,96 +1,84 @@
 
 import numpy as np
 
-def get_disu_kwargs(nlay, nrow, ncol, delr, delc, tp, botm):
-    def get_nn(k, i, j):
-        return k * nrow * ncol + i * ncol + j
+
+def get_disu_kwargs(nlay, nrow, ncol, delr, delc, tp, botm, idomain=None):
+    """
+    Return the DISU keyword arguments for a structured grid.
+
+    The connections for each cell are ordered diagonal, up, back, left,
+    right, front, and bottom. tp can be a scalar or an (nrow, ncol) array and
+    botm can be a list of layer bottoms or an (nlay, nrow, ncol) array. Cells
+    with an idomain value less than one are removed from the grid and the
+    remaining cells are renumbered.
+
+    """
+    shape = (nlay, nrow, ncol)
+    delr = np.asarray(delr, dtype=np.float64)
+    delc = np.asarray(delc, dtype=np.float64)
+    botm = np.asarray(botm, dtype=np.float64)
+    if botm.ndim == 1:
+        botm = botm[:, None, None]
+    bot = np.broadcast_to(botm, shape)
+    top = np.empty(shape, dtype=np.float64)
+    top[0] = tp
+    top[1:] = bot[:-1]
+    dz = top - bot
+    area = np.broadcast_to(delc[:, None] * delr[None, :], shape)
+    delr3d = np.broadcast_to(delr[None, None, :], shape)
+    delc3d = np.broadcast_to(delc[None, :, None], shape)
+
+    # connected cell for the diagonal, up, back, left, right, front, and
+    # bottom positions (-1 if the connection does not exist)
     nodes = nlay * nrow * ncol
-    iac = np.zeros((nodes), dtype=np.int)
-    ja = []
-    area = np.zeros((nodes), dtype=np.float)
-    top = np.zeros((nodes), dtype=np.float)
-    bot = np.zeros((nodes), dtype=np.float)
-    ihc = []
-    cl12 = []
-    hwva = []
-    for k in range(nlay):
-        for i in range(nrow):
-            for j in range(ncol):
-                # diagonal
-                n = get_nn(k, i, j)
-                ja.append(n)
-                iac[n] += 1
-                area[n] = delr[i] * delc[j]
-                ihc.append(n + 1)
-                cl12.append(n + 1)
-                hwva.append(n + 1)
-                if k == 0:
-                    top[n] = tp
-                else:
-                    top[n] = botm[k - 1]
-                bot[n] = botm[k]
-                # up
-                if k > 0:
-                    ja.append(get_nn(k - 1, i, j))
-                    iac[n] += 1
-                    ihc.append(0)
-                    dz = botm[k - 1] - botm[k]
-                    cl12.append(.5 * dz)
-                    hwva.append(delr[i] * delc[j])
-                # back
-                if i > 0:
-                    ja.append(get_nn(k, i - 1, j))
-                    iac[n] += 1
-                    ihc.append(1)
-                    cl12.append(.5 * delc[i])
-                    hwva.append(delr[j])
-                # left
-                if j > 0:
-                    ja.append(get_nn(k, i, j - 1))
-                    iac[n] += 1
-                    ihc.append(1)
-                    cl12.append(.5 * delr[j])
-                    hwva.append(delc[i])
-                # right
-                if j < ncol - 1:
-                    ja.append(get_nn(k, i, j + 1))
-                    iac[n] += 1
-                    ihc.append(1)
-                    cl12.append(.5 * delr[j])
-                    hwva.append(delc[i])
-                # front
-                if i < nrow - 1:
-                    ja.append(get_nn(k, i + 1, j))
-                    iac[n] += 1
-                    ihc.append(1)
-                    cl12.append(.5 * delc[i])
-                    hwva.append(delr[j])
-                # bottom
-                if k < nlay - 1:
-                    ja.append(get_nn(k + 1, i, j))
-                    iac[n] += 1
-                    ihc.append(0)
-                    if k == 0:
-                        dz = tp - botm[k]
-                    else:
-                        dz = botm[k - 1] - botm[k]
-                    cl12.append(.5 * dz)
-                    hwva.append(delr[i] * delc[j])
-    ja = np.array(ja, dtype=np.int)
+    idx = np.arange(nodes, dtype=np.int32).reshape(shape)
+    nn = np.full(shape + (7,), -1, dtype=np.int32)
+    nn[..., 0] = idx
+    nn[1:, :, :, 1] = idx[:-1]
+    nn[:, 1:, :, 2] = idx[:, :-1]
+    nn[:, :, 1:, 3] = idx[:, :, :-1]
+    nn[:, :, :-1, 4] = idx[:, :, 1:]
+    nn[:, :-1, :, 5] = idx[:, 1:]
+    nn[:-1, :, :, 6] = idx[1:]
+    nn = nn.reshape((nodes, 7))
+    mask = nn >= 0
+
+    if idomain is None:
+        active = np.ones(nodes, dtype=bool)
+    else:
+        active = np.broadcast_to(idomain, shape).ravel() > 0
+        mask &= active[:, None]
+        mask[mask] = active[nn[mask]]
+    nodemap = np.cumsum(active, dtype=np.int32) - 1
+    nodes = int(active.sum())
+
+    ihc = np.empty((nodemap.size, 7), dtype=np.int32)
+    ihc[:, 1:] = [0, 1, 1, 1, 1, 0]
+    cl12 = np.empty((nodemap.size, 7), dtype=np.float64)
+    hwva = np.empty((nodemap.size, 7), dtype=np.float64)
+    for ipos, v in ((1, 0.5 * dz), (2, 0.5 * delc3d), (3, 0.5 * delr3d),
+                    (4, 0.5 * delr3d), (5, 0.5 * delc3d), (6, 0.5 * dz)):
+        cl12[:, ipos] = v.ravel()
+    for ipos, v in ((1, area), (2, delr3d), (3, delc3d), (4, delc3d),
+                    (5, delr3d), (6, area)):
+        hwva[:, ipos] = v.ravel()
+    # diagonal values are not used and are set to the node number
+    ihc[:, 0] = nodemap + 1
+    cl12[:, 0] = nodemap + 1
+    hwva[:, 0] = nodemap + 1
+
+    ja = nodemap[nn[mask]]
     nja = ja.shape[0]
-    hwva = np.array(hwva, dtype=np.float)
     kw = {}
     kw['nodes'] = nodes
     kw['nja'] = nja
     kw['nvert'] = None
-    kw['top'] = top
-    kw['bot'] = bot
-    kw['area'] = area
-    kw['iac'] = iac
+    kw['top'] = top.ravel()[active]
+    kw['bot'] = bot.ravel()[active]
+    kw['area'] = area.ravel()[active]
+    kw['iac'] = mask.sum(axis=1, dtype=np.int32)[active]
     kw['ja'] = ja
-    kw['ihc'] = ihc
-    kw['cl12'] = cl12
-    kw['hwva'] = hwva
+    kw['ihc'] = ihc[mask]
+    kw['cl12'] = cl12[mask]
+    kw['hwva'] = hwva[mask]
     return kw
-
-
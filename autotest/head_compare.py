@@ -0,0 +1,329 @@
+"""
+Vectorized comparison of binary head and concentration files.
+
+Both files are memory-mapped and the record headers are indexed once. The
+data for each output time are accessed as views into the memory-mapped
+files and the maximum absolute and root mean square differences are
+calculated for each layer record using numpy. A comparison fails if the
+maximum absolute difference for any output time is greater than or equal to
+htol, which is the same criteria used by pymake.compare_heads.
+
+"""
+
+import os
+import textwrap
+import numpy as np
+
+try:
+    import flopy
+except:
+    msg = 'Error. FloPy package is not available.\n'
+    msg += 'Try installing using the following command:\n'
+    msg += ' pip install flopy'
+    raise Exception(msg)
+
+
+def _header_dtype(precision):
+    if precision == 'single':
+        ftype = np.float32
+    else:
+        ftype = np.float64
+    return np.dtype([('kstp', np.int32),
+                     ('kper', np.int32),
+                     ('pertim', ftype),
+                     ('totim', ftype),
+                     ('text', 'S16'),
+                     ('ncol', np.int32),
+                     ('nrow', np.int32),
+                     ('ilay', np.int32)])
+
+
+class BinaryHeadIndex(object):
+    """
+    Index of the records in a memory-mapped binary head (or concentration)
+    file.
+
+    Parameters
+    ----------
+    fpth : str
+        path to the binary file
+    precision : str
+        'auto', 'single', or 'double'
+
+    """
+
+    def __init__(self, fpth, precision='auto'):
+        self.fpth = fpth
+        self.mm = np.memmap(fpth, dtype=np.uint8, mode='r')
+        if precision == 'auto':
+            precisions = ('double', 'single')
+        else:
+            precisions = (precision,)
+        index = None
+        for precision in precisions:
+            index = self._scan(precision)
+            if index is not None:
+                break
+        if index is None:
+            msg = 'could not read the records in {}'.format(self.fpth)
+            raise ValueError(msg)
+        self.precision = precision
+        self.hdr_dtype = _header_dtype(precision)
+        self.data_dtype = np.dtype(self.hdr_dtype['totim'])
+        self.headers, self.offsets, self.sizes = index
+
+        # group the records by output time, preserving file order
+        totim = self.headers['totim']
+        istart = np.nonzero(np.diff(totim))[0] + 1
+        if totim.size > 0:
+            istart = np.concatenate(([0], istart))
+        self.time_start = istart
+        self.time_end = np.append(istart[1:], totim.size).astype(np.int64)
+        self.times = totim[istart]
+
+    @staticmethod
+    def _record_size(h):
+        if b'HEADU' in h['text'].upper():
+            return h['nrow'] - h['ncol'] + 1
+        return h['ncol'] * h['nrow']
+
+    def _scan(self, precision):
+        """
+        Walk the record headers assuming precision. None is returned if the
+        headers are not valid or the records do not end at the end of the
+        file.
+
+        """
+        dt = _header_dtype(precision)
+        hsize = dt.itemsize
+        vsize = dt['totim'].itemsize
+        nbytes = self.mm.size
+        headers = []
+        offsets = []
+        sizes = []
+        pos = 0
+        while pos + hsize <= nbytes:
+            h = np.frombuffer(self.mm, dtype=dt, count=1, offset=pos)[0]
+            text = np.frombuffer(h['text'].ljust(16), dtype=np.uint8)
+            if np.any(text < 32) or np.any(text > 126):
+                return None
+            n = self._record_size(h)
+            if n < 1:
+                return None
+            headers.append(h)
+            offsets.append(pos + hsize)
+            sizes.append(n)
+            pos += hsize + n * vsize
+        if pos != nbytes:
+            return None
+        return (np.array(headers, dtype=dt),
+                np.array(offsets, dtype=np.int64),
+                np.array(sizes, dtype=np.int64))
+
+    def get_record(self, irec):
+        """
+        Return a read-only view of the data for record irec.
+
+        """
+        return np.ndarray(shape=(self.sizes[irec],), dtype=self.data_dtype,
+                          buffer=self.mm, offset=self.offsets[irec])
+
+    def get_time_data(self, itime):
+        """
+        Return the data for all of the records at output time itime as a
+        single one-dimensional array and the record numbers.
+
+        """
+        irecs = np.arange(self.time_start[itime], self.time_end[itime])
+        if irecs.size == 1:
+            v = self.get_record(irecs[0])
+        else:
+            v = np.concatenate([self.get_record(i) for i in irecs])
+        return v, irecs
+
+
+def read_exclusion_file(exfile):
+    """
+    Return a boolean array that is True where values in exfile are greater
+    than zero.
+
+    """
+    return np.genfromtxt(exfile).flatten() > 0
+
+
+def get_namefile_head_file(namefile, text='head'):
+    """
+    Return the path of the head (or drawdown) file written by a
+    MODFLOW-2005, MODFLOW-NWT, MODFLOW-USG, or MODFLOW-LGR model and a
+    boolean indicating if the file is a binary file. None is returned for
+    the path if the model does not save heads.
+
+    """
+    pth = os.path.dirname(namefile)
+    entries = {}
+    ocfile = None
+    with open(namefile) as f:
+        for line in f:
+            ll = line.strip().split()
+            if len(ll) < 3 or ll[0].startswith('#'):
+                continue
+            entries[abs(int(ll[1]))] = (os.path.join(pth, ll[2]),
+                                        ll[0].upper())
+            if ll[0].upper() == 'OC':
+                ocfile = os.path.join(pth, ll[2])
+    if ocfile is None:
+        return None, True
+    ihedun, fhead, iddnun, fddn = \
+        flopy.modflow.ModflowOc.get_ocoutput_units(ocfile)
+    if text.lower() == 'drawdown':
+        iut = iddnun
+    else:
+        iut = ihedun
+    if abs(iut) not in entries:
+        return None, True
+    fpth, ftype = entries[abs(iut)]
+    return fpth, ftype == 'DATA(BINARY)'
+
+
+def compare_heads(file1, file2, htol=0.001, text='head', outfile=None,
+                  exfile=None, verbose=False, maxerr=None):
+    """
+    Compare two binary head or concentration files.
+
+    Parameters
+    ----------
+    file1 : str
+        path to the binary file for the base model
+    file2 : str
+        path to the binary file for the comparison model
+    htol : float
+        maximum allowed absolute difference
+    text : str
+        type of data being compared (used in output messages)
+    outfile : str
+        path to the comparison output file. A summary of the maximum
+        absolute and root mean square differences for each layer record at
+        every output time is written if outfile is not None.
+    exfile : str
+        path to an exclusion file. Differences are not evaluated where
+        exclusion values are greater than zero.
+    verbose : bool
+        write the locations where htol is exceeded to outfile
+    maxerr : int
+        maximum number of locations to report for each output time. All
+        locations are reported if maxerr is None.
+
+    Returns
+    -------
+    success : bool
+        boolean indicating if all of the differences are less than htol
+
+    """
+    if not os.path.isfile(file1) or not os.path.isfile(file2):
+        print('file1 or file2 is not a file')
+        print('file1 isfile: {}'.format(os.path.isfile(file1)))
+        print('file2 isfile: {}'.format(os.path.isfile(file2)))
+        return False
+
+    hfile1 = BinaryHeadIndex(file1)
+    hfile2 = BinaryHeadIndex(file2)
+
+    iexd = None
+    if exfile is not None:
+        iexd = read_exclusion_file(exfile)
+
+    ntimes = min(hfile1.times.size, hfile2.times.size)
+    t1 = hfile1.times[:ntimes]
+    t2 = hfile2.times[:ntimes]
+    if not np.allclose(t1, t2):
+        idx = np.nonzero(~np.isclose(t1, t2))[0][0]
+        msg = 'times in two {} files are not '.format(text) + \
+              'equal ({},{})'.format(t1[idx], t2[idx])
+        raise ValueError(msg)
+
+    f = None
+    if outfile is not None:
+        f = open(outfile, 'w')
+        f.write('Performing {} comparison\n'.format(text.upper()))
+        if exfile is not None:
+            f.write('Using exclusion file {}\n'.format(exfile))
+        f.write('{} is a binary file ({} precision).\n'.format(
+            file1, hfile1.precision))
+        f.write('{} is a binary file ({} precision).\n'.format(
+            file2, hfile2.precision))
+        line = 15 * '-'
+        f.write('{:>15s} {:>15s} {:>15s} {:>15s} {:>15s} {:>15s}\n'.format(
+            '', '', '', 'MAXIMUM', 'RMS', 'EXCEEDS'))
+        f.write('{:>15s} {:>15s} {:>15s} {:>15s} {:>15s} {:>15s}\n'.format(
+            'STRESS PERIOD', 'TIME STEP', 'LAYER', 'DIFFERENCE',
+            'DIFFERENCE', 'CRITERIA'))
+        f.write(6 * '{:>15s} '.format(line) + '\n')
+
+    icnt = 0
+    for itime in range(ntimes):
+        v1, irecs = hfile1.get_time_data(itime)
+        v2, irecs2 = hfile2.get_time_data(itime)
+        if v1.size != v2.size:
+            msg = '{} array sizes are not equal '.format(text) + \
+                  '({},{}) at time {}'.format(v1.size, v2.size,
+                                              hfile1.times[itime])
+            raise ValueError(msg)
+
+        diff = np.subtract(v1, v2, dtype=np.float64)
+        np.abs(diff, out=diff)
+        if iexd is not None:
+            if iexd.size != diff.size:
+                msg = 'shape of exclusion data ({}) '.format(iexd.shape) + \
+                      'can not be reshaped to the size of the ' + \
+                      '{} arrays ({})'.format(text, diff.shape)
+                raise ValueError(msg)
+            diff[iexd] = 0.
+
+        # statistics for each layer record
+        sizes = hfile1.sizes[irecs]
+        bounds = np.concatenate(([0], np.cumsum(sizes)))
+        nz = sizes > 0
+        dmax = np.zeros(sizes.size, dtype=np.float64)
+        dmax[nz] = np.maximum.reduceat(diff, bounds[:-1][nz])
+        rms = np.zeros(sizes.size, dtype=np.float64)
+        rms[nz] = np.sqrt(np.add.reduceat(diff * diff, bounds[:-1][nz]) /
+                          sizes[nz])
+        diffmax = dmax.max()
+
+        if f is not None:
+            hdr = hfile1.headers[irecs]
+            for ipos in range(irecs.size):
+                sexceed = ''
+                if dmax[ipos] > htol:
+                    sexceed = '*'
+                f.write('{:15d} {:15d} {:15d} {:15.6g} {:15.6g} {:15s}\n'
+                        .format(hdr['kper'][ipos], hdr['kstp'][ipos],
+                                hdr['ilay'][ipos], dmax[ipos], rms[ipos],
+                                sexceed))
+
+        if diffmax >= htol:
+            icnt += 1
+            indices = np.nonzero(diff > htol)[0]
+            ee = 'Maximum absolute {} difference '.format(text) + \
+                 '({}) -- '.format(diffmax) + \
+                 '{} tolerance exceeded at '.format(htol) + \
+                 '{} node location(s)'.format(indices.size)
+            if verbose:
+                print(ee + ' at time {}'.format(hfile1.times[itime]))
+            if f is not None and verbose:
+                f.write(textwrap.fill(ee + ':', width=70,
+                                      initial_indent='  ',
+                                      subsequent_indent='  ') + '\n')
+                if maxerr is not None:
+                    indices = indices[:maxerr]
+                fmtn = '    {:' + '{}'.format(len(str(diff.size))) + 'd}' + \
+                       ' ({}) -- h1: {:20} h2: {:20} diff: {:20}\n'
+                lines = [fmtn.format(jdx + 1, ind + 1, v1[ind], v2[ind],
+                                     v1[ind] - v2[ind])
+                         for jdx, ind in enumerate(indices)]
+                f.write(''.join(lines) + '\n')
+
+    if f is not None:
+        f.close()
+
+    return icnt == 0
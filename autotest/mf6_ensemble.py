@@ -0,0 +1,261 @@
+"""
+Run an ensemble of libmf6 simulations in worker processes.
+
+Every member of the ensemble is a copy of the same simulation that is run
+in its own worker process (libmf6 can only initialize one simulation per
+process) and in its own copy of the simulation directory, so the output
+files of the members do not overwrite each other. At most nprocs worker
+processes run at the same time. A member that terminates its worker
+process (for example, libmf6 stops the process when the simulation
+terminates with an error) does not stop the other members; the failed
+members and the exit codes of their processes are reported in a
+RuntimeError after all of the members have finished. Members differ only in
+the values set by a perturb function through get_value_ptr, so no input
+files have to be written for the members.
+
+The requested output variables are copied after every time step into
+shared memory arrays that are allocated by the parent process, so the
+results are not written to and read from files. The results are returned
+as arrays with the shape (nmembers, nsteps) + the shape of the variable.
+
+The perturb function is called as perturb(mf6, imember) after
+prepare_time_step for every time step, where mf6 is the XmiWrapper of the
+member. Because it is called for every time step, it should set values
+instead of scaling them. The worker processes are started with the spawn
+method, so they do not inherit a copy of libmf6 that was already loaded
+in the parent process, and perturb has to be a module level function that
+can be sent to the worker processes.
+
+Examples
+--------
+Run 16 members with recharge multipliers
+
+>>> def perturb(mf6, imember):
+...     rch = mf6.get_value_ptr('MODEL RCHA/BOUND')
+...     rch[:, 0] = 0.001 * 100. * (1. + 0.1 * imember)
+>>> heads = run_ensemble('libmf6.so', 'model', 16, perturb=perturb,
+...                      outputs=['MODEL/X'])['MODEL/X']
+
+"""
+
+import os
+import shutil
+import multiprocessing
+import multiprocessing.connection
+import numpy as np
+from xmipy import XmiWrapper
+
+# settings and shared output arrays of the worker processes
+_worker = {}
+
+
+def _get_nsteps(mf6):
+    return int(np.sum(mf6.get_value_ptr('TDIS/NSTP')))
+
+
+def _probe(lib_path, model_ws, outputs, conn):
+    """
+    Send the number of time steps and the shapes of the output variables.
+
+    """
+    os.chdir(model_ws)
+    mf6 = XmiWrapper(lib_path)
+    mf6.initialize(os.path.join(model_ws, 'mfsim.nam'))
+    try:
+        nsteps = _get_nsteps(mf6)
+        shapes = [mf6.get_value_ptr(name).shape for name in outputs]
+    finally:
+        mf6.finalize()
+    conn.send((nsteps, shapes))
+    conn.close()
+    return
+
+
+def _init_worker(settings, arrays):
+    _worker.update(settings)
+    _worker['arrays'] = arrays
+    return
+
+
+def _get_output(iout):
+    shape = (_worker['nmembers'], _worker['nsteps']) + \
+        tuple(_worker['shapes'][iout])
+    return np.frombuffer(_worker['arrays'][iout],
+                         dtype=np.float64).reshape(shape)
+
+
+def _run_worker(settings, arrays, nfail, imember):
+    """
+    Run member imember in a worker process and save the number of time
+    steps that did not converge in nfail. nfail is not set if the member
+    fails.
+
+    """
+    _init_worker(settings, arrays)
+    nfail[imember] = _run_member(imember)
+    return
+
+
+def _run_member(imember):
+    """
+    Run member imember and return the number of time steps that did not
+    converge.
+
+    """
+    member_ws = os.path.join(_worker['ensemble_ws'],
+                             'member{:04d}'.format(imember))
+    if os.path.isdir(member_ws):
+        shutil.rmtree(member_ws)
+    shutil.copytree(_worker['model_ws'], member_ws)
+    os.chdir(member_ws)
+
+    mf6 = XmiWrapper(_worker['lib_path'])
+    mf6.initialize(os.path.join(member_ws, 'mfsim.nam'))
+    perturb = _worker['perturb']
+    outputs = [_get_output(iout)
+               for iout in range(len(_worker['outputs']))]
+    nfail = 0
+    try:
+        max_iter = mf6.get_value_ptr('SLN_1/MXITER')
+        current_time = mf6.get_current_time()
+        end_time = mf6.get_end_time()
+        istep = 0
+        while current_time < end_time:
+            dt = mf6.get_time_step()
+            mf6.prepare_time_step(dt)
+            if perturb is not None:
+                perturb(mf6, imember)
+
+            # solve the time step
+            mf6.prepare_solve(1)
+            kiter = 0
+            while kiter < max_iter:
+                has_converged = mf6.solve(1)
+                kiter += 1
+                if has_converged:
+                    break
+            if not has_converged:
+                nfail += 1
+            mf6.finalize_solve(1)
+            mf6.finalize_time_step()
+            current_time = mf6.get_current_time()
+
+            # copy the output variables to shared memory
+            for name, v in zip(_worker['outputs'], outputs):
+                v[imember, istep] = mf6.get_value_ptr(name)
+            istep += 1
+    finally:
+        mf6.finalize()
+    return nfail
+
+
+def run_ensemble(lib_path, model_ws, nmembers, perturb=None, outputs=None,
+                 ensemble_ws=None, nprocs=None):
+    """
+    Run nmembers copies of the simulation in model_ws.
+
+    Parameters
+    ----------
+    lib_path : str
+        path to the libmf6 shared library
+    model_ws : str
+        directory with the simulation name file (mfsim.nam)
+    nmembers : int
+        number of members
+    perturb : function
+        perturb(mf6, imember) is called after prepare_time_step for every
+        time step of every member
+    outputs : list of str
+        memory manager variables (for example, 'MODEL/X') that are saved
+        after every time step
+    ensemble_ws : str
+        directory for the member simulation directories. The default is
+        model_ws with _ensemble appended.
+    nprocs : int
+        number of worker processes. The default is the number of cores.
+
+    Returns
+    -------
+    results : dict
+        output arrays with the shape (nmembers, nsteps) + the shape of the
+        variable for each variable in outputs, and 'nfail', the number of
+        time steps that did not converge for each member
+
+    Raises
+    ------
+    RuntimeError
+        if the simulation cannot be initialized or a member fails
+
+    """
+    lib_path = os.path.abspath(lib_path)
+    model_ws = os.path.abspath(model_ws)
+    if ensemble_ws is None:
+        ensemble_ws = model_ws + '_ensemble'
+    ensemble_ws = os.path.abspath(ensemble_ws)
+    if not os.path.isdir(ensemble_ws):
+        os.makedirs(ensemble_ws)
+    if outputs is None:
+        outputs = []
+    if nprocs is None:
+        nprocs = multiprocessing.cpu_count()
+    nprocs = max(1, min(nprocs, nmembers))
+
+    # the library is not initialized in this process, so the number of
+    # time steps and the output shapes are determined in a worker process
+    ctx = multiprocessing.get_context('spawn')
+    conn_recv, conn_send = ctx.Pipe(duplex=False)
+    p = ctx.Process(target=_probe,
+                    args=(lib_path, model_ws, outputs, conn_send))
+    p.start()
+    conn_send.close()
+    try:
+        nsteps, shapes = conn_recv.recv()
+    except EOFError:
+        p.join()
+        msg = 'simulation in {} could not be initialized '.format(model_ws) + \
+              '(exit code {})'.format(p.exitcode)
+        raise RuntimeError(msg)
+    finally:
+        conn_recv.close()
+    p.join()
+
+    arrays = []
+    for shape in shapes:
+        n = nmembers * nsteps * int(np.prod(shape, dtype=np.int64))
+        arrays.append(ctx.RawArray('d', n))
+    settings = {'lib_path': lib_path, 'model_ws': model_ws,
+                'ensemble_ws': ensemble_ws, 'nmembers': nmembers,
+                'nsteps': nsteps, 'shapes': shapes, 'outputs': outputs,
+                'perturb': perturb}
+
+    # every member needs a new process, a process that exits without
+    # setting nfail failed
+    nfail = ctx.RawArray('i', [-1] * nmembers)
+    pending = list(range(nmembers))
+    running = {}
+    failed = []
+    while pending or running:
+        while pending and len(running) < nprocs:
+            imember = pending.pop(0)
+            p = ctx.Process(target=_run_worker,
+                            args=(settings, arrays, nfail, imember))
+            p.start()
+            running[p.sentinel] = (imember, p)
+        for sentinel in multiprocessing.connection.wait(list(running)):
+            imember, p = running.pop(sentinel)
+            p.join()
+            if p.exitcode != 0 or nfail[imember] < 0:
+                failed.append((imember, p.exitcode))
+    if failed:
+        msg = 'ensemble members failed: ' + \
+              ', '.join('member {} (exit code {})'.format(imember, code)
+                        for imember, code in sorted(failed))
+        raise RuntimeError(msg)
+
+    _init_worker(settings, arrays)
+    results = {}
+    for iout, name in enumerate(outputs):
+        results[name] = _get_output(iout).copy()
+    results['nfail'] = np.array(nfail[:], dtype=int)
+    _worker.clear()
+    return results
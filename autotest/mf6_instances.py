@@ -0,0 +1,192 @@
+"""
+Run several MODFLOW 6 simulations in one process using libmf6.
+
+libmf6 keeps the simulation in module variables, so a loaded library can
+only hold one simulation. Every Mf6Instance loads its own copy of the
+shared library from a temporary directory. The operating system loads
+each copy as a separate library with its own module variables, which
+gives every instance an independent simulation that can be advanced in
+its own thread (ctypes releases the GIL while the library runs).
+
+The copies share the Fortran runtime library, and therefore the file unit
+table and the working directory of the process. Each instance is given a
+range of file unit numbers that does not overlap the ranges of the other
+instances (set_file_unit_range), so a simulation never closes a file that
+was opened by another simulation. The input files are opened relative
+to the working directory when the simulation is initialized, so
+initialize and finalize change to the model directory and are serialized
+with a lock. Only the update functions run concurrently, so run_instances
+initializes all of the simulations before any of them is advanced. The
+time spent advancing each simulation is saved in update_interval, which
+can be used to check that the simulations were advanced at the same time.
+
+A simulation that fails to initialize or terminates with an error stops
+the process, as it does when libmf6 is used for a single simulation.
+
+Examples
+--------
+Advance three simulations concurrently
+
+>>> instances = [Mf6Instance('libmf6.so', ws) for ws in ('m1', 'm2', 'm3')]
+>>> run_instances(instances)
+
+"""
+
+import os
+import sys
+import ctypes
+import shutil
+import tempfile
+import threading
+import time
+from xmipy import XmiWrapper
+
+# initialize and finalize change the working directory of the process
+_lock = threading.Lock()
+
+# first file unit number and number of file units for each instance
+first_unit = 1000
+units_per_instance = 10000
+
+
+class Mf6Instance(object):
+    """
+    A simulation in a private copy of libmf6.
+
+    Parameters
+    ----------
+    lib_path : str
+        path to the libmf6 shared library
+    model_ws : str
+        directory with the simulation name file (mfsim.nam)
+
+    """
+
+    _count = 0
+
+    def __init__(self, lib_path, model_ws):
+        self.model_ws = os.path.abspath(model_ws)
+        with _lock:
+            Mf6Instance._count += 1
+            n = Mf6Instance._count
+        self._tmpdir = tempfile.mkdtemp(prefix='libmf6_')
+        root, ext = os.path.splitext(os.path.basename(lib_path))
+        self.lib_path = os.path.join(self._tmpdir,
+                                     '{}_{}{}'.format(root, n, ext))
+        shutil.copy2(lib_path, self.lib_path)
+        self.mf6 = XmiWrapper(self.lib_path)
+        self.initialized = False
+        self.update_interval = None
+
+        # file units that are not used by the other instances
+        first = first_unit + (n - 1) * units_per_instance
+        last = first + units_per_instance - 1
+        status = self.mf6.lib.set_file_unit_range(
+            ctypes.byref(ctypes.c_int(first)),
+            ctypes.byref(ctypes.c_int(last)))
+        if status != 0:
+            msg = 'could not set the file unit range of {}'.format(
+                self.lib_path)
+            raise RuntimeError(msg)
+
+    def initialize(self):
+        with _lock:
+            init_wd = os.getcwd()
+            os.chdir(self.model_ws)
+            try:
+                self.mf6.initialize(os.path.join(self.model_ws,
+                                                 'mfsim.nam'))
+            finally:
+                os.chdir(init_wd)
+        self.initialized = True
+        return
+
+    def update(self):
+        self.mf6.update()
+        return
+
+    def get_current_time(self):
+        return self.mf6.get_current_time()
+
+    def get_end_time(self):
+        return self.mf6.get_end_time()
+
+    def finalize(self):
+        with _lock:
+            init_wd = os.getcwd()
+            os.chdir(self.model_ws)
+            try:
+                self.mf6.finalize()
+            finally:
+                os.chdir(init_wd)
+        self.initialized = False
+        return
+
+    def run(self, func=None, barrier=None):
+        """
+        Initialize the simulation, advance it to the end time, and finalize
+        it. func(instance) is called after every time step. If a
+        threading.Barrier is passed, the simulation is not advanced until
+        the other simulations waiting on the barrier have been initialized.
+        The start and end time (time.perf_counter) of advancing the
+        simulation are saved in update_interval.
+
+        """
+        self.initialize()
+        try:
+            if barrier is not None:
+                barrier.wait()
+            t0 = time.perf_counter()
+            current_time = self.get_current_time()
+            end_time = self.get_end_time()
+            while current_time < end_time:
+                self.update()
+                if func is not None:
+                    func(self)
+                current_time = self.get_current_time()
+            self.update_interval = (t0, time.perf_counter())
+        finally:
+            self.finalize()
+        return
+
+    def close(self):
+        """
+        Remove the copy of the library. The library cannot be unloaded, so
+        the copy is left in place on systems that do not allow a loaded
+        library to be removed.
+
+        """
+        if self.initialized:
+            self.finalize()
+        shutil.rmtree(self._tmpdir, ignore_errors=True)
+        return
+
+
+def run_instances(instances, func=None):
+    """
+    Run each instance in its own thread and wait for all of them to finish.
+    All of the instances are initialized before any of them is advanced.
+    func(instance) is called after every time step of every instance. The
+    first exception raised in a thread is raised again after all of the
+    threads have finished.
+
+    """
+    errors = []
+    barrier = threading.Barrier(len(instances))
+
+    def target(instance):
+        try:
+            instance.run(func, barrier)
+        except Exception:
+            errors.append(sys.exc_info()[1])
+            barrier.abort()
+
+    threads = [threading.Thread(target=target, args=(instance,))
+               for instance in instances]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    if errors:
+        raise errors[0]
+    return
@@ -0,0 +1,451 @@
+"""
+Run autotest simulations concurrently using a pool of worker processes.
+
+The test modules in autotest contain nose-style test functions. Generator
+tests, such as test_mf6model, yield (function, Simulation) pairs and each
+pair is run as a separate test. Other test functions are run as a single
+test. This script collects the tests from the requested test modules,
+orders them so the largest models are started first, and runs them with a
+process pool.  Every test runs in its own worker
+process (one test per process) so changes to the working directory made by
+bmi tests and changes to targets.target_dict cannot leak between tests.
+Output from each test is captured and written as a single block when the
+test finishes.
+
+Examples
+--------
+Run all of the test_gwf and test_gwt tests using all available cores
+
+    python parallel_runner.py
+
+Run selected tests using four worker processes
+
+    python parallel_runner.py test_gwf_npf01_75x75.py test_gwf_maw01.py -n 4
+
+"""
+
+import os
+import sys
+import io
+import glob
+import time
+import argparse
+import inspect
+import warnings
+import importlib
+import traceback
+import contextlib
+import multiprocessing
+import multiprocessing.pool
+
+sfmt = '{:25s} - {}'
+
+# default memory requirement of a single worker process, in bytes
+default_worker_memory = 1024 ** 3
+
+
+def get_available_memory():
+    """
+    Return the available physical memory in bytes or None if it cannot
+    be determined.
+
+    """
+    try:
+        import psutil
+        return psutil.virtual_memory().available
+    except ImportError:
+        pass
+    fpth = '/proc/meminfo'
+    if os.path.isfile(fpth):
+        with open(fpth) as f:
+            for line in f:
+                if line.startswith('MemAvailable:'):
+                    return int(line.split()[1]) * 1024
+    return None
+
+
+def get_worker_count(nproc=None, worker_memory=None):
+    """
+    Determine the number of worker processes to use.
+
+    Parameters
+    ----------
+    nproc : int
+        maximum number of worker processes. If None the number of cores
+        available to this process is used.
+    worker_memory : int
+        memory, in bytes, that should be available for each worker process.
+        The number of workers is reduced if the available memory is not
+        sufficient.
+
+    Returns
+    -------
+    nworkers : int
+
+    """
+    if hasattr(os, 'sched_getaffinity'):
+        ncores = len(os.sched_getaffinity(0))
+    else:
+        ncores = multiprocessing.cpu_count()
+    if nproc is None:
+        nproc = ncores
+    nworkers = max(1, min(nproc, ncores))
+
+    if worker_memory is None:
+        worker_memory = default_worker_memory
+    available = get_available_memory()
+    if available is not None and worker_memory > 0:
+        nworkers = max(1, min(nworkers, int(available // worker_memory)))
+    return nworkers
+
+
+def get_directory_size(pth):
+    """
+    Return the total size, in bytes, of all of the files in pth.
+
+    """
+    size = 0
+    for root, dirs, files in os.walk(pth):
+        for f in files:
+            fpth = os.path.join(root, f)
+            if os.path.isfile(fpth):
+                size += os.path.getsize(fpth)
+    return size
+
+
+def get_simulation_size(sim, module=None):
+    """
+    Estimate the size of a simulation from the size of its input files.
+
+    The simulation workspace is used if it exists. Otherwise the example
+    directory defined in the test module (exdir) is used.
+
+    """
+    pths = [sim.simpath, sim.name]
+    exdir = getattr(module, 'exdir', None)
+    if exdir is not None:
+        pths.append(os.path.join(exdir, sim.name))
+    for pth in pths:
+        if pth is not None and os.path.isdir(pth):
+            return get_directory_size(pth)
+    return 0
+
+
+def is_simulation(obj):
+    """
+    Return True if obj looks like an autotest Simulation object.
+
+    """
+    return hasattr(obj, 'simpath') and hasattr(obj, 'name')
+
+
+def get_module_tests(module):
+    """
+    Return the test functions defined in module, in the order they are
+    defined. Every module-level function whose name starts with test is a
+    test, like nose collects them.
+
+    """
+    funcs = []
+    for key, value in vars(module).items():
+        if not key.startswith('test') or not inspect.isfunction(value):
+            continue
+        if getattr(value, '__module__', None) != module.__name__:
+            continue
+        funcs.append(value)
+    return funcs
+
+
+def collect_tests(modules):
+    """
+    Collect the tests in each test module.
+
+    Every (function, Simulation) pair yielded by a generator test, such as
+    test_mf6model, is run as a separate test. All of the other tests in a
+    module, such as the test_fmi function of test_gwt_fmi03 or the items
+    yielded by test_gwf_returncodes, are run one after the other in the
+    order they are defined, as a single test, because they may share a
+    workspace (for example, a final test_clean_sim function). All of the
+    tests in modules with simulations that use the same workspace are also
+    run one after the other as a single test.
+
+    Parameters
+    ----------
+    modules : list
+        names of the test modules (with or without the .py extension)
+
+    Returns
+    -------
+    tests : list
+        list of (size, module name, test name, calls, rebuild) tuples sorted
+        from the largest to the smallest simulation, where calls is a list
+        of (module name, function name, yield index) to run. The yield index
+        is None for test functions that are not generators. Tests that do
+        not run a Simulation have an unknown size and are started first.
+        rebuild is True if the models must be built again in the worker
+        process.
+    errors : list
+        list of (module name, message) for the modules that could not be
+        imported or whose tests could not be collected
+
+    """
+    # some test modules create their workspace in temp when they are imported
+    if not os.path.isdir('temp'):
+        os.makedirs('temp')
+
+    tests = []
+    errors = []
+    for name in modules:
+        name = os.path.splitext(os.path.basename(name))[0]
+        try:
+            module_tests = get_collected_module_tests(name)
+        except:
+            errors.append((name, traceback.format_exc()))
+            continue
+        if len(module_tests) < 1:
+            errors.append((name, 'no tests were found in {}'.format(name)))
+            continue
+        tests += module_tests
+
+    # all of the tests in modules with simulations that share a workspace
+    # are run one after the other in a single worker
+    sims = {}
+    for test in tests:
+        if test[0] is not None:
+            sims.setdefault(test[2], set()).add(test[1])
+    groups = []
+    for tname in sorted(sims.keys()):
+        group = sims[tname]
+        if len(group) < 2:
+            continue
+        msg = 'simulation workspace {} is used by '.format(tname) + \
+              ', '.join(sorted(group)) + '. The tests in these modules ' + \
+              'will be run one after the other.'
+        warnings.warn(msg)
+        for other in [g for g in groups if len(g & group) > 0]:
+            groups.remove(other)
+            group = group | other
+        groups.append(group)
+    for group in groups:
+        modules = [test[1] for test in tests if test[1] in group]
+        modules = sorted(set(modules), key=modules.index)
+        calls = []
+        size = 0
+        for module in modules:
+            for test in [t for t in tests if t[1] == module]:
+                tests.remove(test)
+                calls += test[3]
+                if test[0] is not None:
+                    size += test[0]
+        name = '+'.join(modules)
+        tests.append((size, name, name, calls, True))
+
+    tests.sort(key=lambda v: float('inf') if v[0] is None else v[0],
+               reverse=True)
+    return tests, errors
+
+
+def get_collected_module_tests(name):
+    """
+    Import test module name and return its tests as (size, module name,
+    test name, calls, rebuild) tuples. The models are built by the
+    generator tests so they do not need to be built again.
+
+    """
+    module = importlib.import_module(name)
+    tests = []
+    serial = []
+    for func in get_module_tests(module):
+        fname = func.__name__
+        if not inspect.isgeneratorfunction(func):
+            serial.append((name, fname, None))
+            continue
+        for idx, item in enumerate(func()):
+            if not isinstance(item, tuple):
+                item = (item,)
+            args = tuple(item[1:])
+            if len(args) == 1 and is_simulation(args[0]):
+                size = get_simulation_size(args[0], module)
+                tests.append((size, name, args[0].name,
+                              [(name, fname, idx)], False))
+            else:
+                serial.append((name, fname, idx))
+    if len(serial) > 0:
+        tests.append((None, name, name, serial, False))
+    return tests
+
+
+def get_generator_items(module, fname, items, rebuild):
+    """
+    Return the items yielded by the generator test fname in module. The
+    items are stored in items so each generator is only run once. If
+    rebuild is False the build_models function of the module is not called,
+    so the models written when the tests were collected are not rewritten
+    while other workers are running them.
+
+    """
+    key = (module, fname)
+    if key not in items:
+        module = importlib.import_module(module)
+        func = getattr(module, fname)
+        build_models = getattr(module, 'build_models', None)
+        if not rebuild and build_models is not None:
+            module.build_models = lambda: None
+        try:
+            items[key] = list(func())
+        finally:
+            if build_models is not None:
+                module.build_models = build_models
+    return items[key]
+
+
+def run_test(args):
+    """
+    Run a single test in a worker process and capture its output. The test
+    functions are imported in the worker process so only their names are
+    sent to the worker. The test fails if any of its calls raises an
+    exception.
+
+    """
+    module, name, calls, rebuild = args
+    buff = io.StringIO()
+    t0 = time.time()
+    success = True
+    items = {}
+    with contextlib.redirect_stdout(buff):
+        for cmodule, fname, idx in calls:
+            try:
+                if idx is None:
+                    func = getattr(importlib.import_module(cmodule), fname)
+                    fargs = ()
+                else:
+                    item = get_generator_items(cmodule, fname, items,
+                                               rebuild)[idx]
+                    if not isinstance(item, tuple):
+                        item = (item,)
+                    func, fargs = item[0], tuple(item[1:])
+                func(*fargs)
+            except:
+                success = False
+                print(traceback.format_exc())
+    return module, name, success, time.time() - t0, buff.getvalue()
+
+
+def report_errors(errors):
+    """
+    Report the modules that could not be collected as failed tests.
+
+    Returns
+    -------
+    failed : list
+        list of (module, module) for the modules that could not be collected
+
+    """
+    failed = []
+    for module, output in errors:
+        print(output)
+        print(sfmt.format('{}/{}'.format(module, module), 'FAILED'))
+        failed.append((module, module))
+    sys.stdout.flush()
+    return failed
+
+
+class NonDaemonProcess(multiprocessing.Process):
+    """
+    Worker process that can start its own processes, for tests such as
+    test_gwf_libmf6_ens01 that run an ensemble in worker processes.
+
+    """
+
+    @property
+    def daemon(self):
+        return False
+
+    @daemon.setter
+    def daemon(self, value):
+        pass
+
+
+class NonDaemonContext(type(multiprocessing.get_context())):
+    Process = NonDaemonProcess
+
+
+def run_tests(tests, nworkers):
+    """
+    Run the collected tests with a pool of nworkers processes.
+
+    Returns
+    -------
+    failed : list
+        list of (module, simulation name) for the tests that failed
+
+    """
+    failed = []
+    args = [(module, name, calls, rebuild)
+            for size, module, name, calls, rebuild in tests]
+    pool = multiprocessing.pool.Pool(processes=nworkers, maxtasksperchild=1,
+                                     context=NonDaemonContext())
+    try:
+        for module, name, success, elapsed, output in \
+                pool.imap_unordered(run_test, args):
+            if success:
+                status = 'passed'
+            else:
+                status = 'FAILED'
+                failed.append((module, name))
+            print(output)
+            msg = '{} ({:.2f} s)'.format(status, elapsed)
+            print(sfmt.format('{}/{}'.format(module, name), msg))
+            sys.stdout.flush()
+    finally:
+        pool.close()
+        pool.join()
+    return failed
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Run autotest simulations in parallel')
+    parser.add_argument('modules', nargs='*',
+                        help='test modules to run (default: test_gw*.py)')
+    parser.add_argument('-n', '--nproc', type=int, default=None,
+                        help='maximum number of worker processes')
+    parser.add_argument('--worker-memory', type=float, default=None,
+                        help='memory in GB required by each worker process')
+    # options read from sys.argv by the Simulation class and the test modules
+    parser.add_argument('--keep', action='store_true',
+                        help='keep the simulation workspaces')
+    parser.add_argument('--cmp-cache', action='store_true',
+                        help='cache the comparison model output')
+    parser.add_argument('--benchmark', action='store_true',
+                        help='record benchmark results for each run')
+    args = parser.parse_args()
+
+    modules = args.modules
+    if len(modules) < 1:
+        modules = sorted(glob.glob('test_gw*.py'))
+
+    worker_memory = None
+    if args.worker_memory is not None:
+        worker_memory = int(args.worker_memory * 1024 ** 3)
+    nworkers = get_worker_count(args.nproc, worker_memory)
+
+    t0 = time.time()
+    tests, errors = collect_tests(modules)
+    msg = '{} tests using {} worker processes'.format(len(tests), nworkers)
+    print(sfmt.format('Running', msg))
+
+    failed = report_errors(errors)
+    failed += run_tests(tests, nworkers)
+
+    ntests = len(tests) + len(errors)
+    msg = '{} of {} tests failed in {:.2f} s'.format(len(failed), ntests,
+                                                     time.time() - t0)
+    print(sfmt.format('Summary', msg))
+    for module, name in failed:
+        print(sfmt.format('    failed', '{}/{}'.format(module, name)))
+    return len(failed)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
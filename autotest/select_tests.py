@@ -0,0 +1,350 @@
+"""
+Select the autotest tests that exercise changed MODFLOW 6 source files.
+
+The module dependency graph of the Fortran source files in src/ and srcbmi/
+is built from the module and use statements. Changed source files are
+propagated up the graph to the package source files that depend on them and
+the package file types (ftypes) for those source files (for example,
+gwf3maw8.f90 is MAW6) are determined. Propagation stops at package source
+files because the model and simulation source files that use them only
+create the packages. A test is selected if the simulations it builds use any
+of the affected ftypes. The ftypes used by each test are determined from the
+flopy classes used in the test script and, for model directories, from the
+ftypes in the simulation and model name files (like the --pak option used by
+get_mf6_models).
+
+Every test is selected if a changed source file is, or propagates to, a
+core, simulation or solution source file (for example, mf6core.f90 or
+NumericalSolution.f90), because every simulation runs that code, or if a
+changed source file does not map to any ftype.
+
+Examples
+--------
+Select the tests affected by the changes relative to the develop branch
+
+    python select_tests.py --base develop
+
+Select and run the tests affected by changes to specific files
+
+    python select_tests.py ../src/Model/GroundWaterFlow/gwf3maw8.f90 --run
+
+List the model directories in modflow6-testmodels that are affected
+
+    python select_tests.py --base develop \\
+        --models ../../modflow6-testmodels/mf6
+
+"""
+
+import os
+import re
+import sys
+import glob
+import argparse
+import subprocess
+
+srcdirs = [os.path.join('..', 'src'), os.path.join('..', 'srcbmi')]
+
+# ftype used for changes to the library (srcbmi) source files
+libmf6_ftype = 'LIBMF6'
+
+# source files that do not follow the package file naming convention
+# (None is used for source files that do not implement a package)
+special_ftypes = {'gwt1apt1.f90': None,
+                  'gwf3.f90': ('GWF6',),
+                  'gwt1.f90': ('GWT6',),
+                  'gwf3rch8.f90': ('RCH6', 'RCHA6'),
+                  'gwf3evt8.f90': ('EVT6', 'EVTA6'),
+                  'gwt1dsp.f90': ('DSP6',),
+                  'gwfgwfexchange.f90': ('GWF6-GWF6',),
+                  'gwfgwtexchange.f90': ('GWF6-GWT6',),
+                  'ghostnode.f90': ('GNC6',),
+                  'ims8linear.f90': ('IMS6',),
+                  'ims8reordering.f90': ('IMS6',),
+                  'tdis.f90': ('TDIS6',)}
+
+# source files that are run by every simulation. Changes to these files, or
+# to the files they use, select every test.
+core_dirs = [os.path.normpath(os.path.join('..', 'src')),
+             os.path.normpath(os.path.join('..', 'src', 'Solution'))]
+
+re_package_file = re.compile(r'^(?:gwf3(\w+?)8|gwt1(\w+?)1)\.f90$')
+re_module = re.compile(r'^\s*module\s+(\w+)\s*(?:!.*)?$', re.IGNORECASE)
+re_use = re.compile(r'^\s*use\s*(?:,\s*\w+\s*::)?\s*(\w+)', re.IGNORECASE)
+re_flopy = re.compile(r'flopy\.mf6\.(?:\w+\.)*Modflow(\w+)')
+re_model_type = re.compile(r"model_type\s*=\s*['\"](gw[ft])6['\"]",
+                           re.IGNORECASE)
+
+
+def get_source_files(dirs=None):
+    """
+    Return a list of all of the Fortran source files in dirs.
+
+    """
+    if dirs is None:
+        dirs = srcdirs
+    files = []
+    for d in dirs:
+        for root, subdirs, fnames in os.walk(d):
+            for f in fnames:
+                if os.path.splitext(f)[1].lower() in ('.f90', '.fpp'):
+                    files.append(os.path.normpath(os.path.join(root, f)))
+    return sorted(files)
+
+
+def get_dependents(files):
+    """
+    Build the reverse module dependency graph.
+
+    Returns
+    -------
+    dependents : dict
+        dictionary with the source files that use each source file
+
+    """
+    modules = {}
+    uses = {}
+    for fpth in files:
+        uses[fpth] = set()
+        with open(fpth, errors='replace') as f:
+            for line in f:
+                m = re_module.match(line)
+                if m is not None:
+                    modules[m.group(1).lower()] = fpth
+                    continue
+                m = re_use.match(line)
+                if m is not None:
+                    uses[fpth].add(m.group(1).lower())
+    dependents = {fpth: set() for fpth in files}
+    for fpth, modnames in uses.items():
+        for modname in modnames:
+            src = modules.get(modname)
+            if src is not None and src != fpth:
+                dependents[src].add(fpth)
+    return dependents
+
+
+def get_file_ftypes(fpth):
+    """
+    Return the ftypes of the package implemented in a source file or None
+    if the file does not implement a package.
+
+    """
+    fname = os.path.basename(fpth).lower()
+    if os.path.basename(os.path.dirname(os.path.abspath(fpth))) == \
+            'srcbmi':
+        return (libmf6_ftype,)
+    if fname in special_ftypes:
+        return special_ftypes[fname]
+    m = re_package_file.match(fname)
+    if m is not None:
+        pak = m.group(1) or m.group(2)
+        return ('{}6'.format(pak.upper()),)
+    return None
+
+
+def is_core_file(fpth):
+    """
+    Return True if fpth is a core, simulation or solution source file.
+
+    """
+    d = os.path.dirname(os.path.normpath(fpth))
+    return d in core_dirs
+
+
+def get_affected_ftypes(changed, dependents):
+    """
+    Return the set of ftypes affected by the changed source files, or None
+    if every test should be selected.
+
+    """
+    ftypes = set()
+    for fpth in changed:
+        file_ftypes = get_file_affected_ftypes(fpth, dependents)
+        if file_ftypes is None or len(file_ftypes) < 1:
+            return None
+        ftypes.update(file_ftypes)
+    return ftypes
+
+
+def get_file_affected_ftypes(changed, dependents):
+    """
+    Return the set of ftypes affected by a changed source file, or None if
+    the file is, or is used by, a core source file.
+
+    """
+    ftypes = set()
+    visited = set()
+    stack = [os.path.normpath(changed)]
+    while len(stack) > 0:
+        fpth = stack.pop()
+        if fpth in visited:
+            continue
+        visited.add(fpth)
+        if is_core_file(fpth):
+            return None
+        file_ftypes = get_file_ftypes(fpth)
+        if file_ftypes is not None:
+            ftypes.update(file_ftypes)
+            continue
+        stack.extend(dependents.get(fpth, ()))
+    return ftypes
+
+
+def get_namefile_ftypes(simpth):
+    """
+    Return the ftypes in the simulation name file in simpth and in the
+    model name files it references.
+
+    """
+    ftypes = set()
+    namefiles = [os.path.join(simpth, 'mfsim.nam')]
+    ipos = 0
+    while ipos < len(namefiles):
+        fpth = namefiles[ipos]
+        ipos += 1
+        if not os.path.isfile(fpth):
+            continue
+        block = None
+        with open(fpth, errors='replace') as f:
+            for line in f:
+                ll = line.strip().split()
+                if len(ll) < 1 or ll[0].startswith('#'):
+                    continue
+                key = ll[0].upper()
+                if key == 'BEGIN' and len(ll) > 1:
+                    block = ll[1].upper()
+                elif key == 'END':
+                    block = None
+                elif block in ('MODELS', 'EXCHANGES', 'PACKAGES',
+                               'TIMING') and len(ll) > 1:
+                    ftypes.add(key)
+                    if block == 'MODELS':
+                        namefiles.append(os.path.join(simpth, ll[1]))
+                elif block == 'SOLUTIONGROUP' and key != 'MXITER':
+                    ftypes.add(key)
+    return ftypes
+
+
+def get_script_ftypes(fpth):
+    """
+    Return the ftypes for the flopy classes used in a test script.
+
+    """
+    with open(fpth, errors='replace') as f:
+        txt = f.read()
+    ftypes = set()
+    for name in re_flopy.findall(txt):
+        name = name.upper()
+        prefix, suffix = name[:3], name[3:]
+        if prefix in ('GWF', 'GWT') and suffix in ('GWF', 'GWT'):
+            ftypes.add('{}6-{}6'.format(prefix, suffix))
+        elif prefix in ('GWF', 'GWT') and suffix == '':
+            ftypes.add('{}6'.format(prefix))
+        elif prefix in ('GWF', 'GWT', 'UTL'):
+            ftypes.add('{}6'.format(suffix))
+        else:
+            ftypes.add('{}6'.format(name))
+    for model_type in re_model_type.findall(txt):
+        ftypes.add('{}6'.format(model_type.upper()))
+    if 'XmiWrapper' in txt or 'BmiWrapper' in txt:
+        ftypes.add(libmf6_ftype)
+    return ftypes
+
+
+def select_scripts(ftypes, scripts=None):
+    """
+    Return the test scripts that use any of the affected ftypes. Every test
+    script is returned if ftypes is None.
+
+    """
+    if scripts is None:
+        scripts = sorted(glob.glob('test_gw*.py'))
+    if ftypes is None:
+        return scripts
+    selected = []
+    for fpth in scripts:
+        if len(get_script_ftypes(fpth) & ftypes) > 0:
+            selected.append(fpth)
+    return selected
+
+
+def select_models(ftypes, exdir):
+    """
+    Return the model directories in exdir that use any of the affected
+    ftypes. Every model directory is returned if ftypes is None.
+
+    """
+    selected = []
+    for d in sorted(os.listdir(exdir)):
+        pth = os.path.join(exdir, d)
+        if not os.path.isdir(pth):
+            continue
+        if ftypes is None or len(get_namefile_ftypes(pth) & ftypes) > 0:
+            selected.append(d)
+    return selected
+
+
+def get_changed_files(base):
+    """
+    Return the Fortran source files that differ from the git reference base.
+
+    """
+    cmd = ['git', 'diff', '--name-only', base, '--', 'src', 'srcbmi']
+    out = subprocess.check_output(cmd, cwd='..').decode()
+    files = []
+    for line in out.splitlines():
+        fpth = os.path.normpath(os.path.join('..', line.strip()))
+        if os.path.splitext(fpth)[1].lower() in ('.f90', '.fpp'):
+            files.append(fpth)
+    return files
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Select tests affected by changed source files')
+    parser.add_argument('files', nargs='*', help='changed source files')
+    parser.add_argument('--base', default=None,
+                        help='git reference used to determine changed files')
+    parser.add_argument('--models', default=None,
+                        help='directory with test model directories')
+    parser.add_argument('--run', action='store_true',
+                        help='run the selected tests with parallel_runner')
+    args = parser.parse_args()
+
+    changed = list(args.files)
+    if args.base is not None:
+        changed += get_changed_files(args.base)
+    if len(changed) < 1:
+        print('no changed source files')
+        return 0
+
+    dependents = get_dependents(get_source_files())
+    ftypes = get_affected_ftypes(changed, dependents)
+    if ftypes is None:
+        print('affected ftypes: all (core source files changed or a ' +
+              'changed file does not map to a package)')
+    else:
+        print('affected ftypes: {}'.format(' '.join(sorted(ftypes))))
+
+    scripts = select_scripts(ftypes)
+    print('selected {} test script(s):'.format(len(scripts)))
+    for fpth in scripts:
+        print('    {}'.format(fpth))
+
+    if args.models is not None:
+        dirs = select_models(ftypes, args.models)
+        print('selected {} model(s):'.format(len(dirs)))
+        print('    --sim {}'.format(' '.join(dirs)))
+
+    if args.run and len(scripts) > 0:
+        import parallel_runner
+        tests, errors = parallel_runner.collect_tests(scripts)
+        nworkers = parallel_runner.get_worker_count()
+        failed = parallel_runner.report_errors(errors)
+        failed += parallel_runner.run_tests(tests, nworkers)
+        return len(failed)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
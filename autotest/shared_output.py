@@ -0,0 +1,182 @@
+"""
+Read the shared ring buffer files written by the SHAREDMEMORY output
+control option.
+
+A shared output file contains a header, a directory with the name and
+size of every array, and a fixed number of slots. Every time step the
+arrays are written to the next slot, so the file always contains the
+last nslots time steps. The file is memory mapped, so the arrays can be
+returned as views into the file without copying them. On Linux, a file in
+/dev/shm is a POSIX shared memory object and can be read while the
+simulation is running without any disk I/O.
+
+A slot is overwritten while the simulation runs. Views returned with
+copy=False are only valid until the slot is reused, and the records
+returned with copy=True are checked to make sure the slot did not change
+while it was being copied.
+
+Examples
+--------
+Print the maximum head after every time step while MODFLOW is running
+
+>>> shm = SharedOutputReader('/dev/shm/model.head')
+>>> count = 0
+>>> while True:
+...     count = shm.wait(count + 1)
+...     record = shm.get_record(count)
+...     print(record['totim'], record['HEAD'].max())
+
+"""
+
+import os
+import time
+import numpy as np
+
+magic = b'MF6SHARE'
+header_dtype = np.dtype([('magic', 'S8'),
+                         ('version', '<i4'),
+                         ('nslots', '<i4'),
+                         ('narrays', '<i4'),
+                         ('reserved', '<i4'),
+                         ('nvalues', '<i8'),
+                         ('count', '<i8')])
+entry_dtype = np.dtype([('text', 'S16'),
+                        ('n', '<i8')])
+slot_header_dtype = np.dtype([('seq', '<i8'),
+                              ('kstp', '<i4'),
+                              ('kper', '<i4'),
+                              ('pertim', '<f8'),
+                              ('totim', '<f8')])
+
+
+class SharedOutputReader(object):
+    """
+    Reader for a shared output ring buffer file.
+
+    Parameters
+    ----------
+    fpth : str
+        path to the shared output file
+    timeout : float
+        number of seconds to wait for the file to be created
+
+    """
+
+    def __init__(self, fpth, timeout=0.):
+        self.fpth = fpth
+        t0 = time.time()
+        while not os.path.isfile(fpth) or \
+                os.path.getsize(fpth) < header_dtype.itemsize:
+            if time.time() - t0 >= timeout:
+                msg = 'shared output file {} does not exist'.format(fpth)
+                raise IOError(msg)
+            time.sleep(0.01)
+
+        mm = np.memmap(fpth, dtype=np.uint8, mode='r')
+        header = mm[:header_dtype.itemsize].view(header_dtype)[0]
+        if header['magic'] != magic:
+            msg = '{} is not a shared output file'.format(fpth)
+            raise ValueError(msg)
+        self.version = int(header['version'])
+        self.nslots = int(header['nslots'])
+        self.narrays = int(header['narrays'])
+        self.nvalues = int(header['nvalues'])
+
+        # the file has its final size once the header has been written, so
+        # map it again if it was mapped while it was being created
+        offset = header_dtype.itemsize
+        slot_size = slot_header_dtype.itemsize + 8 * self.nvalues
+        size = offset + entry_dtype.itemsize * self.narrays + \
+            self.nslots * slot_size
+        while mm.size < size:
+            if time.time() - t0 >= max(timeout, 1.):
+                msg = 'shared output file {} is incomplete'.format(fpth)
+                raise IOError(msg)
+            time.sleep(0.01)
+            mm = np.memmap(fpth, dtype=np.uint8, mode='r')
+        self.mm = mm
+        self._count = mm[32:40].view('<i8')
+
+        entries = mm[offset:offset + entry_dtype.itemsize *
+                     self.narrays].view(entry_dtype)
+        self.names = [e['text'].decode().strip() for e in entries]
+        self.sizes = [int(e['n']) for e in entries]
+        offset += entry_dtype.itemsize * self.narrays
+
+        # views of the slot headers and the arrays in every slot
+        self.slot_headers = []
+        self.slot_arrays = []
+        for islot in range(self.nslots):
+            pos = offset + islot * slot_size
+            self.slot_headers.append(
+                mm[pos:pos + slot_header_dtype.itemsize].view(
+                    slot_header_dtype))
+            pos += slot_header_dtype.itemsize
+            arrays = {}
+            for name, n in zip(self.names, self.sizes):
+                arrays[name] = mm[pos:pos + 8 * n].view('<f8')
+                pos += 8 * n
+            self.slot_arrays.append(arrays)
+
+    def get_count(self):
+        """
+        Return the number of records that have been written.
+
+        """
+        return int(self._count[0])
+
+    def wait(self, count, timeout=None, interval=0.001):
+        """
+        Wait until at least count records have been written and return the
+        number of records. None is returned if timeout seconds pass first.
+
+        """
+        t0 = time.time()
+        while True:
+            n = self.get_count()
+            if n >= count:
+                return n
+            if timeout is not None and time.time() - t0 >= timeout:
+                return None
+            time.sleep(interval)
+
+    def get_record(self, seq=None, copy=True):
+        """
+        Return record seq (the last record if seq is None) as a dictionary
+        with kstp, kper, pertim, totim, and the arrays. None is returned if
+        the record has been overwritten or has not been written yet.
+
+        """
+        if seq is None:
+            seq = self.get_count()
+        if seq < 1:
+            return None
+        islot = (seq - 1) % self.nslots
+        header = self.slot_headers[islot]
+        if int(header['seq'][0]) != seq:
+            return None
+        record = {'seq': seq,
+                  'kstp': int(header['kstp'][0]),
+                  'kper': int(header['kper'][0]),
+                  'pertim': float(header['pertim'][0]),
+                  'totim': float(header['totim'][0])}
+        for name, v in self.slot_arrays[islot].items():
+            record[name] = v.copy() if copy else v
+
+        # make sure the slot was not reused while it was copied
+        if copy and int(header['seq'][0]) != seq:
+            return None
+        return record
+
+    def get_records(self, copy=True):
+        """
+        Return the records in the file in the order they were written.
+
+        """
+        count = self.get_count()
+        records = []
+        for seq in range(max(1, count - self.nslots + 1), count + 1):
+            record = self.get_record(seq, copy=copy)
+            if record is not None:
+                records.append(record)
+        return records
@@ -20,6 +20,9 @@ except:
     raise Exception(msg)
 
 import targets
+import benchmark
+from comparison_cache import get_comparison_cache, get_file_states
+from head_compare import compare_heads, get_namefile_head_file
 
 sfmt = '{:25s} - {}'
 
@@ -123,8 +126,6 @@ class Simulation(object):
               '{}'.format(os.path.abspath(os.getcwd())))
         try:
             self.inpt, self.outp = pymake.setup_mf6(src=src, dst=dst)
-            print('waiting...')
-            time.sleep(0.5)
             success = True
         except:
             success = False
@@ -155,9 +156,18 @@ class Simulation(object):
         exe = os.path.abspath(targets.target_dict[target])
         msg = sfmt.format('using executable', exe)
         print(msg)
+        history = benchmark.get_history_path()
         try:
-            success, buff = flopy.run_model(exe, nam, model_ws=self.simpath,
-                                            silent=False, report=True)
+            if history is None:
+                success, buff = flopy.run_model(exe, nam,
+                                                model_ws=self.simpath,
+                                                silent=False, report=True)
+            else:
+                success, buff, results = benchmark.run_model(exe,
+                                                             self.simpath)
+                if success:
+                    benchmark.get_results(self.simpath, results)
+                    benchmark.add_to_history(history, self.name, results)
             msg = sfmt.format('MODFLOW 6 run', self.name)
             if success:
                 print(msg)
@@ -192,12 +202,29 @@ class Simulation(object):
                         npth = pymake.get_namefiles(cpth)[0]
                         nam = os.path.basename(npth)
                     self.nam_cmp = nam
+
+                    # comparison output can only be reused if it does not
+                    # depend on a bmi driver defined in the test
+                    cache = None
+                    if self.bmifunc is None:
+                        cache = get_comparison_cache()
+                    if cache is not None:
+                        cache_key = cache.get_key(cpth, exe)
+                        cache_states = get_file_states(cpth)
                     try:
-                        if self.bmifunc is None:
+                        if cache is not None and \
+                                cache.restore(cache_key, cpth):
+                            success_cmp = True
+                            msg = sfmt.format('Cached comparison run',
+                                              self.name + '/' + key)
+                            print(msg)
+                        elif self.bmifunc is None:
                             success_cmp, buff = flopy.run_model(exe, nam,
                                                                 model_ws=cpth,
                                                                 silent=False,
                                                                 report=True)
+                            if success_cmp and cache is not None:
+                                cache.store(cache_key, cpth, cache_states)
                         else:
                             success_cmp, buff = self.bmifunc(exe,
                                                              self.idxsim,
@@ -316,18 +343,35 @@ class Simulation(object):
                                 os.path.basename(exfile))
                             print(txt)
 
+                # determine the comparison file from the comparison
+                # model name file
+                binary = True
+                if file2 is None and pth is not None:
+                    file2, binary = get_namefile_head_file(pth,
+                                                           text=extdict[ext])
+
                 # make comparison
-                success_tst = pymake.compare_heads(None, pth,
-                                                   precision='double',
-                                                   text=extdict[ext],
-                                                   outfile=outfile,
-                                                   files1=file1,
-                                                   files2=file2,
-                                                   htol=self.htol,
-                                                   difftol=True,
-                                                   # Change to true to have list of all nodes exceeding htol
-                                                   verbose=self.cmp_verbose,
-                                                   exfile=exfile)
+                if file2 is None:
+                    success_tst = True
+                elif binary:
+                    success_tst = compare_heads(file1, file2,
+                                                htol=self.htol,
+                                                text=extdict[ext],
+                                                outfile=outfile,
+                                                exfile=exfile,
+                                                verbose=self.cmp_verbose)
+                else:
+                    # formatted comparison files are read by pymake
+                    success_tst = pymake.compare_heads(None, pth,
+                                                       precision='double',
+                                                       text=extdict[ext],
+                                                       outfile=outfile,
+                                                       files1=file1,
+                                                       files2=None,
+                                                       htol=self.htol,
+                                                       difftol=True,
+                                                       verbose=self.cmp_verbose,
+                                                       exfile=exfile)
                 msg = sfmt.format('{} comparison {}'.format(extdict[ext],
                                                             ipos + 1),
                                   self.name)
@@ -353,16 +397,18 @@ class Simulation(object):
                 msg = sfmt.format('Teardown test', self.name)
                 print(msg)
 
-                # wait to delete on windows
-                if sys.platform.lower() == "win32":
-                    time.sleep(3)
-
-                try:
-                    shutil.rmtree(self.simpath)
-                    success = True
-                except:
+                # files may still be locked for a short time on windows, so
+                # only wait if the removal fails
+                success = False
+                for i in range(5):
+                    try:
+                        shutil.rmtree(self.simpath)
+                        success = True
+                        break
+                    except:
+                        time.sleep(0.5 * (i + 1))
+                if not success:
                     print('Could not remove test ' + self.name)
-                    success = False
                 assert success
             else:
                 print('Retaining test files')
@@ -0,0 +1,173 @@
+"""
+MODFLOW 6 Autotest
+Test the connectivity and flow-field functions in binary_file_writer. A
+small DIS model and a small DISV model with triangular cells are run to
+write their binary grid files. The connectivity from
+get_structured_connectivity and get_disv_connectivity must be the same as
+the IA and JA arrays in the binary grid files. Flows from flow_field for a
+uniform specific discharge must be equal and opposite for the two cells of
+every connection and must sum to zero for the cells that are surrounded by
+other cells.
+"""
+
+import os
+import numpy as np
+
+try:
+    import flopy
+except:
+    msg = 'Error. FloPy package is not available.\n'
+    msg += 'Try installing using the following command:\n'
+    msg += ' pip install flopy'
+    raise Exception(msg)
+
+import targets
+from binary_file_writer import get_structured_connectivity, \
+    get_disv_connectivity, flow_field
+
+mf6_exe = os.path.abspath(targets.target_dict['mf6'])
+testname = 'gwf_flow_field01'
+testdir = os.path.join('temp', testname)
+
+nlay = 3
+
+
+def run_model(name, dis, chdcell):
+    """
+    Write and run a steady-state model that uses the discretization
+    package created by dis(gwf), with a constant head in cell chdcell, and
+    return the binary grid file object.
+
+    """
+    ws = os.path.join(testdir, name)
+    sim = flopy.mf6.MFSimulation(sim_name=name, version='mf6',
+                                 exe_name=mf6_exe, sim_ws=ws)
+    tdis = flopy.mf6.ModflowTdis(sim)
+    gwf = flopy.mf6.ModflowGwf(sim, modelname=name)
+    ims = flopy.mf6.ModflowIms(sim, print_option='SUMMARY')
+    ftype = dis(gwf).package_type
+    ic = flopy.mf6.ModflowGwfic(gwf, strt=0.)
+    npf = flopy.mf6.ModflowGwfnpf(gwf)
+    chd = flopy.mf6.ModflowGwfchd(gwf, stress_period_data=[[chdcell, 1.]])
+    sim.write_simulation()
+    success, buff = sim.run_simulation()
+    assert success, 'could not run {}'.format(name)
+
+    fname = os.path.join(ws, '{}.{}.grb'.format(name, ftype))
+    return flopy.utils.MfGrdFile(fname)
+
+
+def check_connectivity(grbobj, ia, ja):
+    """
+    Compare zero-based ia and ja to the one-based IA and JA arrays in a
+    binary grid file.
+
+    """
+    assert np.array_equal(ia + 1, grbobj._datadict['IA']), 'ia differs'
+    assert np.array_equal(ja + 1, grbobj._datadict['JA']), 'ja differs'
+    return
+
+
+def check_flows(ia, ja, flowja):
+    """
+    Confirm that the flow for every connection is equal and opposite for
+    the two cells and return the net flow for each cell.
+
+    """
+    nodes = ia.shape[0] - 1
+    row = np.repeat(np.arange(nodes), np.diff(ia))
+    assert np.all(flowja[row == ja] == 0.), 'diagonal flows are not zero'
+
+    # flow from m into n must be the flow from n into m with opposite sign
+    flows = dict(zip(zip(row, ja), flowja))
+    for (n, m), q in flows.items():
+        assert np.isclose(q, -flows[(m, n)]), \
+            'flows for connection {}-{} are not equal and opposite'.format(n,
+                                                                           m)
+    return np.bincount(row, weights=flowja, minlength=nodes)
+
+
+def test_structured():
+    nrow, ncol = 4, 5
+
+    def dis(gwf):
+        return flopy.mf6.ModflowGwfdis(gwf, nlay=nlay, nrow=nrow, ncol=ncol,
+                                       delr=1., delc=1., top=0.,
+                                       botm=[-1., -2., -3.])
+
+    grbobj = run_model('dis', dis, (0, 0, 0))
+    ia, ja, centers = get_structured_connectivity(nlay, nrow, ncol)
+    check_connectivity(grbobj, ia, ja)
+
+    qx, qy, qz = 1., 0.5, 0.25
+    spdis, flowja = flow_field(ia, ja, centers, qx, qy, qz)
+    assert np.all(spdis['QX'] == qx), 'QX differs from qx'
+    assert np.all(spdis['QY'] == qy), 'QY differs from qy'
+    assert np.all(spdis['QZ'] == qz), 'QZ differs from qz'
+
+    # flow into each cell from the cell to its left is qx
+    nodes = nlay * nrow * ncol
+    row = np.repeat(np.arange(nodes), np.diff(ia))
+    left = ja == row - 1
+    assert np.allclose(flowja[left], qx), 'flow from the left differs'
+
+    # the flows for interior cells sum to zero
+    net = check_flows(ia, ja, flowja).reshape((nlay, nrow, ncol))
+    assert np.allclose(net[1:-1, 1:-1, 1:-1], 0.), \
+        'flows for interior cells do not sum to zero'
+    return
+
+
+def test_disv():
+    # two triangles in each square of a 2 row by 3 column grid
+    nrowv, ncolv = 2, 3
+    x = np.arange(ncolv + 1, dtype=np.float64)
+    y = np.arange(nrowv, -1, -1, dtype=np.float64)
+    xv, yv = np.meshgrid(x, y)
+    vertices = [[iv, xv.ravel()[iv], yv.ravel()[iv]]
+                for iv in range(xv.size)]
+    cell2d = []
+    for i in range(nrowv):
+        for j in range(ncolv):
+            tl = i * (ncolv + 1) + j
+            tr = tl + 1
+            bl = tl + ncolv + 1
+            br = bl + 1
+            cell2d.append([tl, tr, br])
+            cell2d.append([tl, br, bl])
+    xc = np.array([xv.ravel()[iv].mean() for iv in cell2d])
+    yc = np.array([yv.ravel()[iv].mean() for iv in cell2d])
+    ncpl = len(cell2d)
+
+    def dis(gwf):
+        c2d = [[icell, xc[icell], yc[icell], 3] + iv
+               for icell, iv in enumerate(cell2d)]
+        return flopy.mf6.ModflowGwfdisv(gwf, nlay=nlay, ncpl=ncpl,
+                                        nvert=len(vertices), top=0.,
+                                        botm=[-1., -2., -3.],
+                                        vertices=vertices, cell2d=c2d)
+
+    grbobj = run_model('disv', dis, (0, 0))
+    ia, ja, centers = get_disv_connectivity(nlay, cell2d, xc, yc)
+    check_connectivity(grbobj, ia, ja)
+
+    # the vertical flows for cells in the middle layer sum to zero
+    spdis, flowja = flow_field(ia, ja, centers, 0., 0., 1.)
+    net = check_flows(ia, ja, flowja).reshape((nlay, ncpl))
+    assert np.allclose(net[1], 0.), \
+        'flows for middle layer cells do not sum to zero'
+
+    # horizontal flows are equal and opposite for every connection
+    spdis, flowja = flow_field(ia, ja, centers, 1., 0.5, 0.)
+    net = check_flows(ia, ja, flowja)
+    assert np.isclose(net.sum(), 0.), 'total flow is not zero'
+    return
+
+
+if __name__ == "__main__":
+    # print message
+    print('standalone run of {}'.format(os.path.basename(__file__)))
+
+    # run the tests
+    test_structured()
+    test_disv()
@@ -0,0 +1,221 @@
+"""
+MODFLOW 6 Autotest
+Test the IMS PRECONDITIONER_REUSE option. A heterogeneous transient model
+is solved with ILU(0), ILUT, and the Newton-Raphson formulation with the
+preconditioner reused while the coefficient matrix does not change (or
+changes less than PRECONDITIONER_REUSE_TOLERANCE). The results are compared
+to the same model solved without reusing the preconditioner and the number
+of rebuilt and reused preconditioners in the inner iteration csv file are
+checked.
+
+"""
+
+import os
+import numpy as np
+
+try:
+    import flopy
+except:
+    msg = 'Error. FloPy package is not available.\n'
+    msg += 'Try installing using the following command:\n'
+    msg += ' pip install flopy'
+    raise Exception(msg)
+
+from framework import testing_framework
+from simulation import Simulation
+
+ex = ['ims_pcreuse01', 'ims_pcreuse02', 'ims_pcreuse03']
+exdirs = []
+for s in ex:
+    exdirs.append(os.path.join('temp', s))
+
+# linear acceleration, ilut levels, newton, and reuse tolerance
+imsla = ['CG', 'BICGSTAB', 'BICGSTAB']
+levels = [None, 7, None]
+newton = [False, False, True]
+reusetol = [None, None, 1e-3]
+
+# temporal discretization
+nper, nstp = 1, 10
+tdis_rc = [(100., nstp, 1.)]
+
+# spatial discretization data
+nlay, nrow, ncol = 1, 30, 30
+delr = delc = 100.
+top = 50.
+botm = [-100.]
+
+# heterogeneous hydraulic conductivity
+hk = np.random.RandomState(7).lognormal(1., 1., (nlay, nrow, ncol))
+
+# solver options
+nouter, ninner = 50, 300
+hclose, rclose = 1e-9, 1e-6
+
+# chd and well data
+cd6 = {0: [[(0, i, 0), 48.] for i in range(nrow)] +
+          [[(0, i, ncol - 1), 40.] for i in range(nrow)]}
+wd6 = {0: [[(0, nrow // 2, ncol // 2), -1000.]]}
+
+
+def build_model(idx, dir):
+    name = ex[idx]
+
+    # build MODFLOW 6 files
+    ws = dir
+    sim = flopy.mf6.MFSimulation(sim_name=name, version='mf6',
+                                 exe_name='mf6',
+                                 sim_ws=ws)
+    # create tdis package
+    tdis = flopy.mf6.ModflowTdis(sim, time_units='DAYS',
+                                 nper=nper, perioddata=tdis_rc)
+
+    # create gwf model
+    if newton[idx]:
+        newtonoptions = 'NEWTON'
+    else:
+        newtonoptions = None
+    gwf = flopy.mf6.ModflowGwf(sim, modelname=name, save_flows=True,
+                               newtonoptions=newtonoptions)
+
+    # create iterative model solution and register the gwf model with it
+    ims = flopy.mf6.ModflowIms(sim, print_option='SUMMARY',
+                               csv_inner_output_filerecord='inner.csv',
+                               outer_dvclose=hclose,
+                               outer_maximum=nouter,
+                               inner_maximum=ninner,
+                               inner_dvclose=hclose, rcloserecord=rclose,
+                               linear_acceleration=imsla[idx],
+                               preconditioner_levels=levels[idx],
+                               preconditioner_drop_tolerance=1e-4)
+    sim.register_ims_package(ims, [gwf.name])
+
+    dis = flopy.mf6.ModflowGwfdis(gwf, nlay=nlay, nrow=nrow, ncol=ncol,
+                                  delr=delr, delc=delc,
+                                  top=top, botm=botm)
+
+    # initial conditions
+    ic = flopy.mf6.ModflowGwfic(gwf, strt=45.)
+
+    # node property flow
+    if newton[idx]:
+        icelltype = 1
+    else:
+        icelltype = 0
+    npf = flopy.mf6.ModflowGwfnpf(gwf, icelltype=icelltype, k=hk)
+
+    # storage
+    sto = flopy.mf6.ModflowGwfsto(gwf, iconvert=icelltype, ss=1e-5, sy=0.1,
+                                  transient={0: True})
+
+    # chd and wel
+    chd = flopy.mf6.ModflowGwfchd(gwf, stress_period_data=cd6)
+    wel = flopy.mf6.ModflowGwfwel(gwf, stress_period_data=wd6)
+
+    # output control
+    oc = flopy.mf6.ModflowGwfoc(gwf,
+                                head_filerecord='{}.hds'.format(name),
+                                saverecord=[('HEAD', 'ALL')],
+                                printrecord=[('BUDGET', 'ALL')])
+
+    return sim
+
+
+def get_model(idx, dir):
+    sim = build_model(idx, dir)
+
+    # build MODFLOW 6 comparison model that rebuilds the preconditioner
+    pth = os.path.join(dir, 'mf6')
+    mc = build_model(idx, pth)
+
+    return sim, mc
+
+
+def build_models():
+    for idx, dir in enumerate(exdirs):
+        sim, mc = get_model(idx, dir)
+        sim.write_simulation()
+        mc.write_simulation()
+
+        # add preconditioner reuse to the linear block
+        fpth = os.path.join(dir, '{}.ims'.format(ex[idx]))
+        with open(fpth) as f:
+            lines = f.readlines()
+        for i, line in enumerate(lines):
+            if line.strip().upper() == 'BEGIN LINEAR':
+                break
+        reuselines = ['  PRECONDITIONER_REUSE\n']
+        if reusetol[idx] is not None:
+            reuselines.append('  PRECONDITIONER_REUSE_TOLERANCE {}\n'.format(
+                reusetol[idx]))
+        lines[i + 1:i + 1] = reuselines
+        with open(fpth, 'w') as f:
+            f.writelines(lines)
+    return
+
+
+def eval_model(sim):
+    print('evaluating preconditioner reuse...')
+
+    fpth = os.path.join(sim.simpath, 'inner.csv')
+    try:
+        v = np.genfromtxt(fpth, names=True, delimiter=',', dtype=None,
+                          encoding=None)
+    except:
+        assert False, 'could not load data from "{}"'.format(fpth)
+
+    # one linear solve for each outer iteration of each time step
+    nsolve = len(set(zip(v['kstp'], v['nouter'])))
+    rebuilt = v['preconditioner_rebuilt'][-1]
+    reused = v['preconditioner_reused'][-1]
+    msg = 'rebuilt ({}) and reused ({}) '.format(rebuilt, reused) + \
+          'preconditioners is not equal to the number of linear solves ' + \
+          '({})'.format(nsolve)
+    assert rebuilt + reused == nsolve, msg
+
+    # the matrix of the confined models does not change
+    if not newton[sim.idxsim]:
+        msg = 'the preconditioner was rebuilt {} times'.format(rebuilt)
+        assert rebuilt == 1, msg
+    else:
+        assert reused > 0, 'the preconditioner was not reused'
+
+    return
+
+
+# - No need to change any code below
+def test_mf6model():
+    # initialize testing framework
+    test = testing_framework()
+
+    # build the models
+    build_models()
+
+    # run the test models
+    for idx, dir in enumerate(exdirs):
+        yield test.run_mf6, Simulation(dir, exfunc=eval_model, idxsim=idx)
+
+    return
+
+
+def main():
+    # initialize testing framework
+    test = testing_framework()
+
+    # build the models
+    build_models()
+
+    # run the test models
+    for idx, dir in enumerate(exdirs):
+        sim = Simulation(dir, exfunc=eval_model, idxsim=idx)
+        test.run_mf6(sim)
+
+    return
+
+
+if __name__ == "__main__":
+    # print message
+    print('standalone run of {}'.format(os.path.basename(__file__)))
+
+    # run main routine
+    main()
@@ -0,0 +1,169 @@
+"""
+MODFLOW 6 Autotest
+Test the IMS NUMBER_OF_THREADS option. A heterogeneous three-layer model
+is solved with CG and BICGSTAB, with and without MILU(0) relaxation, using
+several threads and the results are compared to the same model solved
+with one thread. The heads must be the same within the solver closure
+criteria.
+
+"""
+
+import os
+import numpy as np
+
+try:
+    import flopy
+except:
+    msg = 'Error. FloPy package is not available.\n'
+    msg += 'Try installing using the following command:\n'
+    msg += ' pip install flopy'
+    raise Exception(msg)
+
+from framework import testing_framework
+from simulation import Simulation
+
+ex = ['ims_thrds01', 'ims_thrds02', 'ims_thrds03']
+exdirs = []
+for s in ex:
+    exdirs.append(os.path.join('temp', s))
+
+# linear acceleration, relaxation factor, and number of threads
+imsla = ['CG', 'BICGSTAB', 'BICGSTAB']
+relax = [0., 0.97, 0.]
+nthreads = [2, 4, 3]
+
+# temporal discretization
+nper = 1
+tdis_rc = [(1., 1, 1.)]
+
+# spatial discretization data
+nlay, nrow, ncol = 3, 20, 25
+delr = delc = 10.
+top = 10.
+botm = [0., -10., -20.]
+
+# heterogeneous hydraulic conductivity
+hk = np.random.RandomState(7).lognormal(0., 1., (nlay, nrow, ncol))
+
+# solver options
+nouter, ninner = 50, 300
+hclose, rclose = 1e-9, 1e-6
+
+# chd data
+cd6 = {0: [[(0, i, 0), 5.] for i in range(nrow)] +
+          [[(0, i, ncol - 1), 1.] for i in range(nrow)]}
+
+
+def build_model(idx, dir):
+    name = ex[idx]
+
+    # build MODFLOW 6 files
+    ws = dir
+    sim = flopy.mf6.MFSimulation(sim_name=name, version='mf6',
+                                 exe_name='mf6',
+                                 sim_ws=ws)
+    # create tdis package
+    tdis = flopy.mf6.ModflowTdis(sim, time_units='DAYS',
+                                 nper=nper, perioddata=tdis_rc)
+
+    # create gwf model
+    gwf = flopy.mf6.ModflowGwf(sim, modelname=name, save_flows=True)
+
+    # create iterative model solution and register the gwf model with it
+    ims = flopy.mf6.ModflowIms(sim, print_option='SUMMARY',
+                               outer_dvclose=hclose,
+                               outer_maximum=nouter,
+                               inner_maximum=ninner,
+                               inner_dvclose=hclose, rcloserecord=rclose,
+                               linear_acceleration=imsla[idx],
+                               relaxation_factor=relax[idx])
+    sim.register_ims_package(ims, [gwf.name])
+
+    dis = flopy.mf6.ModflowGwfdis(gwf, nlay=nlay, nrow=nrow, ncol=ncol,
+                                  delr=delr, delc=delc,
+                                  top=top, botm=botm)
+
+    # initial conditions
+    ic = flopy.mf6.ModflowGwfic(gwf, strt=5.)
+
+    # node property flow
+    npf = flopy.mf6.ModflowGwfnpf(gwf, icelltype=0, k=hk)
+
+    # recharge and chd
+    rch = flopy.mf6.ModflowGwfrcha(gwf, recharge=0.001)
+    chd = flopy.mf6.ModflowGwfchd(gwf, stress_period_data=cd6)
+
+    # output control
+    oc = flopy.mf6.ModflowGwfoc(gwf,
+                                head_filerecord='{}.hds'.format(name),
+                                saverecord=[('HEAD', 'ALL')],
+                                printrecord=[('BUDGET', 'ALL')])
+
+    return sim
+
+
+def get_model(idx, dir):
+    sim = build_model(idx, dir)
+
+    # build MODFLOW 6 comparison model that uses one thread
+    pth = os.path.join(dir, 'mf6')
+    mc = build_model(idx, pth)
+
+    return sim, mc
+
+
+def build_models():
+    for idx, dir in enumerate(exdirs):
+        sim, mc = get_model(idx, dir)
+        sim.write_simulation()
+        mc.write_simulation()
+
+        # add the number of threads to the linear block
+        fpth = os.path.join(dir, '{}.ims'.format(ex[idx]))
+        with open(fpth) as f:
+            lines = f.readlines()
+        for i, line in enumerate(lines):
+            if line.strip().upper() == 'BEGIN LINEAR':
+                break
+        lines.insert(i + 1, '  NUMBER_OF_THREADS {}\n'.format(nthreads[idx]))
+        with open(fpth, 'w') as f:
+            f.writelines(lines)
+    return
+
+
+# - No need to change any code below
+def test_mf6model():
+    # initialize testing framework
+    test = testing_framework()
+
+    # build the models
+    build_models()
+
+    # run the test models
+    for idx, dir in enumerate(exdirs):
+        yield test.run_mf6, Simulation(dir, idxsim=idx)
+
+    return
+
+
+def main():
+    # initialize testing framework
+    test = testing_framework()
+
+    # build the models
+    build_models()
+
+    # run the test models
+    for idx, dir in enumerate(exdirs):
+        sim = Simulation(dir, idxsim=idx)
+        test.run_mf6(sim)
+
+    return
+
+
+if __name__ == "__main__":
+    # print message
+    print('standalone run of {}'.format(os.path.basename(__file__)))
+
+    # run main routine
+    main()
@@ -0,0 +1,323 @@
+"""
+MODFLOW 6 Autotest
+Test the mf6_ensemble ensemble runner. The recharge rate of
+every member is scaled by a different multiplier through get_value_ptr and
+the heads of every member are collected after each time step. The heads
+of the member with a multiplier of one are compared to the heads of a
+simulation run in this process, and the heads of that simulation are
+compared to the heads in the non-bmi simulation. A second ensemble has a
+member that stops its worker process, which must be reported as a failed
+member instead of stopping the ensemble.
+"""
+
+import os
+import numpy as np
+from xmipy import XmiWrapper
+
+try:
+    import pymake
+except:
+    msg = 'Error. Pymake package is not available.\n'
+    msg += 'Try installing using the following command:\n'
+    msg += ' pip install https://github.com/modflowpy/pymake/zipball/master'
+    raise Exception(msg)
+
+try:
+    import flopy
+except:
+    msg = 'Error. FloPy package is not available.\n'
+    msg += 'Try installing using the following command:\n'
+    msg += ' pip install flopy'
+    raise Exception(msg)
+
+from framework import testing_framework
+from simulation import Simulation, bmi_return
+from mf6_ensemble import run_ensemble
+
+ex = ['libgwf_ens01']
+exdirs = []
+for s in ex:
+    exdirs.append(os.path.join('temp', s))
+
+# temporal discretization
+nper = 3
+tdis_rc = [(1., 1, 1.), (10., 5, 1.2), (5., 3, 1.)]
+
+# model spatial dimensions
+nlay, nrow, ncol = 1, 10, 10
+
+# cell spacing
+delr = 10.
+delc = 10.
+area = delr * delc
+
+# top of the aquifer
+top = 10.
+
+# bottom of the aquifer
+botm = 0.
+
+# hydraulic conductivity
+hk = 1.
+
+# starting head
+strt = 5.
+
+# build chd stress period data
+chd_spd = {0: [[(0, 0, 0), strt]],
+           2: [[(0, 0, 0), strt - 1.]]}
+
+# build recharge spd
+rch_spd = {0: 0.001, 1: 0.002, 2: 0.0005}
+
+# recharge multipliers for the ensemble members
+rch_mult = [1., 0.5, 1.5, 2., 0.75, 1.25]
+nmembers = len(rch_mult)
+
+# member of the second ensemble that stops its worker process
+fail_member = 1
+
+# solver data
+nouter, ninner = 100, 100
+hclose, rclose, relax = 1e-9, 1e-3, 0.97
+
+
+def build_model(ws, name):
+    sim = flopy.mf6.MFSimulation(sim_name=name,
+                                 version='mf6',
+                                 exe_name='mf6',
+                                 sim_ws=ws)
+    # create tdis package
+    tdis = flopy.mf6.ModflowTdis(sim, time_units='DAYS',
+                                 nper=nper, perioddata=tdis_rc)
+
+    # create iterative model solution and register the gwf model with it
+    ims = flopy.mf6.ModflowIms(sim,
+                               print_option='SUMMARY',
+                               outer_dvclose=hclose,
+                               outer_maximum=nouter,
+                               inner_maximum=ninner,
+                               inner_dvclose=hclose, rcloserecord=rclose,
+                               linear_acceleration='BICGSTAB',
+                               relaxation_factor=relax)
+
+    # create gwf model
+    gwf = flopy.mf6.ModflowGwf(sim,
+                               modelname=name,
+                               save_flows=True)
+
+    dis = flopy.mf6.ModflowGwfdis(gwf, nlay=nlay, nrow=nrow, ncol=ncol,
+                                  delr=delr, delc=delc,
+                                  top=top, botm=botm)
+
+    # initial conditions
+    ic = flopy.mf6.ModflowGwfic(gwf, strt=strt)
+
+    # node property flow
+    npf = flopy.mf6.ModflowGwfnpf(gwf, save_flows=True,
+                                  icelltype=1,
+                                  k=hk)
+
+    # storage
+    sto = flopy.mf6.ModflowGwfsto(gwf, iconvert=1, ss=1e-5, sy=0.1,
+                                  steady_state={0: True},
+                                  transient={1: True})
+
+    # chd file
+    chd = flopy.mf6.ModflowGwfchd(gwf, stress_period_data=chd_spd)
+
+    # recharge file
+    rch = flopy.mf6.ModflowGwfrcha(gwf, recharge=rch_spd)
+
+    # output control
+    oc = flopy.mf6.ModflowGwfoc(gwf,
+                                head_filerecord='{}.hds'.format(name),
+                                saverecord=[('HEAD', 'ALL')],
+                                printrecord=[('BUDGET', 'ALL')])
+    return sim
+
+
+def get_model(idx, dir):
+    # build MODFLOW 6 files
+    ws = dir
+    name = ex[idx]
+    sim = build_model(ws, name)
+
+    # build comparison model
+    ws = os.path.join(dir, 'libmf6')
+    mc = build_model(ws, name)
+
+    return sim, mc
+
+
+def build_models():
+    for idx, dir in enumerate(exdirs):
+        sim, mc = get_model(idx, dir)
+        sim.write_simulation()
+        if mc is not None:
+            mc.write_simulation()
+    return
+
+
+def perturb(mf6, imember):
+    name = ex[0].upper()
+    kper = mf6.get_value_ptr("TDIS/KPER")[0]
+    recharge = mf6.get_value_ptr("{} RCHA/BOUND".format(name))
+    recharge[:, 0] = rch_spd[kper - 1] * area * rch_mult[imember]
+    return
+
+
+def perturb_fail(mf6, imember):
+    # libmf6 stops the process if a variable does not exist
+    if imember == fail_member:
+        mf6.get_value_ptr("{} NOTAPACKAGE/BOUND".format(ex[0].upper()))
+    return
+
+
+def bmifunc(exe, idx, model_ws=None):
+    print('\nBMI implementation test:')
+    success = False
+
+    name = ex[idx].upper()
+    hname = "{}/X".format(name)
+    dir = os.path.dirname(os.path.normpath(model_ws))
+
+    # run the ensemble in worker processes
+    try:
+        results = run_ensemble(exe, model_ws, nmembers, perturb=perturb,
+                               outputs=[hname],
+                               ensemble_ws=os.path.join(dir, 'ensemble'))
+    except:
+        return bmi_return(success, model_ws)
+    if results['nfail'].sum() > 0:
+        return bmi_return(success, model_ws)
+    ensemble_heads = results[hname]
+
+    # the member that stops its worker process must be reported
+    msg = ''
+    try:
+        run_ensemble(exe, model_ws, 3, perturb=perturb_fail,
+                     ensemble_ws=os.path.join(dir, 'ensemble_fail'))
+    except RuntimeError as e:
+        msg = str(e)
+    print(msg)
+    if 'member {} '.format(fail_member) not in msg or \
+            msg.count('member ') != 1:
+        print('the failed ensemble member was not reported')
+        return bmi_return(success, model_ws)
+
+    init_wd = os.path.abspath(os.getcwd())
+    if model_ws is not None:
+        os.chdir(model_ws)
+
+    mf6_config_file = os.path.join(model_ws, 'mfsim.nam')
+    mf6 = XmiWrapper(exe)
+
+    # initialize the model
+    try:
+        mf6.initialize(mf6_config_file)
+    except:
+        return bmi_return(success, model_ws)
+
+    # time loop
+    current_time = mf6.get_current_time()
+    end_time = mf6.get_end_time()
+
+    # maximum outer iterations
+    max_iter = mf6.get_value_ptr("SLN_1/MXITER")
+
+    # model time loop
+    heads = []
+    while current_time < end_time:
+
+        # get dt and prepare for non-linear iterations
+        dt = mf6.get_time_step()
+        mf6.prepare_time_step(dt)
+
+        # set the recharge rates for the first member
+        perturb(mf6, 0)
+
+        # solve the time step
+        mf6.prepare_solve(1)
+        kiter = 0
+        while kiter < max_iter:
+            has_converged = mf6.solve(1)
+            kiter += 1
+            if has_converged:
+                break
+        if not has_converged:
+            return bmi_return(success, model_ws)
+        mf6.finalize_solve(1)
+
+        # finalize time step and update time
+        mf6.finalize_time_step()
+        current_time = mf6.get_current_time()
+
+        # save the heads
+        heads.append(mf6.get_value_ptr(hname).copy())
+
+    # cleanup
+    try:
+        mf6.finalize()
+    except:
+        return bmi_return(success, model_ws)
+
+    if model_ws is not None:
+        os.chdir(init_wd)
+
+    # the heads of the first member must be the same as the heads of the
+    # simulation run in this process
+    heads = np.array(heads)
+    if not np.array_equal(ensemble_heads[0], heads):
+        print('ensemble heads differ from the heads run in this process')
+        return bmi_return(success, model_ws)
+
+    # the heads increase with the recharge multiplier
+    order = np.argsort(rch_mult)
+    hmean = ensemble_heads[order, -1].mean(axis=1)
+    if not np.all(np.diff(hmean) > 0.):
+        print('ensemble heads do not increase with the recharge rate')
+        return bmi_return(success, model_ws)
+
+    success = True
+
+    # cleanup and return
+    return bmi_return(success, model_ws)
+
+
+# - No need to change any code below
+def test_mf6model():
+    # initialize testing framework
+    test = testing_framework()
+
+    # build the models
+    build_models()
+
+    # run the test models
+    for idx, dir in enumerate(exdirs):
+        yield test.run_mf6, Simulation(dir, idxsim=idx, bmifunc=bmifunc)
+
+    return
+
+
+def main():
+    # initialize testing framework
+    test = testing_framework()
+
+    # build the models
+    build_models()
+
+    # run the test models
+    for idx, dir in enumerate(exdirs):
+        sim = Simulation(dir, idxsim=idx, bmifunc=bmifunc)
+        test.run_mf6(sim)
+
+    return
+
+
+if __name__ == "__main__":
+    # print message
+    print('standalone run of {}'.format(os.path.basename(__file__)))
+
+    # run main routine
+    main()
@@ -0,0 +1,331 @@
+"""
+MODFLOW 6 Autotest
+Test the bmi grid functions for a DISV model. The nodes, edges, and faces
+returned by the grid functions, and the arrays returned as pointers by
+get_grid_ptr_double and get_grid_ptr_int, are compared to the vertices and
+cells of the model. One cell in the second layer is removed with IDOMAIN,
+so the faces are the reduced model cells.
+"""
+
+import os
+import ctypes
+import numpy as np
+from xmipy import XmiWrapper
+
+try:
+    import pymake
+except:
+    msg = 'Error. Pymake package is not available.\n'
+    msg += 'Try installing using the following command:\n'
+    msg += ' pip install https://github.com/modflowpy/pymake/zipball/master'
+    raise Exception(msg)
+
+try:
+    import flopy
+except:
+    msg = 'Error. FloPy package is not available.\n'
+    msg += 'Try installing using the following command:\n'
+    msg += ' pip install flopy'
+    raise Exception(msg)
+
+from framework import testing_framework
+from simulation import Simulation, bmi_return
+
+ex = ['libgwf_grid01']
+exdirs = []
+for s in ex:
+    exdirs.append(os.path.join('temp', s))
+
+# temporal discretization
+nper = 1
+tdis_rc = [(1., 1, 1.)]
+
+# model spatial dimensions, the vertex grid is a regular grid
+nlay, nrow, ncol = 2, 4, 5
+ncpl = nrow * ncol
+delr = delc = 10.
+
+# vertices and cells
+ivert = np.arange((nrow + 1) * (ncol + 1)).reshape((nrow + 1, ncol + 1))
+vertices = [[ivert[i, j], j * delr, (nrow - i) * delc]
+            for i in range(nrow + 1) for j in range(ncol + 1)]
+iverts = [[ivert[i, j], ivert[i, j + 1], ivert[i + 1, j + 1],
+           ivert[i + 1, j]] for i in range(nrow) for j in range(ncol)]
+cell2d = [[icpl, (j + 0.5) * delr, (nrow - i - 0.5) * delc, 4] +
+          iverts[icpl]
+          for icpl, (i, j) in enumerate((i, j) for i in range(nrow)
+                                        for j in range(ncol))]
+nvert = len(vertices)
+nedge = nrow * (ncol + 1) + ncol * (nrow + 1)
+
+# top varies by cell, bottom of the layers
+top = 10. + np.arange(ncpl, dtype=np.float64)
+botm = [0., -10.]
+
+# idomain, a cell in the second layer is removed
+idomain = np.ones((nlay, ncpl), dtype=int)
+idomain[1, 7] = 0
+
+# build chd stress period data
+chd_spd = {0: [[(0, 0), 5.], [(0, ncpl - 1), 4.]]}
+
+# solver data
+nouter, ninner = 100, 100
+hclose, rclose, relax = 1e-9, 1e-3, 0.97
+
+
+def build_model(ws, name):
+    sim = flopy.mf6.MFSimulation(sim_name=name,
+                                 version='mf6',
+                                 exe_name='mf6',
+                                 sim_ws=ws)
+    # create tdis package
+    tdis = flopy.mf6.ModflowTdis(sim, time_units='DAYS',
+                                 nper=nper, perioddata=tdis_rc)
+
+    # create iterative model solution and register the gwf model with it
+    ims = flopy.mf6.ModflowIms(sim,
+                               print_option='SUMMARY',
+                               outer_dvclose=hclose,
+                               outer_maximum=nouter,
+                               inner_maximum=ninner,
+                               inner_dvclose=hclose, rcloserecord=rclose,
+                               linear_acceleration='BICGSTAB',
+                               relaxation_factor=relax)
+
+    # create gwf model
+    gwf = flopy.mf6.ModflowGwf(sim,
+                               modelname=name,
+                               save_flows=True)
+
+    disv = flopy.mf6.ModflowGwfdisv(gwf, nlay=nlay, ncpl=ncpl,
+                                    nvert=nvert, vertices=vertices,
+                                    cell2d=cell2d, top=top, botm=botm,
+                                    idomain=idomain)
+
+    # initial conditions
+    ic = flopy.mf6.ModflowGwfic(gwf, strt=5.)
+
+    # node property flow
+    npf = flopy.mf6.ModflowGwfnpf(gwf, save_flows=True,
+                                  icelltype=0,
+                                  k=1.)
+
+    # chd file
+    chd = flopy.mf6.ModflowGwfchd(gwf, stress_period_data=chd_spd)
+
+    # output control
+    oc = flopy.mf6.ModflowGwfoc(gwf,
+                                head_filerecord='{}.hds'.format(name),
+                                saverecord=[('HEAD', 'ALL')],
+                                printrecord=[('BUDGET', 'ALL')])
+    return sim
+
+
+def get_model(idx, dir):
+    # build MODFLOW 6 files
+    ws = dir
+    name = ex[idx]
+    sim = build_model(ws, name)
+
+    # build comparison model
+    ws = os.path.join(dir, 'libmf6')
+    mc = build_model(ws, name)
+
+    return sim, mc
+
+
+def build_models():
+    for idx, dir in enumerate(exdirs):
+        sim, mc = get_model(idx, dir)
+        sim.write_simulation()
+        if mc is not None:
+            mc.write_simulation()
+    return
+
+
+def get_grid_count(mf6, func, grid_id):
+    count = ctypes.c_int(0)
+    status = getattr(mf6.lib, func)(ctypes.byref(ctypes.c_int(grid_id)),
+                                    ctypes.byref(count))
+    assert status == 0, '{} failed'.format(func)
+    return count.value
+
+
+def get_grid_array(mf6, func, grid_id, n, dtype):
+    v = np.zeros(n, dtype=dtype)
+    status = getattr(mf6.lib, func)(ctypes.byref(ctypes.c_int(grid_id)),
+                                    v.ctypes.data_as(ctypes.c_void_p))
+    assert status == 0, '{} failed'.format(func)
+    return v
+
+
+def get_grid_ptr(mf6, func, grid_id, name, n, ctype):
+    ptr = ctypes.c_void_p()
+    status = getattr(mf6.lib, func)(ctypes.byref(ctypes.c_int(grid_id)),
+                                    ctypes.c_char_p(name.encode()),
+                                    ctypes.byref(ptr))
+    assert status == 0, '{} failed for {}'.format(func, name)
+    return np.ctypeslib.as_array(ctypes.cast(ptr, ctypes.POINTER(ctype)),
+                                 shape=(n,))
+
+
+def check_grid(mf6, name):
+    grid_id = ctypes.c_int(0)
+    status = mf6.lib.get_var_grid(
+        ctypes.c_char_p('{} NPF/K11'.format(name).encode()),
+        ctypes.byref(grid_id))
+    assert status == 0, 'get_var_grid failed'
+    grid_id = grid_id.value
+
+    # expected faces are the active cells
+    cells = [(k, icpl) for k in range(nlay) for icpl in range(ncpl)
+             if idomain[k, icpl] > 0]
+    nface = len(cells)
+
+    assert get_grid_count(mf6, 'get_grid_node_count', grid_id) == nvert, \
+        'node count is not correct'
+    assert get_grid_count(mf6, 'get_grid_edge_count', grid_id) == nedge, \
+        'edge count is not correct'
+    assert get_grid_count(mf6, 'get_grid_face_count', grid_id) == nface, \
+        'face count is not correct'
+
+    # node coordinates, z is the highest top of the cells using the node
+    x = get_grid_array(mf6, 'get_grid_x', grid_id, nvert, np.float64)
+    y = get_grid_array(mf6, 'get_grid_y', grid_id, nvert, np.float64)
+    z = get_grid_array(mf6, 'get_grid_z', grid_id, nvert, np.float64)
+    zexp = np.full(nvert, -1e30)
+    for icpl, vs in enumerate(iverts):
+        zexp[vs] = np.maximum(zexp[vs], top[icpl])
+    assert np.allclose(x, [v[1] for v in vertices]), 'x is not correct'
+    assert np.allclose(y, [v[2] for v in vertices]), 'y is not correct'
+    assert np.allclose(z, zexp), 'z is not correct'
+
+    # face-node connectivity
+    nodes_per_face = get_grid_array(mf6, 'get_grid_nodes_per_face',
+                                    grid_id, nface, np.int32)
+    assert np.all(nodes_per_face == 4), 'nodes per face is not correct'
+    nfacenodes = nodes_per_face.sum()
+    offset = get_grid_array(mf6, 'get_grid_offset', grid_id, nface + 1,
+                            np.int32)
+    assert np.array_equal(offset, np.arange(nface + 1) * 4), \
+        'offset is not correct'
+    face_nodes = get_grid_array(mf6, 'get_grid_face_nodes', grid_id,
+                                nfacenodes, np.int32)
+    for iface, (k, icpl) in enumerate(cells):
+        nodes = face_nodes[offset[iface]:offset[iface + 1]]
+        assert np.array_equal(nodes, iverts[icpl]), \
+            'nodes of face {} are not correct'.format(iface)
+
+    # edges, edge j of a face connects node j and node j + 1
+    edge_nodes = get_grid_array(mf6, 'get_grid_edge_nodes', grid_id,
+                                2 * nedge, np.int32).reshape((nedge, 2))
+    face_edges = get_grid_array(mf6, 'get_grid_face_edges', grid_id,
+                                nfacenodes, np.int32)
+    assert len(set(map(tuple, np.sort(edge_nodes, axis=1)))) == nedge, \
+        'edges are not unique'
+    for iface in range(nface):
+        nodes = face_nodes[offset[iface]:offset[iface + 1]]
+        edges = face_edges[offset[iface]:offset[iface + 1]]
+        for j, iedge in enumerate(edges):
+            n0, n1 = nodes[j], nodes[(j + 1) % len(nodes)]
+            assert set(edge_nodes[iedge]) == {n0, n1}, \
+                'edge {} of face {} is not correct'.format(j, iface)
+
+    # the pointers must point to the same values
+    for arr, v in zip(('X', 'Y', 'Z'), (x, y, z)):
+        p = get_grid_ptr(mf6, 'get_grid_ptr_double', grid_id, arr, nvert,
+                         ctypes.c_double)
+        assert np.array_equal(p, v), '{} pointer is not correct'.format(arr)
+    for arr, v in zip(('NODES_PER_FACE', 'FACE_OFFSET', 'FACE_NODES',
+                       'FACE_EDGES', 'EDGE_NODES'),
+                      (nodes_per_face, offset, face_nodes, face_edges,
+                       edge_nodes.ravel())):
+        p = get_grid_ptr(mf6, 'get_grid_ptr_int', grid_id, arr, v.size,
+                         ctypes.c_int)
+        assert np.array_equal(p, v), '{} pointer is not correct'.format(arr)
+    return
+
+
+def bmifunc(exe, idx, model_ws=None):
+    print('\nBMI implementation test:')
+    success = False
+
+    name = ex[idx].upper()
+    init_wd = os.path.abspath(os.getcwd())
+    if model_ws is not None:
+        os.chdir(model_ws)
+
+    mf6_config_file = os.path.join(model_ws, 'mfsim.nam')
+    mf6 = XmiWrapper(exe)
+
+    # initialize the model
+    try:
+        mf6.initialize(mf6_config_file)
+    except:
+        return bmi_return(success, model_ws)
+
+    # check the grid
+    try:
+        check_grid(mf6, name)
+    except AssertionError as e:
+        print(e)
+        return bmi_return(success, model_ws)
+
+    # time loop
+    current_time = mf6.get_current_time()
+    end_time = mf6.get_end_time()
+    while current_time < end_time:
+        mf6.update()
+        current_time = mf6.get_current_time()
+
+    # cleanup
+    try:
+        mf6.finalize()
+        success = True
+    except:
+        return bmi_return(success, model_ws)
+
+    if model_ws is not None:
+        os.chdir(init_wd)
+
+    # cleanup and return
+    return bmi_return(success, model_ws)
+
+
+# - No need to change any code below
+def test_mf6model():
+    # initialize testing framework
+    test = testing_framework()
+
+    # build the models
+    build_models()
+
+    # run the test models
+    for idx, dir in enumerate(exdirs):
+        yield test.run_mf6, Simulation(dir, idxsim=idx, bmifunc=bmifunc)
+
+    return
+
+
+def main():
+    # initialize testing framework
+    test = testing_framework()
+
+    # build the models
+    build_models()
+
+    # run the test models
+    for idx, dir in enumerate(exdirs):
+        sim = Simulation(dir, idxsim=idx, bmifunc=bmifunc)
+        test.run_mf6(sim)
+
+    return
+
+
+if __name__ == "__main__":
+    # print message
+    print('standalone run of {}'.format(os.path.basename(__file__)))
+
+    # run main routine
+    main()
@@ -0,0 +1,277 @@
+"""
+MODFLOW 6 Autotest
+Test running several libmf6 simulations in one process. The simulations
+differ in their recharge rates and each one is loaded in its own copy of
+the library using mf6_instances. The simulations are run one after the
+other and then concurrently in separate threads. The time steps of the
+concurrent simulations must be solved at the same time, the heads
+simulated concurrently must be the same as the heads simulated one at a
+time, and the heads for the first simulation are compared to the heads in
+the non-bmi simulation.
+"""
+
+import os
+import time
+import numpy as np
+
+try:
+    import pymake
+except:
+    msg = 'Error. Pymake package is not available.\n'
+    msg += 'Try installing using the following command:\n'
+    msg += ' pip install https://github.com/modflowpy/pymake/zipball/master'
+    raise Exception(msg)
+
+try:
+    import flopy
+except:
+    msg = 'Error. FloPy package is not available.\n'
+    msg += 'Try installing using the following command:\n'
+    msg += ' pip install flopy'
+    raise Exception(msg)
+
+from framework import testing_framework
+from simulation import Simulation, bmi_return
+from mf6_instances import Mf6Instance, run_instances
+
+ex = ['libgwf_multi01']
+exdirs = []
+for s in ex:
+    exdirs.append(os.path.join('temp', s))
+
+# number of simulations run in the same process
+nsim = 4
+
+# temporal discretization
+nper = 3
+tdis_rc = [(1., 1, 1.), (10., 10, 1.2), (10., 10, 1.)]
+
+# model spatial dimensions
+nlay, nrow, ncol = 1, 50, 50
+
+# cell spacing
+delr = 10.
+delc = 10.
+
+# top of the aquifer
+top = 10.
+
+# bottom of the aquifer
+botm = 0.
+
+# hydraulic conductivity
+hk = 1.
+
+# starting head
+strt = 5.
+
+# build chd stress period data
+chd_spd = {0: [[(0, i, 0), strt] for i in range(nrow)]}
+
+# recharge rates for each simulation
+rch_rates = [{0: 0.001 * (1. + isim), 1: 0.002 * (1. + isim),
+              2: 0.0005 * (1. + isim)} for isim in range(nsim)]
+
+# solver data
+nouter, ninner = 100, 100
+hclose, rclose, relax = 1e-9, 1e-3, 0.97
+
+
+def build_model(ws, name, rech):
+    sim = flopy.mf6.MFSimulation(sim_name=name,
+                                 version='mf6',
+                                 exe_name='mf6',
+                                 sim_ws=ws)
+    # create tdis package
+    tdis = flopy.mf6.ModflowTdis(sim, time_units='DAYS',
+                                 nper=nper, perioddata=tdis_rc)
+
+    # create iterative model solution and register the gwf model with it
+    ims = flopy.mf6.ModflowIms(sim,
+                               print_option='SUMMARY',
+                               outer_dvclose=hclose,
+                               outer_maximum=nouter,
+                               inner_maximum=ninner,
+                               inner_dvclose=hclose, rcloserecord=rclose,
+                               linear_acceleration='BICGSTAB',
+                               relaxation_factor=relax)
+
+    # create gwf model
+    gwf = flopy.mf6.ModflowGwf(sim,
+                               modelname=name,
+                               save_flows=True)
+
+    dis = flopy.mf6.ModflowGwfdis(gwf, nlay=nlay, nrow=nrow, ncol=ncol,
+                                  delr=delr, delc=delc,
+                                  top=top, botm=botm)
+
+    # initial conditions
+    ic = flopy.mf6.ModflowGwfic(gwf, strt=strt)
+
+    # node property flow
+    npf = flopy.mf6.ModflowGwfnpf(gwf, save_flows=True,
+                                  icelltype=1,
+                                  k=hk)
+
+    # storage
+    sto = flopy.mf6.ModflowGwfsto(gwf, iconvert=1, ss=1e-5, sy=0.1,
+                                  steady_state={0: True},
+                                  transient={1: True})
+
+    # chd file
+    chd = flopy.mf6.ModflowGwfchd(gwf, stress_period_data=chd_spd)
+
+    # recharge file
+    rch = flopy.mf6.ModflowGwfrcha(gwf, recharge=rech)
+
+    # output control
+    oc = flopy.mf6.ModflowGwfoc(gwf,
+                                head_filerecord='{}.hds'.format(name),
+                                saverecord=[('HEAD', 'ALL')],
+                                printrecord=[('BUDGET', 'ALL')])
+    return sim
+
+
+def get_member_ws(dir, isim):
+    return os.path.join(dir, 'sim{}'.format(isim))
+
+
+def get_model(idx, dir):
+    # build MODFLOW 6 files
+    ws = dir
+    name = ex[idx]
+    sim = build_model(ws, name, rch_rates[0])
+
+    # build comparison model
+    ws = os.path.join(dir, 'libmf6')
+    mc = build_model(ws, name, rch_rates[0])
+
+    # build the other simulations run with the comparison model
+    members = []
+    for isim in range(1, nsim):
+        ws = get_member_ws(dir, isim)
+        members.append(build_model(ws, name, rch_rates[isim]))
+
+    return sim, mc, members
+
+
+def build_models():
+    for idx, dir in enumerate(exdirs):
+        sim, mc, members = get_model(idx, dir)
+        sim.write_simulation()
+        if mc is not None:
+            mc.write_simulation()
+        for m in members:
+            m.write_simulation()
+    return
+
+
+def bmifunc(exe, idx, model_ws=None):
+    print('\nBMI implementation test:')
+    success = False
+
+    name = ex[idx].upper()
+    dir = os.path.dirname(os.path.normpath(model_ws))
+    sim_ws = [model_ws] + [get_member_ws(dir, isim)
+                           for isim in range(1, nsim)]
+
+    # save the heads after every time step
+    heads = {}
+
+    def save_head(instance):
+        v = instance.mf6.get_value_ptr("{}/X".format(name)).copy()
+        heads.setdefault(instance.model_ws, []).append(v)
+
+    # run the simulations one at a time
+    t0 = time.perf_counter()
+    for ws in sim_ws:
+        instance = Mf6Instance(exe, ws)
+        try:
+            instance.run(save_head)
+        finally:
+            instance.close()
+    t_sequential = time.perf_counter() - t0
+    heads_sequential = heads
+    heads = {}
+
+    # run the simulations concurrently
+    t0 = time.perf_counter()
+    instances = [Mf6Instance(exe, ws) for ws in sim_ws]
+    try:
+        run_instances(instances, save_head)
+    except:
+        return bmi_return(success, model_ws)
+    finally:
+        for instance in instances:
+            instance.close()
+    t_concurrent = time.perf_counter() - t0
+
+    msg = 'Time to run {} simulations: '.format(nsim) + \
+          'one at a time {:.4f} s, '.format(t_sequential) + \
+          'concurrently {:.4f} s'.format(t_concurrent)
+    print(msg)
+
+    # the simulations must have been advanced at the same time
+    start = max(instance.update_interval[0] for instance in instances)
+    end = min(instance.update_interval[1] for instance in instances)
+    if start >= end:
+        print('simulations were not advanced concurrently')
+        return bmi_return(success, model_ws)
+
+    # compare the heads
+    for key, v0 in heads_sequential.items():
+        v = heads[key]
+        if len(v) != len(v0):
+            return bmi_return(success, model_ws)
+        for h0, h in zip(v0, v):
+            if not np.array_equal(h0, h):
+                print('heads differ for {}'.format(key))
+                return bmi_return(success, model_ws)
+
+    # the simulations must not be the same
+    if np.array_equal(heads[instances[0].model_ws][-1],
+                      heads[instances[1].model_ws][-1]):
+        return bmi_return(success, model_ws)
+
+    success = True
+
+    # cleanup and return
+    return bmi_return(success, model_ws)
+
+
+# - No need to change any code below
+def test_mf6model():
+    # initialize testing framework
+    test = testing_framework()
+
+    # build the models
+    build_models()
+
+    # run the test models
+    for idx, dir in enumerate(exdirs):
+        yield test.run_mf6, Simulation(dir, idxsim=idx, bmifunc=bmifunc)
+
+    return
+
+
+def main():
+    # initialize testing framework
+    test = testing_framework()
+
+    # build the models
+    build_models()
+
+    # run the test models
+    for idx, dir in enumerate(exdirs):
+        sim = Simulation(dir, idxsim=idx, bmifunc=bmifunc)
+        test.run_mf6(sim)
+
+    return
+
+
+if __name__ == "__main__":
+    # print message
+    print('standalone run of {}'.format(os.path.basename(__file__)))
+
+    # run main routine
+    main()
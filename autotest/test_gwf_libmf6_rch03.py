@@ -0,0 +1,321 @@
+"""
+MODFLOW 6 Autotest
+Test the bmi get_value_at_indices and set_value_at_indices functions, which
+are used to set the recharge rate for a subset of the cells in the model
+domain each time step. The simulated heads are compared to the heads in
+the non-bmi simulation, which uses the same recharge rates. The time
+required to update the recharge rates with the indexed functions is
+compared to the time required to copy the full recharge array.
+"""
+
+import os
+import time
+import ctypes
+import numpy as np
+from xmipy import XmiWrapper
+
+try:
+    import pymake
+except:
+    msg = 'Error. Pymake package is not available.\n'
+    msg += 'Try installing using the following command:\n'
+    msg += ' pip install https://github.com/modflowpy/pymake/zipball/master'
+    raise Exception(msg)
+
+try:
+    import flopy
+except:
+    msg = 'Error. FloPy package is not available.\n'
+    msg += 'Try installing using the following command:\n'
+    msg += ' pip install flopy'
+    raise Exception(msg)
+
+from framework import testing_framework
+from simulation import Simulation, bmi_return
+
+ex = ['libgwf_rch03']
+exdirs = []
+for s in ex:
+    exdirs.append(os.path.join('temp', s))
+
+# temporal discretization
+nper = 5
+tdis_rc = []
+for i in range(nper):
+    tdis_rc.append((1., 1, 1))
+
+# model spatial dimensions
+nlay, nrow, ncol = 1, 100, 100
+ncpl = nrow * ncol
+
+# cell spacing
+delr = 10.
+delc = 10.
+area = delr * delc
+
+# top of the aquifer
+top = 10.
+
+# bottom of the aquifer
+botm = 0.
+
+# hydraulic conductivity
+hk = 1.
+
+# starting head
+strt = 5.
+
+# recharge cells and rates
+nrch = 2000
+np.random.seed(0)
+rch_cells = np.sort(np.random.choice(ncpl, size=nrch, replace=False))
+rch_rates = 0.001 * (1. + np.random.random((nper, nrch)))
+
+# build chd stress period data
+chd_spd = {0: [[(0, i, j), strt] for i in range(nrow)
+               for j in (0, ncol - 1)]}
+
+# build recharge spd
+rch_spd = {}
+for n in range(nper):
+    rech = np.zeros(ncpl, dtype=np.float64)
+    rech[rch_cells] = rch_rates[n]
+    rch_spd[n] = rech.reshape((nrow, ncol))
+
+# number of repetitions used to time the recharge updates
+nrep = 100
+
+# solver data
+nouter, ninner = 100, 100
+hclose, rclose, relax = 1e-9, 1e-3, 0.97
+
+
+def build_model(ws, name, rech=rch_spd):
+    sim = flopy.mf6.MFSimulation(sim_name=name,
+                                 version='mf6',
+                                 exe_name='mf6',
+                                 sim_ws=ws)
+    # create tdis package
+    tdis = flopy.mf6.ModflowTdis(sim, time_units='DAYS',
+                                 nper=nper, perioddata=tdis_rc)
+
+    # create iterative model solution and register the gwf model with it
+    ims = flopy.mf6.ModflowIms(sim,
+                               print_option='SUMMARY',
+                               outer_dvclose=hclose,
+                               outer_maximum=nouter,
+                               inner_maximum=ninner,
+                               inner_dvclose=hclose, rcloserecord=rclose,
+                               linear_acceleration='CG',
+                               relaxation_factor=relax)
+
+    # create gwf model
+    gwf = flopy.mf6.ModflowGwf(sim,
+                               modelname=name,
+                               save_flows=True)
+
+    dis = flopy.mf6.ModflowGwfdis(gwf, nlay=nlay, nrow=nrow, ncol=ncol,
+                                  delr=delr, delc=delc,
+                                  top=top, botm=botm)
+
+    # initial conditions
+    ic = flopy.mf6.ModflowGwfic(gwf, strt=strt)
+
+    # node property flow
+    npf = flopy.mf6.ModflowGwfnpf(gwf, save_flows=True,
+                                  icelltype=0,
+                                  k=hk)
+
+    # chd file
+    chd = flopy.mf6.ModflowGwfchd(gwf, stress_period_data=chd_spd)
+
+    # recharge file
+    rch = flopy.mf6.ModflowGwfrcha(gwf, recharge=rech)
+
+    # output control
+    oc = flopy.mf6.ModflowGwfoc(gwf,
+                                head_filerecord='{}.hds'.format(name),
+                                saverecord=[('HEAD', 'ALL')],
+                                printrecord=[('BUDGET', 'ALL')])
+    return sim
+
+
+def get_model(idx, dir):
+    # build MODFLOW 6 files
+    ws = dir
+    name = ex[idx]
+    sim = build_model(ws, name)
+
+    # build comparison model
+    ws = os.path.join(dir, 'libmf6')
+    mc = build_model(ws, name, rech=0.)
+
+    return sim, mc
+
+
+def build_models():
+    for idx, dir in enumerate(exdirs):
+        sim, mc = get_model(idx, dir)
+        sim.write_simulation()
+        if mc is not None:
+            mc.write_simulation()
+    return
+
+
+def get_value_at_indices(mf6, name, inds):
+    values = np.zeros(inds.shape[0], dtype=np.float64)
+    status = mf6.lib.get_value_at_indices_double(
+        ctypes.c_char_p(name.encode()),
+        values.ctypes.data_as(ctypes.POINTER(ctypes.c_double)),
+        inds.ctypes.data_as(ctypes.POINTER(ctypes.c_int)),
+        ctypes.byref(ctypes.c_int(inds.shape[0])))
+    assert status == 0, 'get_value_at_indices_double failed'
+    return values
+
+
+def set_value_at_indices(mf6, name, inds, values):
+    status = mf6.lib.set_value_at_indices_double(
+        ctypes.c_char_p(name.encode()),
+        inds.ctypes.data_as(ctypes.POINTER(ctypes.c_int)),
+        ctypes.byref(ctypes.c_int(inds.shape[0])),
+        values.ctypes.data_as(ctypes.POINTER(ctypes.c_double)))
+    assert status == 0, 'set_value_at_indices_double failed'
+    return
+
+
+def bmifunc(exe, idx, model_ws=None):
+    print('\nBMI implementation test:')
+    success = False
+
+    name = ex[idx].upper()
+    init_wd = os.path.abspath(os.getcwd())
+    if model_ws is not None:
+        os.chdir(model_ws)
+
+    mf6_config_file = os.path.join(model_ws, 'mfsim.nam')
+    mf6 = XmiWrapper(exe)
+
+    # initialize the model
+    try:
+        mf6.initialize(mf6_config_file)
+    except:
+        return bmi_return(success, model_ws)
+
+    # time loop
+    current_time = mf6.get_current_time()
+    end_time = mf6.get_end_time()
+
+    # maximum outer iterations
+    max_iter = mf6.get_value_ptr("SLN_1/MXITER")
+
+    # flattened (C-style) indices of the recharge cells in the bound array
+    cdata = "{} RCHA/BOUND".format(name)
+    ncolbnd = mf6.get_var_shape(cdata)[-1]
+    inds = np.ascontiguousarray(rch_cells * ncolbnd, dtype=np.int32)
+
+    # model time loop
+    t_full = 0.
+    t_indices = 0.
+    kper = 0
+    while current_time < end_time:
+
+        # get dt and prepare for non-linear iterations
+        dt = mf6.get_time_step()
+        mf6.prepare_time_step(dt)
+
+        # recharge flow rates for the time step
+        q = np.ascontiguousarray(rch_rates[kper] * area)
+
+        # time copying the full recharge array
+        t0 = time.perf_counter()
+        for i in range(nrep):
+            recharge = mf6.get_value_ptr(cdata).copy()
+            recharge.flat[inds] = q
+            mf6.get_value_ptr(cdata)[:] = recharge
+        t_full += time.perf_counter() - t0
+
+        # time setting the recharge rates at the recharge cells
+        t0 = time.perf_counter()
+        for i in range(nrep):
+            set_value_at_indices(mf6, cdata, inds, q)
+        t_indices += time.perf_counter() - t0
+
+        # confirm the recharge rates were set
+        v = get_value_at_indices(mf6, cdata, inds)
+        if not np.allclose(v, q):
+            return bmi_return(success, model_ws)
+
+        # solve the time step
+        mf6.prepare_solve(1)
+        kiter = 0
+        while kiter < max_iter:
+            has_converged = mf6.solve(1)
+            kiter += 1
+            if has_converged:
+                break
+        if not has_converged:
+            return bmi_return(success, model_ws)
+        mf6.finalize_solve(1)
+
+        # finalize time step and update time
+        mf6.finalize_time_step()
+        current_time = mf6.get_current_time()
+
+        # increment counter
+        kper += 1
+
+    msg = 'Time to update {} recharge rates {} times: '.format(nrch, nrep) + \
+          'full array copy {:.4f} s, '.format(t_full) + \
+          'set_value_at_indices {:.4f} s'.format(t_indices)
+    print(msg)
+
+    # cleanup
+    try:
+        mf6.finalize()
+        success = True
+    except:
+        return bmi_return(success, model_ws)
+
+    if model_ws is not None:
+        os.chdir(init_wd)
+
+    # cleanup and return
+    return bmi_return(success, model_ws)
+
+
+# - No need to change any code below
+def test_mf6model():
+    # initialize testing framework
+    test = testing_framework()
+
+    # build the models
+    build_models()
+
+    # run the test models
+    for idx, dir in enumerate(exdirs):
+        yield test.run_mf6, Simulation(dir, idxsim=idx, bmifunc=bmifunc)
+
+    return
+
+
+def main():
+    # initialize testing framework
+    test = testing_framework()
+
+    # build the models
+    build_models()
+
+    # run the test models
+    for idx, dir in enumerate(exdirs):
+        sim = Simulation(dir, idxsim=idx, bmifunc=bmifunc)
+        test.run_mf6(sim)
+
+    return
+
+
+if __name__ == "__main__":
+    # print message
+    print('standalone run of {}'.format(os.path.basename(__file__)))
+
+    # run main routine
+    main()
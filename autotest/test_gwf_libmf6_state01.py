@@ -0,0 +1,381 @@
+"""
+MODFLOW 6 Autotest
+Test the libmf6 save_state and restore_state functions. Before each time
+step the simulation state is saved, a trial time step is solved with a
+perturbed recharge rate, and the saved state is restored before the time
+step is solved with the actual recharge rate. In the second simulation the
+state is saved to a file part way through the second stress period, the
+simulation is finalized, and the state is restored in a newly initialized
+simulation that solves the remaining time steps. The simulated heads must
+be the same as the heads in the non-bmi simulation.
+"""
+
+import os
+import shutil
+import ctypes
+import numpy as np
+from xmipy import XmiWrapper
+
+try:
+    import pymake
+except:
+    msg = 'Error. Pymake package is not available.\n'
+    msg += 'Try installing using the following command:\n'
+    msg += ' pip install https://github.com/modflowpy/pymake/zipball/master'
+    raise Exception(msg)
+
+try:
+    import flopy
+except:
+    msg = 'Error. FloPy package is not available.\n'
+    msg += 'Try installing using the following command:\n'
+    msg += ' pip install flopy'
+    raise Exception(msg)
+
+from framework import testing_framework
+from simulation import Simulation, bmi_return
+
+ex = ['libgwf_state01', 'libgwf_state02']
+exdirs = []
+for s in ex:
+    exdirs.append(os.path.join('temp', s))
+
+# temporal discretization
+nper = 3
+tdis_rc = [(1., 1, 1.), (10., 5, 1.2), (5., 3, 1.)]
+
+# model spatial dimensions
+nlay, nrow, ncol = 1, 10, 10
+
+# cell spacing
+delr = 10.
+delc = 10.
+
+# top of the aquifer
+top = 10.
+
+# bottom of the aquifer
+botm = 0.
+
+# hydraulic conductivity
+hk = 1.
+
+# starting head
+strt = 5.
+
+# build chd stress period data
+chd_spd = {0: [[(0, 0, 0), strt]],
+           2: [[(0, 0, 0), strt - 1.]]}
+
+# build recharge spd
+rch_spd = {0: 0.001, 1: 0.002, 2: 0.0005}
+
+# recharge multiplier for the trial time steps
+trial_mult = 3.
+
+# number of time steps solved before the state is saved and the simulation
+# is restarted (libgwf_state02)
+restart_step = 3
+
+# solver data
+nouter, ninner = 100, 100
+hclose, rclose, relax = 1e-9, 1e-3, 0.97
+
+
+def build_model(ws, name):
+    sim = flopy.mf6.MFSimulation(sim_name=name,
+                                 version='mf6',
+                                 exe_name='mf6',
+                                 sim_ws=ws)
+    # create tdis package
+    tdis = flopy.mf6.ModflowTdis(sim, time_units='DAYS',
+                                 nper=nper, perioddata=tdis_rc)
+
+    # create iterative model solution and register the gwf model with it
+    ims = flopy.mf6.ModflowIms(sim,
+                               print_option='SUMMARY',
+                               outer_dvclose=hclose,
+                               outer_maximum=nouter,
+                               inner_maximum=ninner,
+                               inner_dvclose=hclose, rcloserecord=rclose,
+                               linear_acceleration='BICGSTAB',
+                               relaxation_factor=relax)
+
+    # create gwf model
+    gwf = flopy.mf6.ModflowGwf(sim,
+                               modelname=name,
+                               save_flows=True)
+
+    dis = flopy.mf6.ModflowGwfdis(gwf, nlay=nlay, nrow=nrow, ncol=ncol,
+                                  delr=delr, delc=delc,
+                                  top=top, botm=botm)
+
+    # initial conditions
+    ic = flopy.mf6.ModflowGwfic(gwf, strt=strt)
+
+    # node property flow
+    npf = flopy.mf6.ModflowGwfnpf(gwf, save_flows=True,
+                                  icelltype=1,
+                                  k=hk)
+
+    # storage
+    sto = flopy.mf6.ModflowGwfsto(gwf, iconvert=1, ss=1e-5, sy=0.1,
+                                  steady_state={0: True},
+                                  transient={1: True})
+
+    # chd file
+    chd = flopy.mf6.ModflowGwfchd(gwf, stress_period_data=chd_spd)
+
+    # recharge file
+    rch = flopy.mf6.ModflowGwfrcha(gwf, recharge=rch_spd)
+
+    # output control
+    oc = flopy.mf6.ModflowGwfoc(gwf,
+                                head_filerecord='{}.hds'.format(name),
+                                saverecord=[('HEAD', 'ALL')],
+                                printrecord=[('BUDGET', 'ALL')])
+    return sim
+
+
+def get_model(idx, dir):
+    # build MODFLOW 6 files
+    ws = dir
+    name = ex[idx]
+    sim = build_model(ws, name)
+
+    # build comparison model
+    ws = os.path.join(dir, 'libmf6')
+    mc = build_model(ws, name)
+
+    return sim, mc
+
+
+def build_models():
+    for idx, dir in enumerate(exdirs):
+        sim, mc = get_model(idx, dir)
+        sim.write_simulation()
+        if mc is not None:
+            mc.write_simulation()
+    return
+
+
+def save_state_buffer(mf6):
+    nbytes = ctypes.c_int64(0)
+    mf6.lib.get_state_size(ctypes.byref(nbytes))
+    buf = np.zeros(nbytes.value, dtype=np.int8)
+    status = mf6.lib.save_state_buffer(buf.ctypes.data_as(ctypes.c_void_p),
+                                       ctypes.byref(nbytes))
+    assert status == 0, 'save_state_buffer failed'
+    return buf
+
+
+def restore_state_buffer(mf6, buf):
+    nbytes = ctypes.c_int64(buf.shape[0])
+    status = mf6.lib.restore_state_buffer(
+        buf.ctypes.data_as(ctypes.c_void_p), ctypes.byref(nbytes))
+    assert status == 0, 'restore_state_buffer failed'
+    return
+
+
+def solve_time_step(mf6, max_iter, recharge=None, mult=1.):
+    dt = mf6.get_time_step()
+    mf6.prepare_time_step(dt)
+    if recharge is not None:
+        recharge *= mult
+    mf6.prepare_solve(1)
+    kiter = 0
+    while kiter < max_iter:
+        has_converged = mf6.solve(1)
+        kiter += 1
+        if has_converged:
+            break
+    mf6.finalize_solve(1)
+    return has_converged
+
+
+def bmifunc(exe, idx, model_ws=None):
+    print('\nBMI implementation test:')
+    success = False
+
+    name = ex[idx].upper()
+    init_wd = os.path.abspath(os.getcwd())
+    if model_ws is not None:
+        os.chdir(model_ws)
+
+    if idx == 1:
+        success = restart(exe, idx, model_ws)
+        if model_ws is not None:
+            os.chdir(init_wd)
+        return bmi_return(success, model_ws)
+
+    mf6_config_file = os.path.join(model_ws, 'mfsim.nam')
+    mf6 = XmiWrapper(exe)
+
+    # initialize the model
+    try:
+        mf6.initialize(mf6_config_file)
+    except:
+        return bmi_return(success, model_ws)
+
+    # time loop
+    current_time = mf6.get_current_time()
+    end_time = mf6.get_end_time()
+
+    # maximum outer iterations
+    max_iter = mf6.get_value_ptr("SLN_1/MXITER")
+
+    # get recharge array
+    cdata = "{} RCHA/BOUND".format(name)
+    recharge = mf6.get_value_ptr(cdata)
+
+    # model time loop
+    istp = 0
+    while current_time < end_time:
+
+        # save the state and solve a trial time step if the next time step
+        # is in the current stress period, a state cannot be restored after
+        # the input for a later stress period has been read
+        kstp = mf6.get_value_ptr("TDIS/KSTP")[0]
+        nstp = mf6.get_value_ptr("TDIS/NSTP")
+        kper = mf6.get_value_ptr("TDIS/KPER")[0]
+        if 0 < kper <= nper and kstp < nstp[kper - 1]:
+            if istp % 2 == 0:
+                buf = save_state_buffer(mf6)
+            else:
+                fpth = 'state.bin'
+                status = mf6.lib.save_state(ctypes.c_char_p(fpth.encode()))
+                assert status == 0, 'save_state failed'
+            solve_time_step(mf6, max_iter, recharge, trial_mult)
+            if istp % 2 == 0:
+                restore_state_buffer(mf6, buf)
+            else:
+                status = mf6.lib.restore_state(
+                    ctypes.c_char_p(fpth.encode()))
+                assert status == 0, 'restore_state failed'
+
+        # solve the time step
+        has_converged = solve_time_step(mf6, max_iter)
+        if not has_converged:
+            return bmi_return(success, model_ws)
+
+        # finalize time step and update time
+        mf6.finalize_time_step()
+        current_time = mf6.get_current_time()
+
+        # increment counter
+        istp += 1
+
+    # cleanup
+    try:
+        mf6.finalize()
+        success = True
+    except:
+        return bmi_return(success, model_ws)
+
+    if model_ws is not None:
+        os.chdir(init_wd)
+
+    # cleanup and return
+    return bmi_return(success, model_ws)
+
+
+def restart(exe, idx, model_ws):
+    mf6_config_file = os.path.join(model_ws, 'mfsim.nam')
+    fpth = 'state.bin'
+    hds = '{}.hds'.format(ex[idx])
+
+    # solve the first time steps and save the state to a file
+    mf6 = XmiWrapper(exe)
+    try:
+        mf6.initialize(mf6_config_file)
+    except:
+        return False
+    max_iter = mf6.get_value_ptr("SLN_1/MXITER")
+    for istp in range(restart_step):
+        if not solve_time_step(mf6, max_iter):
+            return False
+        mf6.finalize_time_step()
+    save_time = mf6.get_current_time()
+    status = mf6.lib.save_state(ctypes.c_char_p(fpth.encode()))
+    assert status == 0, 'save_state failed'
+    try:
+        mf6.finalize()
+    except:
+        return False
+
+    # the new simulation replaces the head file
+    shutil.copy(hds, hds + '.part1')
+
+    # restore the state in a new simulation and solve the remaining
+    # time steps
+    mf6 = XmiWrapper(exe)
+    try:
+        mf6.initialize(mf6_config_file)
+    except:
+        return False
+    status = mf6.lib.restore_state(ctypes.c_char_p(fpth.encode()))
+    assert status == 0, 'restore_state failed'
+    current_time = mf6.get_current_time()
+    msg = 'restored time {} is not the saved time {}'.format(current_time,
+                                                             save_time)
+    assert current_time == save_time, msg
+    end_time = mf6.get_end_time()
+    max_iter = mf6.get_value_ptr("SLN_1/MXITER")
+    while current_time < end_time:
+        if not solve_time_step(mf6, max_iter):
+            return False
+        mf6.finalize_time_step()
+        current_time = mf6.get_current_time()
+    try:
+        mf6.finalize()
+    except:
+        return False
+
+    # combine the heads saved by both simulations so all of the time steps
+    # are compared with the uninterrupted simulation
+    with open(hds + '.part1', 'rb') as f:
+        b = f.read()
+    with open(hds, 'rb') as f:
+        b += f.read()
+    with open(hds, 'wb') as f:
+        f.write(b)
+
+    return True
+
+
+# - No need to change any code below
+def test_mf6model():
+    # initialize testing framework
+    test = testing_framework()
+
+    # build the models
+    build_models()
+
+    # run the test models
+    for idx, dir in enumerate(exdirs):
+        yield test.run_mf6, Simulation(dir, idxsim=idx, bmifunc=bmifunc)
+
+    return
+
+
+def main():
+    # initialize testing framework
+    test = testing_framework()
+
+    # build the models
+    build_models()
+
+    # run the test models
+    for idx, dir in enumerate(exdirs):
+        sim = Simulation(dir, idxsim=idx, bmifunc=bmifunc)
+        test.run_mf6(sim)
+
+    return
+
+
+if __name__ == "__main__":
+    # print message
+    print('standalone run of {}'.format(os.path.basename(__file__)))
+
+    # run main routine
+    main()
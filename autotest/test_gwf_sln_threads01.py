@@ -0,0 +1,243 @@
+"""
+MODFLOW 6 Autotest
+Test the IMS NUMBER_OF_FORMULATE_THREADS option. A row of GWF models
+connected by GWF-GWF exchanges is formulated with several threads and the
+results are compared to the same simulation formulated with one thread.
+The first simulation is confined and is solved with CG. The second
+simulation is unconfined and uses the Newton-Raphson formulation and
+backtracking. The heads must be identical.
+
+"""
+
+import os
+import numpy as np
+
+try:
+    import flopy
+except:
+    msg = 'Error. FloPy package is not available.\n'
+    msg += 'Try installing using the following command:\n'
+    msg += ' pip install flopy'
+    raise Exception(msg)
+
+from framework import testing_framework
+from simulation import Simulation
+
+ex = ['sln_thrds01', 'sln_thrds02']
+exdirs = []
+for s in ex:
+    exdirs.append(os.path.join('temp', s))
+
+# number of models, number of threads, and newton flag
+nmodels = 5
+nthreads = [3, 4]
+newton = [False, True]
+
+# temporal discretization
+nper = 2
+tdis_rc = [(1., 1, 1.), (100., 5, 1.2)]
+
+# spatial discretization data of each model
+nlay, nrow, ncol = 2, 15, 12
+delr = delc = 50.
+top = 20.
+botm = [5., -10.]
+
+# heterogeneous hydraulic conductivity of each model
+hk = np.random.RandomState(11).lognormal(0., 1., (nmodels, nlay, nrow, ncol))
+
+# solver options
+nouter, ninner = 100, 300
+hclose, rclose = 1e-9, 1e-6
+
+
+def get_model_name(jdx):
+    return 'gwf{}'.format(jdx + 1)
+
+
+def build_model(idx, dir):
+    name = ex[idx]
+    mnames = [get_model_name(jdx) for jdx in range(nmodels)]
+
+    # build MODFLOW 6 files
+    ws = dir
+    sim = flopy.mf6.MFSimulation(sim_name=name, version='mf6',
+                                 exe_name='mf6',
+                                 sim_ws=ws)
+    # create tdis package
+    tdis = flopy.mf6.ModflowTdis(sim, time_units='DAYS',
+                                 nper=nper, perioddata=tdis_rc)
+
+    # create iterative model solution
+    if newton[idx]:
+        ims = flopy.mf6.ModflowIms(sim, print_option='SUMMARY',
+                                   complexity='COMPLEX',
+                                   outer_dvclose=hclose,
+                                   outer_maximum=nouter,
+                                   backtracking_number=5,
+                                   inner_maximum=ninner,
+                                   inner_dvclose=hclose, rcloserecord=rclose,
+                                   linear_acceleration='BICGSTAB')
+    else:
+        ims = flopy.mf6.ModflowIms(sim, print_option='SUMMARY',
+                                   outer_dvclose=hclose,
+                                   outer_maximum=nouter,
+                                   inner_maximum=ninner,
+                                   inner_dvclose=hclose, rcloserecord=rclose,
+                                   linear_acceleration='CG')
+
+    for jdx, mname in enumerate(mnames):
+        newtonoptions = None
+        if newton[idx]:
+            newtonoptions = ''
+        gwf = flopy.mf6.ModflowGwf(sim, modelname=mname,
+                                   newtonoptions=newtonoptions,
+                                   model_nam_file='{}.nam'.format(mname))
+
+        dis = flopy.mf6.ModflowGwfdis(gwf, nlay=nlay, nrow=nrow, ncol=ncol,
+                                      delr=delr, delc=delc,
+                                      top=top, botm=botm,
+                                      filename='{}.dis'.format(mname))
+
+        # initial conditions
+        ic = flopy.mf6.ModflowGwfic(gwf, strt=12.,
+                                    filename='{}.ic'.format(mname))
+
+        # node property flow and storage
+        icelltype = 0
+        if newton[idx]:
+            icelltype = 1
+        npf = flopy.mf6.ModflowGwfnpf(gwf, icelltype=icelltype, k=hk[jdx],
+                                      filename='{}.npf'.format(mname))
+        sto = flopy.mf6.ModflowGwfsto(gwf, iconvert=icelltype, ss=1e-5,
+                                      sy=0.2, steady_state={0: True},
+                                      transient={1: True},
+                                      filename='{}.sto'.format(mname))
+
+        # recharge, wells, and constant heads at both ends of the row
+        rch = flopy.mf6.ModflowGwfrcha(gwf, recharge=0.002,
+                                       filename='{}.rch'.format(mname))
+        wd6 = {1: [[(nlay - 1, nrow // 2, ncol // 2), -50. * (jdx + 1)]]}
+        wel = flopy.mf6.ModflowGwfwel(gwf, stress_period_data=wd6,
+                                      filename='{}.wel'.format(mname))
+        if jdx == 0 or jdx == nmodels - 1:
+            j = 0
+            if jdx == nmodels - 1:
+                j = ncol - 1
+            cd6 = {0: [[(0, i, j), 12. - jdx] for i in range(nrow)]}
+            chd = flopy.mf6.ModflowGwfchd(gwf, stress_period_data=cd6,
+                                          filename='{}.chd'.format(mname))
+
+        # output control
+        oc = flopy.mf6.ModflowGwfoc(gwf,
+                                    head_filerecord='{}.hds'.format(mname),
+                                    saverecord=[('HEAD', 'ALL')],
+                                    filename='{}.oc'.format(mname))
+
+    sim.register_ims_package(ims, mnames)
+
+    # connect the last column of each model to the first column of the
+    # next model. The exchange files are added to the simulation name file
+    # first so flopy can find the models of every exchange.
+    exgfiles = ['{}.gwfgwf'.format(mnames[jdx]) for jdx in range(nmodels - 1)]
+    sim.name_file.exchanges.set_data(
+        [('GWF6-GWF6', exgfiles[jdx], mnames[jdx], mnames[jdx + 1])
+         for jdx in range(nmodels - 1)])
+    for jdx in range(nmodels - 1):
+        exchd = []
+        for k in range(nlay):
+            for i in range(nrow):
+                exchd.append([(k, i, ncol - 1), (k, i, 0), 1,
+                              delr / 2., delr / 2., delc])
+        flopy.mf6.ModflowGwfgwf(sim, exgtype='GWF6-GWF6',
+                                nexg=len(exchd),
+                                exgmnamea=mnames[jdx],
+                                exgmnameb=mnames[jdx + 1],
+                                exchangedata=exchd,
+                                filename=exgfiles[jdx])
+
+    return sim
+
+
+def get_model(idx, dir):
+    sim = build_model(idx, dir)
+
+    # build MODFLOW 6 comparison model that uses one thread
+    pth = os.path.join(dir, 'mf6')
+    mc = build_model(idx, pth)
+
+    return sim, mc
+
+
+def build_models():
+    for idx, dir in enumerate(exdirs):
+        sim, mc = get_model(idx, dir)
+        sim.write_simulation()
+        mc.write_simulation()
+
+        # add the number of formulate threads to the options block
+        fpth = os.path.join(dir, '{}.ims'.format(ex[idx]))
+        with open(fpth) as f:
+            lines = f.readlines()
+        for i, line in enumerate(lines):
+            if line.strip().upper() == 'BEGIN OPTIONS':
+                break
+        lines.insert(i + 1, '  NUMBER_OF_FORMULATE_THREADS {}\n'.format(
+            nthreads[idx]))
+        with open(fpth, 'w') as f:
+            f.writelines(lines)
+    return
+
+
+def eval_heads(sim):
+    print('evaluating heads formulated with several threads...')
+
+    for jdx in range(nmodels):
+        fname = '{}.hds'.format(get_model_name(jdx))
+        fpth = os.path.join(sim.simpath, fname)
+        h = flopy.utils.HeadFile(fpth).get_alldata()
+        fpth = os.path.join(sim.simpath, 'mf6', fname)
+        hc = flopy.utils.HeadFile(fpth).get_alldata()
+        msg = 'heads in {} are not the same as '.format(fname) + \
+              'the heads formulated with one thread'
+        assert np.array_equal(h, hc), msg
+
+    return
+
+
+# - No need to change any code below
+def test_mf6model():
+    # initialize testing framework
+    test = testing_framework()
+
+    # build the models
+    build_models()
+
+    # run the test models
+    for idx, dir in enumerate(exdirs):
+        yield test.run_mf6, Simulation(dir, exfunc=eval_heads, idxsim=idx)
+
+    return
+
+
+def main():
+    # initialize testing framework
+    test = testing_framework()
+
+    # build the models
+    build_models()
+
+    # run the test models
+    for idx, dir in enumerate(exdirs):
+        sim = Simulation(dir, exfunc=eval_heads, idxsim=idx)
+        test.run_mf6(sim)
+
+    return
+
+
+if __name__ == "__main__":
+    # print message
+    print('standalone run of {}'.format(os.path.basename(__file__)))
+
+    # run main routine
+    main()
@@ -0,0 +1,236 @@
+"""
+MODFLOW 6 Autotest
+Test the BUFFER_TIME_STEPS option and COLUMNAR binary output of the
+observation utility. Continuous head observations of a transient model are
+written with simulated values for several time steps written together, to
+a text file and to a columnar binary file. The results are compared to the
+same model written without buffering and with the binary file written in
+rows.
+
+"""
+
+import os
+import numpy as np
+
+try:
+    import flopy
+except:
+    msg = 'Error. FloPy package is not available.\n'
+    msg += 'Try installing using the following command:\n'
+    msg += ' pip install flopy'
+    raise Exception(msg)
+
+from framework import testing_framework
+from simulation import Simulation
+
+ex = ['utl03_obs02a', 'utl03_obs02b']
+exdirs = []
+for s in ex:
+    exdirs.append(os.path.join('temp', s))
+
+# number of time steps written together
+nbuffer = [7, 1]
+
+# temporal discretization
+nper = 2
+tdis_rc = [(1., 1, 1.),
+           (100., 25, 1.1)]
+
+# spatial discretization data
+nlay, nrow, ncol = 1, 21, 21
+top = 200.
+botm = 0.
+delr = delc = 100.
+strt = 100.
+
+# constant head and well data
+cd6 = {0: [[(0, i, 0), 100.] for i in range(nrow)]}
+wd6 = {1: [[(0, nrow // 2, ncol - 1), -500.]]}
+
+# gwf obs
+obs_data0 = [('h{:04d}'.format(i + 1), 'HEAD', (0, nrow // 2, i)) for i in
+             range(ncol)]
+obs_data1 = [('h{:04d}'.format(i + 1001), 'HEAD', (0, i, ncol - 2)) for i in
+             range(nrow)]
+
+# solver data
+nouter, ninner = 100, 300
+hclose, rclose = 1e-9, 1e-6
+
+
+def build_model(idx, ws):
+    name = ex[idx]
+
+    # build MODFLOW 6 files
+    sim = flopy.mf6.MFSimulation(sim_name=name, version='mf6',
+                                 exe_name='mf6',
+                                 sim_ws=ws)
+    # create tdis package
+    flopy.mf6.ModflowTdis(sim, time_units='DAYS',
+                          nper=nper, perioddata=tdis_rc)
+
+    # create gwf model
+    gwf = flopy.mf6.ModflowGwf(sim, modelname=name)
+
+    # create iterative model solution and register the gwf model with it
+    ims = flopy.mf6.ModflowIms(sim, print_option='SUMMARY',
+                               outer_dvclose=hclose,
+                               outer_maximum=nouter,
+                               inner_maximum=ninner,
+                               inner_dvclose=hclose,
+                               rcloserecord=rclose,
+                               linear_acceleration='CG')
+    sim.register_ims_package(ims, [gwf.name])
+
+    flopy.mf6.ModflowGwfdis(gwf, nlay=nlay, nrow=nrow, ncol=ncol,
+                            delr=delr, delc=delc,
+                            top=top, botm=botm)
+
+    # initial conditions
+    flopy.mf6.ModflowGwfic(gwf, strt=strt)
+
+    # node property flow and storage
+    flopy.mf6.ModflowGwfnpf(gwf, icelltype=0, k=1.)
+    flopy.mf6.ModflowGwfsto(gwf, iconvert=0, ss=1e-5,
+                            steady_state={0: True}, transient={1: True})
+
+    # gwf head observations
+    obs_recarray = {'head0.obs.csv': obs_data0,
+                    'head1.obs.bsv': obs_data1}
+    flopy.mf6.ModflowUtlobs(gwf, pname='head_obs',
+                            filename='{}.obs'.format(name),
+                            digits=10, continuous=obs_recarray)
+
+    # chd and wel
+    flopy.mf6.ModflowGwfchd(gwf, stress_period_data=cd6)
+    flopy.mf6.ModflowGwfwel(gwf, stress_period_data=wd6)
+
+    return sim
+
+
+def get_model(idx, dir):
+    sim = build_model(idx, dir)
+
+    # build MODFLOW 6 comparison model without buffered observations
+    pth = os.path.join(dir, 'mf6')
+    mc = build_model(idx, pth)
+
+    return sim, mc
+
+
+def build_models():
+    for idx, dir in enumerate(exdirs):
+        sim, mc = get_model(idx, dir)
+        sim.write_simulation()
+        mc.write_simulation()
+        hack_obs(idx, dir, buffered=True)
+        hack_obs(idx, os.path.join(dir, 'mf6'), buffered=False)
+    return
+
+
+def hack_obs(idx, ws, buffered):
+    fpth = os.path.join(ws, '{}.obs'.format(ex[idx]))
+    with open(fpth, 'r') as f:
+        lines = f.readlines()
+    with open(fpth, 'w') as f:
+        for line in lines:
+            line = line.rstrip()
+            if line.upper().startswith('BEGIN') and \
+                    'FILEOUT  head1.obs.bsv' in line:
+                line += '  BINARY'
+                if buffered:
+                    line += '  COLUMNAR'
+            f.write('{}\n'.format(line))
+            if buffered and line.strip().upper() == 'BEGIN OPTIONS':
+                f.write('  BUFFER_TIME_STEPS {}\n'.format(nbuffer[idx]))
+    return
+
+
+def read_columnar(fpth):
+    with open(fpth, 'rb') as f:
+        b = f.read()
+    assert b[:4] == b'colm', 'columnar header not found in {}'.format(fpth)
+    lenobsname = int(b[11:15])
+    ipos = 100
+    nobs = np.frombuffer(b, np.int32, 1, ipos)[0]
+    ipos += 4
+    names = [b[ipos + i * lenobsname:ipos + (i + 1) * lenobsname].decode()
+             .strip().upper() for i in range(nobs)]
+    ipos += nobs * lenobsname
+    times, values = [], []
+    while ipos < len(b):
+        ntimes = np.frombuffer(b, np.int32, 1, ipos)[0]
+        ipos += 4
+        v = np.frombuffer(b, np.float64, ntimes * (nobs + 1), ipos)
+        ipos += 8 * v.size
+        v = v.reshape(nobs + 1, ntimes)
+        times.append(v[0])
+        values.append(v[1:])
+    return names, np.concatenate(times), np.concatenate(values, axis=1)
+
+
+def eval_obs(sim):
+    print('evaluating buffered observations...')
+
+    # the text files must be the same
+    pth = sim.simpath
+    fpth0 = os.path.join(pth, 'head0.obs.csv')
+    fpth1 = os.path.join(pth, 'mf6', 'head0.obs.csv')
+    with open(fpth0) as f:
+        txt0 = f.read()
+    with open(fpth1) as f:
+        txt1 = f.read()
+    msg = '{} is not the same as {}'.format(fpth0, fpth1)
+    assert txt0 == txt1, msg
+
+    # the columnar binary file must have the same values as the row file
+    fpth0 = os.path.join(pth, 'head1.obs.bsv')
+    fpth1 = os.path.join(pth, 'mf6', 'head1.obs.bsv')
+    names, times, values = read_columnar(fpth0)
+    d1 = flopy.utils.Mf6Obs(fpth1, isBinary=True).get_data()
+    msg = 'times in {} are not the same as in {}'.format(fpth0, fpth1)
+    assert np.array_equal(times, d1['totim']), msg
+    for i, name in enumerate(names):
+        msg = "values for '{}' in {} ".format(name, fpth0) + \
+              'are not the same as in {}'.format(fpth1)
+        assert np.array_equal(values[i], d1[name]), msg
+
+    return
+
+
+# - No need to change any code below
+def test_mf6model():
+    # initialize testing framework
+    test = testing_framework()
+
+    # build the models
+    build_models()
+
+    # run the test models
+    for idx, dir in enumerate(exdirs):
+        yield test.run_mf6, Simulation(dir, exfunc=eval_obs, idxsim=idx)
+
+    return
+
+
+def main():
+    # initialize testing framework
+    test = testing_framework()
+
+    # build the models
+    build_models()
+
+    # run the test models
+    for idx, dir in enumerate(exdirs):
+        sim = Simulation(dir, exfunc=eval_obs, idxsim=idx)
+        test.run_mf6(sim)
+
+    return
+
+
+if __name__ == "__main__":
+    # print message
+    print('standalone run of {}'.format(os.path.basename(__file__)))
+
+    # run main routine
+    main()
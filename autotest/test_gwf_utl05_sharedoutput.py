@@ -0,0 +1,215 @@
+"""
+MODFLOW 6 Autotest
+Test the SHAREDMEMORY output control option. The heads, face flows, and
+specific discharge written to the shared ring buffer files for the last
+time steps must be the same as the values in the head and budget files.
+
+"""
+
+import os
+import numpy as np
+
+try:
+    import flopy
+except:
+    msg = 'Error. FloPy package is not available.\n'
+    msg += 'Try installing using the following command:\n'
+    msg += ' pip install flopy'
+    raise Exception(msg)
+
+from framework import testing_framework
+from simulation import Simulation
+from shared_output import SharedOutputReader
+
+ex = ['shm01']
+exdirs = []
+for s in ex:
+    exdirs.append(os.path.join('temp', s))
+
+# number of slots in the ring buffers
+nslots = 4
+
+
+def get_model(idx, dir):
+
+    nlay, nrow, ncol = 2, 5, 6
+    perlen = [1., 10., 5.]
+    nstp = [1, 5, 3]
+    tsmult = [1., 1.2, 1.]
+    nper = len(perlen)
+    delr = delc = 10.
+    botm = [0., -10.]
+    hk = 1.
+
+    nouter, ninner = 100, 300
+    hclose, rclose, relax = 1e-9, 1e-3, 1.
+
+    tdis_rc = []
+    for i in range(nper):
+        tdis_rc.append((perlen[i], nstp[i], tsmult[i]))
+
+    name = ex[idx]
+
+    # build MODFLOW 6 files
+    ws = dir
+    sim = flopy.mf6.MFSimulation(sim_name=name, version='mf6',
+                                 exe_name='mf6',
+                                 sim_ws=ws)
+    # create tdis package
+    tdis = flopy.mf6.ModflowTdis(sim, time_units='DAYS',
+                                 nper=nper, perioddata=tdis_rc)
+
+    # create gwf model
+    gwf = flopy.mf6.ModflowGwf(sim, modelname=name, save_flows=True)
+
+    # create iterative model solution and register the gwf model with it
+    ims = flopy.mf6.ModflowIms(sim, print_option='SUMMARY',
+                               outer_dvclose=hclose,
+                               outer_maximum=nouter,
+                               inner_maximum=ninner,
+                               inner_dvclose=hclose, rcloserecord=rclose,
+                               linear_acceleration='BICGSTAB',
+                               relaxation_factor=relax)
+    sim.register_ims_package(ims, [gwf.name])
+
+    dis = flopy.mf6.ModflowGwfdis(gwf, nlay=nlay, nrow=nrow, ncol=ncol,
+                                  delr=delr, delc=delc,
+                                  top=10., botm=botm)
+
+    # initial conditions
+    ic = flopy.mf6.ModflowGwfic(gwf, strt=5.)
+
+    # node property flow
+    npf = flopy.mf6.ModflowGwfnpf(gwf, save_specific_discharge=True,
+                                  icelltype=1, k=hk)
+
+    # storage
+    sto = flopy.mf6.ModflowGwfsto(gwf, iconvert=1, ss=1e-5, sy=0.1,
+                                  steady_state={0: True},
+                                  transient={1: True})
+
+    # chd and recharge
+    chd = flopy.mf6.ModflowGwfchd(gwf, stress_period_data={
+        0: [[(0, i, 0), 5.] for i in range(nrow)],
+        2: [[(0, i, 0), 4.] for i in range(nrow)]})
+    rch = flopy.mf6.ModflowGwfrcha(gwf, recharge={0: 0.001, 1: 0.002,
+                                                  2: 0.0005})
+
+    # output control
+    oc = flopy.mf6.ModflowGwfoc(gwf,
+                                budget_filerecord='{}.cbc'.format(name),
+                                head_filerecord='{}.hds'.format(name),
+                                saverecord=[('HEAD', 'ALL'),
+                                            ('BUDGET', 'ALL')])
+
+    return sim
+
+
+def build_models():
+    for idx, dir in enumerate(exdirs):
+        sim = get_model(idx, dir)
+        sim.write_simulation()
+
+        # add the shared output options to the output control file
+        name = ex[idx]
+        fpth = os.path.join(dir, '{}.oc'.format(name))
+        with open(fpth) as f:
+            lines = f.readlines()
+        for i, line in enumerate(lines):
+            if line.strip().upper() == 'BEGIN OPTIONS':
+                break
+        lines.insert(i + 1, '  HEAD SHAREDMEMORY {}.head.shm '
+                            'SLOTS {}\n'.format(name, nslots))
+        lines.insert(i + 1, '  BUDGET SHAREDMEMORY {}.bud.shm '
+                            'SLOTS {}\n'.format(name, nslots))
+        with open(fpth, 'w') as f:
+            f.writelines(lines)
+    return
+
+
+def eval_shm(sim):
+    print('evaluating shared output...')
+
+    name = ex[sim.idxsim]
+    hobj = flopy.utils.HeadFile(os.path.join(sim.simpath,
+                                             '{}.hds'.format(name)))
+    cobj = flopy.utils.CellBudgetFile(os.path.join(sim.simpath,
+                                                   '{}.cbc'.format(name)),
+                                      precision='double')
+    kstpkper = hobj.get_kstpkper()
+    nsteps = len(kstpkper)
+
+    hshm = SharedOutputReader(os.path.join(sim.simpath,
+                                           '{}.head.shm'.format(name)))
+    bshm = SharedOutputReader(os.path.join(sim.simpath,
+                                           '{}.bud.shm'.format(name)))
+    assert hshm.names == ['HEAD'], 'unexpected shared head arrays'
+    assert bshm.names == ['FLOW-JA-FACE', 'DATA-SPDIS'], \
+        'unexpected shared budget arrays'
+
+    for shm in (hshm, bshm):
+        msg = 'shared output count {} should be {}'.format(shm.get_count(),
+                                                           nsteps)
+        assert shm.get_count() == nsteps, msg
+        records = shm.get_records()
+        assert len(records) == nslots, 'all of the slots should be filled'
+        for record in records:
+            kstp, kper = record['kstp'] - 1, record['kper'] - 1
+            assert (kstp, kper) == kstpkper[record['seq'] - 1], \
+                'time step of shared output record is not correct'
+            if shm is hshm:
+                h = hobj.get_data(kstpkper=(kstp, kper))
+                assert np.array_equal(record['HEAD'], h.ravel()), \
+                    'shared heads are not the same as the saved heads'
+            else:
+                flowja = cobj.get_data(kstpkper=(kstp, kper),
+                                       text='FLOW-JA-FACE')[0]
+                assert np.array_equal(record['FLOW-JA-FACE'],
+                                      flowja.ravel()), \
+                    'shared flows are not the same as the saved flows'
+                spdis = cobj.get_data(kstpkper=(kstp, kper),
+                                      text='DATA-SPDIS')[0]
+                q = record['DATA-SPDIS'].reshape((-1, 3))
+                for i, qname in enumerate(('qx', 'qy', 'qz')):
+                    assert np.array_equal(q[:, i], spdis[qname]), \
+                        'shared specific discharge is not the same as ' + \
+                        'the saved specific discharge'
+    return
+
+
+# - No need to change any code below
+def test_mf6model():
+    # initialize testing framework
+    test = testing_framework()
+
+    # build the models
+    build_models()
+
+    # run the test models
+    for idx, dir in enumerate(exdirs):
+        yield test.run_mf6, Simulation(dir, exfunc=eval_shm, idxsim=idx)
+
+    return
+
+
+def main():
+    # initialize testing framework
+    test = testing_framework()
+
+    # build the models
+    build_models()
+
+    # run the test models
+    for idx, dir in enumerate(exdirs):
+        sim = Simulation(dir, exfunc=eval_shm, idxsim=idx)
+        test.run_mf6(sim)
+
+    return
+
+
+if __name__ == "__main__":
+    # print message
+    print('standalone run of {}'.format(os.path.basename(__file__)))
+
+    # run main routine
+    main()
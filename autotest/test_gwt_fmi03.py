@@ -0,0 +1,207 @@
+# tests the ability to run several transport models in one simulation that
+# read flows and heads from the same flow model files.  The flow model has a
+# stream (SFR) that receives water from a well through the water mover, so
+# the budget files of the SFR and MVR packages are also shared.  Each model
+# names the flow model files with a different path, and the last model
+# uses the flow imbalance correction.  The concentrations must be the same
+# as those of transport models run one at a time.
+
+import os
+import shutil
+import numpy as np
+
+try:
+    import pymake
+except:
+    msg = 'Error. Pymake package is not available.\n'
+    msg += 'Try installing using the following command:\n'
+    msg += ' pip install https://github.com/modflowpy/pymake/zipball/master'
+    raise Exception(msg)
+
+try:
+    import flopy
+except:
+    msg = 'Error. FloPy package is not available.\n'
+    msg += 'Try installing using the following command:\n'
+    msg += ' pip install flopy'
+    raise Exception(msg)
+
+
+import targets
+exe_name_mf6 = targets.target_dict['mf6']
+exe_name_mf6 = os.path.abspath(exe_name_mf6)
+testdir = './temp'
+testgroup = 'fmi03'
+d = os.path.join(testdir, testgroup)
+if os.path.isdir(d):
+    shutil.rmtree(d)
+
+# porosity of each transport scenario
+porosity = [0.1, 0.2, 0.3]
+
+# path to the flow model directory used by each transport scenario
+flowdirs = ['../flow/', './../flow/', '../flow/.././flow/']
+
+# stream reaches
+nreach = 3
+
+
+def run_flow_model():
+    name = 'flow'
+    ws = os.path.join(testdir, testgroup, name)
+    sim = flopy.mf6.MFSimulation(sim_name=name, sim_ws=ws,
+                                 exe_name=exe_name_mf6)
+    pd = [(1., 1, 1.), (1., 1, 1.)]
+    tdis = flopy.mf6.ModflowTdis(sim, nper=len(pd), perioddata=pd)
+    ims = flopy.mf6.ModflowIms(sim)
+    gwf = flopy.mf6.ModflowGwf(sim, modelname=name, save_flows=True)
+    dis = flopy.mf6.ModflowGwfdis(gwf, nrow=10, ncol=10)
+    ic = flopy.mf6.ModflowGwfic(gwf)
+    npf = flopy.mf6.ModflowGwfnpf(gwf, save_specific_discharge=True,
+                                  save_saturation=True)
+    spd = {0: [[(0, 0, 0), 1., 1.], [(0, 9, 9), 0., 0.]],
+           1: [[(0, 0, 0), 0., 0.], [(0, 9, 9), 1., 2.]],}
+    chd = flopy.mf6.ModflowGwfchd(gwf, pname='CHD-1',
+                                  stress_period_data=spd,
+                                  auxiliary=['concentration'])
+    spd = {0: [[(0, 7, 2), -0.1]]}
+    wel = flopy.mf6.ModflowGwfwel(gwf, pname='WEL-1', mover=True,
+                                  stress_period_data=spd)
+    # <rno> <cellid> <rlen> <rwid> <rgrd> <rtp> <rbth> <rhk> <man> <ncon>
+    # <ustrf> <ndv>
+    sfrpd = [[i, (0, 4, 2 + i), 1., 0.5, 0.001, 0.5, 0.1, 0.1, 0.04,
+              1 if i in (0, nreach - 1) else 2, 1., 0]
+             for i in range(nreach)]
+    sfrcd = [[0, -1], [1, 0, -2], [2, 1]]
+    sfrspd = {0: [[0, 'INFLOW', 0.5]]}
+    sfr = flopy.mf6.ModflowGwfsfr(gwf, pname='SFR-1', mover=True,
+                                  budget_filerecord=name + '.sfr.bud',
+                                  nreaches=nreach, packagedata=sfrpd,
+                                  connectiondata=sfrcd, perioddata=sfrspd)
+    mvrspd = [['WEL-1', 0, 'SFR-1', 0, 'FACTOR', 1.]]
+    mvr = flopy.mf6.ModflowGwfmvr(gwf, maxmvr=1, maxpackages=2,
+                                  budget_filerecord=name + '.mvr.bud',
+                                  packages=[['WEL-1'], ['SFR-1']],
+                                  perioddata=mvrspd)
+    budget_file = name + '.bud'
+    head_file = name + '.hds'
+    oc = flopy.mf6.ModflowGwfoc(gwf,
+                                budget_filerecord=budget_file,
+                                head_filerecord=head_file,
+                                saverecord=[('HEAD', 'ALL'), ('BUDGET', 'ALL')])
+    sim.write_simulation()
+    sim.run_simulation()
+    fname = os.path.join(ws, budget_file)
+    assert os.path.isfile(fname)
+    fname = os.path.join(ws, head_file)
+    assert os.path.isfile(fname)
+    return
+
+
+def add_transport_model(sim, name):
+    gwt = flopy.mf6.ModflowGwt(sim, modelname=name, save_flows=True)
+    ims = flopy.mf6.ModflowIms(sim, linear_acceleration='BICGSTAB',
+                               filename='{}.ims'.format(name))
+    sim.register_ims_package(ims, [gwt.name])
+    dis = flopy.mf6.ModflowGwtdis(gwt, nrow=10, ncol=10)
+    ic = flopy.mf6.ModflowGwtic(gwt)
+    idx = int(name[-1])
+    mst = flopy.mf6.ModflowGwtmst(gwt, porosity=porosity[idx])
+    adv = flopy.mf6.ModflowGwtadv(gwt)
+    flowdir = flowdirs[idx]
+    flowerr = idx == len(porosity) - 1
+    pd = [('GWFHEAD', flowdir + 'flow.hds', None),
+          ('GWFBUDGET', flowdir + 'flow.bud', None),
+          ('GWFMOVER', flowdir + 'flow.mvr.bud', None),
+          ('SFR-1', flowdir + 'flow.sfr.bud', None)]
+    fmi = flopy.mf6.ModflowGwtfmi(gwt, flow_imbalance_correction=flowerr,
+                                  packagedata=pd)
+    sources = [('CHD-1', 'AUX', 'CONCENTRATION')]
+    ssm = flopy.mf6.ModflowGwtssm(gwt, print_flows=True, sources=sources)
+    sftpd = [(i, 0.) for i in range(nreach)]
+    sftspd = [(0, 'INFLOW', 0.5)]
+    sft = flopy.mf6.ModflowGwtsft(gwt, pname='SFR-1', packagedata=sftpd,
+                                  reachperioddata=sftspd,
+                                  concentration_filerecord=name + '.sft.bin')
+    mvt = flopy.mf6.ModflowGwtmvt(gwt)
+    oc = flopy.mf6.ModflowGwtoc(gwt,
+                                concentration_filerecord=name + '.ucn',
+                                saverecord=[('CONCENTRATION', 'ALL')])
+    return
+
+
+def run_transport_model(name, gwtnames):
+    ws = os.path.join(testdir, testgroup, name)
+    sim = flopy.mf6.MFSimulation(sim_name=name, sim_ws=ws,
+                                 exe_name=exe_name_mf6)
+    pd = [(1., 10, 1.), (1., 10, 1.)]
+    tdis = flopy.mf6.ModflowTdis(sim, nper=len(pd), perioddata=pd)
+    for gwtname in gwtnames:
+        add_transport_model(sim, gwtname)
+    sim.write_simulation()
+    success, buff = sim.run_simulation()
+    errmsg = 'transport model did not terminate successfully\n{}'.format(buff)
+    assert success, errmsg
+    return
+
+
+def eval_transport():
+    gwtnames = ['gwt{}'.format(i) for i in range(len(porosity))]
+    for gwtname in gwtnames:
+        for ext in ['ucn', 'sft.bin']:
+            fname = os.path.join(testdir, testgroup, 'transport',
+                                 '{}.{}'.format(gwtname, ext))
+            cobj = flopy.utils.HeadFile(fname, text='CONCENTRATION')
+            c = cobj.get_alldata()
+            fname = os.path.join(testdir, testgroup, gwtname,
+                                 '{}.{}'.format(gwtname, ext))
+            cobj = flopy.utils.HeadFile(fname, text='CONCENTRATION')
+            cres = cobj.get_alldata()
+            errmsg = '{} concentrations for {} '.format(ext, gwtname) + \
+                     'are not the same as those of the model run by itself'
+            assert np.array_equal(c, cres), errmsg
+
+    # the stream must receive solute from the well through the mover
+    fname = os.path.join(testdir, testgroup, 'transport', 'gwt0.sft.bin')
+    cobj = flopy.utils.HeadFile(fname, text='CONCENTRATION')
+    csft = cobj.get_alldata()
+    assert csft.max() > 0., 'no solute was moved into the stream'
+
+    # the models after the first must share the flow model files
+    for idx, gwtname in enumerate(gwtnames):
+        if idx == 0:
+            continue
+        fname = os.path.join(testdir, testgroup, 'transport',
+                             gwtname + '.lst')
+        with open(fname) as f:
+            lst = f.read()
+        for ftype, ext in [('BUDGET', 'bud'), ('HEAD', 'hds'),
+                           ('MVT BUDGET', 'mvr.bud'),
+                           ('SFR-1 BUDGET', 'sfr.bud')]:
+            errmsg = '{} file is not shared by {}'.format(ftype, gwtname)
+            txt = '{} FILE {}flow.{} IS ALREADY OPEN'.format(ftype,
+                                                            flowdirs[idx],
+                                                            ext)
+            assert txt in lst, errmsg
+    return
+
+
+def test_fmi():
+    run_flow_model()
+    gwtnames = ['gwt{}'.format(i) for i in range(len(porosity))]
+    run_transport_model('transport', gwtnames)
+    for gwtname in gwtnames:
+        run_transport_model(gwtname, [gwtname])
+    eval_transport()
+    d = os.path.join(testdir, testgroup)
+    if os.path.isdir(d):
+        shutil.rmtree(d)
+    return
+
+
+if __name__ == "__main__":
+    # print message
+    print('standalone run of {}'.format(os.path.basename(__file__)))
+
+    # run tests
+    test_fmi()
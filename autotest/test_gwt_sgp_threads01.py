@@ -0,0 +1,262 @@
+"""
+MODFLOW 6 Autotest
+Test the NUMBER_OF_THREADS option of the solution group. Three GWF models
+and three GWT models, each with its own solution, are solved by several
+threads. Each GWT model is connected to one of the GWF models by a GWF-GWT
+exchange, so the GWT solutions must be solved after the GWF solutions. The
+first simulation uses one solution group iteration and the second uses
+two. The heads and concentrations are compared to the same simulation
+solved with one thread and must be identical.
+
+"""
+
+import os
+import numpy as np
+
+try:
+    import flopy
+except:
+    msg = 'Error. FloPy package is not available.\n'
+    msg += 'Try installing using the following command:\n'
+    msg += ' pip install flopy'
+    raise Exception(msg)
+
+from framework import testing_framework
+from simulation import Simulation
+
+ex = ['sgp_thrds01', 'sgp_thrds02']
+exdirs = []
+for s in ex:
+    exdirs.append(os.path.join('temp', s))
+
+# number of flow and transport model pairs, number of threads, and number
+# of solution group iterations
+npairs = 3
+nthreads = [3, 2]
+mxiter = [1, 2]
+
+# temporal discretization
+nper = 2
+tdis_rc = [(1., 1, 1.), (50., 10, 1.1)]
+
+# spatial discretization data
+nlay, nrow, ncol = 1, 5, 40
+delr = delc = 10.
+top = 1.
+botm = [0.]
+
+# hydraulic conductivity and well rate of each flow model
+hk = [1., 5., 20.]
+qwell = [1., 2., 4.]
+
+# solver options
+nouter, ninner = 100, 300
+hclose, rclose = 1e-9, 1e-6
+
+
+def get_names(jdx):
+    return 'gwf{}'.format(jdx + 1), 'gwt{}'.format(jdx + 1)
+
+
+def build_model(idx, dir):
+    name = ex[idx]
+
+    # build MODFLOW 6 files
+    ws = dir
+    sim = flopy.mf6.MFSimulation(sim_name=name, version='mf6',
+                                 exe_name='mf6',
+                                 sim_ws=ws)
+    # create tdis package
+    tdis = flopy.mf6.ModflowTdis(sim, time_units='DAYS',
+                                 nper=nper, perioddata=tdis_rc)
+
+    # create the flow models, each with its own solution
+    for jdx in range(npairs):
+        gwfname, gwtname = get_names(jdx)
+        gwf = flopy.mf6.ModflowGwf(sim, modelname=gwfname,
+                                   model_nam_file='{}.nam'.format(gwfname))
+        ims = flopy.mf6.ModflowIms(sim, print_option='SUMMARY',
+                                   outer_dvclose=hclose,
+                                   outer_maximum=nouter,
+                                   inner_maximum=ninner,
+                                   inner_dvclose=hclose, rcloserecord=rclose,
+                                   linear_acceleration='CG',
+                                   filename='{}.ims'.format(gwfname))
+        sim.register_ims_package(ims, [gwf.name])
+
+        dis = flopy.mf6.ModflowGwfdis(gwf, nlay=nlay, nrow=nrow, ncol=ncol,
+                                      delr=delr, delc=delc,
+                                      top=top, botm=botm,
+                                      filename='{}.dis'.format(gwfname))
+        ic = flopy.mf6.ModflowGwfic(gwf, strt=1.,
+                                    filename='{}.ic'.format(gwfname))
+        npf = flopy.mf6.ModflowGwfnpf(gwf, icelltype=0, k=hk[jdx],
+                                      save_specific_discharge=True,
+                                      filename='{}.npf'.format(gwfname))
+        sto = flopy.mf6.ModflowGwfsto(gwf, iconvert=0, ss=1e-4,
+                                      steady_state={0: True},
+                                      transient={1: True},
+                                      filename='{}.sto'.format(gwfname))
+        cd6 = {0: [[(0, i, ncol - 1), 1.] for i in range(nrow)]}
+        chd = flopy.mf6.ModflowGwfchd(gwf, stress_period_data=cd6,
+                                      filename='{}.chd'.format(gwfname))
+        wd6 = {0: [[(0, nrow // 2, 0), qwell[jdx], 0.],
+                   [(0, 0, 0), qwell[jdx], 0.]],
+               1: [[(0, nrow // 2, 0), qwell[jdx], 1.],
+                   [(0, 0, 0), 2. * qwell[jdx], 1.]]}
+        wel = flopy.mf6.ModflowGwfwel(gwf, stress_period_data=wd6,
+                                      auxiliary='CONCENTRATION',
+                                      pname='WEL-1',
+                                      filename='{}.wel'.format(gwfname))
+        oc = flopy.mf6.ModflowGwfoc(gwf,
+                                    head_filerecord='{}.hds'.format(gwfname),
+                                    saverecord=[('HEAD', 'ALL')],
+                                    filename='{}.oc'.format(gwfname))
+
+    # create the transport models, each with its own solution
+    for jdx in range(npairs):
+        gwfname, gwtname = get_names(jdx)
+        gwt = flopy.mf6.MFModel(sim, model_type='gwt6', modelname=gwtname,
+                                model_nam_file='{}.nam'.format(gwtname))
+        ims = flopy.mf6.ModflowIms(sim, print_option='SUMMARY',
+                                   outer_dvclose=hclose,
+                                   outer_maximum=nouter,
+                                   inner_maximum=ninner,
+                                   inner_dvclose=hclose, rcloserecord=rclose,
+                                   linear_acceleration='BICGSTAB',
+                                   filename='{}.ims'.format(gwtname))
+        sim.register_ims_package(ims, [gwt.name])
+
+        dis = flopy.mf6.ModflowGwtdis(gwt, nlay=nlay, nrow=nrow, ncol=ncol,
+                                      delr=delr, delc=delc,
+                                      top=top, botm=botm,
+                                      filename='{}.dis'.format(gwtname))
+        ic = flopy.mf6.ModflowGwtic(gwt, strt=0.,
+                                    filename='{}.ic'.format(gwtname))
+        adv = flopy.mf6.ModflowGwtadv(gwt, scheme='TVD',
+                                      filename='{}.adv'.format(gwtname))
+        dsp = flopy.mf6.ModflowGwtdsp(gwt, alh=1., ath1=0.1,
+                                      filename='{}.dsp'.format(gwtname))
+        mst = flopy.mf6.ModflowGwtmst(gwt, porosity=0.1,
+                                      filename='{}.mst'.format(gwtname))
+        sources = [('WEL-1', 'AUX', 'CONCENTRATION')]
+        ssm = flopy.mf6.ModflowGwtssm(gwt, sources=sources,
+                                      filename='{}.ssm'.format(gwtname))
+        oc = flopy.mf6.ModflowGwtoc(gwt,
+                                    concentration_filerecord=
+                                    '{}.ucn'.format(gwtname),
+                                    saverecord=[('CONCENTRATION', 'ALL')],
+                                    filename='{}.oc'.format(gwtname))
+
+        # GWF GWT exchange
+        gwfgwt = flopy.mf6.ModflowGwfgwt(sim, exgtype='GWF6-GWT6',
+                                         exgmnamea=gwfname,
+                                         exgmnameb=gwtname,
+                                         filename='{}.gwfgwt'.format(gwtname))
+
+    return sim
+
+
+def get_model(idx, dir):
+    sim = build_model(idx, dir)
+
+    # build MODFLOW 6 comparison model that uses one thread
+    pth = os.path.join(dir, 'mf6')
+    mc = build_model(idx, pth)
+
+    return sim, mc
+
+
+def build_models():
+    for idx, dir in enumerate(exdirs):
+        sim, mc = get_model(idx, dir)
+        sim.write_simulation()
+        mc.write_simulation()
+        hack_sgp(idx, dir, nthreads[idx])
+        hack_sgp(idx, os.path.join(dir, 'mf6'), None)
+    return
+
+
+def hack_sgp(idx, ws, nthread):
+    # set the solution group iterations and the number of threads
+    fpth = os.path.join(ws, 'mfsim.nam')
+    with open(fpth) as f:
+        lines = f.readlines()
+    with open(fpth, 'w') as f:
+        for line in lines:
+            if line.strip().upper().startswith('MXITER'):
+                continue
+            f.write(line)
+            if line.strip().upper().startswith('BEGIN SOLUTIONGROUP'):
+                f.write('  MXITER {}\n'.format(mxiter[idx]))
+                if nthread is not None:
+                    f.write('  NUMBER_OF_THREADS {}\n'.format(nthread))
+    return
+
+
+def eval_results(sim):
+    print('evaluating solutions solved with several threads...')
+
+    for jdx in range(npairs):
+        for fname, text in zip(get_names(jdx), ['HEAD', 'CONCENTRATION']):
+            ext = 'hds' if text == 'HEAD' else 'ucn'
+            fname = '{}.{}'.format(fname, ext)
+            fpth = os.path.join(sim.simpath, fname)
+            v = flopy.utils.HeadFile(fpth, text=text).get_alldata()
+            fpth = os.path.join(sim.simpath, 'mf6', fname)
+            vc = flopy.utils.HeadFile(fpth, text=text).get_alldata()
+            msg = 'results in {} are not the same as '.format(fname) + \
+                  'the results solved with one thread'
+            assert np.array_equal(v, vc), msg
+
+    # the flow solutions must be solved before the transport solutions,
+    #  unless MODFLOW 6 was compiled without OpenMP
+    fpth = os.path.join(sim.simpath, 'mfsim.lst')
+    with open(fpth) as f:
+        lst = f.read()
+    if 'NOT COMPILED WITH OPENMP' in lst:
+        return
+    for ilevel, solutions in [(1, '1 2 3'), (2, '4 5 6')]:
+        txt = 'SOLUTION GROUP 1 LEVEL {} SOLUTION(S): {}'.format(ilevel,
+                                                                solutions)
+        assert txt in lst, '{} not found in {}'.format(txt, fpth)
+
+    return
+
+
+# - No need to change any code below
+def test_mf6model():
+    # initialize testing framework
+    test = testing_framework()
+
+    # build the models
+    build_models()
+
+    # run the test models
+    for idx, dir in enumerate(exdirs):
+        yield test.run_mf6, Simulation(dir, exfunc=eval_results, idxsim=idx)
+
+    return
+
+
+def main():
+    # initialize testing framework
+    test = testing_framework()
+
+    # build the models
+    build_models()
+
+    # run the test models
+    for idx, dir in enumerate(exdirs):
+        sim = Simulation(dir, exfunc=eval_results, idxsim=idx)
+        test.run_mf6(sim)
+
+    return
+
+
+if __name__ == "__main__":
+    # print message
+    print('standalone run of {}'.format(os.path.basename(__file__)))
+
+    # run main routine
+    main()
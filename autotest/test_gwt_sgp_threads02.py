@@ -0,0 +1,198 @@
+# tests the NUMBER_OF_THREADS option of the solution group with transport
+# models that read flows from the same flow model files.  Each transport
+# model has its own solution, so the models are solved by different threads
+# and the flow model files are read through the shared budget, head, and
+# budget object caches of the FMI Package.  The flow model has a stream
+# (SFR) that receives water from a well through the water mover.  The
+# concentrations must be identical to those of the same simulation solved
+# with one thread.
+
+import os
+import shutil
+import numpy as np
+
+try:
+    import pymake
+except:
+    msg = 'Error. Pymake package is not available.\n'
+    msg += 'Try installing using the following command:\n'
+    msg += ' pip install https://github.com/modflowpy/pymake/zipball/master'
+    raise Exception(msg)
+
+try:
+    import flopy
+except:
+    msg = 'Error. FloPy package is not available.\n'
+    msg += 'Try installing using the following command:\n'
+    msg += ' pip install flopy'
+    raise Exception(msg)
+
+
+import targets
+exe_name_mf6 = targets.target_dict['mf6']
+exe_name_mf6 = os.path.abspath(exe_name_mf6)
+testdir = './temp'
+testgroup = 'sgp_threads02'
+d = os.path.join(testdir, testgroup)
+if os.path.isdir(d):
+    shutil.rmtree(d)
+
+# porosity of each transport model
+porosity = [0.1, 0.2, 0.3, 0.4]
+
+# number of threads of each transport simulation
+nthreads = {'threads': 3, 'serial': None}
+
+# stream reaches
+nreach = 3
+
+
+def run_flow_model():
+    name = 'flow'
+    ws = os.path.join(testdir, testgroup, name)
+    sim = flopy.mf6.MFSimulation(sim_name=name, sim_ws=ws,
+                                 exe_name=exe_name_mf6)
+    pd = [(1., 1, 1.), (1., 1, 1.)]
+    tdis = flopy.mf6.ModflowTdis(sim, nper=len(pd), perioddata=pd)
+    ims = flopy.mf6.ModflowIms(sim)
+    gwf = flopy.mf6.ModflowGwf(sim, modelname=name, save_flows=True)
+    dis = flopy.mf6.ModflowGwfdis(gwf, nrow=10, ncol=10)
+    ic = flopy.mf6.ModflowGwfic(gwf)
+    npf = flopy.mf6.ModflowGwfnpf(gwf, save_specific_discharge=True,
+                                  save_saturation=True)
+    spd = {0: [[(0, 0, 0), 1., 1.], [(0, 9, 9), 0., 0.]],
+           1: [[(0, 0, 0), 0., 0.], [(0, 9, 9), 1., 2.]],}
+    chd = flopy.mf6.ModflowGwfchd(gwf, pname='CHD-1',
+                                  stress_period_data=spd,
+                                  auxiliary=['concentration'])
+    spd = {0: [[(0, 7, 2), -0.1]]}
+    wel = flopy.mf6.ModflowGwfwel(gwf, pname='WEL-1', mover=True,
+                                  stress_period_data=spd)
+    # <rno> <cellid> <rlen> <rwid> <rgrd> <rtp> <rbth> <rhk> <man> <ncon>
+    # <ustrf> <ndv>
+    sfrpd = [[i, (0, 4, 2 + i), 1., 0.5, 0.001, 0.5, 0.1, 0.1, 0.04,
+              1 if i in (0, nreach - 1) else 2, 1., 0]
+             for i in range(nreach)]
+    sfrcd = [[0, -1], [1, 0, -2], [2, 1]]
+    sfrspd = {0: [[0, 'INFLOW', 0.5]]}
+    sfr = flopy.mf6.ModflowGwfsfr(gwf, pname='SFR-1', mover=True,
+                                  budget_filerecord=name + '.sfr.bud',
+                                  nreaches=nreach, packagedata=sfrpd,
+                                  connectiondata=sfrcd, perioddata=sfrspd)
+    mvrspd = [['WEL-1', 0, 'SFR-1', 0, 'FACTOR', 1.]]
+    mvr = flopy.mf6.ModflowGwfmvr(gwf, maxmvr=1, maxpackages=2,
+                                  budget_filerecord=name + '.mvr.bud',
+                                  packages=[['WEL-1'], ['SFR-1']],
+                                  perioddata=mvrspd)
+    oc = flopy.mf6.ModflowGwfoc(gwf,
+                                budget_filerecord=name + '.bud',
+                                head_filerecord=name + '.hds',
+                                saverecord=[('HEAD', 'ALL'), ('BUDGET', 'ALL')])
+    sim.write_simulation()
+    success, buff = sim.run_simulation()
+    assert success, 'flow model did not terminate successfully'
+    return
+
+
+def add_transport_model(sim, idx):
+    name = 'gwt{}'.format(idx)
+    gwt = flopy.mf6.ModflowGwt(sim, modelname=name, save_flows=True)
+    ims = flopy.mf6.ModflowIms(sim, linear_acceleration='BICGSTAB',
+                               filename='{}.ims'.format(name))
+    sim.register_ims_package(ims, [gwt.name])
+    dis = flopy.mf6.ModflowGwtdis(gwt, nrow=10, ncol=10)
+    ic = flopy.mf6.ModflowGwtic(gwt)
+    mst = flopy.mf6.ModflowGwtmst(gwt, porosity=porosity[idx])
+    adv = flopy.mf6.ModflowGwtadv(gwt)
+    pd = [('GWFHEAD', '../flow/flow.hds', None),
+          ('GWFBUDGET', '../flow/flow.bud', None),
+          ('GWFMOVER', '../flow/flow.mvr.bud', None),
+          ('SFR-1', '../flow/flow.sfr.bud', None)]
+    fmi = flopy.mf6.ModflowGwtfmi(gwt, packagedata=pd)
+    sources = [('CHD-1', 'AUX', 'CONCENTRATION')]
+    ssm = flopy.mf6.ModflowGwtssm(gwt, sources=sources)
+    sftpd = [(i, 0.) for i in range(nreach)]
+    sftspd = [(0, 'INFLOW', 0.5)]
+    sft = flopy.mf6.ModflowGwtsft(gwt, pname='SFR-1', packagedata=sftpd,
+                                  reachperioddata=sftspd,
+                                  concentration_filerecord=name + '.sft.bin')
+    mvt = flopy.mf6.ModflowGwtmvt(gwt)
+    oc = flopy.mf6.ModflowGwtoc(gwt,
+                                concentration_filerecord=name + '.ucn',
+                                saverecord=[('CONCENTRATION', 'ALL')])
+    return
+
+
+def hack_sgp(ws, nthread):
+    # set the number of threads of the solution group
+    fpth = os.path.join(ws, 'mfsim.nam')
+    with open(fpth) as f:
+        lines = f.readlines()
+    with open(fpth, 'w') as f:
+        for line in lines:
+            f.write(line)
+            if line.strip().upper().startswith('BEGIN SOLUTIONGROUP'):
+                f.write('  NUMBER_OF_THREADS {}\n'.format(nthread))
+    return
+
+
+def run_transport_model(name):
+    ws = os.path.join(testdir, testgroup, name)
+    sim = flopy.mf6.MFSimulation(sim_name=name, sim_ws=ws,
+                                 exe_name=exe_name_mf6)
+    pd = [(1., 10, 1.), (1., 10, 1.)]
+    tdis = flopy.mf6.ModflowTdis(sim, nper=len(pd), perioddata=pd)
+    for idx in range(len(porosity)):
+        add_transport_model(sim, idx)
+    sim.write_simulation()
+    if nthreads[name] is not None:
+        hack_sgp(ws, nthreads[name])
+    success, buff = sim.run_simulation()
+    errmsg = 'transport model did not terminate successfully\n{}'.format(buff)
+    assert success, errmsg
+    return
+
+
+def eval_transport():
+    for idx in range(len(porosity)):
+        gwtname = 'gwt{}'.format(idx)
+        for ext in ['ucn', 'sft.bin']:
+            fname = '{}.{}'.format(gwtname, ext)
+            fpth = os.path.join(testdir, testgroup, 'threads', fname)
+            c = flopy.utils.HeadFile(fpth, text='CONCENTRATION').get_alldata()
+            fpth = os.path.join(testdir, testgroup, 'serial', fname)
+            cs = flopy.utils.HeadFile(fpth, text='CONCENTRATION').get_alldata()
+            errmsg = 'concentrations in {} are not the '.format(fname) + \
+                     'same as the concentrations solved with one thread'
+            assert np.array_equal(c, cs), errmsg
+
+    # the transport solutions must be solved concurrently, unless MODFLOW 6
+    #  was compiled without OpenMP
+    fpth = os.path.join(testdir, testgroup, 'threads', 'mfsim.lst')
+    with open(fpth) as f:
+        lst = f.read()
+    if 'NOT COMPILED WITH OPENMP' in lst:
+        return
+    solutions = ' '.join(str(i + 1) for i in range(len(porosity)))
+    txt = 'SOLUTION GROUP 1 LEVEL 1 SOLUTION(S): {}'.format(solutions)
+    assert txt in lst, '{} not found in {}'.format(txt, fpth)
+    return
+
+
+def test_sgp_threads():
+    run_flow_model()
+    for name in nthreads:
+        run_transport_model(name)
+    eval_transport()
+    d = os.path.join(testdir, testgroup)
+    if os.path.isdir(d):
+        shutil.rmtree(d)
+    return
+
+
+if __name__ == "__main__":
+    # print message
+    print('standalone run of {}'.format(os.path.basename(__file__)))
+
+    # run tests
+    test_sgp_threads()
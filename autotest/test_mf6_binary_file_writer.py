@@ -0,0 +1,172 @@
+"""
+MODFLOW 6 Autotest
+Test the streaming BinaryFileWriter in binary_file_writer. A head record and
+a budget record for every budget method (imeth 0 to 6) are written once from
+complete arrays and once from generators of array chunks. The two files must
+be identical, and the records read with the flopy HeadFile and
+CellBudgetFile readers must match the data that were written.
+"""
+
+import os
+import numpy as np
+
+try:
+    import flopy
+except:
+    msg = 'Error. FloPy package is not available.\n'
+    msg += 'Try installing using the following command:\n'
+    msg += ' pip install flopy'
+    raise Exception(msg)
+
+from binary_file_writer import BinaryFileWriter
+
+ws = os.path.join('temp', 'binary_file_writer')
+
+nlay, nrow, ncol = 2, 3, 4
+nodes = nlay * nrow * ncol
+chunksize = 5
+
+
+def chunks(data):
+    """
+    Yield data in chunks of chunksize items.
+
+    """
+    data = data.ravel()
+    for i in range(0, data.shape[0], chunksize):
+        yield data[i:i + chunksize]
+
+
+def get_test_data():
+    rng = np.random.RandomState(7)
+    head = rng.uniform(size=(nrow, ncol))
+    full = rng.uniform(size=(nlay, nrow, ncol))
+    ilay = rng.randint(1, nlay + 1, size=(nrow, ncol)).astype(np.int32)
+    lay = rng.uniform(size=(nrow, ncol))
+
+    # list data for imeth 2 and 5
+    nlist = 7
+    dt5 = np.dtype([('node', np.int32), ('q', np.float64),
+                    ('iface', np.float64)])
+    lst5 = np.zeros(nlist, dtype=dt5)
+    lst5['node'] = rng.choice(nodes, nlist, replace=False) + 1
+    lst5['q'] = rng.uniform(-1., 1., nlist)
+    lst5['iface'] = rng.randint(0, 6, nlist)
+    dt2 = np.dtype([('node', np.int32), ('q', np.float64)])
+    lst2 = np.zeros(nlist, dtype=dt2)
+    lst2['node'] = lst5['node']
+    lst2['q'] = lst5['q']
+
+    # DATA-SPDIS list data for imeth 6
+    dt6 = np.dtype([('node', np.int32), ('node2', np.int32),
+                    ('q', np.float64), ('qx', np.float64),
+                    ('qy', np.float64), ('qz', np.float64)])
+    spdis = np.zeros(nodes, dtype=dt6)
+    spdis['node'] = np.arange(1, nodes + 1)
+    spdis['node2'] = spdis['node']
+    spdis['qx'] = rng.uniform(size=nodes)
+    spdis['qy'] = rng.uniform(size=nodes)
+    spdis['qz'] = rng.uniform(size=nodes)
+    return head, full, ilay, lay, lst2, lst5, spdis
+
+
+def write_file(fpth, chunked):
+    head, full, ilay, lay, lst2, lst5, spdis = get_test_data()
+    if chunked:
+        cv = chunks
+    else:
+        def cv(data):
+            return data
+
+    with BinaryFileWriter(fpth) as bfw:
+        if chunked:
+            bfw.write_head(cv(head), ncol=ncol, nrow=nrow)
+        else:
+            bfw.write_head(head)
+    with BinaryFileWriter(fpth + '.bud') as bfw:
+        kwargs = dict(ndim1=ncol, ndim2=nrow, ndim3=nlay)
+        bfw.write_budget(cv(full), text='          IMETH0', imeth=0,
+                         **kwargs)
+        bfw.write_budget(cv(full), text='          IMETH1', imeth=1,
+                         **kwargs)
+        bfw.write_budget(cv(lst2), text='          IMETH2', imeth=2,
+                         nlist=lst2.shape[0], ndim1=ncol, ndim2=nrow,
+                         ndim3=nlay)
+        bfw.write_budget((cv(ilay), cv(lay)), text='          IMETH3',
+                         imeth=3, **kwargs)
+        bfw.write_budget(cv(lay), text='          IMETH4', imeth=4,
+                         **kwargs)
+        bfw.write_budget(cv(lst5), text='          IMETH5', imeth=5,
+                         nlist=lst5.shape[0], auxnames=['IFACE'],
+                         ndim1=ncol, ndim2=nrow, ndim3=nlay)
+        bfw.write_flowja(cv(full), nja=nodes)
+        bfw.write_spdis(cv(spdis), nodes=nodes)
+    return
+
+
+def check_file(fpth):
+    head, full, ilay, lay, lst2, lst5, spdis = get_test_data()
+
+    hobj = flopy.utils.HeadFile(fpth, precision='double')
+    assert np.array_equal(hobj.get_data()[0], head), 'head data differ'
+
+    cobj = flopy.utils.CellBudgetFile(fpth + '.bud', precision='double')
+    v = cobj.get_data(text='IMETH0')[0]
+    assert np.array_equal(v, full), 'imeth 0 data differ'
+    v = cobj.get_data(text='IMETH1')[0]
+    assert np.array_equal(v, full), 'imeth 1 data differ'
+    v = cobj.get_data(text='IMETH2')[0]
+    assert np.array_equal(v['node'], lst2['node']), 'imeth 2 nodes differ'
+    assert np.array_equal(v['q'], lst2['q']), 'imeth 2 data differ'
+    v = cobj.get_data(text='IMETH3')[0]
+    assert np.array_equal(v[0], ilay), 'imeth 3 layers differ'
+    assert np.array_equal(v[1], lay), 'imeth 3 data differ'
+    v = cobj.get_data(text='IMETH4')[0]
+    assert np.array_equal(np.asarray(v).reshape(lay.shape), lay), \
+        'imeth 4 data differ'
+    v = cobj.get_data(text='IMETH5')[0]
+    assert np.array_equal(v['node'], lst5['node']), 'imeth 5 nodes differ'
+    assert np.array_equal(v['q'], lst5['q']), 'imeth 5 data differ'
+    # flopy does not strip the padded auxiliary variable names
+    assert v.dtype.names[2].strip() == 'IFACE', 'imeth 5 aux name differs'
+    assert np.array_equal(v[v.dtype.names[2]], lst5['iface']), \
+        'imeth 5 aux differ'
+    v = cobj.get_data(text='FLOW-JA-FACE')[0]
+    assert np.array_equal(np.asarray(v).ravel(), full.ravel()), \
+        'FLOW-JA-FACE data differ'
+    v = cobj.get_data(text='DATA-SPDIS')[0]
+    for name in ('node', 'node2', 'q', 'qx', 'qy', 'qz'):
+        assert np.array_equal(v[name], spdis[name]), \
+            'DATA-SPDIS {} differ'.format(name)
+    return
+
+
+def test_binary_file_writer():
+    if not os.path.isdir(ws):
+        os.makedirs(ws)
+
+    fpth = os.path.join(ws, 'full.bin')
+    fpth_chunked = os.path.join(ws, 'chunked.bin')
+    write_file(fpth, False)
+    write_file(fpth_chunked, True)
+
+    # the chunked and unchunked files must be identical
+    for ext in ('', '.bud'):
+        with open(fpth + ext, 'rb') as f:
+            b0 = f.read()
+        with open(fpth_chunked + ext, 'rb') as f:
+            b1 = f.read()
+        msg = 'chunked and unchunked {} files differ'.format(fpth + ext)
+        assert b0 == b1, msg
+
+    check_file(fpth)
+    check_file(fpth_chunked)
+    return
+
+
+if __name__ == "__main__":
+    # print message
+    print('standalone run of {}'.format(os.path.basename(__file__)))
+
+    # run the test
+    test_binary_file_writer()
@@ -0,0 +1,102 @@
+"""
+MODFLOW 6 Autotest
+Test the record lookup in budget_index. A budget file with a FLOW-JA-FACE
+record, a DATA-SPDIS record for the NPF package, and CHD records for two
+packages is written with BinaryFileWriter. Records must be found without a
+package name when only one package reports the term, a ValueError that lists
+the package names must be raised when several packages report the term, and
+the records must match the records read by flopy.
+"""
+
+import os
+import numpy as np
+
+try:
+    import flopy
+except:
+    msg = 'Error. FloPy package is not available.\n'
+    msg += 'Try installing using the following command:\n'
+    msg += ' pip install flopy'
+    raise Exception(msg)
+
+from binary_file_writer import BinaryFileWriter
+from budget_index import BinaryBudgetIndex
+
+ws = os.path.join('temp', 'budget_index')
+
+nodes = 6
+
+
+def get_list(q):
+    dt = np.dtype([('node', np.int32), ('node2', np.int32),
+                   ('q', np.float64)])
+    v = np.zeros(2, dtype=dt)
+    v['node'] = [1, nodes]
+    v['node2'] = v['node']
+    v['q'] = q
+    return v
+
+
+def write_file(fpth):
+    spdis = np.zeros(nodes, dtype=[('node', np.int32), ('node2', np.int32),
+                                   ('q', np.float64), ('qx', np.float64),
+                                   ('qy', np.float64), ('qz', np.float64)])
+    spdis['node'] = np.arange(1, nodes + 1)
+    spdis['node2'] = spdis['node']
+    spdis['qx'] = np.arange(nodes)
+    with BinaryFileWriter(fpth) as bfw:
+        bfw.write_flowja(np.arange(nodes, dtype=np.float64))
+        bfw.write_spdis(spdis)
+        for paknam, q in (('CHD_0', 1.), ('CHD_1', 2.)):
+            bfw.write_budget(get_list(q), text='             CHD', imeth=6,
+                             text2id2='{:>16}'.format(paknam))
+    return spdis
+
+
+def test_budget_index():
+    if not os.path.isdir(ws):
+        os.makedirs(ws)
+    fpth = os.path.join(ws, 'model.cbc')
+    spdis = write_file(fpth)
+
+    cbc = BinaryBudgetIndex(fpth, save=False)
+    cobj = flopy.utils.CellBudgetFile(fpth, precision='double')
+
+    # terms reported by a single package are found without a package name
+    v = cbc.get_data(1, 1, 'FLOW-JA-FACE')
+    assert len(v) == 1, 'FLOW-JA-FACE was not found'
+    assert np.array_equal(np.asarray(v[0]).ravel(), np.arange(nodes)), \
+        'FLOW-JA-FACE differs'
+    v = cbc.get_data(1, 1, 'DATA-SPDIS')
+    assert len(v) == 1, 'DATA-SPDIS was not found without a package name'
+    v0 = cobj.get_data(text='DATA-SPDIS')[0]
+    # auxiliary variable names are upper case in the index
+    assert np.array_equal(v[0]['QX'], v0['qx']), 'DATA-SPDIS differs'
+    assert np.array_equal(v[0]['QX'], spdis['qx']), 'DATA-SPDIS differs'
+    v = cbc.get_data(1, 1, 'DATA-SPDIS', paknam='NPF')
+    assert len(v) == 1, 'DATA-SPDIS was not found for NPF'
+
+    # terms reported by several packages require a package name
+    msg = ''
+    try:
+        cbc.get_data(1, 1, 'CHD')
+    except ValueError as e:
+        msg = str(e)
+    assert 'CHD_0' in msg and 'CHD_1' in msg, \
+        'the packages that report CHD were not listed'
+    for paknam, q in (('CHD_0', 1.), ('CHD_1', 2.)):
+        v = cbc.get_data(1, 1, 'CHD', paknam=paknam)
+        assert len(v) == 1, 'CHD was not found for {}'.format(paknam)
+        assert np.all(v[0]['q'] == q), 'CHD differs for {}'.format(paknam)
+
+    # missing terms return an empty list
+    assert cbc.get_data(1, 1, 'WEL') == [], 'WEL records were returned'
+    return
+
+
+if __name__ == "__main__":
+    # print message
+    print('standalone run of {}'.format(os.path.basename(__file__)))
+
+    # run the test
+    test_budget_index()
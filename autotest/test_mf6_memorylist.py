@@ -0,0 +1,62 @@
+"""
+MODFLOW 6 Autotest
+Unit test of the hash table and the memory list that index the variables
+in the memory manager. A test program (data/memorylist/memorylist_test.f90)
+is compiled with the MODFLOW 6 source files it uses and checks that every
+entry is found after the hash lists are resized, that missing entries are
+not found, and that the first entry added for a memory address is the one
+that is found.
+"""
+
+import os
+import sys
+import shutil
+import subprocess
+
+try:
+    import pymake
+except:
+    msg = 'Error. Pymake package is not available.\n'
+    msg += 'Try installing using the following command:\n'
+    msg += ' pip install https://github.com/modflowpy/pymake/zipball/master'
+    raise Exception(msg)
+
+srcdir = os.path.join('data', 'memorylist')
+ws = os.path.join('temp', 'memorylist')
+
+eext = ''
+if sys.platform.lower() == 'win32':
+    eext = '.exe'
+
+
+def build_test_program():
+    if os.path.isdir(ws):
+        shutil.rmtree(ws)
+    os.makedirs(ws)
+
+    # build the test program
+    target = os.path.join(ws, 'memorylist_test{}'.format(eext))
+    extrafiles = os.path.join(srcdir, 'extrafiles.txt')
+    pymake.main(srcdir, target, fc='gfortran', cc=None,
+                extrafiles=extrafiles, inplace=True)
+
+    msg = '{} does not exist.'.format(target)
+    assert os.path.isfile(target), msg
+    return os.path.abspath(target)
+
+
+def test_memorylist():
+    exe = build_test_program()
+    proc = subprocess.run([exe], cwd=ws, stdout=subprocess.PIPE,
+                          stderr=subprocess.STDOUT, universal_newlines=True)
+    print(proc.stdout)
+    assert proc.returncode == 0, 'memory list unit test failed'
+    return
+
+
+if __name__ == "__main__":
+    # print message
+    print('standalone run of {}'.format(os.path.basename(__file__)))
+
+    # run the test
+    test_memorylist()
@@ -0,0 +1,77 @@
+"""
+MODFLOW 6 Autotest
+Unit test of the time-series record search and interpolation. A test
+program (data/timeseries/timeseries_test.f90) is compiled with the MODFLOW 6
+source files it uses. The program reads a time series with STEPWISE,
+LINEAR, and LINEAREND methods in order (so records are discarded and the
+record arrays are compacted) and out of order (so the records are
+bisected), and compares the values to the exact values. A value requested
+after the last record must stop the program with an error.
+"""
+
+import os
+import sys
+import shutil
+import subprocess
+
+try:
+    import pymake
+except:
+    msg = 'Error. Pymake package is not available.\n'
+    msg += 'Try installing using the following command:\n'
+    msg += ' pip install https://github.com/modflowpy/pymake/zipball/master'
+    raise Exception(msg)
+
+srcdir = os.path.join('data', 'timeseries')
+ws = os.path.join('temp', 'timeseries')
+
+eext = ''
+if sys.platform.lower() == 'win32':
+    eext = '.exe'
+
+
+def build_test_program():
+    if os.path.isdir(ws):
+        shutil.rmtree(ws)
+    os.makedirs(ws)
+
+    # build the test program
+    target = os.path.join(ws, 'timeseries_test{}'.format(eext))
+    extrafiles = os.path.join(srcdir, 'extrafiles.txt')
+    pymake.main(srcdir, target, fc='gfortran', cc=None,
+                extrafiles=extrafiles, inplace=True)
+
+    msg = '{} does not exist.'.format(target)
+    assert os.path.isfile(target), msg
+    return os.path.abspath(target)
+
+
+def run_test_program(exe, *args):
+    proc = subprocess.run([exe] + list(args), cwd=ws,
+                          stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+                          universal_newlines=True)
+    print(proc.stdout)
+    return proc.returncode, proc.stdout
+
+
+def test_timeseries():
+    exe = build_test_program()
+
+    returncode, stdout = run_test_program(exe)
+    assert returncode == 0, 'time series unit test failed'
+
+    # a value after the last record is an error
+    returncode, stdout = run_test_program(exe, 'PAST')
+    msg = 'a value after the last time-series record did not stop ' + \
+          'the program with an error'
+    assert returncode != 0, msg
+    assert 'Error encountered while performing integration' in stdout, msg
+    return
+
+
+if __name__ == "__main__":
+    # print message
+    print('standalone run of {}'.format(os.path.basename(__file__)))
+
+    # run the test
+    test_timeseries()
@@ -3,6 +3,7 @@ module BaseExchangeModule
   use KindModule,         only: DP, I4B
   use ConstantsModule,    only: LENEXCHANGENAME, LENMEMPATH
   use BaseSolutionModule, only: BaseSolutionType
+  use BaseModelModule,    only: BaseModelType
   use ListModule,         only: ListType
   
   implicit none
@@ -23,6 +24,7 @@ module BaseExchangeModule
     procedure :: exg_ot
     procedure :: exg_fp
     procedure :: exg_da
+    procedure :: connects_model
   end type BaseExchangeType
 
   abstract interface
@@ -111,6 +113,28 @@ module BaseExchangeModule
     return
   end subroutine exg_da
 
+  function connects_model(this, model) result(is_connected)
+! ******************************************************************************
+! connects_model -- Return true if the exchange connects model to another
+!   model.  The base exchange does not connect any models.
+! ******************************************************************************
+!
+!    SPECIFICATIONS:
+! ------------------------------------------------------------------------------
+    ! -- modules
+    ! -- dummy
+    class(BaseExchangeType) :: this
+    class(BaseModelType), pointer, intent(in) :: model
+    ! -- return
+    logical :: is_connected
+! ------------------------------------------------------------------------------
+    !
+    is_connected = .false.
+    !
+    ! -- Return
+    return
+  end function connects_model
+
   function CastAsBaseExchangeClass(obj) result (res)
 ! ******************************************************************************
 ! CastAsBaseExchangeClass
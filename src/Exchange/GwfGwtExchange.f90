@@ -23,6 +23,7 @@ module GwfGwtExchangeModule
     procedure :: exg_df
     procedure :: exg_ar
     procedure :: exg_da
+    procedure :: connects_model
     procedure, private :: set_model_pointers
     procedure, private :: allocate_scalars
     procedure, private :: gwfbnd2gwtfmi
@@ -264,6 +265,27 @@ module GwfGwtExchangeModule
     return
   end subroutine exg_da
 
+  function connects_model(this, model) result(is_connected)
+! ******************************************************************************
+! connects_model -- Return true if model is the flow or the transport model
+! ******************************************************************************
+!
+!    SPECIFICATIONS:
+! ------------------------------------------------------------------------------
+    ! -- modules
+    ! -- dummy
+    class(GwfGwtExchangeType) :: this
+    class(BaseModelType), pointer, intent(in) :: model
+    ! -- return
+    logical :: is_connected
+! ------------------------------------------------------------------------------
+    !
+    is_connected = (model%id == this%m1id .or. model%id == this%m2id)
+    !
+    ! -- return
+    return
+  end function connects_model
+
   subroutine allocate_scalars(this)
 ! ******************************************************************************
 ! allocate_scalars
@@ -4,6 +4,7 @@ module NumericalExchangeModule
   use SimVariablesModule,    only: errmsg
   use BaseExchangeModule,    only: BaseExchangeType
   use NumericalModelModule,  only: NumericalModelType
+  use BaseModelModule,       only: BaseModelType
   use BaseExchangeModule,    only: BaseExchangeType, AddBaseExchangeToList
   use ConstantsModule,       only: LINELENGTH, LENAUXNAME, DZERO
   use ListModule,            only: ListType
@@ -55,6 +56,7 @@ module NumericalExchangeModule
     procedure :: read_options
     procedure :: read_dimensions
     procedure :: get_iasym
+    procedure :: connects_model
   end type NumericalExchangeType
 
 contains
@@ -590,6 +592,33 @@ contains
     iasym = 0
   end function get_iasym
 
+  function connects_model(this, model) result(is_connected)
+! ******************************************************************************
+! connects_model -- Return true if model is model 1 or model 2
+! ******************************************************************************
+!
+!    SPECIFICATIONS:
+! ------------------------------------------------------------------------------
+    ! -- modules
+    ! -- dummy
+    class(NumericalExchangeType) :: this
+    class(BaseModelType), pointer, intent(in) :: model
+    ! -- return
+    logical :: is_connected
+! ------------------------------------------------------------------------------
+    !
+    is_connected = .false.
+    if (associated(this%m1)) then
+      if (this%m1%id == model%id) is_connected = .true.
+    end if
+    if (associated(this%m2)) then
+      if (this%m2%id == model%id) is_connected = .true.
+    end if
+    !
+    ! -- Return
+    return
+  end function connects_model
+
   function CastAsNumericalExchangeClass(obj) result (res)
     implicit none
     class(*), pointer, intent(inout) :: obj
@@ -426,6 +426,7 @@ module GwfModule
     ! -- locals
     integer(I4B) :: ip
     class(BndType), pointer :: packobj
+    real(DP), dimension(:), pointer, contiguous :: spdis
 ! ------------------------------------------------------------------------------
     !
     ! -- Allocate and read modules attached to model
@@ -444,6 +445,15 @@ module GwfModule
     ! -- set up output control
     call this%oc%oc_ar(this%x, this%dis, this%npf%hnoflo)
     !
+    ! -- add the flows to the shared budget output
+    call this%oc%oc_share('BUDGET', 'FLOW-JA-FACE', this%flowja)
+    if(this%innpf > 0) then
+      if(this%npf%icalcspdis /= 0) then
+        spdis(1:size(this%npf%spdis)) => this%npf%spdis
+        call this%oc%oc_share('BUDGET', 'DATA-SPDIS', spdis)
+      endif
+    endif
+    !
     ! -- Package input files now open, so allocate and read
     do ip = 1,this%bndlist%Count()
       packobj => GetBndFromList(this%bndlist, ip)
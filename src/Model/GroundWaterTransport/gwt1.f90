@@ -426,6 +426,9 @@ module GwtModule
     ! -- set up output control
     call this%oc%oc_ar(this%x, this%dis, DHNOFLO)
     !
+    ! -- add the flows to the shared budget output
+    call this%oc%oc_share('BUDGET', 'FLOW-JA-FACE', this%flowja)
+    !
     ! -- Package input files now open, so allocate and read
     do ip=1,this%bndlist%Count()
       packobj => GetBndFromList(this%bndlist, ip)
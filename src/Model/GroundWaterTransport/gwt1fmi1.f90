@@ -6,10 +6,12 @@ module GwtFmiModule
   use NumericalPackageModule, only: NumericalPackageType
   use BaseDisModule,          only: DisBaseType
   use ListModule,             only: ListType
-  use BudgetFileReaderModule, only: BudgetFileReaderType
-  use HeadFileReaderModule,   only: HeadFileReaderType
+  use FlowFileCacheModule,    only: BudgetFileCacheType, HeadFileCacheType,   &
+                                    BudgetObjectCacheType, BudgetRecordType,   &
+                                    bfc_cr, bfc_da, hfc_cr, hfc_da, boc_cr,    &
+                                    boc_da
   use PackageBudgetModule,    only: PackageBudgetType
-  use BudgetObjectModule,     only: BudgetObjectType, budgetobject_cr_bfr
+  use BudgetObjectModule,     only: BudgetObjectType
 
   implicit none
   private
@@ -23,6 +25,7 @@ module GwtFmiModule
   
   type :: BudObjPtrArray
     type(BudgetObjectType), pointer :: ptr
+    type(BudgetObjectCacheType), pointer :: boc => null()
   end type BudObjPtrArray  
   
   type, extends(NumericalPackageType) :: GwtFmiType
@@ -48,10 +51,11 @@ module GwtFmiModule
     integer(I4B), pointer                           :: iuhds => null()          ! unit number GWF head file
     integer(I4B), pointer                           :: iumvr => null()          ! unit number GWF mover budget file
     integer(I4B), pointer                           :: nflowpack => null()      ! number of GWF flow packages
-    type(BudgetFileReaderType)                      :: bfr                      ! budget file reader
-    type(HeadFileReaderType)                        :: hfr                      ! head file reader
+    type(BudgetFileCacheType), pointer              :: bfc => null()            ! budget file cache, shared with other models
+    type(HeadFileCacheType), pointer                :: hfc => null()            ! head file cache, shared with other models
     type(PackageBudgetType), dimension(:), allocatable :: gwfpackages           ! used to get flows between a package and gwf
     type(BudgetObjectType), pointer                 :: mvrbudobj    => null()   ! pointer to the mover budget budget object
+    type(BudgetObjectCacheType), pointer            :: mvrboc => null()         ! mover budget file cache, shared with models
     type(DataAdvancedPackageType), dimension(:), pointer, contiguous :: datp => null()
     character(len=16), dimension(:), allocatable    :: flowpacknamearray        ! array of boundary package names (e.g. LAK-1, SFR-3, etc.)
     type(BudObjPtrArray), dimension(:), allocatable :: aptbudobj              ! flow budget objects for the advanced packages
@@ -70,6 +74,7 @@ module GwtFmiModule
     procedure :: read_options
     procedure :: read_packagedata
     procedure :: initialize_bfr
+    procedure :: select_bfr_terms
     procedure :: advance_bfr
     procedure :: finalize_bfr
     procedure :: initialize_hfr
@@ -294,16 +299,22 @@ module GwtFmiModule
       call this%advance_hfr()
     endif
     !
-    ! -- If mover flows are being read from file, read the next set of records
+    ! -- If mover flows are being read from file, read the next set of records,
+    !    unless another model using the same file, which may be solved by
+    !    another thread, has already read them
     if (this%iumvr /= 0) then
-      call this%mvrbudobj%bfr_advance(this%dis, this%iout)
+!$OMP CRITICAL (fmibudobjcache)
+      call this%mvrboc%advance(this%dis, this%iout)
+!$OMP END CRITICAL (fmibudobjcache)
     end if
     !
     ! -- If advanced package flows are being read from file, read the next set of records
     if (this%flows_from_file .and. this%inunit /= 0) then
+!$OMP CRITICAL (fmibudobjcache)
       do n = 1, size(this%aptbudobj)
-        call this%aptbudobj(n)%ptr%bfr_advance(this%dis, this%iout)
+        call this%aptbudobj(n)%boc%advance(this%dis, this%iout)
       end do
+!$OMP END CRITICAL (fmibudobjcache)
     end if
     !
     ! -- if flow cell is dry, then set gwt%ibound = 0 and conc to dry
@@ -478,8 +489,20 @@ module GwtFmiModule
     use MemoryManagerModule, only: mem_deallocate
     ! -- dummy
     class(GwtFmiType) :: this
+    ! -- local
+    integer(I4B) :: i
 ! ------------------------------------------------------------------------------
-    ! -- todo: finalize hfr and bfr either here or in a finalize routine
+    !
+    ! -- release the budget and head file caches
+    if (associated(this%bfc)) call this%finalize_bfr()
+    if (associated(this%hfc)) call this%finalize_hfr()
+    if (associated(this%mvrboc)) then
+      call boc_da(this%mvrboc)
+      nullify(this%mvrbudobj)
+    end if
+    do i = 1, size(this%aptbudobj)
+      if (associated(this%aptbudobj(i)%boc)) call boc_da(this%aptbudobj(i)%boc)
+    end do
     !
     ! -- deallocate fmi arrays
     deallocate(this%datp)
@@ -731,19 +754,17 @@ module GwtFmiModule
 !    SPECIFICATIONS:
 ! ------------------------------------------------------------------------------
     ! -- modules
-    use OpenSpecModule, only: ACCESS, FORM
     use ConstantsModule, only: LINELENGTH, DEM6, LENPACKAGENAME
-    use InputOutputModule, only: getunit, openfile, urdaux
+    use InputOutputModule, only: urdaux
     use SimModule, only: store_error, store_error_unit, ustop
     ! -- dummy
     class(GwtFmiType) :: this
     ! -- local
-    type(BudgetObjectType), pointer :: budobjptr
+    type(BudgetObjectCacheType), pointer :: boc
     character(len=LINELENGTH) :: keyword, fname
     character(len=LENPACKAGENAME) :: pname
     integer(I4B) :: i
     integer(I4B) :: ierr
-    integer(I4B) :: inunit
     integer(I4B) :: iapt
     logical :: isfound, endOfBlock
     logical :: blockrequired
@@ -775,10 +796,8 @@ module GwtFmiModule
               call ustop()
             endif
             call this%parser%GetString(fname)
-            inunit = getunit()
-            call openfile(inunit, this%iout, fname, 'DATA(BINARY)', FORM,      &
-              ACCESS, 'UNKNOWN')
-            this%iubud = inunit
+            call bfc_cr(this%bfc, fname, this%iout)
+            this%iubud = this%bfc%inunit
             call this%initialize_bfr()
           case ('GWFHEAD')
             call this%parser%GetStringCaps(keyword)
@@ -789,10 +808,8 @@ module GwtFmiModule
               call ustop()
             endif
             call this%parser%GetString(fname)
-            inunit = getunit()
-            call openfile(inunit, this%iout, fname, 'DATA(BINARY)', FORM,      &
-              ACCESS, 'UNKNOWN')
-            this%iuhds = inunit
+            call hfc_cr(this%hfc, fname, this%iout)
+            this%iuhds = this%hfc%inunit
             call this%initialize_hfr()
           case ('GWFMOVER')
             call this%parser%GetStringCaps(keyword)
@@ -803,24 +820,22 @@ module GwtFmiModule
               call ustop()
             endif
             call this%parser%GetString(fname)
-            inunit = getunit()
-            call openfile(inunit, this%iout, fname, 'DATA(BINARY)', FORM,      &
-              ACCESS, 'UNKNOWN')
-            this%iumvr = inunit
-            call budgetobject_cr_bfr(this%mvrbudobj, 'MVT', this%iumvr,    &
-                                     this%iout)
-            call this%mvrbudobj%fill_from_bfr(this%dis, this%iout)
+            call boc_cr(this%mvrboc, fname, 'MVT', this%dis, this%iout)
+            this%iumvr = this%mvrboc%inunit
+            this%mvrbudobj => this%mvrboc%budobj
           case default
             !
             ! --expand the size of aptbudobj, which stores a pointer to the budobj
             allocate(tmpbudobj(iapt))
             do i = 1, size(this%aptbudobj)
               tmpbudobj(i)%ptr => this%aptbudobj(i)%ptr
+              tmpbudobj(i)%boc => this%aptbudobj(i)%boc
             end do
             deallocate(this%aptbudobj)
             allocate(this%aptbudobj(iapt + 1))
             do i = 1, size(tmpbudobj)
               this%aptbudobj(i)%ptr => tmpbudobj(i)%ptr
+              this%aptbudobj(i)%boc => tmpbudobj(i)%boc
             end do
             deallocate(tmpbudobj)
             !
@@ -835,13 +850,10 @@ module GwtFmiModule
               call ustop()
             endif
             call this%parser%GetString(fname)
-            inunit = getunit()
-            call openfile(inunit, this%iout, fname, 'DATA(BINARY)', FORM,      &
-              ACCESS, 'UNKNOWN')
-            call budgetobject_cr_bfr(budobjptr, pname, inunit,    &
-                                     this%iout, colconv2=['GWF             '])
-            call budobjptr%fill_from_bfr(this%dis, this%iout)
-            this%aptbudobj(iapt)%ptr => budobjptr
+            call boc_cr(boc, fname, pname, this%dis, this%iout,                &
+                        colconv2=['GWF             '])
+            this%aptbudobj(iapt)%ptr => boc%budobj
+            this%aptbudobj(iapt)%boc => boc
         end select
       end do
       write(this%iout,'(1x,a)') 'END OF FMI PACKAGEDATA'
@@ -884,8 +896,9 @@ module GwtFmiModule
 
   subroutine initialize_bfr(this)
 ! ******************************************************************************
-! initialize_bfr -- initalize the budget file reader and figure out how many
-!   different terms and packages are contained within the file
+! initialize_bfr -- figure out how many different terms and packages are
+!   contained within the budget file, which was opened and scanned by the
+!   budget file reader of the cache
 ! ******************************************************************************
 !
 !    SPECIFICATIONS:
@@ -897,7 +910,6 @@ module GwtFmiModule
     class(GwtFmiType) :: this
     ! -- local
     character(len=LINELENGTH) :: errmsg
-    integer(I4B) :: ncrbud
     integer(I4B) :: nflowpack
     integer(I4B) :: i, ip
     integer(I4B) :: naux
@@ -908,12 +920,9 @@ module GwtFmiModule
     logical :: found_stosy
     integer(I4B), dimension(:), allocatable :: imap
 ! ------------------------------------------------------------------------------
-    !
-    ! -- Initialize the budget file reader
-    call this%bfr%initialize(this%iubud, this%iout, ncrbud)
     !
     ! -- Calculate the number of gwf flow packages
-    allocate(imap(this%bfr%nbudterms))
+    allocate(imap(this%bfc%bfr%nbudterms))
     imap(:) = 0
     nflowpack = 0
     found_flowja = .false.
@@ -921,8 +930,8 @@ module GwtFmiModule
     found_datasat = .false.
     found_stoss = .false.
     found_stosy = .false.
-    do i = 1, this%bfr%nbudterms
-      select case(trim(adjustl(this%bfr%budtxtarray(i))))
+    do i = 1, this%bfc%bfr%nbudterms
+      select case(trim(adjustl(this%bfc%bfr%budtxtarray(i))))
       case ('FLOW-JA-FACE')
         found_flowja = .true.
       case ('DATA-SPDIS')
@@ -947,11 +956,11 @@ module GwtFmiModule
     ! -- Copy the package name and aux names from budget file reader
     !    to the gwfpackages derived-type variable
     ip = 1
-    do i = 1, this%bfr%nbudterms
+    do i = 1, this%bfc%bfr%nbudterms
       if (imap(i) == 0) cycle
-      call this%gwfpackages(ip)%set_name(this%bfr%dstpackagenamearray(i))
-      naux = this%bfr%nauxarray(i)
-      call this%gwfpackages(ip)%set_auxname(naux, this%bfr%auxtxtarray(1:naux, i))
+      call this%gwfpackages(ip)%set_name(this%bfc%bfr%dstpackagenamearray(i))
+      naux = this%bfc%bfr%nauxarray(i)
+      call this%gwfpackages(ip)%set_auxname(naux, this%bfc%bfr%auxtxtarray(1:naux, i))
       ip = ip + 1
     end do
     !
@@ -960,7 +969,7 @@ module GwtFmiModule
     ip = 1
     do i = 1, size(imap)
       if (imap(i) == 1) then
-        this%flowpacknamearray(ip) = this%bfr%dstpackagenamearray(i)
+        this%flowpacknamearray(ip) = this%bfc%bfr%dstpackagenamearray(i)
         ip = ip + 1
       end if
     end do
@@ -993,10 +1002,47 @@ module GwtFmiModule
     return
   end subroutine initialize_bfr
   
+  subroutine select_bfr_terms(this)
+! ******************************************************************************
+! select_bfr_terms -- tell the budget file cache which budget terms are
+!   needed.  The flows of a package handled by an advanced transport package
+!   are not needed, because the advanced package reads them from its own
+!   budget object, unless they are used for the flow imbalance correction.
+!   This must be called after the advanced transport packages have set
+!   iatp.
+! ******************************************************************************
+!
+!    SPECIFICATIONS:
+! ------------------------------------------------------------------------------
+    ! -- dummy
+    class(GwtFmiType) :: this
+    ! -- local
+    integer(I4B) :: i, ip
+    logical, dimension(:), allocatable :: lread
+! ------------------------------------------------------------------------------
+    !
+    allocate(lread(this%bfc%bfr%nbudterms))
+    ip = 1
+    do i = 1, this%bfc%bfr%nbudterms
+      select case(trim(adjustl(this%bfc%bfr%budtxtarray(i))))
+      case ('FLOW-JA-FACE', 'DATA-SPDIS', 'DATA-SAT', 'STO-SS', 'STO-SY')
+        lread(i) = .true.
+      case default
+        lread(i) = this%iatp(ip) == 0 .or. this%iflowerr /= 0
+        ip = ip + 1
+      end select
+    end do
+    call this%bfc%select_terms(lread)
+    deallocate(lread)
+    !
+    ! -- return
+    return
+  end subroutine select_bfr_terms
+  
   subroutine advance_bfr(this)
 ! ******************************************************************************
-! advance_bfr -- advance the budget file reader by reading the next chunk
-!   of information for the current time step and stress period
+! advance_bfr -- advance the budget file cache to the current time step and
+!   copy its records for the current time step and stress period
 ! ******************************************************************************
 !
 !    SPECIFICATIONS:
@@ -1007,12 +1053,11 @@ module GwtFmiModule
     class(GwtFmiType) :: this
     ! -- local
     character(len=LINELENGTH) :: errmsg
-    logical :: success
     integer(I4B) :: n
     integer(I4B) :: ipos
     integer(I4B) :: nu, nr
     integer(I4B) :: ip, i
-    logical :: readnext
+    type(BudgetRecordType), pointer :: rec
     ! -- format
     character(len=*), parameter :: fmtkstpkper =                               &
       "(1x,/1x,'FMI READING BUDGET TERMS FOR KSTP ', i0, ' KPER ', i0)"
@@ -1021,21 +1066,19 @@ module GwtFmiModule
       &i0, ' TO BUDGET FILE TERMS FROM KSTP ', i0, ' AND KPER ', i0)"
 ! ------------------------------------------------------------------------------
     !
-    ! -- Do not read the budget if the budget is at end of file or if the next
-    !    record in the budget file is the first timestep of the next stress
-    !    period.
-    readnext = .true.
-    if (kstp * kper > 1) then
-      if (this%bfr%endoffile) then
-        readnext = .false.
-      else
-        if (this%bfr%kpernext == kper + 1 .and. this%bfr%kstpnext == 1) &
-          readnext = .false.
-      endif
-    endif
+    ! -- Select the budget terms to read.  The advanced transport packages
+    !    have all been allocated and read by the first time step.  Another
+    !    model using the same budget file may be solved by another thread.
+!$OMP CRITICAL (fmibudgetcache)
+    if (kper * kstp == 1) call this%select_bfr_terms()
+    !
+    ! -- Read the records for this time step, unless another model using the
+    !    same budget file has already read them
+    call this%bfc%advance(kstp, kper)
+!$OMP END CRITICAL (fmibudgetcache)
     !
-    ! -- Read the next record
-    if (readnext) then
+    ! -- Copy the records
+    if (this%bfc%readnext) then
       !
       ! -- Write the current time step and stress period
       write(this%iout, fmtkstpkper) kstp, kper
@@ -1043,17 +1086,19 @@ module GwtFmiModule
       ! -- loop through the budget terms for this stress period
       !    i is the counter for gwf flow packages
       ip = 1
-      do n = 1, this%bfr%nbudterms
-        call this%bfr%read_record(success, this%iout)
-        if (.not. success) then
+      do n = 1, this%bfc%bfr%nbudterms
+        if (n > this%bfc%nread) then
           write(errmsg,'(4x,a)') '***ERROR.  GWF BUDGET READ NOT SUCCESSFUL'
           call store_error(errmsg)
           call store_error_unit(this%iubud)
           call ustop()
         endif
+        rec => this%bfc%records(n)
+        write(this%iout, '(1pg15.6, a, 1x, a)') rec%totim, rec%budtxt,         &
+          rec%dstpackagename
         !
         ! -- Ensure kper is same between model and budget file
-        if (kper /= this%bfr%kper) then
+        if (kper /= rec%kper) then
           write(errmsg,'(4x,a)') '***ERROR.  PERIOD NUMBER IN BUDGET FILE &
             &DOES NOT MATCH PERIOD NUMBER IN TRANSPORT MODEL.'
           call store_error(errmsg)
@@ -1062,7 +1107,7 @@ module GwtFmiModule
         endif
         !
         ! -- if budget file kstp > 1, then kstp must match
-        if (this%bfr%kstp > 1 .and. (kstp /= this%bfr%kstp)) then
+        if (rec%kstp > 1 .and. (kstp /= rec%kstp)) then
           write(errmsg,'(4x,a)') '***ERROR.  IF THERE IS MORE THAN ONE TIME &
             &STEP IN THE BUDGET FILE, THEN BUDGET FILE TIME STEPS MUST MATCH &
             &GWT MODEL TIME STEPS ONE-FOR-ONE.'
@@ -1073,67 +1118,74 @@ module GwtFmiModule
         !
         ! -- parse based on the type of data, and compress all user node
         !    numbers into reduced node numbers
-        select case(trim(adjustl(this%bfr%budtxt)))
+        select case(trim(adjustl(rec%budtxt)))
           case('FLOW-JA-FACE')
             !
-            ! -- bfr%flowja contains only reduced connections so there is
+            ! -- rec%flowja contains only reduced connections so there is
             !    a one-to-one match with this%gwfflowja
-            do ipos = 1, size(this%bfr%flowja)
-              this%gwfflowja(ipos) = this%bfr%flowja(ipos)
+            do ipos = 1, size(rec%flowja)
+              this%gwfflowja(ipos) = rec%flowja(ipos)
             end do
           case('DATA-SPDIS')
-            do i = 1, this%bfr%nlist
-              nu = this%bfr%nodesrc(i)
+            do i = 1, rec%nlist
+              nu = rec%nodesrc(i)
               nr = this%dis%get_nodenumber(nu, 0)
               if (nr <= 0) cycle
-              this%gwfspdis(1, nr) = this%bfr%auxvar(1, i)
-              this%gwfspdis(2, nr) = this%bfr%auxvar(2, i)
-              this%gwfspdis(3, nr) = this%bfr%auxvar(3, i)
+              this%gwfspdis(1, nr) = rec%auxvar(1, i)
+              this%gwfspdis(2, nr) = rec%auxvar(2, i)
+              this%gwfspdis(3, nr) = rec%auxvar(3, i)
             end do
           case('DATA-SAT')
-            do i = 1, this%bfr%nlist
-              nu = this%bfr%nodesrc(i)
+            do i = 1, rec%nlist
+              nu = rec%nodesrc(i)
               nr = this%dis%get_nodenumber(nu, 0)
               if (nr <= 0) cycle
-              this%gwfsat(nr) = this%bfr%auxvar(1, i)
+              this%gwfsat(nr) = rec%auxvar(1, i)
             end do
           case('STO-SS')
             do nu = 1, this%dis%nodesuser
               nr = this%dis%get_nodenumber(nu, 0)
               if (nr <= 0) cycle
-              this%gwfstrgss(nr) = this%bfr%flow(nu)
+              this%gwfstrgss(nr) = rec%flow(nu)
             end do
           case('STO-SY')
             do nu = 1, this%dis%nodesuser
               nr = this%dis%get_nodenumber(nu, 0)
               if (nr <= 0) cycle
-              this%gwfstrgsy(nr) = this%bfr%flow(nu)
+              this%gwfstrgsy(nr) = rec%flow(nu)
             end do
           case default
-            call this%gwfpackages(ip)%copy_values( &
-                                                 this%bfr%dstpackagename, &
-                                                 this%bfr%auxtxt, &
-                                                 this%bfr%nlist, &
-                                                 this%bfr%naux, &
-                                                 this%bfr%nodesrc, &
-                                                 this%bfr%flow, &
-                                                 this%bfr%auxvar)
-            do i = 1, this%gwfpackages(ip)%nbound
-              nu = this%gwfpackages(ip)%nodelist(i)
-              nr = this%dis%get_nodenumber(nu, 0)
-              this%gwfpackages(ip)%nodelist(i) = nr
-            end do
+            !
+            ! -- the flows of a package handled by an advanced transport
+            !    package were not read, unless they are needed for the flow
+            !    imbalance correction
+            if (this%iatp(ip) == 0 .or. this%iflowerr /= 0) then
+              call this%gwfpackages(ip)%copy_values( &
+                                                   rec%dstpackagename, &
+                                                   rec%auxtxt, &
+                                                   rec%nlist, &
+                                                   rec%naux, &
+                                                   rec%nodesrc, &
+                                                   rec%flow, &
+                                                   rec%auxvar)
+              do i = 1, this%gwfpackages(ip)%nbound
+                nu = this%gwfpackages(ip)%nodelist(i)
+                nr = this%dis%get_nodenumber(nu, 0)
+                this%gwfpackages(ip)%nodelist(i) = nr
+              end do
+            end if
             ip = ip + 1
         end select
       end do
     else
-      write(this%iout, fmtbudkstpkper) kstp, kper, this%bfr%kstp, this%bfr%kper
+      write(this%iout, fmtbudkstpkper) kstp, kper, this%bfc%bfr%kstp,         &
+        this%bfc%bfr%kper
     endif
   end subroutine advance_bfr
   
   subroutine finalize_bfr(this)
 ! ******************************************************************************
-! finalize_bfr -- finalize the budget file reader
+! finalize_bfr -- release the budget file cache
 ! ******************************************************************************
 !
 !    SPECIFICATIONS:
@@ -1143,8 +1195,9 @@ module GwtFmiModule
     ! -- dummy
 ! ------------------------------------------------------------------------------
     !
-    ! -- Finalize the budget file reader
-    call this%bfr%finalize()
+    ! -- Release the budget file cache, which closes the file if no other
+    !    model is using it
+    call bfc_da(this%bfc)
     !
   end subroutine finalize_bfr
   
@@ -1160,8 +1213,8 @@ module GwtFmiModule
     ! -- dummy
 ! ------------------------------------------------------------------------------
     !
-    ! -- Initialize the budget file reader
-    call this%hfr%initialize(this%iuhds, this%iout)
+    ! -- The head file reader was initialized when the head file cache
+    !    was created
     !
     ! -- todo: need to run through the head terms
     !    and do some checking
@@ -1169,7 +1222,8 @@ module GwtFmiModule
   
   subroutine advance_hfr(this)
 ! ******************************************************************************
-! advance_hfr -- advance the head file reader
+! advance_hfr -- advance the head file cache to the current time step and
+!   copy its heads
 ! ******************************************************************************
 !
 !    SPECIFICATIONS:
@@ -1181,8 +1235,6 @@ module GwtFmiModule
     integer(I4B) :: nu, nr, i, ilay
     integer(I4B) :: ncpl
     real(DP) :: val
-    logical :: readnext
-    logical :: success
     character(len=*), parameter :: fmtkstpkper =                               &
       "(1x,/1x,'FMI READING HEAD FOR KSTP ', i0, ' KPER ', i0)"
     character(len=*), parameter :: fmthdskstpkper = &
@@ -1190,31 +1242,24 @@ module GwtFmiModule
       &i0, ' TO BINARY FILE HEADS FROM KSTP ', i0, ' AND KPER ', i0)"
 ! ------------------------------------------------------------------------------
     !
-    ! -- Do not read heads if the head is at end of file or if the next
-    !    record in the head file is the first timestep of the next stress
-    !    period.
-    readnext = .true.
-    if (kstp * kper > 1) then
-      if (this%hfr%endoffile) then
-        readnext = .false.
-      else
-        if (this%hfr%kpernext == kper + 1 .and. this%hfr%kstpnext == 1) &
-          readnext = .false.
-      endif
-    endif
+    ! -- Read the heads for this time step, unless another model using the
+    !    same head file, which may be solved by another thread, has already
+    !    read them
+!$OMP CRITICAL (fmiheadcache)
+    call this%hfc%advance(kstp, kper)
+!$OMP END CRITICAL (fmiheadcache)
     !
-    ! -- Read the next record
-    if (readnext) then
+    ! -- Copy the heads
+    if (this%hfc%readnext) then
       !
       ! -- write to list file that heads are being read
       write(this%iout, fmtkstpkper) kstp, kper
       !
       ! -- loop through the layered heads for this time step
-      do ilay = 1, this%hfr%nlay
+      do ilay = 1, this%hfc%hfr%nlay
         !
-        ! -- read next head chunk
-        call this%hfr%read_record(success, this%iout)
-        if (.not. success) then
+        ! -- check that the head chunk was read
+        if (ilay > this%hfc%nread) then
           write(errmsg,'(4x,a)') '***ERROR.  GWF HEAD READ NOT SUCCESSFUL'
           call store_error(errmsg)
           call store_error_unit(this%iuhds)
@@ -1222,7 +1267,7 @@ module GwtFmiModule
         endif
         !
         ! -- Ensure kper is same between model and head file
-        if (kper /= this%hfr%kper) then
+        if (kper /= this%hfc%records(ilay)%kper) then
           write(errmsg,'(4x,a)') '***ERROR.  PERIOD NUMBER IN HEAD FILE &
             &DOES NOT MATCH PERIOD NUMBER IN TRANSPORT MODEL.'
           call store_error(errmsg)
@@ -1231,7 +1276,8 @@ module GwtFmiModule
         endif
         !
         ! -- if head file kstp > 1, then kstp must match
-        if (this%hfr%kstp > 1 .and. (kstp /= this%hfr%kstp)) then
+        if (this%hfc%records(ilay)%kstp > 1 .and.                              &
+            (kstp /= this%hfc%records(ilay)%kstp)) then
           write(errmsg,'(4x,a)') '***ERROR.  IF THERE IS MORE THAN ONE TIME &
             &STEP IN THE HEAD FILE, THEN HEAD FILE TIME STEPS MUST MATCH &
             &GWT MODEL TIME STEPS ONE-FOR-ONE.'
@@ -1242,22 +1288,23 @@ module GwtFmiModule
         !
         ! -- fill the head array for this layer and
         !    compress into reduced form
-        ncpl = size(this%hfr%head)
+        ncpl = size(this%hfc%records(ilay)%head)
         do i = 1, ncpl
           nu = (ilay - 1) * ncpl + i
           nr = this%dis%get_nodenumber(nu, 0)
-          val = this%hfr%head(i)
+          val = this%hfc%records(ilay)%head(i)
           if (nr > 0) this%gwfhead(nr) = val
         enddo
       end do
     else
-      write(this%iout, fmthdskstpkper) kstp, kper, this%hfr%kstp, this%hfr%kper
+      write(this%iout, fmthdskstpkper) kstp, kper, this%hfc%hfr%kstp,         &
+        this%hfc%hfr%kper
     endif
   end subroutine advance_hfr
   
   subroutine finalize_hfr(this)
 ! ******************************************************************************
-! finalize_hfr -- finalize the head file reader
+! finalize_hfr -- release the head file cache
 ! ******************************************************************************
 !
 !    SPECIFICATIONS:
@@ -1267,8 +1314,9 @@ module GwtFmiModule
     ! -- dummy
 ! ------------------------------------------------------------------------------
     !
-    ! -- Finalize the head file reader
-    close(this%iuhds)
+    ! -- Release the head file cache, which closes the file if no other
+    !    model is using it
+    call hfc_da(this%hfc)
     !
   end subroutine finalize_hfr
   
@@ -537,6 +537,17 @@ module SimulationCreateModule
           case ('MXITER')
             sgp%mxiter = parser%GetInteger()
           !
+          case ('NUMBER_OF_THREADS')
+            sgp%nthreads = parser%GetInteger()
+            if (sgp%nthreads < 1) then
+              write(errmsg, '(4x,a,i0)') &
+                '****ERROR. NUMBER_OF_THREADS MUST BE GREATER THAN ZERO ' // &
+                'FOR SOLUTION GROUP ', isgp
+              call store_error(errmsg)
+              call parser%StoreErrorUnit()
+              call ustop()
+            endif
+          !
           case ('IMS6')
             !
             ! -- Initialize and increment counters
@@ -35,6 +35,10 @@ module NumericalSolutionModule
   public :: NumericalSolutionType
   public :: GetNumericalSolutionFromList
   
+  type :: NumericalModelPtrType
+    class(NumericalModelType), pointer :: ptr => null()
+  end type NumericalModelPtrType
+  
   type, extends(BaseSolutionType) :: NumericalSolutionType
     character(len=LINELENGTH)                            :: fname
     type(ListType)                                       :: modellist
@@ -54,6 +58,11 @@ module NumericalSolutionModule
     real(DP), dimension(:), pointer, contiguous          :: xtemp => NULL()
     type(BlockParserType) :: parser
     !
+    ! -- threads used to formulate the models.  The models are stored in an
+    !    array because the model list cannot be accessed by several threads.
+    integer(I4B), pointer                                :: nthreadsfc => NULL()
+    type(NumericalModelPtrType), dimension(:), allocatable :: modelptrs
+    !
     ! -- sparse matrix data
     real(DP), pointer                                    :: theta => NULL()
     real(DP), pointer                                    :: akappa => NULL()
@@ -141,6 +150,9 @@ module NumericalSolutionModule
 
     procedure, private :: sln_connect
     procedure, private :: sln_reset
+    procedure, private :: sln_model_cf
+    procedure, private :: sln_model_fc
+    procedure, private :: sln_model_nr
     procedure, private :: sln_ls
     procedure, private :: sln_setouter
     procedure, private :: sln_backtracking
@@ -282,6 +294,7 @@ contains
     call mem_allocate(this%ptcexp, 'PTCEXP', solutionname)
     call mem_allocate(this%ptcthresh, 'PTCTHRESH', solutionname)
     call mem_allocate(this%ptcrat, 'PTCRAT', solutionname)
+    call mem_allocate(this%nthreadsfc, 'NTHREADSFC', solutionname)
     !
     ! -- initialize
     this%id = 0
@@ -328,6 +341,7 @@ contains
     this%ptcexp = done
     this%ptcthresh = DEM3
     this%ptcrat = DZERO
+    this%nthreadsfc = 1
     !
     ! -- return
     return
@@ -464,7 +478,7 @@ contains
     ! -- modules
     use MemoryManagerModule, only: mem_reallocate
     use SimVariablesModule, only: iout
-    use SimModule, only: ustop, store_error, count_errors,                       &
+    use SimModule, only: ustop, store_error, store_warning, count_errors,        &
                          deprecation_warning
     use InputOutputModule, only: getunit, openfile
     ! -- dummy
@@ -483,6 +497,7 @@ contains
     integer(I4B) :: imslinear
     integer(I4B) :: isymflg=1
     integer(I4B) :: ierr
+    integer(I4B) :: iomp
     logical :: isfound, endOfBlock
     integer(I4B) :: ival
     real(DP) :: rval
@@ -589,6 +604,18 @@ contains
           this%iallowptc = ival
           write(IOUT,'(1x,A)') 'PSEUDO-TRANSIENT CONTINUATION DISABLED FOR' // &
             ' ' // trim(adjustl(msg)) // ' STRESS-PERIOD(S)'
+        case ('NUMBER_OF_FORMULATE_THREADS')
+          ival = this%parser%GetInteger()
+          if (ival < 1) then
+            write(errmsg,'(a)')                                                  &
+              'NUMBER_OF_FORMULATE_THREADS MUST BE GREATER THAN ZERO'
+            call store_error(errmsg)
+          else
+            this%nthreadsfc = ival
+            write(IOUT,'(1x,A,1x,I0,1x,A)')                                      &
+              'MODEL COEFFICIENTS WILL BE FORMULATED WITH', this%nthreadsfc,     &
+              'THREAD(S)'
+          end if
         !
         ! -- DEPRECATED OPTIONS
         case ('CSV_OUTPUT')
@@ -689,6 +716,17 @@ contains
     else
       write(iout,'(1x,a)')'NO IMS OPTION BLOCK DETECTED.'
     end if
+    !
+    ! -- threads are only available if MODFLOW 6 is compiled with OpenMP
+    iomp = 0
+!$  iomp = 1
+    if (this%nthreadsfc > 1 .and. iomp == 0) then
+      write(warnmsg,'(a,1x,a)')                                                  &
+        'MODFLOW 6 WAS NOT COMPILED WITH OPENMP.',                               &
+        'NUMBER_OF_FORMULATE_THREADS WILL BE SET TO 1.'
+      call store_warning(warnmsg)
+      this%nthreadsfc = 1
+    end if
 
 00021 FORMAT(1X,'SIMPLE OPTION:',/,                                              &
     &       1X,'DEFAULT SOLVER INPUT VALUES FOR FAST SOLUTIONS')
@@ -964,6 +1002,13 @@ contains
       end do
     end do
     !
+    ! -- store pointers to the models, which are formulated by several
+    !    threads if nthreadsfc > 1
+    allocate(this%modelptrs(this%modellist%Count()))
+    do i = 1, this%modellist%Count()
+      this%modelptrs(i)%ptr => GetNumericalModelFromList(this%modellist, i)
+    end do
+    !
     ! -- check for numerical solution errors
     ierr = count_errors()
     if (ierr > 0) then
@@ -1162,6 +1207,10 @@ contains
     call mem_deallocate(this%ptcexp)
     call mem_deallocate(this%ptcthresh)
     call mem_deallocate(this%ptcrat)
+    call mem_deallocate(this%nthreadsfc)
+    !
+    ! -- model pointers
+    if (allocated(this%modelptrs)) deallocate(this%modelptrs)
     !
     ! -- return
     return
@@ -1253,6 +1302,10 @@ contains
         write(this%icsvinnerout, '(*(G0,:,","))', advance='NO')            &
           '', 'solution_inner_omega'
       end if
+      if (this%imslinear%ipcreuse /= 0) then
+        write(this%icsvinnerout, '(*(G0,:,","))', advance='NO')            &
+          '', 'preconditioner_rebuilt', 'preconditioner_reused'
+      end if
       ! -- check for more than one model
       if (this%convnmod > 1) then
         do im=1,this%modellist%Count()
@@ -1459,10 +1512,7 @@ contains
     enddo
     !
     ! -- Calculate the matrix terms for each model
-    do im=1,this%modellist%Count()
-      mp => GetNumericalModelFromList(this%modellist, im)
-      call mp%model_cf(kiter)
-    enddo
+    call this%sln_model_cf(kiter)
     !
     ! -- Add exchange coefficients to the solution
     do ic=1,this%exchangelist%Count()
@@ -1471,10 +1521,7 @@ contains
     enddo
     !
     ! -- Add model coefficients to the solution
-    do im=1,this%modellist%Count()
-      mp => GetNumericalModelFromList(this%modellist, im)
-      call mp%model_fc(kiter, this%amat, this%nja, 1)
-    enddo
+    call this%sln_model_fc(kiter, 1)
     !
     ! -- Add exchange Newton-Raphson terms to solution
     do ic=1,this%exchangelist%Count()
@@ -1494,10 +1541,7 @@ contains
     end do
     !
     ! -- Add model Newton-Raphson terms to solution
-    do im=1,this%modellist%Count()
-      mp => GetNumericalModelFromList(this%modellist, im)
-      call mp%model_nr(kiter, this%amat, this%nja, 1)
-    enddo
+    call this%sln_model_nr(kiter)
     call code_timer(1, ttform, this%ttform)
     !
     ! -- linear solve
@@ -2012,6 +2056,12 @@ contains
       write(iu, '(*(G0,:,","))', advance='NO')                                   &
         '', trim(adjustl(this%caccel(kpos)))
       !
+      ! -- write the number of times the preconditioner was rebuilt and reused
+      if (this%imslinear%ipcreuse /= 0) then
+        write(iu, '(*(G0,:,","))', advance='NO')                                 &
+          '', this%imslinear%npcbuild, this%imslinear%npcreuse
+      end if
+      !
       ! -- write information for each model
       if (this%convnmod > 1) then
         do j = 1, this%convnmod
@@ -2250,6 +2300,87 @@ contains
     ! -- return
     return
   end subroutine sln_reset
+
+  subroutine sln_model_cf(this, kiter)
+! ******************************************************************************
+! sln_model_cf -- Calculate the matrix coefficients (CF) for each model.  The
+!   models are independent, so they are calculated concurrently if
+!   nthreadsfc > 1.
+! ******************************************************************************
+!
+!    SPECIFICATIONS:
+! ------------------------------------------------------------------------------
+    ! -- dummy
+    class(NumericalSolutionType) :: this
+    integer(I4B), intent(in) :: kiter
+    ! -- local
+    integer(I4B) :: im
+! ------------------------------------------------------------------------------
+    !
+!$OMP PARALLEL DO IF(this%nthreadsfc > 1) NUM_THREADS(this%nthreadsfc)         &
+!$OMP SCHEDULE(DYNAMIC)
+    do im = 1, size(this%modelptrs)
+      call this%modelptrs(im)%ptr%model_cf(kiter)
+    end do
+!$OMP END PARALLEL DO
+    !
+    ! -- return
+    return
+  end subroutine sln_model_cf
+
+  subroutine sln_model_fc(this, kiter, inwtflag)
+! ******************************************************************************
+! sln_model_fc -- Fill the coefficients (FC) of each model into amat and rhs.
+!   Each model only fills its own rows of amat and rhs, and the exchange
+!   terms have already been added, so the terms are summed in the same order
+!   for any number of threads.
+! ******************************************************************************
+!
+!    SPECIFICATIONS:
+! ------------------------------------------------------------------------------
+    ! -- dummy
+    class(NumericalSolutionType) :: this
+    integer(I4B), intent(in) :: kiter
+    integer(I4B), intent(in) :: inwtflag
+    ! -- local
+    integer(I4B) :: im
+! ------------------------------------------------------------------------------
+    !
+!$OMP PARALLEL DO IF(this%nthreadsfc > 1) NUM_THREADS(this%nthreadsfc)         &
+!$OMP SCHEDULE(DYNAMIC)
+    do im = 1, size(this%modelptrs)
+      call this%modelptrs(im)%ptr%model_fc(kiter, this%amat, this%nja, inwtflag)
+    end do
+!$OMP END PARALLEL DO
+    !
+    ! -- return
+    return
+  end subroutine sln_model_fc
+
+  subroutine sln_model_nr(this, kiter)
+! ******************************************************************************
+! sln_model_nr -- Add the Newton-Raphson terms of each model to amat and rhs
+! ******************************************************************************
+!
+!    SPECIFICATIONS:
+! ------------------------------------------------------------------------------
+    ! -- dummy
+    class(NumericalSolutionType) :: this
+    integer(I4B), intent(in) :: kiter
+    ! -- local
+    integer(I4B) :: im
+! ------------------------------------------------------------------------------
+    !
+!$OMP PARALLEL DO IF(this%nthreadsfc > 1) NUM_THREADS(this%nthreadsfc)         &
+!$OMP SCHEDULE(DYNAMIC)
+    do im = 1, size(this%modelptrs)
+      call this%modelptrs(im)%ptr%model_nr(kiter, this%amat, this%nja, 1)
+    end do
+!$OMP END PARALLEL DO
+    !
+    ! -- return
+    return
+  end subroutine sln_model_nr
 !
   subroutine sln_ls(this, kiter, kstp, kper, in_iter, iptc, ptcf)
 ! ******************************************************************************
@@ -2520,7 +2651,6 @@ contains
     ! -- local
     character(len=7) :: cmsg
     integer(I4B) :: ic
-    integer(I4B) :: im
     integer(I4B) :: nb
     integer(I4B) :: btflag
     integer(I4B) :: ibflag
@@ -2542,10 +2672,7 @@ contains
     end do
     !
     ! -- Calculate matrix coefficients (CF) for each model
-    do im=1,this%modellist%Count()
-      mp => GetNumericalModelFromList(this%modellist, im)
-      call mp%model_cf(kiter)
-    end do
+    call this%sln_model_cf(kiter)
     !
     ! -- Fill coefficients (FC) for each exchange
     do ic=1,this%exchangelist%Count()
@@ -2554,10 +2681,7 @@ contains
     end do
     !
     ! -- Fill coefficients (FC) for each model
-    do im=1,this%modellist%Count()
-      mp => GetNumericalModelFromList(this%modellist, im)
-      call mp%model_fc(kiter, this%amat, this%nja, 0)
-    end do
+    call this%sln_model_fc(kiter, 0)
     !
     ! -- calculate initial l2 norm
     if (kiter == 1) then
@@ -2600,10 +2724,7 @@ contains
           end do
           !
           ! -- Calculate matrix coefficients (CF) for each model
-          do im=1,this%modellist%Count()
-            mp => GetNumericalModelFromList(this%modellist, im)
-            call mp%model_cf(kiter)
-          end do
+          call this%sln_model_cf(kiter)
           !
           ! -- Fill coefficients (FC) for each exchange
           do ic=1,this%exchangelist%Count()
@@ -2612,10 +2733,7 @@ contains
           end do
           !
           ! -- Fill coefficients (FC) for each model
-          do im=1,this%modellist%Count()
-            mp => GetNumericalModelFromList(this%modellist, im)
-            call mp%model_fc(kiter, this%amat, this%nja, 0)
-          end do
+          call this%sln_model_fc(kiter, 0)
           !
           ! -- calculate updated l2norm
           call this%sln_l2norm(this%neq, this%nja,                             &
@@ -11,15 +11,27 @@ module SolutionGroupModule
             GetSolutionGroupFromList, solutiongroup_create
   private :: CastAsSolutionGroupClass
 
+  type :: BaseSolutionPtrType
+    class(BaseSolutionType), pointer :: ptr => null()
+  end type BaseSolutionPtrType
+
   type :: SolutionGroupType
     integer(I4B), pointer                                :: id
     integer(I4B), pointer                                :: mxiter
     integer(I4B), pointer                                :: nsolutions
+    integer(I4B), pointer                                :: nthreads             !number of threads used to solve a level
+    integer(I4B), pointer                                :: nlevels              !number of levels of solutions
     integer(I4B), dimension(:), allocatable              :: idsolutions          !array of solution ids in basesolutionlist
+    integer(I4B), dimension(:), allocatable              :: ialevel              !position of first solution of each level
+    integer(I4B), dimension(:), allocatable              :: jalevel              !solution numbers in this group, ordered by level
+    type(BaseSolutionPtrType), dimension(:), allocatable :: solutionptrs         !pointers to the solutions
   contains
+    procedure          :: sgp_df
     procedure          :: sgp_ca
     procedure          :: sgp_da
     procedure, private :: allocate_scalars
+    procedure, private :: sgp_solve
+    procedure, private :: solutions_connected
     procedure          :: add_solution
   end type SolutionGroupType
   
@@ -44,6 +56,101 @@ module SolutionGroupModule
     return
   end subroutine solutiongroup_create
   
+  subroutine sgp_df(this)
+! ******************************************************************************
+! sgp_df -- Define the solution group
+!    Divide the solutions into levels.  A solution is placed in the level
+!    after the last level of the preceding solutions that it is connected to
+!    by an exchange, so the solutions of a level do not depend on each other
+!    and can be solved by several threads.  The solutions are solved in the
+!    order they are listed if one thread is used.
+! ******************************************************************************
+!
+!    SPECIFICATIONS:
+! ------------------------------------------------------------------------------
+    ! -- modules
+    use SimVariablesModule,     only: iout, warnmsg
+    use SimModule,              only: store_warning
+    ! -- dummy
+    class(SolutionGroupType) :: this
+    ! -- local
+    integer(I4B), dimension(:), allocatable :: ilevel
+    integer(I4B) :: is, js, i, n
+    integer(I4B) :: iomp
+    ! -- formats
+    character(len=*), parameter :: fmtlevel =                                  &
+      "(1x,'SOLUTION GROUP ',i0,' LEVEL ',i0,' SOLUTION(S):',*(1x,i0))"
+! ------------------------------------------------------------------------------
+    !
+    ! -- threads are only available if MODFLOW 6 is compiled with OpenMP
+    iomp = 0
+!$  iomp = 1
+    if (this%nthreads > 1 .and. iomp == 0) then
+      write(warnmsg,'(a,1x,a,1x,i0,1x,a)')                                     &
+        'MODFLOW 6 WAS NOT COMPILED WITH OPENMP.',                             &
+        'NUMBER_OF_THREADS FOR SOLUTION GROUP', this%id, 'WILL BE SET TO 1.'
+      call store_warning(warnmsg)
+      this%nthreads = 1
+    end if
+    !
+    ! -- store pointers to the solutions, which may be solved by several
+    !    threads
+    allocate(this%solutionptrs(this%nsolutions))
+    do is = 1, this%nsolutions
+      this%solutionptrs(is)%ptr =>                                             &
+        GetBaseSolutionFromList(basesolutionlist, this%idsolutions(is))
+    end do
+    !
+    ! -- find the level of each solution
+    allocate(ilevel(this%nsolutions))
+    do is = 1, this%nsolutions
+      if (this%nthreads > 1) then
+        ilevel(is) = 1
+        do js = 1, is - 1
+          if (ilevel(js) >= ilevel(is)) then
+            if (this%solutions_connected(this%idsolutions(js),                 &
+                                         this%idsolutions(is))) then
+              ilevel(is) = ilevel(js) + 1
+            end if
+          end if
+        end do
+      else
+        ilevel(is) = is
+      end if
+    end do
+    !
+    ! -- order the solutions by level
+    this%nlevels = maxval(ilevel)
+    allocate(this%ialevel(this%nlevels + 1))
+    allocate(this%jalevel(this%nsolutions))
+    n = 0
+    do i = 1, this%nlevels
+      this%ialevel(i) = n + 1
+      do is = 1, this%nsolutions
+        if (ilevel(is) == i) then
+          n = n + 1
+          this%jalevel(n) = is
+        end if
+      end do
+    end do
+    this%ialevel(this%nlevels + 1) = n + 1
+    deallocate(ilevel)
+    !
+    ! -- write the levels
+    if (this%nthreads > 1) then
+      write(iout, '(/1x,a,1x,i0,1x,a,1x,i0,1x,a)') 'SOLUTION GROUP', this%id, &
+        'WILL BE SOLVED WITH', this%nthreads, 'THREAD(S)'
+      do i = 1, this%nlevels
+        write(iout, fmtlevel) this%id, i,                                      &
+          (this%idsolutions(this%jalevel(n)),                                  &
+           n = this%ialevel(i), this%ialevel(i + 1) - 1)
+      end do
+    end if
+    !
+    ! -- return
+    return
+  end subroutine sgp_df
+
   subroutine sgp_ca(this)
 ! ******************************************************************************
 ! sgp_ca -- Calculate the solution group
@@ -62,9 +169,7 @@ module SolutionGroupModule
     ! -- dummy
     class(SolutionGroupType) :: this
     ! -- local
-    class(BaseSolutionType),  pointer :: sp
     integer(I4B) :: kpicard, isgcnvg, isuppress_output
-    integer(I4B) :: is, isoln
     ! -- formats
     character(len=*), parameter :: fmtnocnvg =                                 &
       "(1X,'Solution Group ', i0, ' did not converge for stress period ', i0,  &
@@ -84,11 +189,7 @@ module SolutionGroupModule
         write(iout,'(/a,i6/)') 'SOLUTION GROUP PICARD ITERATION: ', kpicard
       end if
       isgcnvg = 1
-      do is = 1, this%nsolutions
-        isoln = this%idsolutions(is)
-        sp => GetBaseSolutionFromList(basesolutionlist, isoln)
-        call sp%sln_ca(isgcnvg, isuppress_output)
-      enddo
+      call this%sgp_solve(isgcnvg, isuppress_output)
       if(isgcnvg == 1) exit picardloop
     enddo picardloop
     !
@@ -99,11 +200,7 @@ module SolutionGroupModule
     if(isgcnvg == 1) then
       if(this%mxiter > 1) then
         isuppress_output = 0
-        do is = 1, this%nsolutions
-          isoln = this%idsolutions(is)
-          sp => GetBaseSolutionFromList(basesolutionlist, isoln)
-          call sp%sln_ca(isgcnvg, isuppress_output)
-        enddo
+        call this%sgp_solve(isgcnvg, isuppress_output)
       endif
     else
       isimcnvg = 0
@@ -114,6 +211,88 @@ module SolutionGroupModule
     return
   end subroutine sgp_ca
 
+  subroutine sgp_solve(this, isgcnvg, isuppress_output)
+! ******************************************************************************
+! sgp_solve -- Solve each solution of the solution group for the time step.
+!    The levels are solved in order.  The solutions of a level are solved by
+!    nthreads threads, and each solution sets its own convergence flag.
+!    isgcnvg is set to zero if any solution did not converge.
+! ******************************************************************************
+!
+!    SPECIFICATIONS:
+! ------------------------------------------------------------------------------
+    ! -- dummy
+    class(SolutionGroupType) :: this
+    integer(I4B), intent(inout) :: isgcnvg
+    integer(I4B), intent(in) :: isuppress_output
+    ! -- local
+    integer(I4B), dimension(this%nsolutions) :: icnvg
+    integer(I4B) :: i, is, ilevel
+! ------------------------------------------------------------------------------
+    !
+    icnvg(:) = isgcnvg
+    do ilevel = 1, this%nlevels
+!$OMP PARALLEL DO IF(this%nthreads > 1) NUM_THREADS(this%nthreads)             &
+!$OMP SCHEDULE(DYNAMIC) PRIVATE(is)
+      do i = this%ialevel(ilevel), this%ialevel(ilevel + 1) - 1
+        is = this%jalevel(i)
+        call this%solutionptrs(is)%ptr%sln_ca(icnvg(is), isuppress_output)
+      end do
+!$OMP END PARALLEL DO
+    end do
+    isgcnvg = minval(icnvg)
+    !
+    ! -- return
+    return
+  end subroutine sgp_solve
+
+  function solutions_connected(this, isoln, jsoln) result(is_connected)
+! ******************************************************************************
+! solutions_connected -- Return true if an exchange connects a model in
+!    solution isoln to a model in solution jsoln
+! ******************************************************************************
+!
+!    SPECIFICATIONS:
+! ------------------------------------------------------------------------------
+    ! -- modules
+    use ListsModule,        only: basemodellist, baseexchangelist
+    use BaseModelModule,    only: BaseModelType, GetBaseModelFromList
+    use BaseExchangeModule, only: BaseExchangeType, GetBaseExchangeFromList
+    ! -- dummy
+    class(SolutionGroupType) :: this
+    integer(I4B), intent(in) :: isoln
+    integer(I4B), intent(in) :: jsoln
+    ! -- return
+    logical :: is_connected
+    ! -- local
+    class(BaseExchangeType), pointer :: ep
+    class(BaseModelType), pointer :: mp1
+    class(BaseModelType), pointer :: mp2
+    integer(I4B) :: ic, im, jm
+! ------------------------------------------------------------------------------
+    !
+    is_connected = .false.
+    exgloop: do ic = 1, baseexchangelist%Count()
+      ep => GetBaseExchangeFromList(baseexchangelist, ic)
+      do im = 1, basemodellist%Count()
+        mp1 => GetBaseModelFromList(basemodellist, im)
+        if (mp1%idsoln /= isoln) cycle
+        if (.not. ep%connects_model(mp1)) cycle
+        do jm = 1, basemodellist%Count()
+          mp2 => GetBaseModelFromList(basemodellist, jm)
+          if (mp2%idsoln /= jsoln) cycle
+          if (ep%connects_model(mp2)) then
+            is_connected = .true.
+            exit exgloop
+          end if
+        end do
+      end do
+    end do exgloop
+    !
+    ! -- return
+    return
+  end function solutions_connected
+
   subroutine sgp_da(this)
 ! ******************************************************************************
 ! deallocate
@@ -127,7 +306,12 @@ module SolutionGroupModule
     deallocate(this%id)
     deallocate(this%mxiter)
     deallocate(this%nsolutions)
+    deallocate(this%nthreads)
+    deallocate(this%nlevels)
     deallocate(this%idsolutions)
+    if (allocated(this%ialevel)) deallocate(this%ialevel)
+    if (allocated(this%jalevel)) deallocate(this%jalevel)
+    if (allocated(this%solutionptrs)) deallocate(this%solutionptrs)
     !
     ! -- return
     return
@@ -146,9 +330,13 @@ module SolutionGroupModule
     allocate(this%id)
     allocate(this%mxiter)
     allocate(this%nsolutions)
+    allocate(this%nthreads)
+    allocate(this%nlevels)
     this%id = 0
     this%mxiter = 1
     this%nsolutions = 0
+    this%nthreads = 1
+    this%nlevels = 0
     !
     ! -- return
     return
@@ -0,0 +1,1007 @@
+! Smoothed aggregation algebraic multigrid (AMG) preconditioner for the
+! IMS linear accelerators.
+!
+! The hierarchy is built from the coefficient matrix of the solution:
+!
+!   1. strong connections are connections with
+!      |a(i,j)| >= AMGTHETA * sqrt(|a(i,i) * a(j,j)|), rows without strong
+!      connections (for example constant head cells) are not aggregated
+!   2. the nodes are grouped into aggregates of strongly connected nodes
+!   3. the tentative interpolation (one for the nodes of an aggregate) is
+!      smoothed with one damped Jacobi step using the filtered matrix, in
+!      which weak connections are added to the diagonal
+!   4. restriction is the transpose of interpolation and the coarse matrix
+!      is the Galerkin product R * A * P
+!
+! Coarsening stops when the coarse grid is small, when coarsening stalls, or
+! when AMGMAXLEVELS levels have been created. The preconditioner is one
+! V-cycle with a forward Gauss-Seidel pre-smoothing sweep and a backward
+! Gauss-Seidel post-smoothing sweep, so it is symmetric for symmetric
+! matrices and can be used with CG. The coarsest grid is solved with a dense
+! LU factorization if it is small enough and with Gauss-Seidel sweeps
+! otherwise.
+!
+! The finest matrix is not copied. It is passed to amg_apply, so the
+! smoothers on the finest level always use the current matrix, even if the
+! coarse levels are reused from an earlier setup.
+module IMSAmgModule
+
+  use KindModule, only: DP, I4B
+  use ConstantsModule, only: DZERO, DONE, DEM6
+
+  implicit none
+  private
+  public :: ImsAmgType
+
+  integer(I4B), parameter :: AMGMAXLEVELS = 10                                   !< maximum number of levels
+  integer(I4B), parameter :: AMGMINCOARSE = 50                                   !< coarsening stops below this size
+  integer(I4B), parameter :: AMGMAXDENSE = 400                                   !< largest coarsest grid solved with dense LU
+  integer(I4B), parameter :: AMGCOARSESWEEPS = 10                                !< sweeps if the coarsest grid is not dense
+  real(DP), parameter :: AMGTHETA = 0.08_DP                                      !< strength of connection threshold
+  real(DP), parameter :: AMGSTALL = 0.8_DP                                       !< coarsening stalls above this ratio
+
+  type :: AmgLevelType
+    integer(I4B) :: n = 0                                                        !< number of rows
+    integer(I4B) :: nc = 0                                                       !< number of rows of the next coarser level
+    integer(I4B), dimension(:), allocatable :: ia                                !< row pointers of the matrix (coarse levels)
+    integer(I4B), dimension(:), allocatable :: ja                                !< columns of the matrix (coarse levels)
+    real(DP), dimension(:), allocatable :: a                                     !< values of the matrix (coarse levels)
+    integer(I4B), dimension(:), allocatable :: idiag                             !< position of the diagonal in each row
+    integer(I4B), dimension(:), allocatable :: iap                               !< row pointers of interpolation
+    integer(I4B), dimension(:), allocatable :: jap                               !< columns of interpolation
+    real(DP), dimension(:), allocatable :: ap                                    !< values of interpolation
+    integer(I4B), dimension(:), allocatable :: iar                               !< row pointers of restriction
+    integer(I4B), dimension(:), allocatable :: jar                               !< columns of restriction
+    real(DP), dimension(:), allocatable :: ar                                    !< values of restriction
+    real(DP), dimension(:), allocatable :: x                                     !< solution on the level
+    real(DP), dimension(:), allocatable :: b                                     !< right-hand side on the level
+    real(DP), dimension(:), allocatable :: r                                     !< residual on the level
+  end type AmgLevelType
+
+  type :: ImsAmgType
+    integer(I4B) :: nlevels = 0                                                  !< number of levels in the hierarchy
+    integer(I4B) :: nsetup = 0                                                   !< number of times the hierarchy was built
+    integer(I4B) :: idense = 0                                                   !< coarsest level is solved with dense LU
+    real(DP), dimension(:, :), allocatable :: dlu                                !< dense LU factors of the coarsest level
+    integer(I4B), dimension(:), allocatable :: ipiv                              !< pivots of the dense LU factorization
+    type(AmgLevelType), dimension(:), allocatable :: levels                      !< levels of the hierarchy
+  contains
+    procedure :: amg_setup
+    procedure :: amg_apply
+    procedure :: amg_da
+    procedure, private :: amg_summary
+    procedure, private :: coarse_solve
+  end type ImsAmgType
+
+  contains
+
+  subroutine amg_setup(this, iout, neq, nja, ia, ja, a)
+! ******************************************************************************
+! amg_setup -- Build the multigrid hierarchy for the matrix
+! ******************************************************************************
+!
+!    SPECIFICATIONS:
+! ------------------------------------------------------------------------------
+    ! -- dummy
+    class(ImsAmgType) :: this
+    integer(I4B), intent(in) :: iout
+    integer(I4B), intent(in) :: neq
+    integer(I4B), intent(in) :: nja
+    integer(I4B), dimension(neq+1), intent(in) :: ia
+    integer(I4B), dimension(nja), intent(in) :: ja
+    real(DP), dimension(nja), intent(in) :: a
+    ! -- local
+    type(AmgLevelType), dimension(:), allocatable :: levels
+    integer(I4B), dimension(:), allocatable :: iapt
+    integer(I4B), dimension(:), allocatable :: japt
+    real(DP), dimension(:), allocatable :: apt
+    integer(I4B) :: nc
+    integer(I4B) :: k
+! ------------------------------------------------------------------------------
+    !
+    ! -- remove the previous hierarchy
+    call this%amg_da()
+    allocate(levels(AMGMAXLEVELS))
+    !
+    ! -- finest level, the matrix is not stored
+    levels(1)%n = neq
+    allocate(levels(1)%idiag(neq))
+    call find_diagonal(neq, nja, ia, ja, levels(1)%idiag)
+    !
+    ! -- coarsen until the grid is small or coarsening stalls
+    k = 1
+    do
+      if (k == AMGMAXLEVELS) exit
+      if (levels(k)%n <= AMGMINCOARSE) exit
+      if (k == 1) then
+        call coarsen(neq, nja, ia, ja, a, levels(1)%idiag, nc,                 &
+                     levels(1)%iap, levels(1)%jap, levels(1)%ap)
+      else
+        call coarsen(levels(k)%n, size(levels(k)%ja), levels(k)%ia,            &
+                     levels(k)%ja, levels(k)%a, levels(k)%idiag, nc,           &
+                     levels(k)%iap, levels(k)%jap, levels(k)%ap)
+      end if
+      if (nc == 0 .or. real(nc, DP) > AMGSTALL * real(levels(k)%n, DP)) then
+        deallocate(levels(k)%iap, levels(k)%jap, levels(k)%ap)
+        exit
+      end if
+      levels(k)%nc = nc
+      !
+      ! -- restriction is the transpose of interpolation
+      call transpose_csr(levels(k)%n, nc, levels(k)%iap, levels(k)%jap,        &
+                         levels(k)%ap, levels(k)%iar, levels(k)%jar,           &
+                         levels(k)%ar)
+      !
+      ! -- coarse matrix R * (A * P)
+      if (k == 1) then
+        call multiply_csr(neq, nc, ia, ja, a, levels(1)%iap, levels(1)%jap,    &
+                          levels(1)%ap, iapt, japt, apt)
+      else
+        call multiply_csr(levels(k)%n, nc, levels(k)%ia, levels(k)%ja,         &
+                          levels(k)%a, levels(k)%iap, levels(k)%jap,           &
+                          levels(k)%ap, iapt, japt, apt)
+      end if
+      call multiply_csr(nc, nc, levels(k)%iar, levels(k)%jar, levels(k)%ar,    &
+                        iapt, japt, apt, levels(k+1)%ia, levels(k+1)%ja,       &
+                        levels(k+1)%a)
+      deallocate(iapt, japt, apt)
+      levels(k+1)%n = nc
+      allocate(levels(k+1)%idiag(nc))
+      call find_diagonal(nc, size(levels(k+1)%ja), levels(k+1)%ia,             &
+                         levels(k+1)%ja, levels(k+1)%idiag)
+      k = k + 1
+    end do
+    this%nlevels = k
+    !
+    ! -- work vectors
+    do k = 1, this%nlevels
+      allocate(levels(k)%x(levels(k)%n))
+      allocate(levels(k)%b(levels(k)%n))
+      allocate(levels(k)%r(levels(k)%n))
+    end do
+    !
+    ! -- store the levels
+    allocate(this%levels(this%nlevels))
+    do k = 1, this%nlevels
+      call move_level(levels(k), this%levels(k))
+    end do
+    deallocate(levels)
+    !
+    ! -- factor the coarsest level if it is small, the finest level is not
+    !    stored so a one-level hierarchy is always smoothed
+    k = this%nlevels
+    this%idense = 0
+    if (k > 1 .and. this%levels(k)%n <= AMGMAXDENSE) then
+      this%idense = 1
+      call dense_factor(this%levels(k)%n, size(this%levels(k)%ja),             &
+                        this%levels(k)%ia, this%levels(k)%ja,                  &
+                        this%levels(k)%a, this%dlu, this%ipiv)
+    end if
+    !
+    ! -- write the hierarchy the first time it is built
+    this%nsetup = this%nsetup + 1
+    if (this%nsetup == 1 .and. iout > 0) then
+      call this%amg_summary(iout, nja)
+    end if
+    !
+    ! -- Return
+    return
+  end subroutine amg_setup
+
+  subroutine amg_apply(this, neq, nja, ia, ja, a, r, z)
+! ******************************************************************************
+! amg_apply -- Apply one V-cycle to r and return the result in z
+! ******************************************************************************
+!
+!    SPECIFICATIONS:
+! ------------------------------------------------------------------------------
+    ! -- dummy
+    class(ImsAmgType) :: this
+    integer(I4B), intent(in) :: neq
+    integer(I4B), intent(in) :: nja
+    integer(I4B), dimension(neq+1), intent(in) :: ia
+    integer(I4B), dimension(nja), intent(in) :: ja
+    real(DP), dimension(nja), intent(in) :: a
+    real(DP), dimension(neq), intent(in) :: r
+    real(DP), dimension(neq), intent(inout) :: z
+    ! -- local
+    integer(I4B) :: k
+    integer(I4B) :: nl
+    integer(I4B) :: n
+! ------------------------------------------------------------------------------
+    !
+    nl = this%nlevels
+    do n = 1, neq
+      this%levels(1)%b(n) = r(n)
+    end do
+    !
+    ! -- restrict the residual after pre-smoothing
+    do k = 1, nl - 1
+      associate(lev => this%levels(k))
+        do n = 1, lev%n
+          lev%x(n) = DZERO
+        end do
+        if (k == 1) then
+          call gs_sweep(neq, nja, ia, ja, a, lev%idiag, lev%b, lev%x, 1)
+          call residual(neq, nja, ia, ja, a, lev%b, lev%x, lev%r)
+        else
+          call gs_sweep(lev%n, size(lev%ja), lev%ia, lev%ja, lev%a,            &
+                        lev%idiag, lev%b, lev%x, 1)
+          call residual(lev%n, size(lev%ja), lev%ia, lev%ja, lev%a,            &
+                        lev%b, lev%x, lev%r)
+        end if
+        call csr_mv(lev%nc, size(lev%jar), lev%iar, lev%jar, lev%ar, lev%r,    &
+                    this%levels(k+1)%b)
+      end associate
+    end do
+    !
+    ! -- solve on the coarsest level
+    call this%coarse_solve(neq, nja, ia, ja, a)
+    !
+    ! -- interpolate the correction and post-smooth
+    do k = nl - 1, 1, -1
+      associate(lev => this%levels(k))
+        call csr_mv(lev%n, size(lev%jap), lev%iap, lev%jap, lev%ap,            &
+                    this%levels(k+1)%x, lev%r)
+        do n = 1, lev%n
+          lev%x(n) = lev%x(n) + lev%r(n)
+        end do
+        if (k == 1) then
+          call gs_sweep(neq, nja, ia, ja, a, lev%idiag, lev%b, lev%x, -1)
+        else
+          call gs_sweep(lev%n, size(lev%ja), lev%ia, lev%ja, lev%a,            &
+                        lev%idiag, lev%b, lev%x, -1)
+        end if
+      end associate
+    end do
+    !
+    do n = 1, neq
+      z(n) = this%levels(1)%x(n)
+    end do
+    !
+    ! -- Return
+    return
+  end subroutine amg_apply
+
+  subroutine amg_da(this)
+! ******************************************************************************
+! amg_da -- Deallocate the hierarchy
+! ******************************************************************************
+!
+!    SPECIFICATIONS:
+! ------------------------------------------------------------------------------
+    ! -- dummy
+    class(ImsAmgType) :: this
+! ------------------------------------------------------------------------------
+    !
+    if (allocated(this%levels)) deallocate(this%levels)
+    if (allocated(this%dlu)) deallocate(this%dlu)
+    if (allocated(this%ipiv)) deallocate(this%ipiv)
+    this%nlevels = 0
+    this%idense = 0
+    !
+    ! -- Return
+    return
+  end subroutine amg_da
+
+  subroutine amg_summary(this, iout, nja)
+! ******************************************************************************
+! amg_summary -- Write the size of each level of the hierarchy
+! ******************************************************************************
+!
+!    SPECIFICATIONS:
+! ------------------------------------------------------------------------------
+    ! -- dummy
+    class(ImsAmgType) :: this
+    integer(I4B), intent(in) :: iout
+    integer(I4B), intent(in) :: nja
+    ! -- local
+    integer(I4B) :: k
+    integer(I4B) :: nnz
+    ! -- formats
+    character(len=*), parameter :: fmtheader =                                 &
+      "(/,1x,'ALGEBRAIC MULTIGRID HIERARCHY',/,1x,3(a15),/,1x,45('-'))"
+    character(len=*), parameter :: fmtlevel = "(1x,3(i15))"
+    character(len=*), parameter :: fmtcoarse =                                 &
+      "(1x,'COARSEST LEVEL SOLVED WITH ',a,/)"
+! ------------------------------------------------------------------------------
+    !
+    write(iout, fmtheader) 'LEVEL', 'ROWS', 'NONZEROS'
+    do k = 1, this%nlevels
+      if (k == 1) then
+        nnz = nja
+      else
+        nnz = size(this%levels(k)%ja)
+      end if
+      write(iout, fmtlevel) k, this%levels(k)%n, nnz
+    end do
+    if (this%idense /= 0) then
+      write(iout, fmtcoarse) 'DENSE LU FACTORIZATION'
+    else
+      write(iout, fmtcoarse) 'GAUSS-SEIDEL SWEEPS'
+    end if
+    !
+    ! -- Return
+    return
+  end subroutine amg_summary
+
+  subroutine coarse_solve(this, neq, nja, ia, ja, a)
+! ******************************************************************************
+! coarse_solve -- Solve on the coarsest level
+! ******************************************************************************
+!
+!    SPECIFICATIONS:
+! ------------------------------------------------------------------------------
+    ! -- dummy
+    class(ImsAmgType) :: this
+    integer(I4B), intent(in) :: neq
+    integer(I4B), intent(in) :: nja
+    integer(I4B), dimension(neq+1), intent(in) :: ia
+    integer(I4B), dimension(nja), intent(in) :: ja
+    real(DP), dimension(nja), intent(in) :: a
+    ! -- local
+    integer(I4B) :: i
+    integer(I4B) :: n
+! ------------------------------------------------------------------------------
+    !
+    associate(lev => this%levels(this%nlevels))
+      if (this%idense /= 0) then
+        call dense_solve(lev%n, this%dlu, this%ipiv, lev%b, lev%x)
+      else
+        do n = 1, lev%n
+          lev%x(n) = DZERO
+        end do
+        do i = 1, AMGCOARSESWEEPS
+          if (this%nlevels == 1) then
+            call gs_sweep(neq, nja, ia, ja, a, lev%idiag, lev%b, lev%x, 1)
+            call gs_sweep(neq, nja, ia, ja, a, lev%idiag, lev%b, lev%x, -1)
+          else
+            call gs_sweep(lev%n, size(lev%ja), lev%ia, lev%ja, lev%a,          &
+                          lev%idiag, lev%b, lev%x, 1)
+            call gs_sweep(lev%n, size(lev%ja), lev%ia, lev%ja, lev%a,          &
+                          lev%idiag, lev%b, lev%x, -1)
+          end if
+        end do
+      end if
+    end associate
+    !
+    ! -- Return
+    return
+  end subroutine coarse_solve
+
+  subroutine coarsen(n, nja, ia, ja, a, idiag, nc, iap, jap, ap)
+! ******************************************************************************
+! coarsen -- Aggregate the nodes of a level and build the smoothed
+!   interpolation from the coarse level
+! ******************************************************************************
+!
+!    SPECIFICATIONS:
+! ------------------------------------------------------------------------------
+    ! -- dummy
+    integer(I4B), intent(in) :: n
+    integer(I4B), intent(in) :: nja
+    integer(I4B), dimension(n+1), intent(in) :: ia
+    integer(I4B), dimension(nja), intent(in) :: ja
+    real(DP), dimension(nja), intent(in) :: a
+    integer(I4B), dimension(n), intent(in) :: idiag
+    integer(I4B), intent(out) :: nc
+    integer(I4B), dimension(:), allocatable, intent(inout) :: iap
+    integer(I4B), dimension(:), allocatable, intent(inout) :: jap
+    real(DP), dimension(:), allocatable, intent(inout) :: ap
+    ! -- local
+    logical, dimension(:), allocatable :: strong
+    integer(I4B), dimension(:), allocatable :: nstrong
+    integer(I4B), dimension(:), allocatable :: iagg
+    integer(I4B), dimension(:), allocatable :: iagg1
+    integer(I4B), dimension(:), allocatable :: imark
+    real(DP), dimension(:), allocatable :: dd
+    real(DP), dimension(:), allocatable :: df
+    real(DP), dimension(:), allocatable :: w
+    integer(I4B), dimension(:), allocatable :: jw
+    integer(I4B) :: i, j, jj, jc, nw, ip
+    logical :: lfree
+    real(DP) :: aij, amax, rho, rowsum, omega, fact
+! ------------------------------------------------------------------------------
+    !
+    allocate(strong(nja), nstrong(n), dd(n))
+    do i = 1, n
+      dd(i) = DZERO
+      if (idiag(i) > 0) dd(i) = a(idiag(i))
+    end do
+    !
+    ! -- strong connections, a row without strong connections is isolated
+    do i = 1, n
+      nstrong(i) = 0
+      do jj = ia(i), ia(i+1) - 1
+        strong(jj) = .false.
+        j = ja(jj)
+        if (j == i) cycle
+        aij = abs(a(jj))
+        if (aij == DZERO) cycle
+        if (aij >= AMGTHETA * sqrt(abs(dd(i) * dd(j)))) then
+          strong(jj) = .true.
+          nstrong(i) = nstrong(i) + 1
+        end if
+      end do
+    end do
+    do i = 1, n
+      do jj = ia(i), ia(i+1) - 1
+        if (strong(jj)) then
+          if (nstrong(ja(jj)) == 0) then
+            strong(jj) = .false.
+            nstrong(i) = nstrong(i) - 1
+          end if
+        end if
+      end do
+    end do
+    !
+    ! -- pass 1, aggregates of a node and its strong neighbors if none of
+    !    them have been aggregated
+    allocate(iagg(n), iagg1(n))
+    nc = 0
+    do i = 1, n
+      iagg(i) = 0
+      if (nstrong(i) == 0) iagg(i) = -1
+    end do
+    do i = 1, n
+      if (iagg(i) /= 0) cycle
+      lfree = .true.
+      do jj = ia(i), ia(i+1) - 1
+        if (strong(jj)) then
+          if (iagg(ja(jj)) /= 0) then
+            lfree = .false.
+            exit
+          end if
+        end if
+      end do
+      if (.not. lfree) cycle
+      nc = nc + 1
+      iagg(i) = nc
+      do jj = ia(i), ia(i+1) - 1
+        if (strong(jj)) iagg(ja(jj)) = nc
+      end do
+    end do
+    !
+    ! -- pass 2, add the remaining nodes to the aggregate of the most
+    !    strongly connected neighbor from pass 1
+    do i = 1, n
+      iagg1(i) = iagg(i)
+    end do
+    do i = 1, n
+      if (iagg(i) /= 0) cycle
+      amax = DZERO
+      do jj = ia(i), ia(i+1) - 1
+        if (strong(jj)) then
+          j = ja(jj)
+          if (iagg1(j) > 0 .and. abs(a(jj)) > amax) then
+            amax = abs(a(jj))
+            iagg(i) = iagg1(j)
+          end if
+        end if
+      end do
+    end do
+    !
+    ! -- pass 3, new aggregates for nodes that are still not aggregated
+    do i = 1, n
+      if (iagg(i) /= 0) cycle
+      nc = nc + 1
+      iagg(i) = nc
+      do jj = ia(i), ia(i+1) - 1
+        if (strong(jj)) then
+          if (iagg(ja(jj)) == 0) iagg(ja(jj)) = nc
+        end if
+      end do
+    end do
+    !
+    ! -- diagonal of the filtered matrix, the weak connections are added to
+    !    the diagonal, and the Gershgorin estimate of the spectral radius
+    allocate(df(n))
+    rho = DZERO
+    do i = 1, n
+      df(i) = dd(i)
+      do jj = ia(i), ia(i+1) - 1
+        if (ja(jj) /= i .and. .not. strong(jj)) df(i) = df(i) + a(jj)
+      end do
+      if (df(i) == DZERO) cycle
+      rowsum = abs(df(i))
+      do jj = ia(i), ia(i+1) - 1
+        if (strong(jj)) rowsum = rowsum + abs(a(jj))
+      end do
+      rho = max(rho, rowsum / abs(df(i)))
+    end do
+    omega = DZERO
+    if (rho > DZERO) omega = 4.0_DP / (3.0_DP * rho)
+    !
+    ! -- smoothed interpolation P = (I - omega * Df^-1 * Af) * Ptent
+    allocate(iap(n+1), imark(max(nc, 1)), w(max(nc, 1)), jw(max(nc, 1)))
+    do jc = 1, nc
+      imark(jc) = 0
+    end do
+    !
+    ! -- count the nonzeros in each row
+    iap(1) = 1
+    do i = 1, n
+      nw = 0
+      if (iagg(i) > 0) then
+        nw = 1
+        imark(iagg(i)) = i
+      end if
+      if (df(i) /= DZERO) then
+        do jj = ia(i), ia(i+1) - 1
+          if (strong(jj)) then
+            jc = iagg(ja(jj))
+            if (jc > 0) then
+              if (imark(jc) /= i) then
+                imark(jc) = i
+                nw = nw + 1
+              end if
+            end if
+          end if
+        end do
+      end if
+      iap(i+1) = iap(i) + nw
+    end do
+    allocate(jap(iap(n+1) - 1), ap(iap(n+1) - 1))
+    !
+    ! -- fill the rows
+    do jc = 1, nc
+      imark(jc) = 0
+    end do
+    do i = 1, n
+      nw = 0
+      if (iagg(i) > 0) then
+        nw = 1
+        jw(1) = iagg(i)
+        w(1) = DONE
+        imark(iagg(i)) = 1
+      end if
+      if (df(i) /= DZERO) then
+        fact = omega / df(i)
+        if (iagg(i) > 0) w(1) = w(1) - omega
+        do jj = ia(i), ia(i+1) - 1
+          if (strong(jj)) then
+            jc = iagg(ja(jj))
+            if (jc > 0) then
+              if (imark(jc) == 0) then
+                nw = nw + 1
+                jw(nw) = jc
+                w(nw) = DZERO
+                imark(jc) = nw
+              end if
+              w(imark(jc)) = w(imark(jc)) - fact * a(jj)
+            end if
+          end if
+        end do
+      end if
+      ip = iap(i)
+      do j = 1, nw
+        jap(ip) = jw(j)
+        ap(ip) = w(j)
+        imark(jw(j)) = 0
+        ip = ip + 1
+      end do
+    end do
+    !
+    deallocate(strong, nstrong, dd, df, iagg, iagg1, imark, w, jw)
+    !
+    ! -- Return
+    return
+  end subroutine coarsen
+
+  subroutine find_diagonal(n, nja, ia, ja, idiag)
+! ******************************************************************************
+! find_diagonal -- Find the position of the diagonal in each row, zero if
+!   the row does not have a diagonal
+! ******************************************************************************
+!
+!    SPECIFICATIONS:
+! ------------------------------------------------------------------------------
+    ! -- dummy
+    integer(I4B), intent(in) :: n
+    integer(I4B), intent(in) :: nja
+    integer(I4B), dimension(n+1), intent(in) :: ia
+    integer(I4B), dimension(nja), intent(in) :: ja
+    integer(I4B), dimension(n), intent(inout) :: idiag
+    ! -- local
+    integer(I4B) :: i, jj
+! ------------------------------------------------------------------------------
+    !
+    do i = 1, n
+      idiag(i) = 0
+      do jj = ia(i), ia(i+1) - 1
+        if (ja(jj) == i) then
+          idiag(i) = jj
+          exit
+        end if
+      end do
+    end do
+    !
+    ! -- Return
+    return
+  end subroutine find_diagonal
+
+  subroutine transpose_csr(n, m, ia, ja, a, iat, jat, at)
+! ******************************************************************************
+! transpose_csr -- Transpose the n by m matrix (ia, ja, a)
+! ******************************************************************************
+!
+!    SPECIFICATIONS:
+! ------------------------------------------------------------------------------
+    ! -- dummy
+    integer(I4B), intent(in) :: n
+    integer(I4B), intent(in) :: m
+    integer(I4B), dimension(n+1), intent(in) :: ia
+    integer(I4B), dimension(:), intent(in) :: ja
+    real(DP), dimension(:), intent(in) :: a
+    integer(I4B), dimension(:), allocatable, intent(inout) :: iat
+    integer(I4B), dimension(:), allocatable, intent(inout) :: jat
+    real(DP), dimension(:), allocatable, intent(inout) :: at
+    ! -- local
+    integer(I4B) :: i, j, jj, ip
+! ------------------------------------------------------------------------------
+    !
+    allocate(iat(m+1), jat(ia(n+1) - 1), at(ia(n+1) - 1))
+    do j = 1, m + 1
+      iat(j) = 0
+    end do
+    do jj = 1, ia(n+1) - 1
+      iat(ja(jj) + 1) = iat(ja(jj) + 1) + 1
+    end do
+    iat(1) = 1
+    do j = 1, m
+      iat(j+1) = iat(j+1) + iat(j)
+    end do
+    !
+    ! -- iat(j) is advanced to the start of row j + 1 while filling
+    do i = 1, n
+      do jj = ia(i), ia(i+1) - 1
+        j = ja(jj)
+        ip = iat(j)
+        jat(ip) = i
+        at(ip) = a(jj)
+        iat(j) = ip + 1
+      end do
+    end do
+    do j = m, 1, -1
+      iat(j+1) = iat(j)
+    end do
+    iat(1) = 1
+    !
+    ! -- Return
+    return
+  end subroutine transpose_csr
+
+  subroutine multiply_csr(n, m, ia, ja, a, ib, jb, b, ic, jc, c)
+! ******************************************************************************
+! multiply_csr -- Multiply the matrix (ia, ja, a) with n rows and the matrix
+!   (ib, jb, b) with m columns
+! ******************************************************************************
+!
+!    SPECIFICATIONS:
+! ------------------------------------------------------------------------------
+    ! -- dummy
+    integer(I4B), intent(in) :: n
+    integer(I4B), intent(in) :: m
+    integer(I4B), dimension(n+1), intent(in) :: ia
+    integer(I4B), dimension(:), intent(in) :: ja
+    real(DP), dimension(:), intent(in) :: a
+    integer(I4B), dimension(:), intent(in) :: ib
+    integer(I4B), dimension(:), intent(in) :: jb
+    real(DP), dimension(:), intent(in) :: b
+    integer(I4B), dimension(:), allocatable, intent(inout) :: ic
+    integer(I4B), dimension(:), allocatable, intent(inout) :: jc
+    real(DP), dimension(:), allocatable, intent(inout) :: c
+    ! -- local
+    integer(I4B), dimension(:), allocatable :: imark
+    integer(I4B) :: i, k, kk, jj, j, ip
+! ------------------------------------------------------------------------------
+    !
+    allocate(ic(n+1), imark(max(m, 1)))
+    do j = 1, m
+      imark(j) = 0
+    end do
+    !
+    ! -- count the nonzeros in each row
+    ic(1) = 1
+    do i = 1, n
+      ip = 0
+      do kk = ia(i), ia(i+1) - 1
+        k = ja(kk)
+        do jj = ib(k), ib(k+1) - 1
+          j = jb(jj)
+          if (imark(j) /= i) then
+            imark(j) = i
+            ip = ip + 1
+          end if
+        end do
+      end do
+      ic(i+1) = ic(i) + ip
+    end do
+    allocate(jc(ic(n+1) - 1), c(ic(n+1) - 1))
+    !
+    ! -- fill the rows, imark has the position of a column in the row
+    do j = 1, m
+      imark(j) = 0
+    end do
+    do i = 1, n
+      ip = ic(i)
+      do kk = ia(i), ia(i+1) - 1
+        k = ja(kk)
+        do jj = ib(k), ib(k+1) - 1
+          j = jb(jj)
+          if (imark(j) == 0) then
+            imark(j) = ip
+            jc(ip) = j
+            c(ip) = DZERO
+            ip = ip + 1
+          end if
+          c(imark(j)) = c(imark(j)) + a(kk) * b(jj)
+        end do
+      end do
+      do jj = ic(i), ic(i+1) - 1
+        imark(jc(jj)) = 0
+      end do
+    end do
+    deallocate(imark)
+    !
+    ! -- Return
+    return
+  end subroutine multiply_csr
+
+  subroutine csr_mv(n, nja, ia, ja, a, x, y)
+! ******************************************************************************
+! csr_mv -- Calculate y = A * x
+! ******************************************************************************
+!
+!    SPECIFICATIONS:
+! ------------------------------------------------------------------------------
+    ! -- dummy
+    integer(I4B), intent(in) :: n
+    integer(I4B), intent(in) :: nja
+    integer(I4B), dimension(n+1), intent(in) :: ia
+    integer(I4B), dimension(nja), intent(in) :: ja
+    real(DP), dimension(nja), intent(in) :: a
+    real(DP), dimension(:), intent(in) :: x
+    real(DP), dimension(n), intent(inout) :: y
+    ! -- local
+    integer(I4B) :: i, jj
+    real(DP) :: tv
+! ------------------------------------------------------------------------------
+    !
+    do i = 1, n
+      tv = DZERO
+      do jj = ia(i), ia(i+1) - 1
+        tv = tv + a(jj) * x(ja(jj))
+      end do
+      y(i) = tv
+    end do
+    !
+    ! -- Return
+    return
+  end subroutine csr_mv
+
+  subroutine residual(n, nja, ia, ja, a, b, x, r)
+! ******************************************************************************
+! residual -- Calculate r = b - A * x
+! ******************************************************************************
+!
+!    SPECIFICATIONS:
+! ------------------------------------------------------------------------------
+    ! -- dummy
+    integer(I4B), intent(in) :: n
+    integer(I4B), intent(in) :: nja
+    integer(I4B), dimension(n+1), intent(in) :: ia
+    integer(I4B), dimension(nja), intent(in) :: ja
+    real(DP), dimension(nja), intent(in) :: a
+    real(DP), dimension(n), intent(in) :: b
+    real(DP), dimension(n), intent(in) :: x
+    real(DP), dimension(n), intent(inout) :: r
+    ! -- local
+    integer(I4B) :: i, jj
+    real(DP) :: tv
+! ------------------------------------------------------------------------------
+    !
+    do i = 1, n
+      tv = b(i)
+      do jj = ia(i), ia(i+1) - 1
+        tv = tv - a(jj) * x(ja(jj))
+      end do
+      r(i) = tv
+    end do
+    !
+    ! -- Return
+    return
+  end subroutine residual
+
+  subroutine gs_sweep(n, nja, ia, ja, a, idiag, b, x, idir)
+! ******************************************************************************
+! gs_sweep -- Forward (idir = 1) or backward (idir = -1) Gauss-Seidel sweep,
+!   rows without a diagonal are not changed
+! ******************************************************************************
+!
+!    SPECIFICATIONS:
+! ------------------------------------------------------------------------------
+    ! -- dummy
+    integer(I4B), intent(in) :: n
+    integer(I4B), intent(in) :: nja
+    integer(I4B), dimension(n+1), intent(in) :: ia
+    integer(I4B), dimension(nja), intent(in) :: ja
+    real(DP), dimension(nja), intent(in) :: a
+    integer(I4B), dimension(n), intent(in) :: idiag
+    real(DP), dimension(n), intent(in) :: b
+    real(DP), dimension(n), intent(inout) :: x
+    integer(I4B), intent(in) :: idir
+    ! -- local
+    integer(I4B) :: i, i0, i1, jj
+    real(DP) :: tv
+! ------------------------------------------------------------------------------
+    !
+    if (idir > 0) then
+      i0 = 1
+      i1 = n
+    else
+      i0 = n
+      i1 = 1
+    end if
+    do i = i0, i1, idir
+      if (idiag(i) == 0) cycle
+      if (a(idiag(i)) == DZERO) cycle
+      tv = b(i)
+      do jj = ia(i), ia(i+1) - 1
+        if (jj == idiag(i)) cycle
+        tv = tv - a(jj) * x(ja(jj))
+      end do
+      x(i) = tv / a(idiag(i))
+    end do
+    !
+    ! -- Return
+    return
+  end subroutine gs_sweep
+
+  subroutine dense_factor(n, nja, ia, ja, a, dlu, ipiv)
+! ******************************************************************************
+! dense_factor -- LU factorization with partial pivoting of the coarsest
+!   matrix, a zero pivot is replaced with a small value
+! ******************************************************************************
+!
+!    SPECIFICATIONS:
+! ------------------------------------------------------------------------------
+    ! -- dummy
+    integer(I4B), intent(in) :: n
+    integer(I4B), intent(in) :: nja
+    integer(I4B), dimension(n+1), intent(in) :: ia
+    integer(I4B), dimension(nja), intent(in) :: ja
+    real(DP), dimension(nja), intent(in) :: a
+    real(DP), dimension(:, :), allocatable, intent(inout) :: dlu
+    integer(I4B), dimension(:), allocatable, intent(inout) :: ipiv
+    ! -- local
+    integer(I4B) :: i, j, k, jj, ip
+    real(DP) :: amax, t
+! ------------------------------------------------------------------------------
+    !
+    allocate(dlu(n, n), ipiv(n))
+    do j = 1, n
+      do i = 1, n
+        dlu(i, j) = DZERO
+      end do
+    end do
+    do i = 1, n
+      do jj = ia(i), ia(i+1) - 1
+        dlu(i, ja(jj)) = dlu(i, ja(jj)) + a(jj)
+      end do
+    end do
+    do k = 1, n
+      !
+      ! -- pivot
+      ip = k
+      amax = abs(dlu(k, k))
+      do i = k + 1, n
+        if (abs(dlu(i, k)) > amax) then
+          amax = abs(dlu(i, k))
+          ip = i
+        end if
+      end do
+      ipiv(k) = ip
+      if (ip /= k) then
+        do j = 1, n
+          t = dlu(k, j)
+          dlu(k, j) = dlu(ip, j)
+          dlu(ip, j) = t
+        end do
+      end if
+      if (dlu(k, k) == DZERO) dlu(k, k) = DEM6
+      !
+      ! -- eliminate
+      do i = k + 1, n
+        dlu(i, k) = dlu(i, k) / dlu(k, k)
+      end do
+      do j = k + 1, n
+        t = dlu(k, j)
+        if (t == DZERO) cycle
+        do i = k + 1, n
+          dlu(i, j) = dlu(i, j) - dlu(i, k) * t
+        end do
+      end do
+    end do
+    !
+    ! -- Return
+    return
+  end subroutine dense_factor
+
+  subroutine dense_solve(n, dlu, ipiv, b, x)
+! ******************************************************************************
+! dense_solve -- Solve with the dense LU factors
+! ******************************************************************************
+!
+!    SPECIFICATIONS:
+! ------------------------------------------------------------------------------
+    ! -- dummy
+    integer(I4B), intent(in) :: n
+    real(DP), dimension(n, n), intent(in) :: dlu
+    integer(I4B), dimension(n), intent(in) :: ipiv
+    real(DP), dimension(n), intent(in) :: b
+    real(DP), dimension(n), intent(inout) :: x
+    ! -- local
+    integer(I4B) :: i, k
+    real(DP) :: t
+! ------------------------------------------------------------------------------
+    !
+    do i = 1, n
+      x(i) = b(i)
+    end do
+    do k = 1, n
+      if (ipiv(k) /= k) then
+        t = x(k)
+        x(k) = x(ipiv(k))
+        x(ipiv(k)) = t
+      end if
+    end do
+    do k = 1, n
+      do i = k + 1, n
+        x(i) = x(i) - dlu(i, k) * x(k)
+      end do
+    end do
+    do k = n, 1, -1
+      x(k) = x(k) / dlu(k, k)
+      do i = 1, k - 1
+        x(i) = x(i) - dlu(i, k) * x(k)
+      end do
+    end do
+    !
+    ! -- Return
+    return
+  end subroutine dense_solve
+
+  subroutine move_level(from, to)
+! ******************************************************************************
+! move_level -- Move the arrays of a level without copying them
+! ******************************************************************************
+!
+!    SPECIFICATIONS:
+! ------------------------------------------------------------------------------
+    ! -- dummy
+    type(AmgLevelType), intent(inout) :: from
+    type(AmgLevelType), intent(inout) :: to
+! ------------------------------------------------------------------------------
+    !
+    to%n = from%n
+    to%nc = from%nc
+    if (allocated(from%ia)) call move_alloc(from%ia, to%ia)
+    if (allocated(from%ja)) call move_alloc(from%ja, to%ja)
+    if (allocated(from%a)) call move_alloc(from%a, to%a)
+    if (allocated(from%idiag)) call move_alloc(from%idiag, to%idiag)
+    if (allocated(from%iap)) call move_alloc(from%iap, to%iap)
+    if (allocated(from%jap)) call move_alloc(from%jap, to%jap)
+    if (allocated(from%ap)) call move_alloc(from%ap, to%ap)
+    if (allocated(from%iar)) call move_alloc(from%iar, to%iar)
+    if (allocated(from%jar)) call move_alloc(from%jar, to%jar)
+    if (allocated(from%ar)) call move_alloc(from%ar, to%ar)
+    if (allocated(from%x)) call move_alloc(from%x, to%x)
+    if (allocated(from%b)) call move_alloc(from%b, to%b)
+    if (allocated(from%r)) call move_alloc(from%r, to%r)
+    !
+    ! -- Return
+    return
+  end subroutine move_level
+
+end module IMSAmgModule
@@ -8,6 +8,7 @@
                              VDEBUG
   use GenericUtilitiesModule, only: sim_message, IS_SAME
   use IMSReorderingModule, only: ims_genrcm, ims_odrv, ims_dperm, ims_vperm
+  use IMSAmgModule, only: ImsAmgType
   use BlockParserModule, only: BlockParserType
 
   IMPLICIT NONE
@@ -40,6 +41,19 @@
     integer(I4B), POINTER :: NJLU => NULL()
     integer(I4B), POINTER :: NJW => NULL()
     integer(I4B), POINTER :: NWLU => NULL()
+    ! THREADING VARIABLES
+    integer(I4B), POINTER :: NTHREADS => NULL()
+    integer(I4B), POINTER :: NIALEV => NULL()
+    integer(I4B), POINTER :: NLEVL => NULL()
+    integer(I4B), POINTER :: NLEVU => NULL()
+    ! AMG VARIABLES
+    integer(I4B), POINTER :: NAMGREUSE => NULL()
+    TYPE(ImsAmgType), POINTER :: AMG => NULL()
+    ! PRECONDITIONER REUSE VARIABLES
+    integer(I4B), POINTER :: IPCREUSE => NULL()
+    integer(I4B), POINTER :: NPCBUILD => NULL()
+    integer(I4B), POINTER :: NPCREUSE => NULL()
+    real(DP), POINTER :: PCREUSETOL => NULL()
     ! POINTERS TO SOLUTION VARIABLES
     integer(I4B), POINTER :: NEQ => NULL()
     integer(I4B), POINTER :: NJA => NULL()
@@ -54,6 +68,7 @@
     integer(I4B), POINTER,DIMENSION(:),CONTIGUOUS :: IAPC => NULL()
     integer(I4B), POINTER,DIMENSION(:),CONTIGUOUS :: JAPC => NULL()
     real(DP), POINTER, DIMENSION(:), CONTIGUOUS :: APC => NULL()
+    real(DP), POINTER, DIMENSION(:), CONTIGUOUS :: APCLAST => NULL()
     integer(I4B), POINTER, DIMENSION(:), CONTIGUOUS :: LORDER => NULL()
     integer(I4B), POINTER, DIMENSION(:), CONTIGUOUS :: IORDER => NULL()
     integer(I4B), POINTER, DIMENSION(:), CONTIGUOUS :: IARO => NULL()
@@ -81,6 +96,11 @@
     integer(I4B), POINTER, DIMENSION(:), CONTIGUOUS :: JLU => NULL()
     integer(I4B), POINTER, DIMENSION(:), CONTIGUOUS :: JW => NULL()
     real(DP), POINTER, DIMENSION(:), CONTIGUOUS :: WLU => NULL()
+    ! ILU0 AND MILU0 LEVEL SCHEDULING ARRAYS
+    integer(I4B), POINTER, DIMENSION(:), CONTIGUOUS :: ILEVL => NULL()
+    integer(I4B), POINTER, DIMENSION(:), CONTIGUOUS :: JLEVL => NULL()
+    integer(I4B), POINTER, DIMENSION(:), CONTIGUOUS :: ILEVU => NULL()
+    integer(I4B), POINTER, DIMENSION(:), CONTIGUOUS :: JLEVU => NULL()
     
     ! PROCEDURES (METHODS)
     CONTAINS
@@ -108,7 +128,7 @@
 !     ------------------------------------------------------------------
       use MemoryManagerModule, only: mem_allocate
       use MemoryHelperModule,  only: create_mem_path
-      use SimModule, only: ustop, store_error, count_errors,            &
+      use SimModule, only: ustop, store_error, store_warning, count_errors,      &
                            deprecation_warning
       !IMPLICIT NONE
 !     + + + DUMMY VARIABLES + + +
@@ -144,6 +164,8 @@
       integer(I4B) :: ijw
       integer(I4B) :: iwlu
       integer(I4B) :: iwk
+      integer(I4B) :: iomp
+      integer(I4B) :: iamg
 !     + + + PARAMETERS + + +
 !     + + + OUTPUT FORMATS + + +
 !------------------------------------------------------------------
@@ -197,6 +219,8 @@
       THIS%NORTH = 0
 
       THIS%ICNVGOPT = 0
+
+      iamg = 0
 !
 !-------PRINT A MESSAGE IDENTIFYING IMSLINEAR SOLVER PACKAGE
       write(iout,2000)
@@ -314,6 +338,45 @@
                   'MUST BE GREATER THAN OR EQUAL TO ZERO'
                 call store_error(errmsg)
               end if
+            case ('PRECONDITIONER_METHOD')
+              call parser%GetStringCaps(keyword)
+              if (keyword == 'ILU') then
+                iamg = 0
+              else if (keyword == 'AMG') then
+                iamg = 1
+              else
+                write(errmsg,'(3a)')                                             &
+                  'UNKNOWN IMSLINEAR PRECONDITIONER_METHOD (', trim(keyword),    &
+                  ').'
+                call store_error(errmsg)
+              end if
+            case ('AMG_SETUP_REUSE')
+              i = parser%GetInteger()
+              this%namgreuse = i
+              if (i < 1) then
+                write(errmsg,'(a)')                                              &
+                  'IMSLINEAR AMG_SETUP_REUSE MUST BE GREATER THAN ZERO'
+                call store_error(errmsg)
+              end if
+            case ('PRECONDITIONER_REUSE')
+              this%ipcreuse = 1
+            case ('PRECONDITIONER_REUSE_TOLERANCE')
+              r = parser%GetDouble()
+              this%pcreusetol = r
+              if (r < DZERO) then
+                write(errmsg,'(a,1x,a)')                                         &
+                  'IMSLINEAR PRECONDITIONER_REUSE_TOLERANCE',                    &
+                  'MUST BE GREATER THAN OR EQUAL TO ZERO'
+                call store_error(errmsg)
+              end if
+            case ('NUMBER_OF_THREADS')
+              i = parser%GetInteger()
+              this%nthreads = i
+              if (i < 1) then
+                write(errmsg,'(a)')                                              &
+                  'IMSLINEAR NUMBER_OF_THREADS MUST BE GREATER THAN ZERO'
+                call store_error(errmsg)
+              end if
             !
             ! -- deprecated variables
             case ('INNER_HCLOSE')
@@ -353,6 +416,9 @@
       IF (THIS%RELAX > DZERO) THEN
         THIS%IPC = THIS%IPC + 1
       END IF
+      IF (iamg /= 0) THEN
+        THIS%IPC = 5
+      END IF
 !
 !-------ERROR CHECKING FOR OPTIONS
       IF (THIS%ISCL < 0 ) THIS%ISCL = 0
@@ -384,6 +450,17 @@
         call store_error(errmsg)
       END IF
 !
+!-------THREADS ARE ONLY AVAILABLE IF MODFLOW 6 IS COMPILED WITH OPENMP
+      iomp = 0
+!$    iomp = 1
+      IF (THIS%NTHREADS > 1 .AND. iomp == 0) THEN
+        WRITE(warnmsg,'(A,1X,A)')                                               &
+          'MODFLOW 6 WAS NOT COMPILED WITH OPENMP.',                            &
+          'IMSLINEAR NUMBER_OF_THREADS WILL BE SET TO 1.'
+        call store_warning(warnmsg)
+        THIS%NTHREADS = 1
+      END IF
+!
 !-------CHECK FOR ERRORS IN IMSLINEAR      
       if (count_errors() > 0) then
         call parser%StoreErrorUnit()
@@ -426,6 +503,11 @@
         ijw        = 2 * THIS%NEQ
         iwlu       = THIS%NEQ + 1
       END IF
+      ! -- AMG
+      IF (THIS%IPC ==  5) THEN
+        THIS%NIAPC = 1
+        THIS%NJAPC = 1
+      END IF
       THIS%NJLU = ijlu
       THIS%NJW  = ijw
       THIS%NWLU = iwlu
@@ -433,6 +515,15 @@
       CALL mem_allocate(THIS%IAPC, THIS%NIAPC+1, 'IAPC', TRIM(THIS%memoryPath))
       CALL mem_allocate(THIS%JAPC, THIS%NJAPC, 'JAPC', TRIM(THIS%memoryPath))
       CALL mem_allocate(THIS%APC, THIS%NJAPC, 'APC', TRIM(THIS%memoryPath))
+!-------ALLOCATE MEMORY FOR THE COEFFICIENT MATRIX USED TO BUILD THE
+!       PRECONDITIONER, IT IS COMPARED TO THE CURRENT COEFFICIENT MATRIX
+!       IF THE PRECONDITIONER IS REUSED
+      i = 1
+      IF (THIS%IPCREUSE /= 0) i = THIS%NJA
+      CALL mem_allocate(THIS%APCLAST, i, 'APCLAST', TRIM(THIS%memoryPath))
+      DO n = 1, i
+        THIS%APCLAST(n) = DZERO
+      END DO
 !-------ALLOCATE MEMORY FOR ILU0 AND MILU0 NON-ZERO ROW ENTRY VECTOR
       CALL mem_allocate(THIS%IW, THIS%NIAPC, 'IW', TRIM(THIS%memoryPath))
       CALL mem_allocate(THIS%W, THIS%NIAPC, 'W', TRIM(THIS%memoryPath))
@@ -445,6 +536,35 @@
         CALL IMSLINEARSUB_PCCRS(THIS%NEQ,THIS%NJA,THIS%IA,THIS%JA,              &
                                 THIS%IAPC,THIS%JAPC)
       END IF
+!-------ALLOCATE MEMORY FOR THE ILU0 AND MILU0 LEVEL SCHEDULE USED BY THE
+!       THREADED FORWARD AND BACKWARD SOLVES
+      THIS%NIALEV = 1
+      IF (THIS%NTHREADS > 1) THEN
+        IF (THIS%IPC ==  1 .OR. THIS%IPC ==  2) THEN
+          THIS%NIALEV = THIS%NEQ
+        END IF
+      END IF
+      CALL mem_allocate(THIS%ILEVL, THIS%NIALEV+1, 'ILEVL', TRIM(THIS%memoryPath))
+      CALL mem_allocate(THIS%JLEVL, THIS%NIALEV, 'JLEVL', TRIM(THIS%memoryPath))
+      CALL mem_allocate(THIS%ILEVU, THIS%NIALEV+1, 'ILEVU', TRIM(THIS%memoryPath))
+      CALL mem_allocate(THIS%JLEVU, THIS%NIALEV, 'JLEVU', TRIM(THIS%memoryPath))
+      DO n = 1, THIS%NIALEV + 1
+        THIS%ILEVL(n) = IZERO
+        THIS%ILEVU(n) = IZERO
+      END DO
+      DO n = 1, THIS%NIALEV
+        THIS%JLEVL(n) = IZERO
+        THIS%JLEVU(n) = IZERO
+      END DO
+      IF (THIS%NTHREADS > 1) THEN
+        IF (THIS%IPC ==  1 .OR. THIS%IPC ==  2) THEN
+          CALL IMSLINEARSUB_ILU0LEV(THIS%NEQ, THIS%NJA, THIS%IAPC, THIS%JAPC,   &
+                                    THIS%NLEVL, THIS%ILEVL, THIS%JLEVL,         &
+                                    THIS%NLEVU, THIS%ILEVU, THIS%JLEVU)
+        END IF
+      END IF
+!-------CREATE THE AMG HIERARCHY, IT IS BUILT WHEN THE MATRIX IS AVAILABLE
+      ALLOCATE(THIS%AMG)
 !-------ALLOCATE SPACE FOR PERMUTATION VECTOR
       i0     = 1
       iolen  = 1
@@ -540,7 +660,7 @@
 !     + + + LOCAL VARIABLES + + +
       CHARACTER (LEN= 10) :: clin(0:2)
       CHARACTER (LEN= 31) :: clintit(0:2)
-      CHARACTER (LEN= 20) :: cipc(0:4)
+      CHARACTER (LEN= 20) :: cipc(0:5)
       CHARACTER (LEN= 20) :: cscale(0:2)
       CHARACTER (LEN= 25) :: corder(0:2)
       CHARACTER (LEN= 16), DIMENSION(0:4) :: ccnvgopt
@@ -559,7 +679,8 @@
      &            'INCOMPLETE LU       ', &
      &            'MOD. INCOMPLETE LU  ', &
      &            'INCOMPLETE LUT      ', &
-     &            'MOD. INCOMPLETE LUT '/
+     &            'MOD. INCOMPLETE LUT ', &
+     &            'ALGEBRAIC MULTIGRID '/
       DATA cscale/'NO SCALING          ', &
      &            'SYMMETRIC SCALING   ', &
      &            'L2 NORM SCALING     '/
@@ -587,6 +708,9 @@
      &        ' RESIDUAL CONVERGENCE OPTION           =',I9,/, &
      &        ' RESIDUAL CONVERGENCE NORM             =',1X,A,/, &
      &        ' RELAXATION FACTOR                     =',E15.5)
+02012 FORMAT (' NUMBER OF THREADS                     =',I9)
+02013 FORMAT (' AMG SETUP REUSE (OUTER ITERATIONS)    =',I9)
+02014 FORMAT (' PRECONDITIONER REUSE TOLERANCE        =',E15.5)
 02015 FORMAT (' NUMBER OF LEVELS                      =',A15,/, &
      &        ' DROP TOLERANCE                        =',A15,//)
 2030  FORMAT(1X,A20,1X,6(I6,1X))
@@ -606,6 +730,15 @@
                         THIS%NORTH, THIS%DVCLOSE, THIS%RCLOSE,      &
                         THIS%ICNVGOPT, ccnvgopt(THIS%ICNVGOPT),     &
                         THIS%RELAX
+      if (this%nthreads > 1) then
+        write(this%iout,2012) this%nthreads
+      end if
+      if (this%ipc == 5) then
+        write(this%iout,2013) this%namgreuse
+      end if
+      if (this%ipcreuse /= 0) then
+        write(this%iout,2014) this%pcreusetol
+      end if
       if (this%level > 0) then
         write(clevel, '(i15)') this%level
       end if
@@ -668,6 +801,15 @@
       call mem_allocate(this%njlu, 'NJLU', this%memoryPath)
       call mem_allocate(this%njw, 'NJW', this%memoryPath)
       call mem_allocate(this%nwlu, 'NWLU', this%memoryPath)
+      call mem_allocate(this%nthreads, 'NTHREADS', this%memoryPath)
+      call mem_allocate(this%nialev, 'NIALEV', this%memoryPath)
+      call mem_allocate(this%nlevl, 'NLEVL', this%memoryPath)
+      call mem_allocate(this%nlevu, 'NLEVU', this%memoryPath)
+      call mem_allocate(this%namgreuse, 'NAMGREUSE', this%memoryPath)
+      call mem_allocate(this%ipcreuse, 'IPCREUSE', this%memoryPath)
+      call mem_allocate(this%npcbuild, 'NPCBUILD', this%memoryPath)
+      call mem_allocate(this%npcreuse, 'NPCREUSE', this%memoryPath)
+      call mem_allocate(this%pcreusetol, 'PCREUSETOL', this%memoryPath)
       !
       ! -- initialize
       this%iout = 0
@@ -693,6 +835,15 @@
       this%njlu = 0
       this%njw = 0
       this%nwlu = 0
+      this%nthreads = 1
+      this%nialev = 0
+      this%nlevl = 0
+      this%nlevu = 0
+      this%namgreuse = 1
+      this%ipcreuse = 0
+      this%npcbuild = 0
+      this%npcreuse = 0
+      this%pcreusetol = DZERO
       !
       ! --Return
       return
@@ -708,11 +859,16 @@
       call mem_deallocate(this%iapc)
       call mem_deallocate(this%japc)
       call mem_deallocate(this%apc)
+      call mem_deallocate(this%apclast)
       call mem_deallocate(this%iw)
       call mem_deallocate(this%w)
       call mem_deallocate(this%jlu)
       call mem_deallocate(this%jw)
       call mem_deallocate(this%wlu)
+      call mem_deallocate(this%ilevl)
+      call mem_deallocate(this%jlevl)
+      call mem_deallocate(this%ilevu)
+      call mem_deallocate(this%jlevu)
       call mem_deallocate(this%lorder)
       call mem_deallocate(this%iorder)
       call mem_deallocate(this%iaro)
@@ -753,6 +909,19 @@
       call mem_deallocate(this%njlu)
       call mem_deallocate(this%njw)
       call mem_deallocate(this%nwlu)
+      call mem_deallocate(this%nthreads)
+      call mem_deallocate(this%nialev)
+      call mem_deallocate(this%nlevl)
+      call mem_deallocate(this%nlevu)
+      call mem_deallocate(this%namgreuse)
+      call mem_deallocate(this%ipcreuse)
+      call mem_deallocate(this%npcbuild)
+      call mem_deallocate(this%npcreuse)
+      call mem_deallocate(this%pcreusetol)
+      !
+      ! -- amg hierarchy
+      call this%amg%amg_da()
+      deallocate(this%amg)
       !
       ! -- nullify pointers
       nullify(this%iprims)
@@ -862,6 +1031,7 @@
       integer(I4B) :: innerit
       integer(I4B) :: irc
       integer(I4B) :: itmax
+      integer(I4B) :: ipcu
       real(DP) :: tv
       real(DP) :: rmax
 !     + + + PARAMETERS + + +
@@ -905,12 +1075,42 @@
         THIS%A0  => THIS%AMAT
       END IF
 !
+!-------DETERMINE IF THE PRECONDITIONER IS UPDATED, IT IS REUSED IF THE
+!       COEFFICIENT MATRIX HAS NOT CHANGED BY MORE THAN PCREUSETOL SINCE THE
+!       PRECONDITIONER WAS BUILT. THE AMG HIERARCHY IS BUILT ON THE FIRST
+!       OUTER ITERATION OF A TIME STEP AND EVERY NAMGREUSE OUTER ITERATIONS
+      ipcu = 1
+      IF (THIS%IPCREUSE /= 0 .AND. THIS%NPCBUILD > 0) THEN
+        ipcu = IMSLINEARSUB_PCCHANGED(THIS%NJA, THIS%A0, THIS%APCLAST,          &
+                                      THIS%PCREUSETOL)
+      END IF
+      IF (THIS%IPC ==  5 .AND. ipcu /= 0) THEN
+        IF (KITER /= 1 .AND. THIS%AMG%NSETUP > 0 .AND.                          &
+            MOD(KITER - 1, THIS%NAMGREUSE) /= 0) THEN
+          ipcu = 0
+        END IF
+      END IF
 !-------UPDATE PRECONDITIONER
-      CALL IMSLINEARSUB_PCU(this%iout,THIS%NJA,THIS%NEQ,THIS%NIAPC,THIS%NJAPC,  &
-                            THIS%IPC, THIS%RELAX, THIS%A0, THIS%IA0, THIS%JA0,  &
-                            THIS%APC,THIS%IAPC,THIS%JAPC,THIS%IW,THIS%W,        &
-                            THIS%LEVEL, THIS%DROPTOL, THIS%NJLU, THIS%NJW,      &
-                            THIS%NWLU, THIS%JLU, THIS%JW, THIS%WLU)
+      IF (ipcu /= 0) THEN
+        IF (THIS%IPC ==  5) THEN
+          CALL THIS%AMG%AMG_SETUP(THIS%IOUT, THIS%NEQ, THIS%NJA,                &
+                                  THIS%IA0, THIS%JA0, THIS%A0)
+        END IF
+        CALL IMSLINEARSUB_PCU(this%iout,THIS%NJA,THIS%NEQ,THIS%NIAPC,           &
+                              THIS%NJAPC, THIS%IPC, THIS%RELAX, THIS%A0,        &
+                              THIS%IA0, THIS%JA0, THIS%APC,THIS%IAPC,THIS%JAPC, &
+                              THIS%IW,THIS%W, THIS%LEVEL, THIS%DROPTOL,         &
+                              THIS%NJLU, THIS%NJW, THIS%NWLU, THIS%JLU,         &
+                              THIS%JW, THIS%WLU)
+        IF (THIS%IPCREUSE /= 0) THEN
+          DO n = 1, THIS%NJA
+            THIS%APCLAST(n) = THIS%A0(n)
+          END DO
+        END IF
+        THIS%NPCBUILD = THIS%NPCBUILD + 1
+      ELSE
+        THIS%NPCREUSE = THIS%NPCREUSE + 1
+      END IF
 !-------INITIALIZE SOLUTION VARIABLE AND ARRAYS
       IF (KITER ==  1 ) THIS%NITERC = 0
       irc    = 1
@@ -923,7 +1123,7 @@
       END DO
 !-------CALCULATE INITIAL RESIDUAL
       CALL IMSLINEARSUB_MV(THIS%NJA,THIS%NEQ,THIS%A0,THIS%X,THIS%D,             &
-                           THIS%IA0,THIS%JA0)
+                           THIS%IA0,THIS%JA0,THIS%NTHREADS)
       rmax = DZERO
       THIS%L2NORM0 = DZERO
       DO n = 1, THIS%NEQ
@@ -949,6 +1149,10 @@
                              THIS%IAPC, THIS%JAPC, THIS%APC,                    &
                              THIS%X, THIS%RHS, THIS%D, THIS%P, THIS%Q, THIS%Z,  &
                              THIS%NJLU, THIS%IW, THIS%JLU,                      &
+                             THIS%NTHREADS, THIS%NIALEV,                        &
+                             THIS%NLEVL, THIS%ILEVL, THIS%JLEVL,                &
+                             THIS%NLEVU, THIS%ILEVU, THIS%JLEVU,                &
+                             THIS%AMG,                                          &
                              NCONV, CONVNMOD, CONVMODSTART, LOCDV, LOCDR,       &
                              CACCEL, ITINNER, CONVLOCDV, CONVLOCDR,             &
                              DVMAX, DRMAX, CONVDVMAX, CONVDRMAX)
@@ -964,6 +1168,10 @@
                                THIS%X, THIS%RHS, THIS%D, THIS%P, THIS%Q,        &
                                THIS%T, THIS%V, THIS%DHAT, THIS%PHAT, THIS%QHAT, &
                                THIS%NJLU, THIS%IW, THIS%JLU,                    &
+                               THIS%NTHREADS, THIS%NIALEV,                      &
+                               THIS%NLEVL, THIS%ILEVL, THIS%JLEVL,              &
+                               THIS%NLEVU, THIS%ILEVU, THIS%JLEVU,              &
+                               THIS%AMG,                                        &
                                NCONV, CONVNMOD, CONVMODSTART, LOCDV, LOCDR,     &
                                CACCEL, ITINNER, CONVLOCDV, CONVLOCDR,           &
                                DVMAX, DRMAX, CONVDVMAX, CONVDRMAX)
@@ -1500,6 +1708,78 @@
 !---------RETURN                                                        
         RETURN 
       END SUBROUTINE IMSLINEARSUB_ILU0A 
+!
+!-------ILU0 AND MILU0 FORWARD AND BACKWARD SOLVE USING THE LEVEL SCHEDULE.
+!       THE ROWS IN A LEVEL DO NOT DEPEND ON EACH OTHER AND ARE SOLVED BY
+!       NTHREADS THREADS. THE RESULT IS THE SAME AS IMSLINEARSUB_ILU0A.
+      SUBROUTINE IMSLINEARSUB_ILU0A_LEV(NJA, NEQ, NIALEV, APC, IAPC, JAPC,      &
+                                        NLEVL, ILEVL, JLEVL,                    &
+                                        NLEVU, ILEVU, JLEVU,                    &
+                                        NTHREADS, R, D)
+        IMPLICIT NONE 
+!       + + + DUMMY ARGUMENTS + + +                                       
+        integer(I4B), INTENT(IN) :: NJA 
+        integer(I4B), INTENT(IN) :: NEQ 
+        integer(I4B), INTENT(IN) :: NIALEV
+        real(DP), DIMENSION(NJA),  INTENT(IN)  :: APC 
+        integer(I4B), DIMENSION(NEQ+1), INTENT(IN) :: IAPC 
+        integer(I4B), DIMENSION(NJA), INTENT(IN)   :: JAPC 
+        integer(I4B), INTENT(IN) :: NLEVL
+        integer(I4B), DIMENSION(NIALEV+1), INTENT(IN) :: ILEVL
+        integer(I4B), DIMENSION(NIALEV), INTENT(IN) :: JLEVL
+        integer(I4B), INTENT(IN) :: NLEVU
+        integer(I4B), DIMENSION(NIALEV+1), INTENT(IN) :: ILEVU
+        integer(I4B), DIMENSION(NIALEV), INTENT(IN) :: JLEVU
+        integer(I4B), INTENT(IN) :: NTHREADS
+        real(DP), DIMENSION(NEQ),  INTENT(IN)     :: R 
+        real(DP), DIMENSION(NEQ),  INTENT(INOUT)  :: D 
+!       + + + LOCAL DEFINITIONS + + +                                     
+        integer(I4B) :: ic0, ic1 
+        integer(I4B) :: iu 
+        integer(I4B) :: jcol 
+        integer(I4B) :: i, j, k, n 
+        real(DP) :: tv 
+!       + + + FUNCTIONS + + +                                             
+!       + + + CODE + + +                                                  
+!$OMP PARALLEL NUM_THREADS(NTHREADS) DEFAULT(SHARED)                            &
+!$OMP PRIVATE(k, i, n, ic0, ic1, iu, j, jcol, tv)
+!         FORWARD SOLVE - APC * D = R                                   
+        FORWARD: DO k = 1, NLEVL
+!$OMP DO SCHEDULE(STATIC)
+          DO i = ILEVL(k), ILEVL(k+1) - 1
+            n = JLEVL(i)
+            tv   = R(n) 
+            ic0 = IAPC(n) 
+            iu  = JAPC(n) - 1 
+            LOWER: DO j = ic0, iu 
+              jcol = JAPC(j) 
+              tv    = tv - APC(j) * D(jcol) 
+            END DO LOWER 
+            D(n) = tv 
+          END DO
+!$OMP END DO
+        END DO FORWARD 
+!         BACKWARD SOLVE - D = D / U                                    
+        BACKWARD: DO k = 1, NLEVU
+!$OMP DO SCHEDULE(STATIC)
+          DO i = ILEVU(k), ILEVU(k+1) - 1
+            n = JLEVU(i)
+            ic1 = IAPC(n+1) - 1 
+            iu  = JAPC(n) 
+            tv   = D(n) 
+            UPPER: DO j = iu, ic1 
+              jcol = JAPC(j) 
+              tv    = tv - APC(j) * D(jcol) 
+            END DO UPPER 
+!             COMPUTE D FOR DIAGONAL - D = D / U                        
+            D(n) =  tv * APC(n) 
+          END DO
+!$OMP END DO
+        END DO BACKWARD 
+!$OMP END PARALLEL
+!---------RETURN                                                        
+        RETURN 
+      END SUBROUTINE IMSLINEARSUB_ILU0A_LEV
                                                                         
       SUBROUTINE IMSLINEARSUB_CG(ICNVG, ITMAX, INNERIT,                         &
                                  NEQ, NJA, NIAPC, NJAPC,                        &
@@ -1508,6 +1788,8 @@
                                  IA0, JA0, A0, IAPC, JAPC, APC,                 &
                                  X, B, D, P, Q, Z,                              &
                                  NJLU, IW, JLU,                                 &
+                                 NTHREADS, NIALEV, NLEVL, ILEVL, JLEVL,         &
+                                 NLEVU, ILEVU, JLEVU, AMG,                      &
                                  NCONV, CONVNMOD, CONVMODSTART, LOCDV, LOCDR,   &
                                  CACCEL, ITINNER, CONVLOCDV, CONVLOCDR,         &
                                  DVMAX, DRMAX, CONVDVMAX, CONVDRMAX)                                        
@@ -1544,6 +1826,17 @@
         integer(I4B), INTENT(IN) :: NJLU
         integer(I4B), DIMENSION(NIAPC), INTENT(IN) :: IW
         integer(I4B), DIMENSION(NJLU), INTENT(IN) :: JLU
+        ! THREADS AND ILU0 LEVEL SCHEDULE
+        integer(I4B), INTENT(IN) :: NTHREADS
+        integer(I4B), INTENT(IN) :: NIALEV
+        integer(I4B), INTENT(IN) :: NLEVL
+        integer(I4B), DIMENSION(NIALEV+1), INTENT(IN) :: ILEVL
+        integer(I4B), DIMENSION(NIALEV), INTENT(IN) :: JLEVL
+        integer(I4B), INTENT(IN) :: NLEVU
+        integer(I4B), DIMENSION(NIALEV+1), INTENT(IN) :: ILEVU
+        integer(I4B), DIMENSION(NIALEV), INTENT(IN) :: JLEVU
+        ! AMG
+        TYPE(ImsAmgType), INTENT(INOUT) :: AMG
         ! CONVERGENCE INFORMATION
         integer(I4B), INTENT(IN) :: NCONV
         integer(I4B), INTENT(IN) :: CONVNMOD
@@ -1590,29 +1883,43 @@
           SELECT CASE (IPC) 
 !             ILU0 AND MILU0              
             CASE (1,2) 
-              CALL IMSLINEARSUB_ILU0A(NJA, NEQ, APC, IAPC, JAPC, D, Z) 
+              IF (NTHREADS > 1) THEN
+                CALL IMSLINEARSUB_ILU0A_LEV(NJA, NEQ, NIALEV, APC, IAPC, JAPC,  &
+                                            NLEVL, ILEVL, JLEVL,                &
+                                            NLEVU, ILEVU, JLEVU,                &
+                                            NTHREADS, D, Z)
+              ELSE
+                CALL IMSLINEARSUB_ILU0A(NJA, NEQ, APC, IAPC, JAPC, D, Z)
+              END IF
 !             ILUT AND MILUT
             CASE (3,4)
               CALL IMSLINEARSUB_PCMILUT_LUSOL(NEQ, D, Z, APC, JLU, IW) 
+!             AMG
+            CASE (5)
+              CALL AMG%AMG_APPLY(NEQ, NJA, IA0, JA0, A0, D, Z)
           END SELECT 
-          rho = IMSLINEARSUB_DP(NEQ, D, Z) 
+          rho = IMSLINEARSUB_DP(NEQ, D, Z, NTHREADS) 
 !-----------COMPUTE DIRECTIONAL VECTORS                                 
           IF (IITER ==  1) THEN 
+!$OMP PARALLEL DO IF(NTHREADS > 1) NUM_THREADS(NTHREADS) SCHEDULE(STATIC)
             DO n = 1, NEQ 
               P(n) = Z(n) 
             END DO 
+!$OMP END PARALLEL DO
           ELSE
             !denom = rho0 + SIGN(DPREC,rho0)
             !beta = rho / denom
             beta = rho / rho0 
+!$OMP PARALLEL DO IF(NTHREADS > 1) NUM_THREADS(NTHREADS) SCHEDULE(STATIC)
             DO n = 1, NEQ 
               P(n) = Z(n) + beta * P(n) 
             END DO 
+!$OMP END PARALLEL DO
           END IF 
 !-----------COMPUTE ITERATES                                            
 !           UPDATE Q                                                   
-          CALL IMSLINEARSUB_MV(NJA, NEQ, A0, P, Q, IA0, JA0) 
-          denom =  IMSLINEARSUB_DP(NEQ, P, Q)
+          CALL IMSLINEARSUB_MV(NJA, NEQ, A0, P, Q, IA0, JA0, NTHREADS) 
+          denom =  IMSLINEARSUB_DP(NEQ, P, Q, NTHREADS)
           denom = denom + SIGN(DPREC, denom) 
           alpha = rho / denom
 !-----------UPDATE X AND RESIDUAL                                       
@@ -1697,8 +2004,8 @@
           IF (NORTH > 0) THEN
             LORTH = mod(iiter+1,NORTH) == 0
             IF (LORTH) THEN
-              CALL IMSLINEARSUB_MV(NJA, NEQ, A0, X, D, IA0, JA0)
-              CALL IMSLINEARSUB_AXPY(NEQ, B, -DONE, D, D)
+              CALL IMSLINEARSUB_MV(NJA, NEQ, A0, X, D, IA0, JA0, NTHREADS)
+              CALL IMSLINEARSUB_AXPY(NEQ, B, -DONE, D, D, NTHREADS)
             END IF
           END IF
 !-----------SAVE CURRENT INNER ITERATES                                 
@@ -1718,6 +2025,8 @@
                                    X, B, D, P, Q,                               &
                                    T, V, DHAT, PHAT, QHAT,                      &
                                    NJLU, IW, JLU,                               &
+                                   NTHREADS, NIALEV, NLEVL, ILEVL, JLEVL,       &
+                                   NLEVU, ILEVU, JLEVU, AMG,                    &
                                    NCONV, CONVNMOD, CONVMODSTART, LOCDV, LOCDR, &
                                    CACCEL, ITINNER, CONVLOCDV, CONVLOCDR,       &
                                    DVMAX, DRMAX, CONVDVMAX, CONVDRMAX)                                
@@ -1760,6 +2069,17 @@
         integer(I4B), INTENT(IN) :: NJLU
         integer(I4B), DIMENSION(NIAPC), INTENT(IN) :: IW
         integer(I4B), DIMENSION(NJLU), INTENT(IN) :: JLU
+        ! THREADS AND ILU0 LEVEL SCHEDULE
+        integer(I4B), INTENT(IN) :: NTHREADS
+        integer(I4B), INTENT(IN) :: NIALEV
+        integer(I4B), INTENT(IN) :: NLEVL
+        integer(I4B), DIMENSION(NIALEV+1), INTENT(IN) :: ILEVL
+        integer(I4B), DIMENSION(NIALEV), INTENT(IN) :: JLEVL
+        integer(I4B), INTENT(IN) :: NLEVU
+        integer(I4B), DIMENSION(NIALEV+1), INTENT(IN) :: ILEVU
+        integer(I4B), DIMENSION(NIALEV), INTENT(IN) :: JLEVU
+        ! AMG
+        TYPE(ImsAmgType), INTENT(INOUT) :: AMG
         ! CONVERGENCE INFORMATION
         integer(I4B), INTENT(IN) :: NCONV
         integer(I4B), INTENT(IN) :: CONVNMOD
@@ -1816,38 +2136,54 @@
            INNERIT = INNERIT + 1 
            NITERC = NITERC + 1 
 !----------CALCULATE rho                                                
-          rho = IMSLINEARSUB_DP(NEQ, DHAT, D) 
+          rho = IMSLINEARSUB_DP(NEQ, DHAT, D, NTHREADS) 
 !-----------COMPUTE DIRECTIONAL VECTORS                                 
           IF (IITER ==  1) THEN 
+!$OMP PARALLEL DO IF(NTHREADS > 1) NUM_THREADS(NTHREADS) SCHEDULE(STATIC)
             DO n = 1, NEQ 
               P(n) = D(n) 
             END DO 
+!$OMP END PARALLEL DO
           ELSE 
             beta = ( rho / rho0 ) * ( alpha0 / omega0 ) 
+!$OMP PARALLEL DO IF(NTHREADS > 1) NUM_THREADS(NTHREADS) SCHEDULE(STATIC)
             DO n = 1, NEQ 
               P(n) = D(n) + beta * ( P(n) - omega0 * V(n) ) 
             END DO 
+!$OMP END PARALLEL DO
           END IF 
 !----------APPLY PRECONDITIONER TO UPDATE PHAT                          
           SELECT CASE (IPC) 
 !             ILU0 AND MILU0
             CASE (1,2) 
-              CALL IMSLINEARSUB_ILU0A(NJA, NEQ, APC, IAPC, JAPC, P, PHAT) 
+              IF (NTHREADS > 1) THEN
+                CALL IMSLINEARSUB_ILU0A_LEV(NJA, NEQ, NIALEV, APC, IAPC, JAPC,  &
+                                            NLEVL, ILEVL, JLEVL,                &
+                                            NLEVU, ILEVU, JLEVU,                &
+                                            NTHREADS, P, PHAT)
+              ELSE
+                CALL IMSLINEARSUB_ILU0A(NJA, NEQ, APC, IAPC, JAPC, P, PHAT)
+              END IF
 !             ILUT AND MILUT
             CASE (3,4)
               CALL IMSLINEARSUB_PCMILUT_LUSOL(NEQ, P, PHAT, APC, JLU, IW) 
+!             AMG
+            CASE (5)
+              CALL AMG%AMG_APPLY(NEQ, NJA, IA0, JA0, A0, P, PHAT)
           END SELECT 
 !-----------COMPUTE ITERATES                                            
 !           UPDATE V WITH A AND PHAT                                    
-          CALL IMSLINEARSUB_MV(NJA, NEQ, A0, PHAT, V, IA0, JA0) 
+          CALL IMSLINEARSUB_MV(NJA, NEQ, A0, PHAT, V, IA0, JA0, NTHREADS) 
 !           UPDATE alpha WITH DHAT AND V                                
-          denom = IMSLINEARSUB_DP(NEQ, DHAT, V) 
+          denom = IMSLINEARSUB_DP(NEQ, DHAT, V, NTHREADS) 
           denom = denom + SIGN(DPREC, denom) 
           alpha = rho / denom 
 !-----------UPDATE Q                                                    
+!$OMP PARALLEL DO IF(NTHREADS > 1) NUM_THREADS(NTHREADS) SCHEDULE(STATIC)
           DO n = 1, NEQ 
             Q(n) = D(n) - alpha * V(n)  
           END DO 
+!$OMP END PARALLEL DO
 !!-----------CALCULATE INFINITY NORM OF Q - TEST FOR TERMINATION         
 !!           TERMINATE IF rmax IS LESS THAN MACHINE PRECISION (DPREC) 
 !          rmax = DZERO 
@@ -1875,16 +2211,26 @@
           SELECT CASE (IPC) 
 !            ILU0 AND MILU0            
             CASE (1,2) 
-              CALL IMSLINEARSUB_ILU0A(NJA, NEQ, APC, IAPC, JAPC, Q, QHAT) 
+              IF (NTHREADS > 1) THEN
+                CALL IMSLINEARSUB_ILU0A_LEV(NJA, NEQ, NIALEV, APC, IAPC, JAPC,  &
+                                            NLEVL, ILEVL, JLEVL,                &
+                                            NLEVU, ILEVU, JLEVU,                &
+                                            NTHREADS, Q, QHAT)
+              ELSE
+                CALL IMSLINEARSUB_ILU0A(NJA, NEQ, APC, IAPC, JAPC, Q, QHAT)
+              END IF
 !             ILUT AND MILUT
             CASE (3,4)
               CALL IMSLINEARSUB_PCMILUT_LUSOL(NEQ, Q, QHAT, APC, JLU, IW)
+!             AMG
+            CASE (5)
+              CALL AMG%AMG_APPLY(NEQ, NJA, IA0, JA0, A0, Q, QHAT)
           END SELECT
 !           UPDATE T WITH A AND QHAT                                    
-          CALL IMSLINEARSUB_MV(NJA, NEQ, A0, QHAT, T, IA0, JA0) 
+          CALL IMSLINEARSUB_MV(NJA, NEQ, A0, QHAT, T, IA0, JA0, NTHREADS) 
 !-----------UPDATE omega                                                
-          numer = IMSLINEARSUB_DP(NEQ, T, Q) 
-          denom = IMSLINEARSUB_DP(NEQ, T, T)
+          numer = IMSLINEARSUB_DP(NEQ, T, Q, NTHREADS) 
+          denom = IMSLINEARSUB_DP(NEQ, T, T, NTHREADS)
           denom = denom + SIGN(DPREC,denom) 
           omega = numer / denom 
 !-----------UPDATE X AND RESIDUAL                                       
@@ -1984,8 +2330,8 @@
           IF (NORTH > 0) THEN
             LORTH = mod(iiter+1,NORTH) == 0
             IF (LORTH) THEN
-              CALL IMSLINEARSUB_MV(NJA, NEQ, A0,X , D, IA0, JA0)
-              CALL IMSLINEARSUB_AXPY(NEQ, B, -DONE, D, D)
+              CALL IMSLINEARSUB_MV(NJA, NEQ, A0, X, D, IA0, JA0, NTHREADS)
+              CALL IMSLINEARSUB_AXPY(NEQ, B, -DONE, D, D, NTHREADS)
               !DO n = 1, NEQ
               !  tv   = D(n)
               !  D(n) = B(n) - tv
@@ -2119,6 +2465,99 @@
 !---------RETURN                                                        
         RETURN 
       END SUBROUTINE IMSLINEARSUB_PCCRS 
+!
+!-------DETERMINE THE LEVEL SCHEDULE FOR THE ILU0 AND MILU0 FORWARD AND
+!       BACKWARD SOLVES. THE LEVEL OF A ROW IS ONE MORE THAN THE LARGEST
+!       LEVEL OF THE ROWS IT DEPENDS ON. ILEVL AND ILEVU ARE THE POSITIONS
+!       OF THE FIRST ROW OF EACH LEVEL IN JLEVL AND JLEVU.
+      SUBROUTINE IMSLINEARSUB_ILU0LEV(NEQ, NJA, IAPC, JAPC,                     &
+                                      NLEVL, ILEVL, JLEVL,                      &
+                                      NLEVU, ILEVU, JLEVU)
+        IMPLICIT NONE 
+!       + + + DUMMY ARGUMENTS + + +                                       
+        integer(I4B), INTENT(IN) :: NEQ 
+        integer(I4B), INTENT(IN) :: NJA 
+        integer(I4B), DIMENSION(NEQ+1), INTENT(IN) :: IAPC 
+        integer(I4B), DIMENSION(NJA), INTENT(IN)   :: JAPC 
+        integer(I4B), INTENT(INOUT) :: NLEVL
+        integer(I4B), DIMENSION(NEQ+1), INTENT(INOUT) :: ILEVL
+        integer(I4B), DIMENSION(NEQ), INTENT(INOUT) :: JLEVL
+        integer(I4B), INTENT(INOUT) :: NLEVU
+        integer(I4B), DIMENSION(NEQ+1), INTENT(INOUT) :: ILEVU
+        integer(I4B), DIMENSION(NEQ), INTENT(INOUT) :: JLEVU
+!       + + + LOCAL DEFINITIONS + + +                                     
+        integer(I4B) :: n, j 
+        integer(I4B) :: lev
+        integer(I4B), DIMENSION(:), ALLOCATABLE :: ilev
+!       + + + FUNCTIONS + + +                                             
+!       + + + CODE + + +                                                  
+        ALLOCATE(ilev(NEQ))
+!---------LEVELS OF THE FORWARD SOLVE, A ROW DEPENDS ON THE LOWER ENTRIES
+        NLEVL = 0
+        DO n = 1, NEQ
+          lev = 0
+          DO j = IAPC(n), JAPC(n) - 1
+            lev = MAX(lev, ilev(JAPC(j)))
+          END DO
+          ilev(n) = lev + 1
+          NLEVL = MAX(NLEVL, lev + 1)
+        END DO
+        CALL IMSLINEARSUB_LEVSORT(NEQ, NLEVL, ilev, ILEVL, JLEVL)
+!---------LEVELS OF THE BACKWARD SOLVE, A ROW DEPENDS ON THE UPPER ENTRIES
+        NLEVU = 0
+        DO n = NEQ, 1, -1
+          lev = 0
+          DO j = JAPC(n), IAPC(n+1) - 1
+            lev = MAX(lev, ilev(JAPC(j)))
+          END DO
+          ilev(n) = lev + 1
+          NLEVU = MAX(NLEVU, lev + 1)
+        END DO
+        CALL IMSLINEARSUB_LEVSORT(NEQ, NLEVU, ilev, ILEVU, JLEVU)
+        DEALLOCATE(ilev)
+!---------RETURN                                                        
+        RETURN 
+      END SUBROUTINE IMSLINEARSUB_ILU0LEV
+!
+!-------SORT THE ROWS BY LEVEL
+      SUBROUTINE IMSLINEARSUB_LEVSORT(NEQ, NLEV, ILEV, IPLEV, JLEV)
+        IMPLICIT NONE 
+!       + + + DUMMY ARGUMENTS + + +                                       
+        integer(I4B), INTENT(IN) :: NEQ 
+        integer(I4B), INTENT(IN) :: NLEV 
+        integer(I4B), DIMENSION(NEQ), INTENT(IN) :: ILEV
+        integer(I4B), DIMENSION(NEQ+1), INTENT(INOUT) :: IPLEV
+        integer(I4B), DIMENSION(NEQ), INTENT(INOUT) :: JLEV
+!       + + + LOCAL DEFINITIONS + + +                                     
+        integer(I4B) :: n, k
+!       + + + FUNCTIONS + + +                                             
+!       + + + CODE + + +                                                  
+!---------COUNT THE ROWS IN EACH LEVEL
+        DO k = 1, NLEV + 1
+          IPLEV(k) = 0
+        END DO
+        DO n = 1, NEQ
+          k = ILEV(n) + 1
+          IPLEV(k) = IPLEV(k) + 1
+        END DO
+!---------POSITION OF THE FIRST ROW OF EACH LEVEL
+        IPLEV(1) = 1
+        DO k = 1, NLEV
+          IPLEV(k+1) = IPLEV(k+1) + IPLEV(k)
+        END DO
+!---------FILL JLEV, IPLEV(k) IS ADVANCED TO THE START OF LEVEL k+1
+        DO n = 1, NEQ
+          k = ILEV(n)
+          JLEV(IPLEV(k)) = n
+          IPLEV(k) = IPLEV(k) + 1
+        END DO
+        DO k = NLEV, 1, -1
+          IPLEV(k+1) = IPLEV(k)
+        END DO
+        IPLEV(1) = 1
+!---------RETURN                                                        
+        RETURN 
+      END SUBROUTINE IMSLINEARSUB_LEVSORT
 !                                                                       
 !-------SIMPLE IN-PLACE SORTING ROUTINE FOR AN INTEGER ARRAY             
       SUBROUTINE IMSLINEARSUB_ISORT(NVAL, IARRAY) 
@@ -2217,7 +2656,7 @@
       END SUBROUTINE IMSLINEARSUB_RSCAL
 
       
-      SUBROUTINE IMSLINEARSUB_MV(NJA, NEQ, A, D1, D2, IA, JA)                        
+      SUBROUTINE IMSLINEARSUB_MV(NJA, NEQ, A, D1, D2, IA, JA, NTHREADS)
         IMPLICIT NONE                                                   
 !       + + + DUMMY ARGUMENTS + + +                                       
         integer(I4B), INTENT(IN) :: NJA                                      
@@ -2227,6 +2666,7 @@
         real(DP), DIMENSION(NEQ),  INTENT(INOUT) :: D2           
         integer(I4B), DIMENSION(NEQ+1), INTENT(IN) :: IA                     
         integer(I4B), DIMENSION(NJA), INTENT(IN)   :: JA                     
+        integer(I4B), INTENT(IN) :: NTHREADS
 !       + + + LOCAL DEFINITIONS + + +                                     
         integer(I4B) :: ic0, ic1                                             
         integer(I4B) :: icol                                                 
@@ -2235,6 +2675,8 @@
 !       + + + PARAMETERS + + +                                            
 !       + + + FUNCTIONS + + +                                             
 !       + + + CODE + + +                                                  
+!$OMP PARALLEL DO IF(NTHREADS > 1) NUM_THREADS(NTHREADS) SCHEDULE(STATIC)       &
+!$OMP PRIVATE(tv, ic0, ic1, m, icol)
         DO n = 1, NEQ                                                   
 !           ADD DIAGONAL AND OFF-DIAGONAL TERMS                         
           tv     = DZERO                                                
@@ -2246,11 +2688,12 @@
           END DO                                                        
           D2(n) = tv                                                    
         END DO                                                          
+!$OMP END PARALLEL DO
 !---------RETURN                                                        
         RETURN                                                          
       END SUBROUTINE IMSLINEARSUB_MV  
       
-      SUBROUTINE IMSLINEARSUB_AXPY(NEQ, D1, DC, D2, DR)
+      SUBROUTINE IMSLINEARSUB_AXPY(NEQ, D1, DC, D2, DR, NTHREADS)
         IMPLICIT NONE
 !     + + + DUMMY ARGUMENTS + + +
         integer(I4B), INTENT(IN) :: NEQ
@@ -2258,34 +2701,43 @@
         real(DP), INTENT(IN) :: DC
         real(DP), DIMENSION(NEQ), INTENT(IN)    :: D2
         real(DP), DIMENSION(NEQ), INTENT(INOUT) :: DR
+        integer(I4B), INTENT(IN) :: NTHREADS
 !     + + + LOCAL DEFINITIONS + + +
         integer(I4B) :: n
 !     + + + FUNCTIONS + + +
 !     + + + CODE + + +
+!$OMP PARALLEL DO IF(NTHREADS > 1) NUM_THREADS(NTHREADS) SCHEDULE(STATIC)
          DO n = 1, NEQ
           DR(n) = D1(n) + DC * D2(n)
          END DO
+!$OMP END PARALLEL DO
 !---------RETURN
         RETURN
       END SUBROUTINE IMSLINEARSUB_AXPY
 
       
-    FUNCTION IMSLINEARSUB_DP(neq, a, b) RESULT(c)
+    FUNCTION IMSLINEARSUB_DP(neq, a, b, nthreads) RESULT(c)
       ! -- return variable
       real(DP) :: c
 !     + + + dummy arguments + + +
       integer(I4B), intent(in) :: neq
       real(DP), dimension(neq),  intent(in) :: a
       real(DP), dimension(neq),  intent(in) :: b
+      integer(I4B), intent(in) :: nthreads
 !     + + + local definitions + + +
       integer(I4B) :: n
+      real(DP) :: ssum
 !     + + + parameters + + +
 !     + + + functions + + +
 !     + + + code + + +
-      c = DZERO
+      ssum = DZERO
+!$OMP PARALLEL DO IF(nthreads > 1) NUM_THREADS(nthreads) SCHEDULE(STATIC)     &
+!$OMP REDUCTION(+:ssum)
       do n = 1, neq
-        c = c + a(n) * b(n)
+        ssum = ssum + a(n) * b(n)
       end do
+!$OMP END PARALLEL DO
+      c = ssum
       !---------return
       return
     END FUNCTION IMSLINEARSUB_DP
@@ -2330,6 +2782,41 @@
       !---------return
       return
     END FUNCTION IMSLINEARSUB_RNRM2
+
+
+    FUNCTION IMSLINEARSUB_PCCHANGED(nja, a, alast, tol) RESULT(ichanged)
+      ! -- return variable
+      integer(I4B) :: ichanged
+!     + + + dummy arguments + + +
+      integer(I4B), intent(in) :: nja
+      real(DP), dimension(nja), intent(in) :: a
+      real(DP), dimension(nja), intent(in) :: alast
+      real(DP), intent(in) :: tol
+!     + + + local definitions + + +
+      integer(I4B) :: n
+      real(DP) :: dmax
+      real(DP) :: amax
+!     + + + parameters + + +
+!     + + + functions + + +
+!     + + + code + + +
+!
+!-------THE COEFFICIENT MATRIX HAS CHANGED IF THE MAXIMUM CHANGE IN A
+!       COEFFICIENT IS GREATER THAN TOL TIMES THE LARGEST COEFFICIENT OF THE
+!       MATRIX USED TO BUILD THE PRECONDITIONER
+      ichanged = 0
+      dmax = DZERO
+      amax = DZERO
+      do n = 1, nja
+        dmax = max(dmax, abs(a(n) - alast(n)))
+        amax = max(amax, abs(alast(n)))
+        if (tol == DZERO .and. dmax > DZERO) exit
+      end do
+      if (dmax > tol * amax) then
+        ichanged = 1
+      end if
+      !---------return
+      return
+    END FUNCTION IMSLINEARSUB_PCCHANGED
 !
 !    
 !-------BEGINNING OF SUBROUTINES FROM OTHER LIBRARIES                   
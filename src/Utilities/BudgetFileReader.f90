@@ -45,12 +45,27 @@ module BudgetFileReaderModule
     character(len=16) :: dstmodelname
     character(len=16) :: dstpackagename
     character(len=16), dimension(:), allocatable :: dstpackagenamearray
+    !
+    ! -- index of the records in the file.  recordpos is the offset of the
+    !    record header from the start of the file and irecord is the number
+    !    of records that have been read or skipped.
+    integer(I4B) :: nrecords = 0
+    integer(I4B) :: irecord = 0
+    integer(I8B), dimension(:), allocatable :: recordpos
+    integer(I4B), dimension(:), allocatable :: recordkstp
+    integer(I4B), dimension(:), allocatable :: recordkper
   
   contains
   
     procedure :: initialize
     procedure :: read_record
+    procedure :: skip_record
     procedure :: finalize
+    procedure, private :: build_index
+    procedure, private :: position_next
+    procedure, private :: read_header
+    procedure, private :: read_data
+    procedure, private :: set_next
   
   end type BudgetFileReaderType
   
@@ -58,7 +73,8 @@ module BudgetFileReaderModule
   
   subroutine initialize(this, iu, iout, ncrbud)
 ! ******************************************************************************
-! initialize
+! initialize -- build the index of the records in the budget file and
+!   determine the budget terms for a time step from the first time step
 ! ******************************************************************************
 !
 !    SPECIFICATIONS:
@@ -70,7 +86,6 @@ module BudgetFileReaderModule
     integer(I4B), intent(out) :: ncrbud
     ! -- local
     integer(I4B) :: ibudterm
-    integer(I4B) :: kstp_last, kper_last
     integer(I4B) :: maxaux
     logical :: success
 ! ------------------------------------------------------------------------------
@@ -85,39 +100,53 @@ module BudgetFileReaderModule
       write(iout, '(a)') &
         'Reading budget file to determine number of terms per time step.'
     !
-    ! -- Read through the first set of data for time step 1 and stress period 1
-    do
-      call this%read_record(success)
-      if (.not. success) exit
-      this%nbudterms = this%nbudterms + 1
+    ! -- Find the offset of every record header in the file
+    call this%build_index()
+    !
+    ! -- The records for time step 1 and stress period 1 are the budget terms
+    do ibudterm = 1, this%nrecords
+      if (this%recordkstp(ibudterm) /= this%recordkstp(1) .or.                 &
+          this%recordkper(ibudterm) /= this%recordkper(1)) exit
+      this%nbudterms = ibudterm
+    end do
+    do ibudterm = 1, this%nbudterms
+      call this%skip_record(success)
       if (this%naux > maxaux) maxaux = this%naux
-      if (this%kstp /= this%kstpnext .or. this%kper /= this%kpernext) &
-        exit
     end do
-    kstp_last = this%kstp
-    kper_last = this%kper
     allocate(this%budtxtarray(this%nbudterms))
     allocate(this%imetharray(this%nbudterms))
     allocate(this%dstpackagenamearray(this%nbudterms))
     allocate(this%nauxarray(this%nbudterms))
     allocate(this%auxtxtarray(maxaux, this%nbudterms))
     this%auxtxtarray(:, :) = ''
-    rewind(this%inunit)
+    this%irecord = 0
     !
-    ! -- Now read through again and store budget text names
+    ! -- Now read through again and store budget text names.  Only the
+    !    records that are needed to determine the number of cells or reaches
+    !    are read in full.
     do ibudterm = 1, this%nbudterms
-      call this%read_record(success, iout)
+      call this%position_next(success)
+      if (success) call this%read_header(success)
       if (.not. success) exit
+      if (this%imeth == 6 .and. this%srcmodelname == this%dstmodelname) then
+        call this%read_data()
+        if (this%nlist > 0) ncrbud = max(ncrbud, maxval(this%nodesrc))
+      else if (this%imeth == 1 .and.                                           &
+               trim(adjustl(this%budtxt)) /= 'FLOW-JA-FACE') then
+        ncrbud = max(ncrbud, this%nval)
+      endif
+      call this%set_next()
+      if (iout > 0) then
+        write(iout, '(1pg15.6, a, 1x, a)') this%totim, this%budtxt, &
+          this%dstpackagename
+      endif
       this%budtxtarray(ibudterm) = this%budtxt
       this%imetharray(ibudterm) = this%imeth
       this%dstpackagenamearray(ibudterm) = this%dstpackagename
       this%nauxarray(ibudterm) = this%naux
       this%auxtxtarray(1:this%naux, ibudterm) = this%auxtxt(:)
-      if (this%srcmodelname == this%dstmodelname) then
-        if(allocated(this%nodesrc)) ncrbud = max(ncrbud, maxval(this%nodesrc))
-      endif
     enddo
-    rewind(this%inunit)
+    this%irecord = 0
     if (iout > 0) &
     write(iout, '(a, i0, a)') 'Detected ', this%nbudterms, &
       ' unique flow terms in budget file.'
@@ -126,22 +155,135 @@ module BudgetFileReaderModule
     return
   end subroutine initialize
   
-  subroutine read_record(this, success, iout_opt)
+  subroutine build_index(this)
+! ******************************************************************************
+! build_index -- read the header of every record in the file and store the
+!   offset of the header, kstp, and kper.  The data for each record are
+!   skipped without being read.
+! ******************************************************************************
+!
+!    SPECIFICATIONS:
+! ------------------------------------------------------------------------------
+    ! -- modules
+    use InputOutputModule, only: fseek_stream
+    ! -- dummy
+    class(BudgetFileReaderType) :: this
+    ! -- local
+    integer(I8B), parameter :: NBYTESI4 = 4
+    integer(I8B), parameter :: NBYTESDP = 8
+    integer(I4B) :: iostat
+    integer(I4B) :: nsize
+    integer(I8B) :: ipos
+    integer(I8B) :: iheader
+    integer(I8B) :: ndata
+    integer(I8B) :: filesize
+    logical :: success
+    integer(I8B), dimension(:), allocatable :: tmppos
+    integer(I4B), dimension(:), allocatable :: tmpkstp
+    integer(I4B), dimension(:), allocatable :: tmpkper
+! ------------------------------------------------------------------------------
+    !
+    ! -- initialize
+    nsize = 100
+    allocate(this%recordpos(nsize))
+    allocate(this%recordkstp(nsize))
+    allocate(this%recordkper(nsize))
+    this%nrecords = 0
+    this%irecord = 0
+    inquire(unit=this%inunit, size=filesize)
+    rewind(this%inunit)
+    !
+    ! -- read the headers
+    do
+      inquire(unit=this%inunit, pos=iheader)
+      call this%read_header(success)
+      if (.not. success) exit
+      !
+      ! -- determine the size of the data and stop if the record is
+      !    incomplete
+      if (this%imeth == 1) then
+        ndata = int(this%nval, I8B) * NBYTESDP
+      else
+        ndata = int(this%nlist, I8B) * (2 * NBYTESI4 + this%ndat * NBYTESDP)
+      endif
+      inquire(unit=this%inunit, pos=ipos)
+      if (ipos - 1 + ndata > filesize) exit
+      !
+      ! -- increase the size of the index arrays
+      if (this%nrecords == nsize) then
+        nsize = 2 * nsize
+        allocate(tmppos(nsize))
+        allocate(tmpkstp(nsize))
+        allocate(tmpkper(nsize))
+        tmppos(1:this%nrecords) = this%recordpos(1:this%nrecords)
+        tmpkstp(1:this%nrecords) = this%recordkstp(1:this%nrecords)
+        tmpkper(1:this%nrecords) = this%recordkper(1:this%nrecords)
+        call move_alloc(tmppos, this%recordpos)
+        call move_alloc(tmpkstp, this%recordkstp)
+        call move_alloc(tmpkper, this%recordkper)
+      endif
+      !
+      ! -- store the record and move to the next header
+      this%nrecords = this%nrecords + 1
+      this%recordpos(this%nrecords) = iheader - 1
+      this%recordkstp(this%nrecords) = this%kstp
+      this%recordkper(this%nrecords) = this%kper
+      call fseek_stream(this%inunit, ndata, 1, iostat)
+    end do
+    this%endoffile = .false.
+    rewind(this%inunit)
+    !
+    ! -- return
+    return
+  end subroutine build_index
+  
+  subroutine position_next(this, success)
 ! ******************************************************************************
-! read_record
+! position_next -- move to the header of the next record in the index.
+!   success is .false. if all of the records have been read.
 ! ******************************************************************************
 !
 !    SPECIFICATIONS:
 ! ------------------------------------------------------------------------------
     ! -- modules
     use InputOutputModule, only: fseek_stream
+    ! -- dummy
+    class(BudgetFileReaderType) :: this
+    logical, intent(out) :: success
+    ! -- local
+    integer(I4B) :: iostat
+! ------------------------------------------------------------------------------
+    !
+    success = .true.
+    if (this%irecord >= this%nrecords) then
+      success = .false.
+      this%endoffile = .true.
+      this%kstp = 0
+      this%kper = 0
+      this%kstpnext = 0
+      this%kpernext = 0
+    else
+      call fseek_stream(this%inunit, this%recordpos(this%irecord + 1), 0,      &
+                        iostat)
+    endif
+    !
+    ! -- return
+    return
+  end subroutine position_next
+  
+  subroutine read_record(this, success, iout_opt)
+! ******************************************************************************
+! read_record -- read the next record
+! ******************************************************************************
+!
+!    SPECIFICATIONS:
+! ------------------------------------------------------------------------------
     ! -- dummy
     class(BudgetFileReaderType) :: this
     logical, intent(out) :: success
     integer(I4B), intent(in), optional :: iout_opt
     ! -- local
-    integer(I4B) :: i, n, iostat, iout
-    character(len=LINELENGTH) :: errmsg
+    integer(I4B) :: iout
 ! ------------------------------------------------------------------------------
     !
     if (present(iout_opt)) then
@@ -149,6 +291,73 @@ module BudgetFileReaderModule
     else
       iout = 0
     endif
+    !
+    ! -- read the header and the data
+    call this%position_next(success)
+    if (success) call this%read_header(success)
+    if (.not. success) return
+    call this%read_data()
+    call this%set_next()
+    if (iout > 0) then
+      write(iout, '(1pg15.6, a, 1x, a)') this%totim, this%budtxt, &
+        this%dstpackagename
+    endif
+    !
+    ! -- return
+    return
+  end subroutine read_record
+  
+  subroutine skip_record(this, success, iout_opt)
+! ******************************************************************************
+! skip_record -- read the header of the next record without reading its
+!   data.  The header variables (kstp, kper, budtxt, dstpackagename, nlist,
+!   ...) are set, but flowja, nodesrc, nodedst, flow, and auxvar are not.
+! ******************************************************************************
+!
+!    SPECIFICATIONS:
+! ------------------------------------------------------------------------------
+    ! -- dummy
+    class(BudgetFileReaderType) :: this
+    logical, intent(out) :: success
+    integer(I4B), intent(in), optional :: iout_opt
+    ! -- local
+    integer(I4B) :: iout
+! ------------------------------------------------------------------------------
+    !
+    if (present(iout_opt)) then
+      iout = iout_opt
+    else
+      iout = 0
+    endif
+    !
+    ! -- read the header
+    call this%position_next(success)
+    if (success) call this%read_header(success)
+    if (.not. success) return
+    call this%set_next()
+    if (iout > 0) then
+      write(iout, '(1pg15.6, a, 1x, a)') this%totim, this%budtxt, &
+        this%dstpackagename
+    endif
+    !
+    ! -- return
+    return
+  end subroutine skip_record
+  
+  subroutine read_header(this, success)
+! ******************************************************************************
+! read_header -- read the record header at the current position
+! ******************************************************************************
+!
+!    SPECIFICATIONS:
+! ------------------------------------------------------------------------------
+    ! -- dummy
+    class(BudgetFileReaderType) :: this
+    logical, intent(out) :: success
+    ! -- local
+    integer(I4B) :: iostat
+    character(len=LINELENGTH) :: errmsg
+! ------------------------------------------------------------------------------
     !
     this%kstp = 0
     this%kper = 0
@@ -175,20 +384,9 @@ module BudgetFileReaderModule
     read(this%inunit) this%imeth, this%delt, this%pertim, this%totim
     if(this%imeth == 1) then
       if (trim(adjustl(this%budtxt)) == 'FLOW-JA-FACE') then
-        if(allocated(this%flowja)) deallocate(this%flowja)
-        allocate(this%flowja(this%nval))
-        read(this%inunit) this%flowja
         this%hasimeth1flowja = .true.
       else
         this%nval = this%nval * this%idum1 * abs(this%idum2)
-        if(allocated(this%flow)) deallocate(this%flow)
-        allocate(this%flow(this%nval))
-        if(allocated(this%nodesrc)) deallocate(this%nodesrc)
-        allocate(this%nodesrc(this%nval))
-        read(this%inunit) this%flow
-        do i = 1, this%nval
-          this%nodesrc(i) = i
-        enddo
       endif
     elseif (this%imeth == 6) then
       ! -- method code 6
@@ -202,6 +400,48 @@ module BudgetFileReaderModule
       allocate(this%auxtxt(this%naux))
       read(this%inunit) this%auxtxt
       read(this%inunit) this%nlist
+    else
+      write(errmsg, '(a, a)') 'ERROR READING: ', trim(this%budtxt)
+      call store_error(errmsg)
+      write(errmsg, '(a, i0)') 'INVALID METHOD CODE DETECTED: ', this%imeth
+      call store_error(errmsg)
+      call store_error_unit(this%inunit)
+      call ustop()
+    endif
+    !
+    ! -- return
+    return
+  end subroutine read_header
+  
+  subroutine read_data(this)
+! ******************************************************************************
+! read_data -- read the data for the record whose header was just read
+! ******************************************************************************
+!
+!    SPECIFICATIONS:
+! ------------------------------------------------------------------------------
+    ! -- dummy
+    class(BudgetFileReaderType) :: this
+    ! -- local
+    integer(I4B) :: i, n
+! ------------------------------------------------------------------------------
+    !
+    if(this%imeth == 1) then
+      if (trim(adjustl(this%budtxt)) == 'FLOW-JA-FACE') then
+        if(allocated(this%flowja)) deallocate(this%flowja)
+        allocate(this%flowja(this%nval))
+        read(this%inunit) this%flowja
+      else
+        if(allocated(this%flow)) deallocate(this%flow)
+        allocate(this%flow(this%nval))
+        if(allocated(this%nodesrc)) deallocate(this%nodesrc)
+        allocate(this%nodesrc(this%nval))
+        read(this%inunit) this%flow
+        do i = 1, this%nval
+          this%nodesrc(i) = i
+        enddo
+      endif
+    else
       if(allocated(this%nodesrc)) deallocate(this%nodesrc)
       allocate(this%nodesrc(this%nlist))
       if(allocated(this%nodedst)) deallocate(this%nodedst)
@@ -212,32 +452,35 @@ module BudgetFileReaderModule
       allocate(this%auxvar(this%naux, this%nlist))
       read(this%inunit) (this%nodesrc(n), this%nodedst(n), this%flow(n), &
         (this%auxvar(i, n), i = 1, this%naux), n = 1, this%nlist)
-    else
-      write(errmsg, '(a, a)') 'ERROR READING: ', trim(this%budtxt)
-      call store_error(errmsg)
-      write(errmsg, '(a, i0)') 'INVALID METHOD CODE DETECTED: ', this%imeth
-      call store_error(errmsg)
-      call store_error_unit(this%inunit)
-      call ustop()
-    endif
-    if (iout > 0) then
-      write(iout, '(1pg15.6, a, 1x, a)') this%totim, this%budtxt, &
-        this%dstpackagename
     endif
     !
-    ! -- look ahead to next kstp and kper, then backup if read successfully
-    if (.not. this%endoffile) then
-      read(this%inunit, iostat=iostat) this%kstpnext, this%kpernext
-      if (iostat == 0) then
-        call fseek_stream(this%inunit, -2 * I4B, 1, iostat)
-      else if (iostat < 0) then
-        this%endoffile = .true.
-      end if
+    ! -- return
+    return
+  end subroutine read_data
+  
+  subroutine set_next(this)
+! ******************************************************************************
+! set_next -- count the record that was just read and set kstp and kper of
+!   the next record from the index
+! ******************************************************************************
+!
+!    SPECIFICATIONS:
+! ------------------------------------------------------------------------------
+    ! -- dummy
+    class(BudgetFileReaderType) :: this
+! ------------------------------------------------------------------------------
+    !
+    this%irecord = this%irecord + 1
+    if (this%irecord < this%nrecords) then
+      this%kstpnext = this%recordkstp(this%irecord + 1)
+      this%kpernext = this%recordkper(this%irecord + 1)
+    else
+      this%endoffile = .true.
     endif
     !
     ! -- return
     return
-  end subroutine read_record
+  end subroutine set_next
   
   subroutine finalize(this)
 ! ******************************************************************************
@@ -255,9 +498,13 @@ module BudgetFileReaderModule
     if(allocated(this%nodedst)) deallocate(this%nodedst)
     if(allocated(this%flow)) deallocate(this%flow)
     if(allocated(this%auxvar)) deallocate(this%auxvar)
+    if(allocated(this%recordpos)) deallocate(this%recordpos)
+    if(allocated(this%recordkstp)) deallocate(this%recordkstp)
+    if(allocated(this%recordkper)) deallocate(this%recordkper)
     !
     ! -- return
     return
   end subroutine finalize
   
+  
 end module BudgetFileReaderModule
@@ -0,0 +1,748 @@
+module FlowFileCacheModule
+
+  use KindModule
+  use ConstantsModule,        only: LINELENGTH
+  use BudgetFileReaderModule, only: BudgetFileReaderType
+  use HeadFileReaderModule,   only: HeadFileReaderType
+  use BudgetObjectModule,     only: BudgetObjectType, budgetobject_cr_bfr
+  use BaseDisModule,          only: DisBaseType
+
+  implicit none
+
+  private
+  public :: BudgetFileCacheType
+  public :: HeadFileCacheType
+  public :: BudgetObjectCacheType
+  public :: BudgetRecordType
+  public :: HeadRecordType
+  public :: bfc_cr
+  public :: bfc_da
+  public :: hfc_cr
+  public :: hfc_da
+  public :: boc_cr
+  public :: boc_da
+
+  ! -- A budget file or head file written by a GWF model is read once for
+  !    each time step, no matter how many transport models use it.  The
+  !    records for the time step are kept until all of the models have
+  !    advanced to the next time step.  Once every model has selected the
+  !    budget terms it needs, only the headers of the other terms are read.
+  !    The budget files of the water mover and of the advanced packages are
+  !    read into a budget object, which is shared by the transport models
+  !    because they only read its terms.
+
+  type :: BudgetRecordType
+    integer(I4B) :: kstp = 0
+    integer(I4B) :: kper = 0
+    real(DP) :: totim = 0.d0
+    character(len=16) :: budtxt = ''
+    character(len=16) :: dstpackagename = ''
+    integer(I4B) :: naux = 0
+    integer(I4B) :: nlist = 0
+    character(len=16), dimension(:), allocatable :: auxtxt
+    real(DP), dimension(:), allocatable :: flowja
+    integer(I4B), dimension(:), allocatable :: nodesrc
+    real(DP), dimension(:), allocatable :: flow
+    real(DP), dimension(:, :), allocatable :: auxvar
+  end type BudgetRecordType
+
+  type :: BudgetFileCacheType
+    character(len=LINELENGTH) :: filename = ''
+    integer(I4B) :: inunit = 0
+    integer(I4B) :: nuser = 0
+    integer(I4B) :: kstp = 0
+    integer(I4B) :: kper = 0
+    integer(I4B) :: nread = 0
+    integer(I4B) :: nselect = 0
+    logical :: readnext = .false.
+    type(BudgetFileReaderType) :: bfr
+    type(BudgetRecordType), dimension(:), allocatable :: records
+    logical, dimension(:), allocatable :: lread
+  contains
+    procedure :: advance => bfc_advance
+    procedure :: select_terms => bfc_select_terms
+  end type BudgetFileCacheType
+
+  type :: HeadRecordType
+    integer(I4B) :: kstp = 0
+    integer(I4B) :: kper = 0
+    real(DP), dimension(:), allocatable :: head
+  end type HeadRecordType
+
+  type :: HeadFileCacheType
+    character(len=LINELENGTH) :: filename = ''
+    integer(I4B) :: inunit = 0
+    integer(I4B) :: nuser = 0
+    integer(I4B) :: kstp = 0
+    integer(I4B) :: kper = 0
+    integer(I4B) :: nread = 0
+    logical :: readnext = .false.
+    type(HeadFileReaderType) :: hfr
+    type(HeadRecordType), dimension(:), allocatable :: records
+  contains
+    procedure :: advance => hfc_advance
+  end type HeadFileCacheType
+
+  type :: BudgetObjectCacheType
+    character(len=LINELENGTH) :: filename = ''
+    integer(I4B) :: inunit = 0
+    integer(I4B) :: nuser = 0
+    integer(I4B) :: kstp = 0
+    integer(I4B) :: kper = 0
+    type(BudgetObjectType), pointer :: budobj => null()
+  contains
+    procedure :: advance => boc_advance
+  end type BudgetObjectCacheType
+
+  type :: BudgetFileCachePtr
+    type(BudgetFileCacheType), pointer :: ptr => null()
+  end type BudgetFileCachePtr
+
+  type :: HeadFileCachePtr
+    type(HeadFileCacheType), pointer :: ptr => null()
+  end type HeadFileCachePtr
+
+  type :: BudgetObjectCachePtr
+    type(BudgetObjectCacheType), pointer :: ptr => null()
+  end type BudgetObjectCachePtr
+
+  ! -- caches for all of the budget and head files that are open
+  type(BudgetFileCachePtr), dimension(:), allocatable :: bfclist
+  type(HeadFileCachePtr), dimension(:), allocatable :: hfclist
+  type(BudgetObjectCachePtr), dimension(:), allocatable :: boclist
+
+  contains
+
+  subroutine bfc_cr(bfc, fname, iout)
+! ******************************************************************************
+! bfc_cr -- Return the cache for budget file fname.  The file is opened and
+!   the budget file reader is initialized if this is the first request for
+!   the file.
+! ******************************************************************************
+!
+!    SPECIFICATIONS:
+! ------------------------------------------------------------------------------
+    ! -- modules
+    use OpenSpecModule, only: ACCESS, FORM
+    use InputOutputModule, only: getunit, openfile
+    ! -- dummy
+    type(BudgetFileCacheType), pointer :: bfc
+    character(len=*), intent(in) :: fname
+    integer(I4B), intent(in) :: iout
+    ! -- local
+    integer(I4B) :: i, n
+    integer(I4B) :: ncrbud
+    type(BudgetFileCachePtr), dimension(:), allocatable :: tmplist
+    ! -- formats
+    character(len=*), parameter :: fmtshare =                                  &
+      "(1x,'BUDGET FILE ',a,' IS ALREADY OPEN ON UNIT ',i0,                    &
+      &'.  RECORDS WILL BE SHARED.')"
+! ------------------------------------------------------------------------------
+    !
+    ! -- return the cache if the file is already open
+    if (.not. allocated(bfclist)) allocate(bfclist(0))
+    n = size(bfclist)
+    do i = 1, n
+      if (same_file(bfclist(i)%ptr%filename, bfclist(i)%ptr%inunit, fname)) then
+        bfc => bfclist(i)%ptr
+        bfc%nuser = bfc%nuser + 1
+        write(iout, fmtshare) trim(fname), bfc%inunit
+        return
+      end if
+    end do
+    !
+    ! -- open the file and initialize the reader
+    allocate(bfc)
+    bfc%filename = normalize_path(fname)
+    bfc%inunit = getunit()
+    call openfile(bfc%inunit, iout, fname, 'DATA(BINARY)', FORM, ACCESS,       &
+                  'UNKNOWN')
+    call bfc%bfr%initialize(bfc%inunit, iout, ncrbud)
+    allocate(bfc%records(bfc%bfr%nbudterms))
+    allocate(bfc%lread(bfc%bfr%nbudterms))
+    bfc%lread(:) = .false.
+    bfc%nuser = 1
+    !
+    ! -- add the cache to the list
+    allocate(tmplist(n + 1))
+    do i = 1, n
+      tmplist(i)%ptr => bfclist(i)%ptr
+    end do
+    tmplist(n + 1)%ptr => bfc
+    call move_alloc(tmplist, bfclist)
+    !
+    ! -- return
+    return
+  end subroutine bfc_cr
+
+  subroutine bfc_advance(this, kstp, kper)
+! ******************************************************************************
+! bfc_advance -- Read the budget records for time step kstp of stress period
+!   kper, unless they were already read for another model.  readnext is
+!   .false. if the records from the previous time step are to be used
+!   again.  nread is the number of records read successfully.  The data of
+!   a term that was not selected by any model are skipped, and only the
+!   header variables of its record are set.
+! ******************************************************************************
+!
+!    SPECIFICATIONS:
+! ------------------------------------------------------------------------------
+    ! -- dummy
+    class(BudgetFileCacheType) :: this
+    integer(I4B), intent(in) :: kstp
+    integer(I4B), intent(in) :: kper
+    ! -- local
+    logical :: success
+    integer(I4B) :: n
+! ------------------------------------------------------------------------------
+    !
+    ! -- records are already available for this time step
+    if (kstp == this%kstp .and. kper == this%kper) return
+    this%kstp = kstp
+    this%kper = kper
+    !
+    ! -- Do not read the budget if the budget is at end of file or if the next
+    !    record in the budget file is the first timestep of the next stress
+    !    period.
+    this%readnext = .true.
+    if (kstp * kper > 1) then
+      if (this%bfr%endoffile) then
+        this%readnext = .false.
+      else
+        if (this%bfr%kpernext == kper + 1 .and. this%bfr%kstpnext == 1) &
+          this%readnext = .false.
+      endif
+    endif
+    if (.not. this%readnext) return
+    !
+    ! -- read and store each budget term
+    this%nread = 0
+    do n = 1, this%bfr%nbudterms
+      if (this%nselect < this%nuser .or. this%lread(n)) then
+        call this%bfr%read_record(success)
+        if (.not. success) exit
+        call store_budget_record(this%bfr, this%records(n))
+      else
+        call this%bfr%skip_record(success)
+        if (.not. success) exit
+        call store_budget_header(this%bfr, this%records(n))
+      end if
+      this%nread = n
+    end do
+    !
+    ! -- return
+    return
+  end subroutine bfc_advance
+
+  subroutine store_budget_record(bfr, rec)
+! ******************************************************************************
+! store_budget_record -- Copy the last record read by bfr into rec
+! ******************************************************************************
+!
+!    SPECIFICATIONS:
+! ------------------------------------------------------------------------------
+    ! -- dummy
+    type(BudgetFileReaderType), intent(in) :: bfr
+    type(BudgetRecordType), intent(inout) :: rec
+! ------------------------------------------------------------------------------
+    !
+    call store_budget_header(bfr, rec)
+    if (bfr%imeth == 1) then
+      if (trim(adjustl(bfr%budtxt)) == 'FLOW-JA-FACE') then
+        rec%flowja = bfr%flowja
+      else
+        rec%flow = bfr%flow
+      end if
+    else
+      rec%auxtxt = bfr%auxtxt
+      rec%nodesrc = bfr%nodesrc
+      rec%flow = bfr%flow
+      rec%auxvar = bfr%auxvar
+    end if
+    !
+    ! -- return
+    return
+  end subroutine store_budget_record
+
+  subroutine store_budget_header(bfr, rec)
+! ******************************************************************************
+! store_budget_header -- Copy the header variables of the last record read
+!   or skipped by bfr into rec
+! ******************************************************************************
+!
+!    SPECIFICATIONS:
+! ------------------------------------------------------------------------------
+    ! -- dummy
+    type(BudgetFileReaderType), intent(in) :: bfr
+    type(BudgetRecordType), intent(inout) :: rec
+! ------------------------------------------------------------------------------
+    !
+    rec%kstp = bfr%kstp
+    rec%kper = bfr%kper
+    rec%totim = bfr%totim
+    rec%budtxt = bfr%budtxt
+    rec%dstpackagename = bfr%dstpackagename
+    rec%naux = bfr%naux
+    rec%nlist = bfr%nlist
+    !
+    ! -- return
+    return
+  end subroutine store_budget_header
+
+  subroutine bfc_select_terms(this, lread)
+! ******************************************************************************
+! bfc_select_terms -- Called once by each model using the cache with lread
+!   set to .true. for the budget terms that the model needs.  Until every
+!   model has made its selection, all of the terms are read.
+! ******************************************************************************
+!
+!    SPECIFICATIONS:
+! ------------------------------------------------------------------------------
+    ! -- dummy
+    class(BudgetFileCacheType) :: this
+    logical, dimension(:), intent(in) :: lread
+! ------------------------------------------------------------------------------
+    !
+    this%lread(:) = this%lread(:) .or. lread(:)
+    this%nselect = this%nselect + 1
+    !
+    ! -- return
+    return
+  end subroutine bfc_select_terms
+
+  subroutine bfc_da(bfc)
+! ******************************************************************************
+! bfc_da -- Called by each model using the cache when it is finished.  The
+!   file is closed and the cache is removed from the list and deallocated
+!   after the last model releases it.  bfc is nullified.
+! ******************************************************************************
+!
+!    SPECIFICATIONS:
+! ------------------------------------------------------------------------------
+    ! -- dummy
+    type(BudgetFileCacheType), pointer :: bfc
+    ! -- local
+    integer(I4B) :: i, j, n
+    type(BudgetFileCachePtr), dimension(:), allocatable :: tmplist
+! ------------------------------------------------------------------------------
+    !
+    bfc%nuser = bfc%nuser - 1
+    if (bfc%nuser == 0) then
+      !
+      ! -- remove the cache from the list
+      n = size(bfclist)
+      allocate(tmplist(n - 1))
+      j = 0
+      do i = 1, n
+        if (associated(bfclist(i)%ptr, bfc)) cycle
+        j = j + 1
+        tmplist(j)%ptr => bfclist(i)%ptr
+      end do
+      call move_alloc(tmplist, bfclist)
+      !
+      ! -- close the file and deallocate the cache
+      call bfc%bfr%finalize()
+      deallocate(bfc%records)
+      deallocate(bfc%lread)
+      deallocate(bfc)
+    end if
+    nullify(bfc)
+    !
+    ! -- return
+    return
+  end subroutine bfc_da
+
+  subroutine hfc_cr(hfc, fname, iout)
+! ******************************************************************************
+! hfc_cr -- Return the cache for head file fname.  The file is opened and
+!   the head file reader is initialized if this is the first request for
+!   the file.
+! ******************************************************************************
+!
+!    SPECIFICATIONS:
+! ------------------------------------------------------------------------------
+    ! -- modules
+    use OpenSpecModule, only: ACCESS, FORM
+    use InputOutputModule, only: getunit, openfile
+    ! -- dummy
+    type(HeadFileCacheType), pointer :: hfc
+    character(len=*), intent(in) :: fname
+    integer(I4B), intent(in) :: iout
+    ! -- local
+    integer(I4B) :: i, n
+    type(HeadFileCachePtr), dimension(:), allocatable :: tmplist
+    ! -- formats
+    character(len=*), parameter :: fmtshare =                                  &
+      "(1x,'HEAD FILE ',a,' IS ALREADY OPEN ON UNIT ',i0,                      &
+      &'.  RECORDS WILL BE SHARED.')"
+! ------------------------------------------------------------------------------
+    !
+    ! -- return the cache if the file is already open
+    if (.not. allocated(hfclist)) allocate(hfclist(0))
+    n = size(hfclist)
+    do i = 1, n
+      if (same_file(hfclist(i)%ptr%filename, hfclist(i)%ptr%inunit, fname)) then
+        hfc => hfclist(i)%ptr
+        hfc%nuser = hfc%nuser + 1
+        write(iout, fmtshare) trim(fname), hfc%inunit
+        return
+      end if
+    end do
+    !
+    ! -- open the file and initialize the reader
+    allocate(hfc)
+    hfc%filename = normalize_path(fname)
+    hfc%inunit = getunit()
+    call openfile(hfc%inunit, iout, fname, 'DATA(BINARY)', FORM, ACCESS,       &
+                  'UNKNOWN')
+    call hfc%hfr%initialize(hfc%inunit, iout)
+    allocate(hfc%records(hfc%hfr%nlay))
+    hfc%nuser = 1
+    !
+    ! -- add the cache to the list
+    allocate(tmplist(n + 1))
+    do i = 1, n
+      tmplist(i)%ptr => hfclist(i)%ptr
+    end do
+    tmplist(n + 1)%ptr => hfc
+    call move_alloc(tmplist, hfclist)
+    !
+    ! -- return
+    return
+  end subroutine hfc_cr
+
+  subroutine hfc_advance(this, kstp, kper)
+! ******************************************************************************
+! hfc_advance -- Read the head records for time step kstp of stress period
+!   kper, unless they were already read for another model.  readnext is
+!   .false. if the heads from the previous time step are to be used again.
+!   nread is the number of records read successfully.
+! ******************************************************************************
+!
+!    SPECIFICATIONS:
+! ------------------------------------------------------------------------------
+    ! -- dummy
+    class(HeadFileCacheType) :: this
+    integer(I4B), intent(in) :: kstp
+    integer(I4B), intent(in) :: kper
+    ! -- local
+    logical :: success
+    integer(I4B) :: n
+! ------------------------------------------------------------------------------
+    !
+    ! -- records are already available for this time step
+    if (kstp == this%kstp .and. kper == this%kper) return
+    this%kstp = kstp
+    this%kper = kper
+    !
+    ! -- Do not read heads if the head is at end of file or if the next
+    !    record in the head file is the first timestep of the next stress
+    !    period.
+    this%readnext = .true.
+    if (kstp * kper > 1) then
+      if (this%hfr%endoffile) then
+        this%readnext = .false.
+      else
+        if (this%hfr%kpernext == kper + 1 .and. this%hfr%kstpnext == 1) &
+          this%readnext = .false.
+      endif
+    endif
+    if (.not. this%readnext) return
+    !
+    ! -- read and store the head for each layer
+    this%nread = 0
+    do n = 1, this%hfr%nlay
+      call this%hfr%read_record(success)
+      if (.not. success) exit
+      this%records(n)%kstp = this%hfr%kstp
+      this%records(n)%kper = this%hfr%kper
+      this%records(n)%head = this%hfr%head
+      this%nread = n
+    end do
+    !
+    ! -- return
+    return
+  end subroutine hfc_advance
+
+  subroutine hfc_da(hfc)
+! ******************************************************************************
+! hfc_da -- Called by each model using the cache when it is finished.  The
+!   file is closed and the cache is removed from the list and deallocated
+!   after the last model releases it.  hfc is nullified.
+! ******************************************************************************
+!
+!    SPECIFICATIONS:
+! ------------------------------------------------------------------------------
+    ! -- dummy
+    type(HeadFileCacheType), pointer :: hfc
+    ! -- local
+    integer(I4B) :: i, j, n
+    type(HeadFileCachePtr), dimension(:), allocatable :: tmplist
+! ------------------------------------------------------------------------------
+    !
+    hfc%nuser = hfc%nuser - 1
+    if (hfc%nuser == 0) then
+      !
+      ! -- remove the cache from the list
+      n = size(hfclist)
+      allocate(tmplist(n - 1))
+      j = 0
+      do i = 1, n
+        if (associated(hfclist(i)%ptr, hfc)) cycle
+        j = j + 1
+        tmplist(j)%ptr => hfclist(i)%ptr
+      end do
+      call move_alloc(tmplist, hfclist)
+      !
+      ! -- close the file and deallocate the cache
+      call hfc%hfr%finalize()
+      deallocate(hfc%records)
+      deallocate(hfc)
+    end if
+    nullify(hfc)
+    !
+    ! -- return
+    return
+  end subroutine hfc_da
+
+  subroutine boc_cr(boc, fname, name, dis, iout, colconv2)
+! ******************************************************************************
+! boc_cr -- Return the cache for budget file fname, which is read into a
+!   budget object called name.  The file is opened and the budget object is
+!   created and filled with the first time step if this is the first request
+!   for the file.  The models sharing the budget object must have the same
+!   discretization because the node numbers are converted by the first one.
+! ******************************************************************************
+!
+!    SPECIFICATIONS:
+! ------------------------------------------------------------------------------
+    ! -- modules
+    use OpenSpecModule, only: ACCESS, FORM
+    use InputOutputModule, only: getunit, openfile
+    use SimModule, only: store_error, ustop
+    ! -- dummy
+    type(BudgetObjectCacheType), pointer :: boc
+    character(len=*), intent(in) :: fname
+    character(len=*), intent(in) :: name
+    class(DisBaseType), intent(in) :: dis
+    integer(I4B), intent(in) :: iout
+    character(len=16), dimension(:), optional :: colconv2
+    ! -- local
+    character(len=LINELENGTH) :: errmsg
+    integer(I4B) :: i, n
+    type(BudgetObjectCachePtr), dimension(:), allocatable :: tmplist
+    ! -- formats
+    character(len=*), parameter :: fmtshare =                                  &
+      "(1x,a,' BUDGET FILE ',a,' IS ALREADY OPEN ON UNIT ',i0,                 &
+      &'.  RECORDS WILL BE SHARED.')"
+! ------------------------------------------------------------------------------
+    !
+    ! -- return the cache if the file is already open
+    if (.not. allocated(boclist)) allocate(boclist(0))
+    n = size(boclist)
+    do i = 1, n
+      if (same_file(boclist(i)%ptr%filename, boclist(i)%ptr%inunit, fname)) then
+        boc => boclist(i)%ptr
+        if (boc%budobj%name /= name) then
+          write(errmsg, '(a,a,a,a,a,a,a)') 'BUDGET FILE ', trim(fname),        &
+            ' IS READ FOR ', trim(boc%budobj%name), ' BY ANOTHER MODEL AND ',  &
+            'CANNOT ALSO BE READ FOR ', trim(name)
+          call store_error(errmsg)
+          call ustop()
+        end if
+        boc%nuser = boc%nuser + 1
+        write(iout, fmtshare) trim(name), trim(fname), boc%inunit
+        return
+      end if
+    end do
+    !
+    ! -- open the file, create the budget object and read the first time step
+    allocate(boc)
+    boc%filename = normalize_path(fname)
+    boc%inunit = getunit()
+    call openfile(boc%inunit, iout, fname, 'DATA(BINARY)', FORM, ACCESS,       &
+                  'UNKNOWN')
+    call budgetobject_cr_bfr(boc%budobj, name, boc%inunit, iout,               &
+                             colconv2=colconv2)
+    call boc%budobj%fill_from_bfr(dis, iout)
+    boc%nuser = 1
+    !
+    ! -- add the cache to the list
+    allocate(tmplist(n + 1))
+    do i = 1, n
+      tmplist(i)%ptr => boclist(i)%ptr
+    end do
+    tmplist(n + 1)%ptr => boc
+    call move_alloc(tmplist, boclist)
+    !
+    ! -- return
+    return
+  end subroutine boc_cr
+
+  subroutine boc_advance(this, dis, iout)
+! ******************************************************************************
+! boc_advance -- Read the budget terms of the budget object for the current
+!   time step, unless they were already read for another model.
+! ******************************************************************************
+!
+!    SPECIFICATIONS:
+! ------------------------------------------------------------------------------
+    ! -- modules
+    use TdisModule, only: kstp, kper
+    ! -- dummy
+    class(BudgetObjectCacheType) :: this
+    class(DisBaseType), intent(in) :: dis
+    integer(I4B), intent(in) :: iout
+! ------------------------------------------------------------------------------
+    !
+    ! -- terms are already available for this time step
+    if (kstp == this%kstp .and. kper == this%kper) return
+    this%kstp = kstp
+    this%kper = kper
+    !
+    ! -- read the terms
+    call this%budobj%bfr_advance(dis, iout)
+    !
+    ! -- return
+    return
+  end subroutine boc_advance
+
+  subroutine boc_da(boc)
+! ******************************************************************************
+! boc_da -- Called by each model using the cache when it is finished.  The
+!   file is closed and the cache and its budget object are removed from the
+!   list and deallocated after the last model releases it.  boc is
+!   nullified.
+! ******************************************************************************
+!
+!    SPECIFICATIONS:
+! ------------------------------------------------------------------------------
+    ! -- dummy
+    type(BudgetObjectCacheType), pointer :: boc
+    ! -- local
+    integer(I4B) :: i, j, n
+    type(BudgetObjectCachePtr), dimension(:), allocatable :: tmplist
+! ------------------------------------------------------------------------------
+    !
+    boc%nuser = boc%nuser - 1
+    if (boc%nuser == 0) then
+      !
+      ! -- remove the cache from the list
+      n = size(boclist)
+      allocate(tmplist(n - 1))
+      j = 0
+      do i = 1, n
+        if (associated(boclist(i)%ptr, boc)) cycle
+        j = j + 1
+        tmplist(j)%ptr => boclist(i)%ptr
+      end do
+      call move_alloc(tmplist, boclist)
+      !
+      ! -- close the file and deallocate the budget object and the cache
+      call boc%budobj%bfr%finalize()
+      deallocate(boc%budobj%bfr)
+      call boc%budobj%budgetobject_da()
+      deallocate(boc%budobj)
+      deallocate(boc)
+    end if
+    nullify(boc)
+    !
+    ! -- return
+    return
+  end subroutine boc_da
+
+  function same_file(cachename, cacheunit, fname) result(same)
+! ******************************************************************************
+! same_file -- Return .true. if fname is the file of a cache, which was
+!   opened on cacheunit.  The names are compared after they are normalized,
+!   so ./flow.bud and flow.bud are the same file.  A file with a different
+!   name is also the same file if it is open on cacheunit, for example when
+!   an absolute path is used by one of the models.
+! ******************************************************************************
+!
+!    SPECIFICATIONS:
+! ------------------------------------------------------------------------------
+    ! -- dummy
+    character(len=*), intent(in) :: cachename
+    integer(I4B), intent(in) :: cacheunit
+    character(len=*), intent(in) :: fname
+    logical :: same
+    ! -- local
+    integer(I4B) :: iu
+! ------------------------------------------------------------------------------
+    !
+    same = (cachename == normalize_path(fname))
+    if (.not. same) then
+      inquire(file=trim(fname), number=iu)
+      same = (iu == cacheunit)
+    end if
+    !
+    ! -- return
+    return
+  end function same_file
+
+  function normalize_path(fname) result(path)
+! ******************************************************************************
+! normalize_path -- Return fname with / as the separator and without empty
+!   and . directories.  A directory followed by .. is removed with the ..
+! ******************************************************************************
+!
+!    SPECIFICATIONS:
+! ------------------------------------------------------------------------------
+    ! -- dummy
+    character(len=*), intent(in) :: fname
+    character(len=LINELENGTH) :: path
+    ! -- local
+    character(len=LINELENGTH) :: f
+    character(len=LINELENGTH) :: dir
+    integer(I4B) :: i, istart, iend, ilast
+! ------------------------------------------------------------------------------
+    !
+    ! -- use / as the separator
+    f = adjustl(fname)
+    do i = 1, len_trim(f)
+      if (f(i:i) == '\') f(i:i) = '/'
+    end do
+    !
+    ! -- keep the leading / of an absolute path
+    path = ''
+    if (f(1:1) == '/') path = '/'
+    !
+    ! -- add the directories one at a time
+    iend = len_trim(f)
+    istart = 1
+    do while (istart <= iend)
+      i = index(f(istart:iend), '/')
+      if (i == 0) then
+        dir = f(istart:iend)
+        istart = iend + 1
+      else
+        dir = f(istart:istart + i - 2)
+        istart = istart + i
+      end if
+      if (len_trim(dir) == 0 .or. dir == '.') cycle
+      !
+      ! -- remove the last directory if dir is .. and the last directory is
+      !    not also ..
+      if (dir == '..') then
+        ilast = index(path, '/', back=.true.)
+        if (path(ilast + 1:) /= '..' .and. len_trim(path(ilast + 1:)) > 0) then
+          path(ilast + 1:) = ''
+          if (ilast > 1) path(ilast:) = ''
+          cycle
+        end if
+      end if
+      !
+      ! -- add dir
+      if (len_trim(path) == 0 .or. path == '/') then
+        path = trim(path) // dir
+      else
+        path = trim(path) // '/' // dir
+      end if
+    end do
+    !
+    ! -- return
+    return
+  end function normalize_path
+
+end module FlowFileCacheModule
@@ -6,7 +6,9 @@
 ! like a dictionary.  There can be n number of character
 ! strings and each string will be assigned a unique number
 ! between 1 and n, allowing an efficient way to store a
-! unique integer index with a character string.
+! unique integer index with a character string.  The number
+! of hash lists is increased as entries are added so the
+! average list length stays short for large tables.
   
 module HashTableModule
 
@@ -21,6 +23,7 @@ module HashTableModule
   
   integer, parameter, private :: HASH_SIZE  = 4993
   integer, parameter, private :: MULTIPLIER = 31
+  integer, parameter, private :: MAX_LOAD   = 2
 
   type :: ListDataType
     character(len=:), allocatable :: key
@@ -41,10 +44,13 @@ module HashTableModule
   type :: HashTableType
     private
     type(HashListType), dimension(:), pointer :: table => null()
+    integer(I4B) :: nentry = 0
   contains
     procedure :: add_entry
     procedure :: get_elem
     procedure :: get_index
+    procedure :: count_entries
+    procedure, private :: resize
   end type HashTableType
   
   contains
@@ -65,6 +71,7 @@ module HashTableModule
     ! -- allocate
     allocate(ht)
     allocate(ht%table(HASH_SIZE))
+    ht%nentry = 0
     !
     ! -- nullify each list
     do i = 1, HASH_SIZE
@@ -127,12 +134,18 @@ module HashTableModule
     if (associated(elem)) then
       elem%listdata%index = index
     else
-      ihash = hashfunc(trim(key))
+      ihash = hashfunc(trim(key), size(this%table))
       if (associated(this%table(ihash)%list)) then
         call this%table(ihash)%list%add(key, index)
       else
         call listtype_cr(this%table(ihash)%list, key, index)
       end if
+      this%nentry = this%nentry + 1
+      !
+      ! -- increase the number of hash lists if the lists are getting long
+      if (this%nentry > MAX_LOAD * size(this%table)) then
+        call this%resize(2 * size(this%table) + 1)
+      end if
     end if
     !
     ! -- return
@@ -153,7 +166,7 @@ module HashTableModule
     type(ListType), pointer :: elem
     integer(I4B) :: ihash
 ! ------------------------------------------------------------------------------
-    ihash = hashfunc(trim(key))
+    ihash = hashfunc(trim(key), size(this%table))
     elem => this%table(ihash)%list
     do while (associated(elem))
       if (elem%listdata%key == key) then
@@ -193,6 +206,68 @@ module HashTableModule
     ! -- return
     return
   end function get_index
+
+  function count_entries(this) result(nentry)
+! ******************************************************************************
+! count_entries -- get the number of keys in the hash table
+! ******************************************************************************
+!
+!    SPECIFICATIONS:
+! ------------------------------------------------------------------------------
+    ! -- dummy
+    class(HashTableType) :: this
+    ! -- return
+    integer(I4B) :: nentry
+! ------------------------------------------------------------------------------
+    nentry = this%nentry
+    !
+    ! -- return
+    return
+  end function count_entries
+
+  subroutine resize(this, nsize)
+! ******************************************************************************
+! resize -- move the entries of the hash table to nsize hash lists
+! ******************************************************************************
+!
+!    SPECIFICATIONS:
+! ------------------------------------------------------------------------------
+    ! -- dummy
+    class(HashTableType) :: this
+    integer(I4B), intent(in) :: nsize
+    ! -- local
+    type(HashListType), dimension(:), pointer :: table
+    type(ListType), pointer :: elem
+    type(ListType), pointer :: next
+    integer(I4B) :: i
+    integer(I4B) :: ihash
+! ------------------------------------------------------------------------------
+    !
+    ! -- allocate the new hash lists
+    allocate(table(nsize))
+    do i = 1, nsize
+      table(i)%list => null()
+    enddo
+    !
+    ! -- move each element to the front of its new hash list
+    do i = 1, size(this%table)
+      elem => this%table(i)%list
+      do while (associated(elem))
+        next => elem%next
+        ihash = hashfunc(trim(elem%listdata%key), nsize)
+        elem%next => table(ihash)%list
+        table(ihash)%list => elem
+        elem => next
+      enddo
+    enddo
+    !
+    ! -- replace the hash lists
+    deallocate(this%table)
+    this%table => table
+    !
+    ! -- return
+    return
+  end subroutine resize
   
   subroutine listtype_cr(list, key, index)
 ! ******************************************************************************
@@ -263,7 +338,7 @@ module HashTableModule
     return
   end subroutine listtype_da
 
-  function hashfunc(key) result(ihash)
+  function hashfunc(key, nsize) result(ihash)
 ! ******************************************************************************
 ! hashfunc -- function to convert key into an integer hash number
 ! ******************************************************************************
@@ -272,15 +347,16 @@ module HashTableModule
 ! ------------------------------------------------------------------------------
     ! -- dummy
     character(len=*), intent(in) :: key
+    integer(I4B), intent(in) :: nsize
     ! -- local
     integer(I4B) :: ihash
     integer(I4B) :: i
 ! ------------------------------------------------------------------------------
     ihash = 0
     do i = 1,len(key)
-      ihash = modulo( MULTIPLIER * ihash + ichar(key(i:i)), HASH_SIZE)
+      ihash = modulo( MULTIPLIER * ihash + ichar(key(i:i)), nsize)
     enddo
-    ihash = 1 + modulo(ihash - 1, HASH_SIZE)
+    ihash = 1 + modulo(ihash - 1, nsize)
     !
     ! -- return
     return
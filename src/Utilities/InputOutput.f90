@@ -2,8 +2,8 @@
 !
 module InputOutputModule
 
-  use KindModule, only: DP, I4B
-  use SimVariablesModule, only: iunext, isim_mode
+  use KindModule, only: DP, I4B, I8B
+  use SimVariablesModule, only: iunext, iunitlast, isim_mode
   use SimModule, only: store_error, ustop, store_error_unit,                   &
                        store_error_filename
   use ConstantsModule, only: IUSTART, IULAST,                                  &
@@ -27,6 +27,12 @@ module InputOutputModule
             BuildFloatFormat, BuildIntFormat, fseek_stream,                    &
             get_nwords, u9rdcom
 
+  interface fseek_stream
+    ! The offset can be a four or an eight byte integer.  Eight byte offsets
+    ! are needed to position files larger than two gigabytes.
+    module procedure fseek_stream_i4, fseek_stream_i8
+  end interface fseek_stream
+
   contains
 
   subroutine openfile(iu, iout, fname, ftype, fmtarg_opt, accarg_opt,          &
@@ -193,7 +199,7 @@ module InputOutputModule
     logical :: opened
 ! ------------------------------------------------------------------------------
   !
-    do i = iunext, iulast
+    do i = iunext, iunitlast
       inquire(unit=i, opened=opened)
       if(.not. opened) exit
     enddo
@@ -2186,20 +2192,41 @@ module InputOutputModule
     return
   end function get_nwords
 
-  subroutine fseek_stream(iu, offset, whence, status)
+  subroutine fseek_stream_i4(iu, offset, whence, status)
+! ******************************************************************************
+! Move the file pointer by a four byte offset.  See fseek_stream_i8.
+! ******************************************************************************
+!
+!    SPECIFICATIONS:
+! ------------------------------------------------------------------------------
+    integer(I4B), intent(in) :: iu
+    integer(I4B), intent(in) :: offset
+    integer(I4B), intent(in) :: whence
+    integer(I4B), intent(inout) :: status
+! ------------------------------------------------------------------------------
+    !
+    call fseek_stream_i8(iu, int(offset, I8B), whence, status)
+    !
+    ! -- return
+    return
+  end subroutine fseek_stream_i4
+
+  subroutine fseek_stream_i8(iu, offset, whence, status)
 ! ******************************************************************************
 ! Move the file pointer.  Patterned after fseek, which is not 
 ! supported as part of the fortran standard.  For this subroutine to work
 ! the file must have been opened with access='stream' and action='readwrite'.
+! As with fseek, an offset of zero with whence = 0 is the start of the file
+! and an offset of zero with whence = 2 is the end of the file.
 ! ******************************************************************************
 !
 !    SPECIFICATIONS:
 ! ------------------------------------------------------------------------------
     integer(I4B), intent(in) :: iu
-    integer(I4B), intent(in) :: offset
+    integer(I8B), intent(in) :: offset
     integer(I4B), intent(in) :: whence
     integer(I4B), intent(inout) :: status
-    integer(I4B) :: ipos
+    integer(I8B) :: ipos
 ! ------------------------------------------------------------------------------
     !
     inquire(unit=iu, size=ipos)
@@ -2208,7 +2235,7 @@ module InputOutputModule
     case(0)
       !
       ! -- whence = 0, offset is relative to start of file
-      ipos = 0 + offset
+      ipos = 1 + offset
     case(1)
       !
       ! -- whence = 1, offset is relative to current pointer position
@@ -2218,7 +2245,7 @@ module InputOutputModule
       !
       ! -- whence = 2, offset is relative to end of file
       inquire(unit=iu, size=ipos)
-      ipos = ipos + offset
+      ipos = ipos + 1 + offset
     end select
     !
     ! -- position the file pointer to ipos
@@ -2227,7 +2254,7 @@ module InputOutputModule
     !
     ! -- return
     return
-  end subroutine fseek_stream
+  end subroutine fseek_stream_i8
   
   subroutine u9rdcom(iin, iout, line, ierr)
 ! ******************************************************************************
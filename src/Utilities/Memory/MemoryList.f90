@@ -1,52 +1,102 @@
 module MemoryListModule
   use KindModule, only: DP, I4B
   use MemoryTypeModule, only: MemoryType
-  use ListModule, only: ListType
+  use MemoryHelperModule, only: create_mem_address
+  use HashTableModule, only: HashTableType, hash_table_cr, hash_table_da
   private
   public :: MemoryListType
-  
+
+  type :: MemoryContainerType
+    type(MemoryType), pointer :: mt => null()
+  end type MemoryContainerType
+
   type :: MemoryListType
-    type(ListType), private :: list
+    type(MemoryContainerType), dimension(:), allocatable, private :: mts
+    integer(I4B), private :: nmt = 0
+    type(HashTableType), pointer, private :: ht => null()                       !< index of the entries keyed on the memory address
   contains
     procedure :: add
     procedure :: get
+    procedure :: find
     procedure :: count
     procedure :: clear
   end type MemoryListType
-  
+
   contains
-  
+
   subroutine add(this, mt)
     class(MemoryListType) :: this
     type(MemoryType), pointer :: mt
-    class(*), pointer :: obj
-    obj => mt
-    call this%list%add(obj)
+    type(MemoryContainerType), dimension(:), allocatable :: mts
+    character(len=:), allocatable :: key
+    integer(I4B) :: i
+    !
+    ! -- increase the size of the entry array
+    if (.not. allocated(this%mts)) then
+      allocate(this%mts(1000))
+    else if (this%nmt == size(this%mts)) then
+      allocate(mts(2 * this%nmt))
+      do i = 1, this%nmt
+        mts(i)%mt => this%mts(i)%mt
+      end do
+      call move_alloc(mts, this%mts)
+    end if
+    this%nmt = this%nmt + 1
+    this%mts(this%nmt)%mt => mt
+    !
+    ! -- index the entry, the first entry with an address is the one found
+    if (.not. associated(this%ht)) then
+      call hash_table_cr(this%ht)
+    end if
+    key = trim(create_mem_address(mt%path, mt%name))
+    if (this%ht%get_index(key) == 0) then
+      call this%ht%add_entry(key, this%nmt)
+    end if
   end subroutine add
-  
+
   function get(this, ipos) result(res)
     class(MemoryListType) :: this
     integer(I4B), intent(in) :: ipos
     type(MemoryType), pointer :: res
-    class(*), pointer :: obj
-    obj => this%list%getitem(ipos)
-    select type (obj)
-    type is (MemoryType)
-      res => obj
-    end select
+    res => null()
+    if (ipos > 0 .and. ipos <= this%nmt) then
+      res => this%mts(ipos)%mt
+    end if
     return
   end function get
-  
+
+  function find(this, path, name) result(res)
+    class(MemoryListType) :: this
+    character(len=*), intent(in) :: path
+    character(len=*), intent(in) :: name
+    type(MemoryType), pointer :: res
+    integer(I4B) :: ipos
+    res => null()
+    if (associated(this%ht)) then
+      ipos = this%ht%get_index(trim(create_mem_address(path, name)))
+      if (ipos > 0) then
+        res => this%mts(ipos)%mt
+      end if
+    end if
+    return
+  end function find
+
   function count(this) result(nval)
     class(MemoryListType) :: this
     integer(I4B) :: nval
-    nval = this%list%count()
+    nval = this%nmt
     return
   end function count
 
   subroutine clear(this)
     class(MemoryListType) :: this
-    call this%list%Clear()
+    if (allocated(this%mts)) then
+      deallocate(this%mts)
+    end if
+    this%nmt = 0
+    if (associated(this%ht)) then
+      call hash_table_da(this%ht)
+    end if
   end subroutine clear
-  
-end module MemoryListModule
\ No newline at end of file
+
+end module MemoryListModule
@@ -13,6 +13,7 @@ module MemoryManagerModule
   use MemoryTypeModule,       only: MemoryType
   use MemoryListModule,       only: MemoryListType
   use TableModule,            only: TableType, table_cr
+  use iso_c_binding,          only: c_int8_t, c_loc, c_f_pointer
   
   implicit none
   private
@@ -26,6 +27,10 @@ module MemoryManagerModule
   public :: mem_write_usage
   public :: mem_da
   public :: mem_set_print_option
+  public :: mem_state_size
+  public :: mem_state_save
+  public :: mem_state_restore
+  public :: mem_state_get_int
   
   public :: get_mem_type
   public :: get_mem_rank
@@ -42,6 +47,12 @@ module MemoryManagerModule
   integer(I8B) :: nvalues_aint = 0
   integer(I8B) :: nvalues_adbl = 0
   integer(I4B) :: iprmem = 0
+  
+  ! -- memory manager state buffer header and entry sizes (in bytes)
+  character(len=8), parameter :: STATEMAGIC = 'MF6STATE'
+  integer(I4B), parameter :: STATEVERSION = 1
+  integer(I4B), parameter :: LENSTATEHEADER = 16
+  integer(I4B), parameter :: LENSTATEENTRY = LENVARNAME + LENMEMPATH + 8
 
   interface mem_allocate
     module procedure allocate_logical,                                           &
@@ -318,22 +329,12 @@ module MemoryManagerModule
     logical(LGP),intent(out) :: found
     logical(LGP), intent(in), optional :: check
     ! -- local
-    integer(I4B) :: ipos
     logical(LGP) check_opt
     ! -- code
     !
-    ! -- initialize
-    mt => null()
-    found = .false.
-    !
-    ! -- iterate over the memory list
-    do ipos = 1, memorylist%count()
-      mt => memorylist%Get(ipos)
-      if(mt%name == name .and. mt%path == origin) then
-        found = .true.
-        exit
-      end if
-    end do
+    ! -- find the entry in the hash index of the memory list
+    mt => memorylist%find(origin, name)
+    found = associated(mt)
     check_opt = .true.
     if (present(check)) then
       check_opt = check
@@ -3209,6 +3210,334 @@ module MemoryManagerModule
     return
   end subroutine mem_da
   
+  subroutine mem_state_bytes(mt, bytes)
+! ******************************************************************************
+! Set a byte pointer to the values of a memory manager variable. The pointer
+! is not associated for variables that do not have values or that point to
+! the memory of another (master) variable.
+!
+! -- Arguments are as follows:
+!       MT           : memory type entry
+!       BYTES        : returned pointer to the values of the variable
+!
+! ******************************************************************************
+!
+!    SPECIFICATIONS:
+! ------------------------------------------------------------------------------
+    ! -- dummy
+    type(MemoryType), pointer, intent(in) :: mt
+    integer(c_int8_t), dimension(:), pointer, contiguous, intent(inout) :: bytes
+    ! -- local
+    integer(I4B) :: n
+    ! -- code
+    bytes => null()
+    if (.not. mt%master) return
+    if (associated(mt%logicalsclr)) then
+      n = storage_size(mt%logicalsclr) / 8
+      call c_f_pointer(c_loc(mt%logicalsclr), bytes, (/n/))
+    else if (associated(mt%intsclr)) then
+      n = storage_size(mt%intsclr) / 8
+      call c_f_pointer(c_loc(mt%intsclr), bytes, (/n/))
+    else if (associated(mt%dblsclr)) then
+      n = storage_size(mt%dblsclr) / 8
+      call c_f_pointer(c_loc(mt%dblsclr), bytes, (/n/))
+    else if (associated(mt%aint1d)) then
+      n = size(mt%aint1d) * (storage_size(mt%aint1d) / 8)
+      if (n > 0) call c_f_pointer(c_loc(mt%aint1d), bytes, (/n/))
+    else if (associated(mt%aint2d)) then
+      n = size(mt%aint2d) * (storage_size(mt%aint2d) / 8)
+      if (n > 0) call c_f_pointer(c_loc(mt%aint2d), bytes, (/n/))
+    else if (associated(mt%aint3d)) then
+      n = size(mt%aint3d) * (storage_size(mt%aint3d) / 8)
+      if (n > 0) call c_f_pointer(c_loc(mt%aint3d), bytes, (/n/))
+    else if (associated(mt%adbl1d)) then
+      n = size(mt%adbl1d) * (storage_size(mt%adbl1d) / 8)
+      if (n > 0) call c_f_pointer(c_loc(mt%adbl1d), bytes, (/n/))
+    else if (associated(mt%adbl2d)) then
+      n = size(mt%adbl2d) * (storage_size(mt%adbl2d) / 8)
+      if (n > 0) call c_f_pointer(c_loc(mt%adbl2d), bytes, (/n/))
+    else if (associated(mt%adbl3d)) then
+      n = size(mt%adbl3d) * (storage_size(mt%adbl3d) / 8)
+      if (n > 0) call c_f_pointer(c_loc(mt%adbl3d), bytes, (/n/))
+    end if
+    !
+    ! -- return
+    return
+  end subroutine mem_state_bytes
+  
+  subroutine mem_state_size(nbytes)
+! ******************************************************************************
+! Return the size of the buffer needed to save the values of all of the 
+! variables in the memory manager.
+!
+! -- Arguments are as follows:
+!       NBYTES       : returned buffer size in bytes
+!
+! ******************************************************************************
+!
+!    SPECIFICATIONS:
+! ------------------------------------------------------------------------------
+    ! -- dummy
+    integer(I8B), intent(out) :: nbytes
+    ! -- local
+    type(MemoryType), pointer :: mt
+    integer(c_int8_t), dimension(:), pointer, contiguous :: bytes
+    integer(I4B) :: ipos
+    ! -- code
+    nbytes = LENSTATEHEADER
+    do ipos = 1, memorylist%count()
+      mt => memorylist%Get(ipos)
+      call mem_state_bytes(mt, bytes)
+      if (associated(bytes)) then
+        nbytes = nbytes + LENSTATEENTRY + size(bytes, kind=I8B)
+      end if
+    end do
+    !
+    ! -- return
+    return
+  end subroutine mem_state_size
+  
+  subroutine mem_state_save(buf)
+! ******************************************************************************
+! Save the values of all of the variables in the memory manager to a buffer.
+! The buffer contains a header followed by the name, path, size, and values
+! of each variable. The size of the buffer is determined using
+! mem_state_size.
+!
+! -- Arguments are as follows:
+!       BUF          : byte buffer
+!
+! ******************************************************************************
+!
+!    SPECIFICATIONS:
+! ------------------------------------------------------------------------------
+    ! -- dummy
+    integer(c_int8_t), dimension(:), intent(inout) :: buf
+    ! -- local
+    type(MemoryType), pointer :: mt
+    integer(c_int8_t), dimension(:), pointer, contiguous :: bytes
+    integer(I8B) :: i
+    integer(I8B) :: n
+    integer(I4B) :: ipos
+    integer(I4B) :: nentries
+    ! -- code
+    i = LENSTATEHEADER + 1
+    nentries = 0
+    do ipos = 1, memorylist%count()
+      mt => memorylist%Get(ipos)
+      call mem_state_bytes(mt, bytes)
+      if (.not. associated(bytes)) cycle
+      n = size(bytes, kind=I8B)
+      buf(i:i+LENVARNAME-1) = transfer(mt%name, buf(1:1), LENVARNAME)
+      i = i + LENVARNAME
+      buf(i:i+LENMEMPATH-1) = transfer(mt%path, buf(1:1), LENMEMPATH)
+      i = i + LENMEMPATH
+      buf(i:i+7) = transfer(n, buf(1:1), 8)
+      i = i + 8
+      buf(i:i+n-1) = bytes
+      i = i + n
+      nentries = nentries + 1
+    end do
+    !
+    ! -- write the header
+    buf(1:8) = transfer(STATEMAGIC, buf(1:1), 8)
+    buf(9:12) = transfer(STATEVERSION, buf(1:1), 4)
+    buf(13:16) = transfer(nentries, buf(1:1), 4)
+    !
+    ! -- return
+    return
+  end subroutine mem_state_save
+  
+  subroutine mem_state_entry(buf, i, name, path, n)
+! ******************************************************************************
+! Read the name, path, and size of the state buffer entry starting at 
+! position i and advance i to the start of the values.
+!
+! ******************************************************************************
+!
+!    SPECIFICATIONS:
+! ------------------------------------------------------------------------------
+    ! -- dummy
+    integer(c_int8_t), dimension(:), intent(in) :: buf
+    integer(I8B), intent(inout) :: i
+    character(len=LENVARNAME), intent(out) :: name
+    character(len=LENMEMPATH), intent(out) :: path
+    integer(I8B), intent(out) :: n
+    ! -- code
+    name = transfer(buf(i:i+LENVARNAME-1), name)
+    i = i + LENVARNAME
+    path = transfer(buf(i:i+LENMEMPATH-1), path)
+    i = i + LENMEMPATH
+    n = transfer(buf(i:i+7), n)
+    i = i + 8
+    !
+    ! -- return
+    return
+  end subroutine mem_state_entry
+  
+  function mem_state_header(buf, nentries) result(isvalid)
+! ******************************************************************************
+! Check the state buffer header and return the number of entries.
+!
+! ******************************************************************************
+!
+!    SPECIFICATIONS:
+! ------------------------------------------------------------------------------
+    ! -- dummy
+    integer(c_int8_t), dimension(:), intent(in) :: buf
+    integer(I4B), intent(out) :: nentries
+    ! -- return
+    logical(LGP) :: isvalid
+    ! -- local
+    character(len=8) :: magic
+    integer(I4B) :: iversion
+    ! -- code
+    isvalid = .false.
+    nentries = 0
+    if (size(buf, kind=I8B) < LENSTATEHEADER) return
+    magic = transfer(buf(1:8), magic)
+    iversion = transfer(buf(9:12), iversion)
+    nentries = transfer(buf(13:16), nentries)
+    isvalid = (magic == STATEMAGIC .and. iversion == STATEVERSION)
+    !
+    ! -- return
+    return
+  end function mem_state_header
+  
+  subroutine mem_state_restore(buf, ierr)
+! ******************************************************************************
+! Restore the values of the variables in the memory manager from a buffer
+! created by mem_state_save. The buffer is checked before any values are
+! restored and ierr is set to a value greater than zero (and errmsg is set)
+! if a variable in the buffer does not exist in the memory manager or has a
+! different size.
+!
+! -- Arguments are as follows:
+!       BUF          : byte buffer
+!       IERR         : returned error flag
+!
+! ******************************************************************************
+!
+!    SPECIFICATIONS:
+! ------------------------------------------------------------------------------
+    ! -- dummy
+    integer(c_int8_t), dimension(:), intent(in) :: buf
+    integer(I4B), intent(out) :: ierr
+    ! -- local
+    type(MemoryType), pointer :: mt
+    type(MemoryType), pointer :: mtpos
+    integer(c_int8_t), dimension(:), pointer, contiguous :: bytes
+    character(len=LENVARNAME) :: name
+    character(len=LENMEMPATH) :: path
+    logical(LGP) :: found
+    integer(I8B) :: i
+    integer(I8B) :: n
+    integer(I4B) :: ipass
+    integer(I4B) :: ipos
+    integer(I4B) :: ientry
+    integer(I4B) :: nentries
+    ! -- code
+    ierr = 0
+    if (.not. mem_state_header(buf, nentries)) then
+      ierr = 1
+      errmsg = 'State buffer was not created by this version of MODFLOW 6.'
+      return
+    end if
+    !
+    ! -- check the entries (pass 1) and restore the values (pass 2)
+    do ipass = 1, 2
+      i = LENSTATEHEADER + 1
+      ipos = 0
+      do ientry = 1, nentries
+        call mem_state_entry(buf, i, name, path, n)
+        !
+        ! -- entries are usually in the same order as the memory list
+        found = .false.
+        do while (ipos < memorylist%count())
+          ipos = ipos + 1
+          mtpos => memorylist%Get(ipos)
+          if (mtpos%name == name .and. mtpos%path == path) then
+            mt => mtpos
+            found = .true.
+            exit
+          end if
+        end do
+        if (.not. found) then
+          call get_from_memorylist(name, path, mt, found, check=.false.)
+          ipos = 0
+        end if
+        bytes => null()
+        if (found) call mem_state_bytes(mt, bytes)
+        if (.not. associated(bytes)) then
+          ierr = 1
+        else if (size(bytes, kind=I8B) /= n) then
+          ierr = 1
+        end if
+        if (ierr > 0) then
+          write(errmsg, '(a,a,a,a,a)') 'Variable ', trim(name),              &
+            ' in origin ', trim(path), ' in the state buffer does not '     // &
+            'match the memory manager.'
+          return
+        end if
+        if (ipass == 2) then
+          bytes = buf(i:i+n-1)
+        end if
+        i = i + n
+      end do
+    end do
+    !
+    ! -- return
+    return
+  end subroutine mem_state_restore
+  
+  subroutine mem_state_get_int(buf, name, origin, ival, found)
+! ******************************************************************************
+! Return the value of an integer scalar in a buffer created by 
+! mem_state_save.
+!
+! -- Arguments are as follows:
+!       BUF          : byte buffer
+!       NAME         : variable name
+!       ORIGIN       : variable origin
+!       IVAL         : returned integer value
+!       FOUND        : returned boolean indicating if the variable was found
+!
+! ******************************************************************************
+!
+!    SPECIFICATIONS:
+! ------------------------------------------------------------------------------
+    ! -- dummy
+    integer(c_int8_t), dimension(:), intent(in) :: buf
+    character(len=*), intent(in) :: name
+    character(len=*), intent(in) :: origin
+    integer(I4B), intent(out) :: ival
+    logical(LGP), intent(out) :: found
+    ! -- local
+    character(len=LENVARNAME) :: ename
+    character(len=LENMEMPATH) :: epath
+    integer(I8B) :: i
+    integer(I8B) :: n
+    integer(I4B) :: ientry
+    integer(I4B) :: nentries
+    ! -- code
+    found = .false.
+    ival = 0
+    if (.not. mem_state_header(buf, nentries)) return
+    i = LENSTATEHEADER + 1
+    do ientry = 1, nentries
+      call mem_state_entry(buf, i, ename, epath, n)
+      if (ename == name .and. epath == origin .and. n == 4) then
+        ival = transfer(buf(i:i+3), ival)
+        found = .true.
+        exit
+      end if
+      i = i + n
+    end do
+    !
+    ! -- return
+    return
+  end subroutine mem_state_get_int
+  
   subroutine mem_unique_origins(cunique)
 ! ******************************************************************************
 ! Create a character array that contains the unique origins in the memory 
@@ -91,6 +91,10 @@ module MessageModule
       logical :: inc_array
       integer(I4B) :: i
     ! ------------------------------------------------------------------------------
+      !
+      ! -- messages may be stored by solutions that are solved by several
+      !    threads
+!$OMP CRITICAL (storemessage)
       !
       ! -- determine if messages should be expanded
       inc_array = .TRUE.
@@ -115,6 +119,7 @@ module MessageModule
       else
         this%max_exceeded = this%max_exceeded + 1
       end if
+!$OMP END CRITICAL (storemessage)
       !
       ! -- return
       return
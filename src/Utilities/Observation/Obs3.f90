@@ -123,11 +123,28 @@
 ! Any number of repetitions of:
 ! TIME SIMVAL-1 SIMVAL-2 ... SIMVAL-NOBS  (floating point)
 !
+! IN A FILE OF COLUMNAR CONTINUOUS OBSERVATIONS:
+!
+! Bytes 1-4 of the 100-byte header are "colm". The header, NOBS, and the
+! observation names are followed by any number of blocks of:
+! NTIMES (4-byte integer) -- Number of times in the block.
+! TIME-1 TIME-2 ... TIME-NTIMES  (floating point)
+! NOBS repetitions of:
+! SIMVAL-1 SIMVAL-2 ... SIMVAL-NTIMES  (floating point)
+! A block is written each time the buffer of BUFFER_TIME_STEPS time steps
+! is full, so the values for one observation can be read from each block
+! without reading the values for the other observations.
+!
+! BUFFERED OUTPUT:
+!
+! The simulated values for up to BUFFER_TIME_STEPS time steps (default 1)
+! are stored and written to each output file together. The stored values
+! are written at the end of the simulation.
+!
 !-------------------------------------------------------------------------------
 module ObsModule
 
   use KindModule,          only: DP, I4B
-  use ArrayHandlersModule, only: ExpandArray
   use BaseDisModule,       only: DisBaseType
   use BlockParserModule,   only: BlockParserType
   use ConstantsModule,     only: LENBIGLINE, LENFTYPE, LENOBSNAME,               &
@@ -144,7 +161,6 @@ module ObsModule
                                  AddObsToList
   use ObsOutputListModule, only: ObsOutputListType
   use ObsOutputModule,     only: ObsOutputType
-  use ObsUtilityModule,    only: write_fmtd_cont, write_unfmtd_cont
   use OpenSpecModule,      only: ACCESS, FORM
   use SimModule,           only: count_errors, store_error, store_error_unit,    &
                                  ustop
@@ -169,6 +185,7 @@ module ObsModule
     ! -- Private members
     integer(I4B), private :: iprecision = 2                                      ! 2=double; 1=single
     integer(I4B), private :: idigits = 5
+    integer(I4B), private :: nbuffer = 1                                         ! number of time steps written together
     character(len=LINELENGTH), private :: outputFilename = ''
     character(len=LINELENGTH), private :: blockTypeFound = ''
     character(len=20), private:: obsfmtcont = ''
@@ -382,8 +399,9 @@ contains
 ! ******************************************************************************
 ! obs_ot -- Observation Output
 ! Subroutine: (1) stores each simulated value into its ObserveType object
-!             (2) writes each simulated value to it ObsOutputList object
-!             (3) writes contents of ObsOutputList to output file
+!             (2) stores each simulated value in its ObsOutputList object
+!             (3) writes contents of ObsOutputList to output file when the
+!                 buffer of BUFFER_TIME_STEPS time steps is full
 ! Note: This procedure should NOT be called from a package's _ot procedure
 !       because the package _ot procedure may not be called every time step.
 ! ******************************************************************************
@@ -441,7 +459,8 @@ contains
       deallocate(this%pakobs)
     end if
     !
-    ! -- deallocate obsOutputList
+    ! -- write the stored simulated values and deallocate obsOutputList
+    call this%obsOutputList%WriteBuffers()
     call this%obsOutputList%DeallocObsOutputList()
     deallocate(this%obsOutputList)
     !
@@ -663,6 +682,7 @@ contains
     integer(I4B) :: ierr
     integer(I4B) :: localprecision
     integer(I4B) :: localdigits
+    integer(I4B) :: localbuffer
     character(len=40) :: keyword
     character(len=LINELENGTH) :: ermsg
     character(len=LINELENGTH) :: errormessage, fname
@@ -671,11 +691,13 @@ contains
     ! -- formats
 10  format('No options block found in OBS input. Defaults will be used.')
 40  format('Text output number of digits of precision set to: ',i2)
+50  format('Simulated values for ',i0,' time steps will be written together.')
 60  format(/,'Processing observation options:',/)
 ! ------------------------------------------------------------------------------
     !
     localprecision = 0
     localdigits = 0
+    localbuffer = 0
     lineList => null()
     !
     ! -- Find and store file name
@@ -732,6 +754,17 @@ contains
         case ('PRINT_INPUT')
           this%echo = .true.
           write(this%iout,'(a)')'The PRINT_INPUT option has been specified.'
+        case ('BUFFER_TIME_STEPS')
+          ! -- Specifies number of time steps for which simulated values
+          !    are stored before they are written. Default is 1.
+          localbuffer = this%parser%GetInteger()
+          if (localbuffer < 1) then
+            errormessage = 'Error in OBS input: Invalid value for ' //         &
+                           'BUFFER_TIME_STEPS option'
+            call store_error(errormessage)
+            exit readblockoptions
+          endif
+          write(this%iout,50)localbuffer
         case default
           errormessage = 'Error in OBS input: Unrecognized option: ' // &
                          trim(keyword)
@@ -751,6 +784,7 @@ contains
     ! -- Assign type variables
     if (localprecision>0) this%iprecision = localprecision
     if (localdigits>0) this%idigits = localdigits
+    if (localbuffer>0) this%nbuffer = localbuffer
     !
     return
   end subroutine read_obs_options
@@ -830,6 +864,7 @@ contains
     ! -- local
     integer(I4B) :: i, ii, idx, indx, iu, num, nunit
     integer(int32) :: nobs
+    integer(I4B), dimension(:), allocatable :: ifill
     character(len=LENOBSNAME), pointer :: headr => null()
     character(len=LENOBSNAME)          :: nam
     character(len=4)                   :: clenobsname
@@ -841,6 +876,9 @@ contains
     num = this%obsList%Count()
     ! -- Cycle through observations to build the header(s)
     if (num>0) then
+      ! -- obsnames is allocated once for each output file, with ifill
+      !    counting the names stored so far
+      allocate(ifill(this%obsOutputList%Count()))
       do i=1,num
         obsrv => this%get_obs(i)
         ! -- header for file of continuous observations
@@ -851,10 +889,15 @@ contains
           headr = 'time'
         endif
         nam = obsrv%Name
-        call ExpandArray(obsOutput%obsnames)
-        idx = size(obsOutput%obsnames)
+        if (.not. allocated(obsOutput%obsnames)) then
+          allocate(obsOutput%obsnames(obsOutput%nobs))
+          ifill(indx) = 0
+        endif
+        ifill(indx) = ifill(indx) + 1
+        idx = ifill(indx)
         obsOutput%obsnames(idx) = nam
       enddo
+      deallocate(ifill)
     endif
     !
     ! -- Cycle through ObsOutputList to write headers
@@ -878,12 +921,17 @@ contains
         ! -- write header to unformatted file
         !    First 11 bytes are obs type and precision
         nunit = obsOutput%nunit
+        if (obsOutput%ColumnarOutput) then
+          write(nunit)'colm'
+        else
+          write(nunit)'cont'
+        endif
         if (this%iprecision==1) then
           ! -- single precision output
-          write(nunit)'cont single'
+          write(nunit)' single'
         elseif (this%iprecision==2) then
           ! -- double precision output
-          write(nunit)'cont double'
+          write(nunit)' double'
         endif
         ! -- write LENOBSNAME to bytes 12-15
         write(clenobsname,'(i4)')LENOBSNAME
@@ -900,6 +948,10 @@ contains
           write(nunit)obsOutput%obsnames(ii)
         enddo
       endif
+      !
+      ! -- allocate the buffer of simulated values
+      call obsOutput%AllocateBuffer(this%nbuffer, this%iprecision,             &
+                                    this%obsfmtcont)
     enddo
     !
     return
@@ -1034,6 +1086,7 @@ contains
     character(len=LINELENGTH) :: title
     character(len=LINELENGTH) :: tag
     character(len=20) :: accarg, bin, fmtarg
+    logical :: columnar
     type(ObserveType),     pointer :: obsrv => null()
     type(ObsOutputType),   pointer :: obsOutput => null()
     integer(I4B) :: ntabrows
@@ -1105,16 +1158,25 @@ contains
         cycle
       end if
       !
-      ! -- look for BINARY option
+      ! -- look for BINARY and COLUMNAR options
       call this%parser%GetStringCaps(bin)
+      columnar = .false.
       if (bin == 'BINARY') then
         fmtarg = FORM
         accarg = ACCESS
         fmtd = .false.
+        call this%parser%GetStringCaps(bin)
+        columnar = (bin == 'COLUMNAR')
       else
         fmtarg = 'FORMATTED'
         accarg = 'SEQUENTIAL'
         fmtd = .true.
+        if (bin == 'COLUMNAR') then
+          ermsg = 'COLUMNAR output of OBS outfile "' // trim(fname) //         &
+                  '" requires the BINARY option.'
+          call store_error(ermsg)
+          cycle
+        end if
       endif
       !
       ! -- open the output file
@@ -1128,6 +1190,7 @@ contains
       indexobsout = this%obsOutputList%Count()
       obsOutput => this%obsOutputList%Get(indexobsout)
       obsOutput%FormattedOutput = fmtd
+      obsOutput%ColumnarOutput = columnar
       !
       ! -- process lines defining observations
       select case (btagfound)
@@ -1178,7 +1241,8 @@ contains
   subroutine write_continuous_simvals(this)
 ! ******************************************************************************
 ! write_continuous_simvals
-! Subroutine: (1) for each continuous observation, writes value to output
+! Subroutine: (1) for each continuous observation, stores the simulated value
+!                 in the buffer of its output file
 ! ******************************************************************************
 !
 !    SPECIFICATIONS:
@@ -1186,26 +1250,20 @@ contains
     ! -- dummy
     class(ObsType), intent(inout) :: this
     ! -- local
-    integer(I4B)                :: i, iprec, numobs
-    character(len=20)           :: fmtc
+    integer(I4B)                :: i, numobs
     real(DP)                    :: simval
     class(ObserveType), pointer :: obsrv => null()
+    type(ObsOutputType), pointer :: obsOutput => null()
 ! ------------------------------------------------------------------------------
     !
-    ! Write simulated values for observations
-    iprec = this%iprecision
-    fmtc = this%obsfmtcont
     ! -- iterate through all observations
     numobs = this%obsList%Count()
     do i=1,numobs
       obsrv => this%get_obs(i)
       ! -- continuous observation
       simval = obsrv%CurrentTimeStepEndValue
-      if (obsrv%FormattedOutput) then
-        call write_fmtd_cont(fmtc, obsrv, this%obsOutputList, simval)
-      else
-        call write_unfmtd_cont(obsrv, iprec, this%obsOutputList, simval)
-      endif
+      obsOutput => this%obsOutputList%Get(obsrv%indxObsOutput)
+      call obsOutput%StoreSimval(totim, simval)
     enddo
     !
     return
@@ -1,10 +1,12 @@
 ! This module defines derived type ObsOutputType.
 !
 ! ObsOutputType -- contains information and methods needed for writing
-! a line of simulated values for observations to an output file.  Each
+! rows of simulated values for observations to an output file.  Each
 ! block of type continuous in an observation file is
 ! associated with an ObsOutputType object. However, the methods are
-! needed only for continuous observations.
+! needed only for continuous observations.  The simulated values for
+! up to nbuffer time steps are stored in the simvals array and written
+! to the output file together.
 !-----------------------------------------------------------------------
 module ObsOutputModule
 
@@ -26,12 +28,22 @@ module ObsOutputModule
     character(len=500), public :: filename = ''
     character(len=LENOBSNAME), allocatable, dimension(:), public :: obsnames
     character(len=LENOBSNAME), public :: header = ''
-    character(len=LENOBSNAME), public :: lineout = ''
     logical, public :: FormattedOutput = .true.
+    logical, public :: ColumnarOutput = .false.
+    ! -- Private members
+    integer(I4B), private :: nbuffer = 1                                        ! number of time steps stored before writing
+    integer(I4B), private :: ntimes = 0                                         ! number of time steps stored
+    integer(I4B), private :: nvalues = 0                                        ! number of values stored for the current time step
+    integer(I4B), private :: iprecision = 2                                     ! 2=double; 1=single
+    character(len=20), private :: fmtc = ''
+    real(DP), allocatable, dimension(:,:), private :: simvals                   ! time (row 0) and simulated values for each time step
   contains
     ! -- Public procedures
+    procedure, public :: AllocateBuffer
+    procedure, public :: StoreSimval
     procedure, public :: ClearLineout
     procedure, public :: WriteLineout
+    procedure, public :: WriteBuffer
     procedure, public :: DeallocObsOutput
   end type ObsOutputType
 
@@ -39,9 +51,55 @@ contains
 
   ! Procedures bound to ObsOutputType
 
+  subroutine AllocateBuffer(this, nbuffer, iprecision, fmtc)
+! **************************************************************************
+! AllocateBuffer -- allocate the array that stores the time and simulated
+! values for nbuffer time steps and define the output precision and format
+! **************************************************************************
+!
+!    SPECIFICATIONS:
+! --------------------------------------------------------------------------
+    implicit none
+    ! -- dummy
+    class(ObsOutputType), intent(inout) :: this
+    integer(I4B), intent(in) :: nbuffer
+    integer(I4B), intent(in) :: iprecision
+    character(len=*), intent(in) :: fmtc
+    !
+    this%nbuffer = nbuffer
+    this%iprecision = iprecision
+    this%fmtc = fmtc
+    allocate(this%simvals(0:this%nobs, nbuffer))
+    return
+  end subroutine AllocateBuffer
+
+  subroutine StoreSimval(this, time, value)
+! **************************************************************************
+! StoreSimval -- store the simulated value of the next observation in the
+! file for the current time step.  The time is stored with the first
+! value of each time step.
+! **************************************************************************
+!
+!    SPECIFICATIONS:
+! --------------------------------------------------------------------------
+    implicit none
+    ! -- dummy
+    class(ObsOutputType), intent(inout) :: this
+    real(DP), intent(in) :: time
+    real(DP), intent(in) :: value
+    !
+    if (this%nvalues == 0) then
+      this%ntimes = this%ntimes + 1
+      this%simvals(0, this%ntimes) = time
+    endif
+    this%nvalues = this%nvalues + 1
+    this%simvals(this%nvalues, this%ntimes) = value
+    return
+  end subroutine StoreSimval
+
   subroutine ClearLineout(this)
 ! **************************************************************************
-! ClearLineout -- clear the lineout member
+! ClearLineout -- start a new row of simulated values
 ! **************************************************************************
 !
 !    SPECIFICATIONS:
@@ -50,13 +108,14 @@ contains
     ! -- dummy
     class(ObsOutputType), intent(inout) :: this
     !
-    this%lineout = ''
+    this%nvalues = 0
     return
   end subroutine ClearLineout
 
   subroutine WriteLineout(this)
 ! **************************************************************************
-! WriteLineout -- write the lineout member to the output file
+! WriteLineout -- complete the row of simulated values for the current
+! time step and write the stored rows when the buffer is full
 ! **************************************************************************
 !
 !    SPECIFICATIONS:
@@ -64,13 +123,83 @@ contains
     implicit none
     ! -- dummy
     class(ObsOutputType), intent(inout) :: this
-    ! -- write a line return to end of observation output line 
-    !    for this totim
-    write(this%nunit,'(a)', advance='YES') ''
+    !
+    this%nvalues = 0
+    if (this%ntimes == this%nbuffer) then
+      call this%WriteBuffer()
+    endif
     !
     return
   end subroutine WriteLineout
 
+  subroutine WriteBuffer(this)
+! **************************************************************************
+! WriteBuffer -- write the stored rows of simulated values to the output
+! file.  Formatted files get one line per time step.  Unformatted files
+! get the time and values for each time step or, for columnar output, a
+! block containing the number of time steps, the times, and the values
+! for each observation in turn.
+! **************************************************************************
+!
+!    SPECIFICATIONS:
+! --------------------------------------------------------------------------
+!   real32 specifies 32-bit real = 4 bytes = single precision.
+!   real64 specifies 64-bit real = 8 bytes = double precision.
+    use iso_fortran_env, only: int32, real32, real64
+    implicit none
+    ! -- dummy
+    class(ObsOutputType), intent(inout) :: this
+    ! -- local
+    integer(I4B) :: i, j, n, nt
+    integer(int32) :: ntimes
+    character(len=50) :: cval
+    character(len=:), allocatable :: line
+    ! -- format
+10  format(G20.13)
+    !
+    nt = this%ntimes
+    if (nt == 0) return
+    !
+    if (this%FormattedOutput) then
+      allocate(character(len=50*(this%nobs+1)) :: line)
+      do j = 1, nt
+        write(cval,10) this%simvals(0, j)
+        cval = adjustl(cval)
+        n = len_trim(cval)
+        line(1:n) = cval(1:n)
+        do i = 1, this%nobs
+          write(cval,this%fmtc) this%simvals(i, j)
+          cval = adjustl(cval)
+          line(n+1:n+1) = ','
+          line(n+2:n+1+len_trim(cval)) = trim(cval)
+          n = n + 1 + len_trim(cval)
+        enddo
+        write(this%nunit, '(a)') line(1:n)
+      enddo
+      deallocate(line)
+    elseif (this%ColumnarOutput) then
+      ntimes = nt
+      if (this%iprecision == 1) then
+        write(this%nunit) ntimes,                                              &
+          real(transpose(this%simvals(:, 1:nt)), real32)
+      else
+        write(this%nunit) ntimes,                                              &
+          real(transpose(this%simvals(:, 1:nt)), real64)
+      endif
+    else
+      if (this%iprecision == 1) then
+        write(this%nunit) real(this%simvals(:, 1:nt), real32)
+      else
+        write(this%nunit) real(this%simvals(:, 1:nt), real64)
+      endif
+    endif
+    !
+    this%ntimes = 0
+    this%nvalues = 0
+    !
+    return
+  end subroutine WriteBuffer
+
   subroutine DeallocObsOutput(this)
     implicit none
     ! -- dummy
@@ -79,6 +208,9 @@ contains
     if (allocated(this%obsnames)) then
       deallocate(this%obsnames)
     endif
+    if (allocated(this%simvals)) then
+      deallocate(this%simvals)
+    endif
     !
     return
   end subroutine DeallocObsOutput
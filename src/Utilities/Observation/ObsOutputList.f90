@@ -29,6 +29,7 @@ module ObsOutputListModule
     procedure, public :: Count
     procedure, public :: Get
     procedure, public :: WriteOutputLines
+    procedure, public :: WriteBuffers
     procedure, public :: Clear
     procedure, public :: DeallocObsOutputList
   end type ObsOutputListType
@@ -129,8 +130,9 @@ contains
   subroutine WriteOutputLines(this)
 ! **************************************************************************
 ! WriteOutputLines -- iterate through list of ObsOutputType objects and,
-! for each continuous observation, write the lineout member to the output
-! file
+! for each continuous observation output file, complete the row of
+! simulated values for the current time step.  The stored rows are
+! written to the output file when its buffer is full.
 ! **************************************************************************
 !
 !    SPECIFICATIONS:
@@ -145,14 +147,36 @@ contains
     num = this%Count()
     do i=1,num
       obsOutput => this%Get(i)
-      if (obsOutput%FormattedOutput) then
-        call obsOutput%WriteLineout()
-      endif
+      call obsOutput%WriteLineout()
     enddo
     !
     return
   end subroutine WriteOutputLines
 
+  subroutine WriteBuffers(this)
+! **************************************************************************
+! WriteBuffers -- iterate through list of ObsOutputType objects and write
+! the rows of simulated values that are stored to the output files
+! **************************************************************************
+!
+!    SPECIFICATIONS:
+! --------------------------------------------------------------------------
+    implicit none
+    ! -- dummy
+    class(ObsOutputListType), intent(inout) :: this
+    ! -- local
+    type(ObsOutputType), pointer :: obsOutput => null()
+    integer(I4B) :: i, num
+    !
+    num = this%Count()
+    do i=1,num
+      obsOutput => this%Get(i)
+      call obsOutput%WriteBuffer()
+    enddo
+    !
+    return
+  end subroutine WriteBuffers
+
   function Get(this, indx) result(obsOutput)
 ! **************************************************************************
 ! Get -- return the specified ObsOutputType object from the list
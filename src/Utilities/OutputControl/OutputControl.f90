@@ -28,6 +28,7 @@ module OutputControlModule
     procedure :: oc_save
     procedure :: oc_print
     procedure :: oc_save_unit
+    procedure :: oc_share
     procedure :: set_print_flag
   end type OutputControlType
 
@@ -479,6 +480,39 @@ module OutputControlModule
     return
   end function oc_save_unit
 
+  subroutine oc_share(this, cname, text, dblvec)
+! ******************************************************************************
+! oc_share -- add dblvec to the shared output of cname if shared output was
+!   requested for cname
+! ******************************************************************************
+!
+!    SPECIFICATIONS:
+! ------------------------------------------------------------------------------
+    ! -- modules
+    ! -- dummy
+    class(OutputControlType) :: this
+    character(len=*), intent(in) :: cname
+    character(len=*), intent(in) :: text
+    real(DP), dimension(:), pointer, contiguous, intent(in) :: dblvec
+    ! -- local
+    integer(I4B) :: ipos
+    class(OutputControlDataType), pointer :: ocdobjptr
+! ------------------------------------------------------------------------------
+    !
+    do ipos = 1, size(this%ocdobj)
+      ocdobjptr => this%ocdobj(ipos)
+      if(cname == trim(ocdobjptr%cname)) then
+        if(associated(ocdobjptr%shmobj)) then
+          call ocdobjptr%shmobj%add_array(text, dblvec)
+        endif
+        exit
+      endif
+    enddo
+    !
+    ! -- Return
+    return
+  end subroutine oc_share
+
   function set_print_flag(this, cname, icnvg, endofperiod) result(iprint_flag)
 ! ******************************************************************************
 ! set_print_flag -- determine if cname should be printed
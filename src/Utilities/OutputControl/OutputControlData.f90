@@ -4,6 +4,7 @@ module OutputControlData
   use InputOutputModule,      only: print_format
   use KindModule,             only: DP, I4B
   use PrintSaveManagerModule, only: PrintSaveManagerType
+  use SharedOutputModule,     only: SharedOutputType, shm_cr
   
   implicit none
   private
@@ -22,6 +23,7 @@ module OutputControlData
     integer(I4B), dimension(:), pointer, contiguous     :: intvec   => null()
     class(DisBaseType), pointer             :: dis      => null()
     type(PrintSaveManagerType), pointer     :: psmobj   => null()
+    type(SharedOutputType), pointer         :: shmobj   => null()
   contains
     procedure :: allocate_scalars
     procedure :: init_int
@@ -155,6 +157,9 @@ module OutputControlData
     !                               this%cname, this%cdatafmp, this%nvaluesp,   &
     !                               this%nwidthp, this%editdesc, this%inodata)
     !
+    ! -- Publish the shared output arrays every time step
+    if(associated(this%shmobj)) call this%shmobj%shm_ot(iout)
+    !
     ! -- Return
     return
   end subroutine ocd_ot
@@ -182,6 +187,10 @@ module OutputControlData
     deallocate(this%dnodata)
     deallocate(this%inodata)
     deallocate(this%psmobj)
+    if(associated(this%shmobj)) then
+      call this%shmobj%shm_da()
+      deallocate(this%shmobj)
+    endif
     !
     ! -- return
     return
@@ -307,12 +316,17 @@ module OutputControlData
     integer(I4B), intent(in) :: iout
     ! -- local
     character(len=len(linein)) :: line
+    character(len=len(linein)) :: fname
     integer(I4B) :: lloc, istart, istop, ival
+    integer(I4B) :: nslots
     real(DP) :: rval
     ! -- format
     character(len=*),parameter :: fmtocsave = &
       "(4X,A,' INFORMATION WILL BE WRITTEN TO:',                                 &
        &/,6X,'UNIT NUMBER: ', I0,/,6X, 'FILE NAME: ', A)"
+    character(len=*),parameter :: fmtocshared = &
+      "(4X,A,' INFORMATION WILL BE WRITTEN EVERY TIME STEP TO A SHARED ',        &
+       &'RING BUFFER WITH ',I0,' SLOTS:',/,6X, 'FILE NAME: ', A)"
 ! ------------------------------------------------------------------------------
     !
     line(:) = linein(:)
@@ -326,12 +340,32 @@ module OutputControlData
                              line(istart:istop)
       call openfile(this%idataun, iout, line(istart:istop), 'DATA(BINARY)',      &
                     form, access, 'REPLACE', MNORMAL)
+    case('SHAREDMEMORY')
+      call urword(line, lloc, istart, istop, 0, ival, rval, 0, 0)
+      fname = line(istart:istop)
+      nslots = 2
+      call urword(line, lloc, istart, istop, 1, ival, rval, 0, 0)
+      if(line(istart:istop) == 'SLOTS') then
+        call urword(line, lloc, istart, istop, 2, nslots, rval, 0, 0)
+        if(nslots < 1) then
+          call store_error('SHAREDMEMORY SLOTS MUST BE GREATER THAN ZERO.')
+          call store_error(trim(adjustl(line)))
+          call store_error_unit(inunit)
+          call ustop()
+        endif
+      endif
+      write(iout, fmtocshared) trim(adjustl(this%cname)), nslots, trim(fname)
+      call shm_cr(this%shmobj, fname, nslots)
+      if(associated(this%dblvec)) then
+        call this%shmobj%add_array(this%cname, this%dblvec)
+      endif
     case('PRINT_FORMAT')
       call urword(line, lloc, istart, istop, 1, ival, rval, 0, 0)
       call print_format(line(istart:), this%cdatafmp, this%editdesc,             &
                         this%nvaluesp, this%nwidthp, inunit)
     case default
-       call store_error('Looking for FILEOUT or PRINT_FORMAT.  Found:')
+       call store_error('Looking for FILEOUT, SHAREDMEMORY, or PRINT_FORMAT.  &
+                        &Found:')
        call store_error(trim(adjustl(line)))
        call store_error_unit(inunit)
        call ustop()
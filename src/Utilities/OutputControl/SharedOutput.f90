@@ -0,0 +1,244 @@
+! Publish model arrays to a shared ring buffer file.
+!
+! The arrays that are registered with a SharedOutputType object are
+! written every time step to one slot of a fixed-size ring buffer file.
+! A file in a memory-backed file system (for example /dev/shm on Linux,
+! where it is a POSIX shared memory object) can be memory mapped by other
+! processes that read the results while the simulation is running without
+! any disk I/O.
+!
+! File layout (all integers are little-endian on the supported platforms):
+!
+!   header     magic 'MF6SHARE' (8 bytes), version (int32), nslots (int32),
+!              narrays (int32), reserved (int32), nvalues (int64), and
+!              count (int64), the number of records written
+!   directory  text (16 bytes) and number of values (int64) for each array
+!   slots      nslots records with seq (int64), kstp (int32), kper (int32),
+!              pertim (real64), totim (real64), and the nvalues values of
+!              the arrays in directory order
+!
+! Record seq is written to slot mod(seq - 1, nslots). The seq of a slot is
+! set to zero before the slot is overwritten and is set to the record
+! number after the values are written, and count is updated last, so a
+! reader can detect a slot that changed while it was being read.
+module SharedOutputModule
+
+  use KindModule, only: DP, I4B, I8B
+  use ConstantsModule, only: LINELENGTH
+
+  implicit none
+  private
+  public :: SharedOutputType, shm_cr
+
+  character(len=8), parameter :: SHMMAGIC = 'MF6SHARE'
+  integer(I4B), parameter :: SHMVERSION = 1
+  integer(I4B), parameter :: LENSHMTEXT = 16
+  integer(I8B), parameter :: LENSHMHEADER = 40
+  integer(I8B), parameter :: LENSHMENTRY = LENSHMTEXT + 8
+  integer(I8B), parameter :: LENSHMSLOTHEADER = 32
+
+  type :: SharedArrayType
+    character(len=LENSHMTEXT) :: text = ''                                       !< name of the array
+    real(DP), dimension(:), pointer, contiguous :: dblvec => null()              !< array that is published
+  end type SharedArrayType
+
+  type :: SharedOutputType
+    character(len=LINELENGTH) :: fname = ''                                      !< name of the ring buffer file
+    integer(I4B) :: iu = 0                                                       !< unit number of the ring buffer file
+    integer(I4B) :: nslots = 0                                                   !< number of slots in the ring buffer
+    integer(I4B) :: narrays = 0                                                  !< number of published arrays
+    integer(I8B) :: nvalues = 0                                                  !< number of values in a slot
+    integer(I8B) :: icount = 0                                                   !< number of records written
+    type(SharedArrayType), dimension(:), allocatable :: arrays                   !< published arrays
+  contains
+    procedure :: add_array
+    procedure :: shm_ot
+    procedure :: shm_da
+    procedure, private :: write_header
+  end type SharedOutputType
+
+  contains
+
+  subroutine shm_cr(shmobj, fname, nslots)
+! ******************************************************************************
+! shm_cr -- Create a new shared output object
+! ******************************************************************************
+!
+!    SPECIFICATIONS:
+! ------------------------------------------------------------------------------
+    ! -- dummy
+    type(SharedOutputType), pointer :: shmobj
+    character(len=*), intent(in) :: fname
+    integer(I4B), intent(in) :: nslots
+! ------------------------------------------------------------------------------
+    !
+    ! -- Create the object, the file is created when the first record is
+    !    written so arrays can be added until then
+    allocate(shmobj)
+    allocate(shmobj%arrays(0))
+    shmobj%fname = fname
+    shmobj%nslots = nslots
+    !
+    ! -- Return
+    return
+  end subroutine shm_cr
+
+  subroutine add_array(this, text, dblvec)
+! ******************************************************************************
+! add_array -- Add an array to the arrays written to each slot
+! ******************************************************************************
+!
+!    SPECIFICATIONS:
+! ------------------------------------------------------------------------------
+    ! -- modules
+    use SimModule, only: store_error, ustop
+    ! -- dummy
+    class(SharedOutputType) :: this
+    character(len=*), intent(in) :: text
+    real(DP), dimension(:), pointer, contiguous, intent(in) :: dblvec
+    ! -- local
+    type(SharedArrayType), dimension(:), allocatable :: arrays
+    integer(I4B) :: i
+! ------------------------------------------------------------------------------
+    !
+    ! -- Arrays cannot be added after the file has been created
+    if (this%iu /= 0) then
+      call store_error('ARRAYS CANNOT BE ADDED TO SHARED OUTPUT FILE ' //      &
+                       trim(this%fname) // ' AFTER IT HAS BEEN WRITTEN.')
+      call ustop()
+    end if
+    !
+    ! -- Grow the array list
+    allocate(arrays(this%narrays + 1))
+    do i = 1, this%narrays
+      arrays(i) = this%arrays(i)
+    end do
+    arrays(this%narrays + 1)%text = adjustl(text)
+    arrays(this%narrays + 1)%dblvec => dblvec
+    call move_alloc(arrays, this%arrays)
+    this%narrays = this%narrays + 1
+    this%nvalues = this%nvalues + size(dblvec)
+    !
+    ! -- Return
+    return
+  end subroutine add_array
+
+  subroutine write_header(this, iout)
+! ******************************************************************************
+! write_header -- Create the ring buffer file and write the header and the
+!   empty slots
+! ******************************************************************************
+!
+!    SPECIFICATIONS:
+! ------------------------------------------------------------------------------
+    ! -- modules
+    use OpenSpecModule, only: access, form
+    use InputOutputModule, only: getunit, openfile
+    ! -- dummy
+    class(SharedOutputType) :: this
+    integer(I4B), intent(in) :: iout
+    ! -- local
+    integer(I8B) :: ipos
+    integer(I4B) :: i
+    integer(I4B) :: n
+! ------------------------------------------------------------------------------
+    !
+    this%iu = getunit()
+    call openfile(this%iu, iout, this%fname, 'DATA(SHARED)', form, access,     &
+                  'REPLACE')
+    !
+    ! -- header and array directory
+    write(this%iu, pos=1) SHMMAGIC, SHMVERSION, this%nslots, this%narrays,     &
+                          0_I4B, this%nvalues, 0_I8B
+    do i = 1, this%narrays
+      write(this%iu) this%arrays(i)%text, int(size(this%arrays(i)%dblvec), I8B)
+    end do
+    !
+    ! -- write every slot so the file has its final size, a slot with a
+    !    seq of zero does not contain a record
+    ipos = LENSHMHEADER + LENSHMENTRY * this%narrays + 1
+    do n = 1, this%nslots
+      write(this%iu, pos=ipos) 0_I8B, 0_I4B, 0_I4B, 0.0_DP, 0.0_DP
+      do i = 1, this%narrays
+        write(this%iu) this%arrays(i)%dblvec
+      end do
+      ipos = ipos + LENSHMSLOTHEADER + 8 * this%nvalues
+    end do
+    flush(this%iu)
+    !
+    ! -- Return
+    return
+  end subroutine write_header
+
+  subroutine shm_ot(this, iout)
+! ******************************************************************************
+! shm_ot -- Write the arrays for the current time step to the next slot
+! ******************************************************************************
+!
+!    SPECIFICATIONS:
+! ------------------------------------------------------------------------------
+    ! -- modules
+    use TdisModule, only: kstp, kper, pertim, totim
+    ! -- dummy
+    class(SharedOutputType) :: this
+    integer(I4B), intent(in) :: iout
+    ! -- local
+    integer(I8B) :: ipos
+    integer(I8B) :: islot
+    integer(I4B) :: i
+! ------------------------------------------------------------------------------
+    !
+    ! -- nothing to publish
+    if (this%narrays == 0) return
+    !
+    ! -- create the file
+    if (this%iu == 0) then
+      call this%write_header(iout)
+    end if
+    !
+    ! -- position of the slot for the next record
+    this%icount = this%icount + 1
+    islot = mod(this%icount - 1, int(this%nslots, I8B))
+    ipos = LENSHMHEADER + LENSHMENTRY * this%narrays + 1 +                     &
+           islot * (LENSHMSLOTHEADER + 8 * this%nvalues)
+    !
+    ! -- invalidate the slot, write the record, and then mark the slot and
+    !    the header with the record number
+    write(this%iu, pos=ipos) 0_I8B
+    flush(this%iu)
+    write(this%iu) kstp, kper, pertim, totim
+    do i = 1, this%narrays
+      write(this%iu) this%arrays(i)%dblvec
+    end do
+    flush(this%iu)
+    write(this%iu, pos=ipos) this%icount
+    flush(this%iu)
+    write(this%iu, pos=LENSHMHEADER - 7) this%icount
+    flush(this%iu)
+    !
+    ! -- Return
+    return
+  end subroutine shm_ot
+
+  subroutine shm_da(this)
+! ******************************************************************************
+! shm_da -- Close the ring buffer file and deallocate
+! ******************************************************************************
+!
+!    SPECIFICATIONS:
+! ------------------------------------------------------------------------------
+    ! -- dummy
+    class(SharedOutputType) :: this
+! ------------------------------------------------------------------------------
+    !
+    if (this%iu /= 0) then
+      close(this%iu)
+      this%iu = 0
+    end if
+    deallocate(this%arrays)
+    !
+    ! -- Return
+    return
+  end subroutine shm_da
+
+end module SharedOutputModule
@@ -8,7 +8,7 @@ module SimModule
                                     VSUMMARY, VALL, VDEBUG,                      &
                                     OSWIN, OSUNDEF
   use SimVariablesModule,     only: istdout, iout, isim_level, ireturnerr,       &
-                                    iforcestop, iunext
+                                    iforcestop, iunitfirst, iunext
   use GenericUtilitiesModule, only: sim_message, stop_with_error
   use MessageModule,          only: MessageType
 
@@ -506,7 +506,7 @@ subroutine converge_reset()
 ! ------------------------------------------------------------------------------
     !
     ! -- close all open file units
-    do i = iustart, iunext - 1
+    do i = iunitfirst, iunext - 1
       !
       ! -- determine if file unit i is open
       inquire(unit=i, opened=opened)
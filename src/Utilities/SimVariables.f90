@@ -1,7 +1,8 @@
 module SimVariablesModule
   use, intrinsic :: iso_fortran_env, only: output_unit
   use KindModule, only: DP, I4B
-  use ConstantsModule, only: LINELENGTH, MAXCHARLEN, IUSTART, VALL, MNORMAL
+  use ConstantsModule, only: LINELENGTH, MAXCHARLEN, IUSTART, IULAST,         &
+                             VALL, MNORMAL
   public
   character(len=LINELENGTH) :: simfile    = 'mfsim.nam'
   character(len=LINELENGTH) :: simlstfile = 'mfsim.lst'
@@ -18,5 +19,7 @@ module SimVariablesModule
   integer(I4B) :: numnoconverge = 0                                              ! -- number of times there were convergence problems
   integer(I4B) :: ireturnerr = 0                                                 ! -- return code for program (0 successful, 1 non-convergence, 2 error)
   integer(I4B) :: iforcestop = 1                                                 ! -- 1 forces a call to ustop(..) when the simulation has ended, 0 doesn't
+  integer(I4B) :: iunitfirst = IUSTART                                           ! -- first file unit number that can be assigned
+  integer(I4B) :: iunitlast = IULAST                                             ! -- last file unit number that can be assigned
   integer(I4B) :: iunext = iustart
 end module SimVariablesModule
@@ -7,13 +7,9 @@ module TimeSeriesModule
                                     DZERO, DONE, DNODATA
   use GenericUtilitiesModule,       only: IS_SAME
   use InputOutputModule,      only: GetUnit, openfile, ParseLine, upcase
-  use ListModule,             only: ListType, ListNodeType
+  use ListModule,             only: ListType
   use SimModule,              only: count_errors, store_error, &
                                     store_error_unit, ustop
-  use TimeSeriesRecordModule, only: TimeSeriesRecordType, &
-                                    ConstructTimeSeriesRecord, &
-                                    CastAsTimeSeriesRecordType, &
-                                    AddTimeSeriesRecordToList
 
   private
   public :: TimeSeriesType, TimeSeriesFileType, ConstructTimeSeriesFile, &
@@ -28,28 +24,32 @@ module TimeSeriesModule
     ! -- Private members
     real(DP), private :: sfac = DONE
     logical, public :: autoDeallocate = .true.
-    type(ListType), pointer, private :: list => null()
+    ! -- Records are stored in contiguous time and value arrays. Records
+    !    before ifirst have been discarded, icur is the record found by
+    !    the last search, and the value for the last time span is cached.
+    integer(I4B), private :: nrec = 0
+    integer(I4B), private :: ifirst = 1
+    integer(I4B), private :: icur = 0
+    real(DP), dimension(:), allocatable, private :: times
+    real(DP), dimension(:), allocatable, private :: values
+    logical, private :: lcached = .false.
+    real(DP), private :: cachetime0 = DZERO
+    real(DP), private :: cachetime1 = DZERO
+    real(DP), private :: cachevalue = DZERO
     class(TimeSeriesFileType), pointer, private :: tsfile => null()
   contains
     ! -- Public procedures
-    procedure, public :: AddTimeSeriesRecord
     procedure, public :: Clear
     procedure, public :: FindLatestTime
-    procedure, public :: get_surrounding_records
-    procedure, public :: get_surrounding_nodes
-    procedure, public :: GetCurrentTimeSeriesRecord
-    procedure, public :: GetNextTimeSeriesRecord
-    procedure, public :: GetPreviousTimeSeriesRecord
-    procedure, public :: GetTimeSeriesRecord
     procedure, public :: GetValue
     procedure, public :: InitializeTimeSeries => initialize_time_series
-    procedure, public :: InsertTsr
-    procedure, public :: Reset
     ! -- Private procedures
+    procedure, private :: add_record
     procedure, private :: da => ts_da
+    procedure, private :: discard_records
+    procedure, private :: find_record
     procedure, private :: get_average_value
     procedure, private :: get_integrated_value
-    procedure, private :: get_latest_preceding_node
     procedure, private :: get_value_at_time
     procedure, private :: initialize_time_series
     procedure, private :: read_next_record
@@ -60,6 +60,7 @@ module TimeSeriesModule
     integer(I4B), public :: inunit = 0
     integer(I4B), public :: iout = 0
     integer(I4B), public :: nTimeSeries = 0
+    logical, public :: endOfData = .false.
     character(len=LINELENGTH), public :: datafile = ''
     type(TimeSeriesType), dimension(:), pointer, contiguous, public :: timeSeries => null()
     type(BlockParserType), pointer, public :: parser
@@ -203,23 +204,19 @@ contains
     type(TimeSeriesType), intent(in) :: ts2
     logical :: same
     ! -- local
-    integer :: i, n1, n2
-    type(TimeSeriesRecordType), pointer :: tsr1, tsr2
+    integer :: i, i1, i2, n1, n2
 ! ------------------------------------------------------------------------------
     !
     same = .false.
-    n1 = ts1%list%Count()
-    n2 = ts2%list%Count()
+    n1 = ts1%nrec - ts1%ifirst + 1
+    n2 = ts2%nrec - ts2%ifirst + 1
     if (n1 /= n2) return
     !
-    call ts1%Reset()
-    call ts2%Reset()
-    !
-    do i=1,n1
-      tsr1 => ts1%GetNextTimeSeriesRecord()
-      tsr2 => ts2%GetNextTimeSeriesRecord()
-      if (tsr1%tsrTime /= tsr2%tsrTime) return
-      if (tsr1%tsrValue /= tsr2%tsrValue) return
+    do i=0,n1-1
+      i1 = ts1%ifirst + i
+      i2 = ts2%ifirst + i
+      if (ts1%times(i1) /= ts2%times(i2)) return
+      if (ts1%values(i1) /= ts2%values(i2)) return
     enddo
     !
     same = .true.
@@ -227,6 +224,29 @@ contains
     return
   end function SameTimeSeries
 
+  logical function record_precedes(tsrTime, time, inclusive)
+! ******************************************************************************
+! record_precedes -- Return true if a record time is earlier than the time of
+!   interest or, if inclusive is true, the same as the time of interest.
+! ******************************************************************************
+!
+!    SPECIFICATIONS:
+! ------------------------------------------------------------------------------
+    ! -- dummy
+    real(DP), intent(in) :: tsrTime
+    real(DP), intent(in) :: time
+    logical, intent(in) :: inclusive
+! ------------------------------------------------------------------------------
+    !
+    if (inclusive) then
+      record_precedes = tsrTime < time .or. IS_SAME(tsrTime, time)
+    else
+      record_precedes = tsrTime < time .and. .not. IS_SAME(tsrTime, time)
+    endif
+    !
+    return
+  end function record_precedes
+
   ! Type-bound procedures of TimeSeriesType
 
   function GetValue(this, time0, time1)
@@ -236,6 +256,8 @@ contains
 !        Return a time-weighted average value for a specified time span.
 !    If iMethod is LINEAREND:
 !        Return value at time1. Time0 argument is ignored.
+!    The value is evaluated once for a time span and reused for all of the
+!    links that share the time series.
 !    Units: (ts-value-unit)
 ! ******************************************************************************
 !
@@ -248,6 +270,13 @@ contains
     real(DP),      intent(in)    :: time0
     real(DP),      intent(in)    :: time1
 ! ------------------------------------------------------------------------------
+    !
+    if (this%lcached) then
+      if (time0 == this%cachetime0 .and. time1 == this%cachetime1) then
+        GetValue = this%cachevalue
+        return
+      endif
+    endif
     !
     select case (this%iMethod)
     case (STEPWISE, LINEAR)
@@ -256,6 +285,11 @@ contains
       GetValue =  this%get_value_at_time(time1)
     end select
     !
+    this%lcached = .true.
+    this%cachetime0 = time0
+    this%cachetime1 = time1
+    this%cachevalue = GetValue
+    !
     return
   end function GetValue
 
@@ -288,8 +322,9 @@ contains
     !
     if (present(autoDeallocate)) this%autoDeallocate = autoDeallocate
     !
-    ! -- allocate the list
-    allocate(this%list)
+    ! -- allocate the record arrays
+    allocate(this%times(100))
+    allocate(this%values(100))
     !
     ! -- ensure that NAME has been specified
     if (this%Name == '') then
@@ -301,204 +336,140 @@ contains
     return
   end subroutine initialize_time_series
 
-  subroutine get_surrounding_records(this, time, tsrecEarlier, tsrecLater)
+  subroutine add_record(this, tsrTime, tsrValue)
 ! ******************************************************************************
-! get_surrounding_records -- get surrounding records
+! add_record -- add a time-series record
+!   Append a record to the time and value arrays, doubling the size of the
+!   arrays when they are full.
 ! ******************************************************************************
 !
 !    SPECIFICATIONS:
 ! ------------------------------------------------------------------------------
     ! -- dummy
     class(TimeSeriesType), intent(inout) :: this
-    real(DP),      intent(in)    :: time
-    type(TimeSeriesRecordType), pointer, intent(inout) :: tsrecEarlier
-    type(TimeSeriesRecordType), pointer, intent(inout) :: tsrecLater
+    real(DP), intent(in) :: tsrTime
+    real(DP), intent(in) :: tsrValue
     ! -- local
-    real(DP) :: time0, time1
-    type(ListNodeType), pointer :: currNode => null()
-    type(ListNodeType), pointer :: tsNode0 => null()
-    type(ListNodeType), pointer :: tsNode1 => null()
-    type(TimeSeriesRecordType), pointer :: tsr => null(), tsrec0 => null()
-    type(TimeSeriesRecordType), pointer :: tsrec1 => null()
-    class(*),                   pointer :: obj => null()
+    integer(I4B) :: n
+    real(DP), dimension(:), allocatable :: temp
 ! ------------------------------------------------------------------------------
     !
-    tsrecEarlier => null()
-    tsrecLater => null()
-    !
-    if (associated(this%list%firstNode)) then
-      currNode => this%list%firstNode
+    n = size(this%times)
+    if (this%nrec == n) then
+      allocate(temp(2 * n))
+      temp(1:n) = this%times(1:n)
+      call move_alloc(temp, this%times)
+      allocate(temp(2 * n))
+      temp(1:n) = this%values(1:n)
+      call move_alloc(temp, this%values)
     endif
     !
-    ! -- If the next node is earlier than time of interest, advance along
-    !    linked list until the next node is later than time of interest.
-    do
-      if (associated(currNode)) then
-        if (associated(currNode%nextNode)) then
-          obj => currNode%nextNode%GetItem()
-          tsr => CastAsTimeSeriesRecordType(obj)
-          if (tsr%tsrTime < time .and. .not. IS_SAME(tsr%tsrTime, time)) then
-            currNode => currNode%nextNode
-          else
-            exit
-          endif
-        else
-          ! -- read another record
-          if (.not. this%read_next_record()) exit
-        endif
-      else
-        exit
-      endif
-    enddo
-    !
-    if (associated(currNode)) then
-      !
-      ! -- find earlier record
-      tsNode0 => currNode
-      obj => tsNode0%GetItem()
-      tsrec0 => CastAsTimeSeriesRecordType(obj)
-      time0 = tsrec0%tsrTime
-      do while (time0 > time)
-        if (associated(tsNode0%prevNode)) then
-          tsNode0 => tsNode0%prevNode
-          obj => tsNode0%GetItem()
-          tsrec0 => CastAsTimeSeriesRecordType(obj)
-          time0 = tsrec0%tsrTime
-        else
-          exit
-        endif
-      enddo
-      !
-      ! -- find later record
-      tsNode1 => currNode
-      obj => tsNode1%GetItem()
-      tsrec1 => CastAsTimeSeriesRecordType(obj)
-      time1 = tsrec1%tsrTime
-      do while (time1 < time .and. .not. IS_SAME(time1, time))
-        if (associated(tsNode1%nextNode)) then
-          tsNode1 => tsNode1%nextNode
-          obj => tsNode1%GetItem()
-          tsrec1 => CastAsTimeSeriesRecordType(obj)
-          time1 = tsrec1%tsrTime
-        else
-          ! -- get next record
-          if (.not. this%read_next_record()) then
-            ! -- end of file reached, so exit loop
-            exit
-          endif
-        endif
-      enddo
-      !
-    endif
-    !
-    if (time0 < time .or. IS_SAME(time0, time)) tsrecEarlier => tsrec0
-    if (time1 > time .or. IS_SAME(time1, time)) tsrecLater => tsrec1
+    this%nrec = this%nrec + 1
+    this%times(this%nrec) = tsrTime
+    this%values(this%nrec) = tsrValue
     !
     return
-  end subroutine get_surrounding_records
+  end subroutine add_record
 
-  subroutine get_surrounding_nodes(this, time, nodeEarlier, nodeLater)
+  subroutine discard_records(this, irec)
 ! ******************************************************************************
-! get_surrounding_nodes -- get surrounding nodes
-!   This subroutine is for working with time series already entirely stored
-!   in memory -- it does not read data from a file.
+! discard_records -- discard the records before a record
+!   The retained records are moved to the start of the arrays once the
+!   discarded records occupy at least half of the arrays.
 ! ******************************************************************************
 !
 !    SPECIFICATIONS:
 ! ------------------------------------------------------------------------------
     ! -- dummy
-    class(TimeSeriesType),       intent(inout) :: this
-    real(DP),                    intent(in)    :: time
-    type(ListNodeType), pointer, intent(inout) :: nodeEarlier
-    type(ListNodeType), pointer, intent(inout) :: nodeLater
+    class(TimeSeriesType), intent(inout) :: this
+    integer(I4B), intent(in) :: irec
     ! -- local
-    real(DP) :: time0, time1
-    type(ListNodeType), pointer :: currNode => null()
-    type(ListNodeType), pointer :: tsNode0 => null()
-    type(ListNodeType), pointer :: tsNode1 => null()
-    type(TimeSeriesRecordType), pointer :: tsr => null(), tsrec0 => null()
-    type(TimeSeriesRecordType), pointer :: tsrec1 => null()
-    type(TimeSeriesRecordType), pointer :: tsrecEarlier
-    type(TimeSeriesRecordType), pointer :: tsrecLater
-    class(*),                   pointer :: obj => null()
+    integer(I4B) :: ishift, n
 ! ------------------------------------------------------------------------------
     !
-    tsrecEarlier => null()
-    tsrecLater => null()
-    nodeEarlier => null()
-    nodeLater  => null()
-    !
-    if (associated(this%list%firstNode)) then
-      currNode => this%list%firstNode
+    if (irec <= this%ifirst) return
+    this%ifirst = irec
+    !
+    ishift = this%ifirst - 1
+    if (2 * ishift >= size(this%times)) then
+      n = this%nrec - ishift
+      this%times(1:n) = this%times(this%ifirst:this%nrec)
+      this%values(1:n) = this%values(this%ifirst:this%nrec)
+      this%nrec = n
+      this%ifirst = 1
+      this%icur = max(this%icur - ishift, 0)
     endif
     !
-    ! -- If the next node is earlier than time of interest, advance along
-    !    linked list until the next node is later than time of interest.
+    return
+  end subroutine discard_records
+
+  function find_record(this, time, inclusive) result(irec)
+! ******************************************************************************
+! find_record -- find the latest record preceding a time
+!   Return the index of the latest record with a time earlier than the time
+!   of interest or, if inclusive is true, the same as the time of interest.
+!   Records are read until a record after the time of interest is available.
+!   The record found by the last search, and the record after it, are checked
+!   before the records are bisected. ifirst - 1 is returned if no record
+!   precedes the time of interest.
+! ******************************************************************************
+!
+!    SPECIFICATIONS:
+! ------------------------------------------------------------------------------
+    ! -- return
+    integer(I4B) :: irec
+    ! -- dummy
+    class(TimeSeriesType), intent(inout) :: this
+    real(DP), intent(in) :: time
+    logical, intent(in) :: inclusive
+    ! -- local
+    integer(I4B) :: i, ilo, ihi, imid
+! ------------------------------------------------------------------------------
+    !
+    ! -- read records until the last record is later than time of interest
     do
-      if (associated(currNode)) then
-        if (associated(currNode%nextNode)) then
-          obj => currNode%nextNode%GetItem()
-          tsr => CastAsTimeSeriesRecordType(obj)
-          if (tsr%tsrTime < time .and. .not. IS_SAME(tsr%tsrTime, time)) then
-            currNode => currNode%nextNode
-          else
-            exit
-          endif
-        else
-          exit
-        endif
-      else
-        exit
+      if (this%nrec >= this%ifirst) then
+        if (.not. record_precedes(this%times(this%nrec), time, inclusive)) exit
       endif
+      if (.not. this%read_next_record()) exit
     enddo
     !
-    if (associated(currNode)) then
-      !
-      ! -- find earlier record
-      tsNode0 => currNode
-      obj => tsNode0%GetItem()
-      tsrec0 => CastAsTimeSeriesRecordType(obj)
-      time0 = tsrec0%tsrTime
-      do while (time0 > time)
-        if (associated(tsNode0%prevNode)) then
-          tsNode0 => tsNode0%prevNode
-          obj => tsNode0%GetItem()
-          tsrec0 => CastAsTimeSeriesRecordType(obj)
-          time0 = tsrec0%tsrTime
-        else
-          exit
+    ! -- check the cursor and the record after it
+    irec = 0
+    i = this%icur
+    if (i >= this%ifirst .and. i <= this%nrec) then
+      if (record_precedes(this%times(i), time, inclusive)) then
+        if (i == this%nrec) then
+          irec = i
+        elseif (.not. record_precedes(this%times(i+1), time, inclusive)) then
+          irec = i
+        elseif (i + 1 == this%nrec) then
+          irec = i + 1
+        elseif (.not. record_precedes(this%times(i+2), time, inclusive)) then
+          irec = i + 1
         endif
-      enddo
-      !
-      ! -- find later record
-      tsNode1 => currNode
-      obj => tsNode1%GetItem()
-      tsrec1 => CastAsTimeSeriesRecordType(obj)
-      time1 = tsrec1%tsrTime
-      do while (time1 < time .and. .not. IS_SAME(time1, time))
-        if (associated(tsNode1%nextNode)) then
-          tsNode1 => tsNode1%nextNode
-          obj => tsNode1%GetItem()
-          tsrec1 => CastAsTimeSeriesRecordType(obj)
-          time1 = tsrec1%tsrTime
+      endif
+    endif
+    !
+    ! -- bisect the records
+    if (irec == 0) then
+      ilo = this%ifirst - 1
+      ihi = this%nrec + 1
+      do while (ihi - ilo > 1)
+        imid = (ilo + ihi) / 2
+        if (record_precedes(this%times(imid), time, inclusive)) then
+          ilo = imid
         else
-          exit
+          ihi = imid
         endif
       enddo
-      !
+      irec = ilo
     endif
     !
-    if (time0 < time .or. IS_SAME(time0, time)) then
-      tsrecEarlier => tsrec0
-      nodeEarlier => tsNode0
-    endif
-    if (time1 > time .or. IS_SAME(time1, time)) then
-      tsrecLater => tsrec1
-      nodeLater => tsNode1
-    endif
+    if (irec >= this%ifirst) this%icur = irec
     !
     return
-  end subroutine get_surrounding_nodes
+  end function find_record
 
   logical function read_next_record(this)
 ! ******************************************************************************
@@ -532,29 +503,38 @@ contains
     class(TimeSeriesType), intent(inout) :: this
     real(DP),      intent(in)    :: time ! time of interest
     ! -- local
-    integer(I4B) :: ierr
+    integer(I4B) :: ierr, irec, iEarlier, iLater
     real(DP) :: ratio, time0, time1, timediff, timediffi, val0, val1, &
                         valdiff
     character(len=LINELENGTH) :: errmsg
-    type(TimeSeriesRecordType), pointer :: tsrEarlier => null()
-    type(TimeSeriesRecordType), pointer :: tsrLater => null()
     ! -- formats
     10 format('Error getting value at time ',g10.3,' for time series "',a,'"')
 ! ------------------------------------------------------------------------------
     !
     ierr = 0
-    call this%get_surrounding_records(time,tsrEarlier,tsrLater)
-    if (associated(tsrEarlier)) then
-      if (associated(tsrLater)) then
+    !
+    ! -- find the records surrounding the time of interest
+    irec = this%find_record(time, .false.)
+    iEarlier = 0
+    iLater = 0
+    if (irec >= this%ifirst) then
+      iEarlier = irec
+    elseif (this%nrec >= this%ifirst) then
+      if (IS_SAME(this%times(this%ifirst), time)) iEarlier = this%ifirst
+    endif
+    if (irec < this%nrec) iLater = irec + 1
+    !
+    if (iEarlier > 0) then
+      if (iLater > 0) then
         ! -- values are available for both earlier and later times
         if (this%iMethod == STEPWISE) then
-          get_value_at_time =  tsrEarlier%tsrValue
+          get_value_at_time =  this%values(iEarlier)
         elseif (this%iMethod == LINEAR .or. this%iMethod == LINEAREND) then
           ! -- For get_value_at_time, result is the same for either
           !    linear method.
           ! -- Perform linear interpolation.
-          time0 = tsrEarlier%tsrTime
-          time1 = tsrLater%tsrtime
+          time0 = this%times(iEarlier)
+          time1 = this%times(iLater)
           timediff = time1 - time0
           timediffi = time - time0
           if (timediff>0) then
@@ -563,30 +543,30 @@ contains
             ! -- should not happen if TS does not contain duplicate times
             ratio = 0.5d0
           endif
-          val0 = tsrEarlier%tsrValue
-          val1 = tsrLater%tsrValue
+          val0 = this%values(iEarlier)
+          val1 = this%values(iLater)
           valdiff = val1 - val0
           get_value_at_time = val0 + (ratio*valdiff)
         else
           ierr = 1
         endif
       else
-        if (IS_SAME(tsrEarlier%tsrTime, time)) then
-          get_value_at_time = tsrEarlier%tsrValue
+        if (IS_SAME(this%times(iEarlier), time)) then
+          get_value_at_time = this%values(iEarlier)
         else
           ! -- Only earlier time is available, and it is not time of interest;
           !    however, if method is STEPWISE, use value for earlier time.
           if (this%iMethod == STEPWISE) then
-            get_value_at_time =  tsrEarlier%tsrValue
+            get_value_at_time =  this%values(iEarlier)
           else
             ierr = 1
           endif
         endif
       endif
     else
-      if (associated(tsrLater)) then
-        if (IS_SAME(tsrLater%tsrTime, time)) then
-          get_value_at_time = tsrLater%tsrValue
+      if (iLater > 0) then
+        if (IS_SAME(this%times(iLater), time)) then
+          get_value_at_time = this%values(iLater)
         else
           ! -- only later time is available, and it is not time of interest
           ierr = 1
@@ -623,15 +603,11 @@ contains
     real(DP),      intent(in)    :: time0
     real(DP),      intent(in)    :: time1
     ! -- local
+    integer(I4B) :: iPreceding, i
     real(DP) :: area, currTime, nextTime, ratio0, ratio1, t0, t01, t1, &
                         timediff, value, value0, value1, valuediff
     logical :: ldone
     character(len=LINELENGTH) :: errmsg
-    type(ListNodeType), pointer :: tslNodePreceding => null()
-    type(ListNodeType), pointer :: currNode => null(), nextNode => null()
-    type(TimeSeriesRecordType), pointer :: currRecord => null()
-    type(TimeSeriesRecordType), pointer :: nextRecord => null()
-    class(*), pointer :: currObj => null(), nextObj => null()
     ! -- formats
     10 format('Error encountered while performing integration', &
         ' for time series "',a,'" for time interval: ',g12.5,' to ',g12.5)
@@ -640,18 +616,20 @@ contains
     value = DZERO
     ldone = .false.
     t1 = -DONE
-    call this%get_latest_preceding_node(time0, tslNodePreceding)
-    if (associated(tslNodePreceding)) then
-      currNode => tslNodePreceding
+    iPreceding = this%find_record(time0, .true.)
+    if (this%nrec < this%ifirst) then
+      call store_error('probable programming error in get_integrated_value')
+      call ustop()
+    endif
+    if (iPreceding >= this%ifirst) then
+      i = iPreceding
       do while (.not. ldone)
-        currObj => currNode%GetItem()
-        currRecord => CastAsTimeSeriesRecordType(currObj)
-        currTime = currRecord%tsrTime
+        currTime = this%times(i)
         if (IS_SAME(currTime, time1)) then
-          ! Current node time = time1 so should be ldone
+          ! Current record time = time1 so should be ldone
           ldone = .true.
         elseif (currTime < time1) then
-          if (.not. associated(currNode%nextNode)) then
+          if (i == this%nrec) then
             ! -- try to read the next record
             if (.not. this%read_next_record()) then
               write(errmsg,10)trim(this%Name),time0,time1
@@ -659,11 +637,8 @@ contains
               call ustop()
             endif
           endif
-          if (associated(currNode%nextNode)) then
-            nextNode => currNode%nextNode
-            nextObj => nextNode%GetItem()
-            nextRecord => CastAsTimeSeriesRecordType(nextObj)
-            nextTime = nextRecord%tsrTime
+          if (i < this%nrec) then
+            nextTime = this%times(i+1)
             ! -- determine lower and upper limits of time span of interest
             !    within current interval
             if (currTime > time0 .or. IS_SAME(currTime, time0)) then
@@ -681,16 +656,16 @@ contains
             select case (this%iMethod)
             case (STEPWISE)
               ! -- compute area of a rectangle
-              value0 = currRecord%tsrValue
+              value0 = this%values(i)
               area = value0 * t01
             case (LINEAR, LINEAREND)
               ! -- compute area of a trapezoid
               timediff = nextTime - currTime
               ratio0 = (t0 - currTime) / timediff
               ratio1 = (t1 - currTime) / timediff
-              valuediff = nextRecord%tsrValue - currRecord%tsrValue
-              value0 = currRecord%tsrValue + ratio0 * valuediff
-              value1 = currRecord%tsrValue + ratio1 * valuediff
+              valuediff = this%values(i+1) - this%values(i)
+              value0 = this%values(i) + ratio0 * valuediff
+              value1 = this%values(i) + ratio1 * valuediff
               if (this%iMethod == LINEAR) then
                 area = 0.5d0 * t01 * (value0 + value1)
               elseif (this%iMethod == LINEAREND) then
@@ -710,27 +685,25 @@ contains
           ldone = .true.
         else
           ! -- We are not done yet
-          if (.not. associated(currNode%nextNode)) then
+          if (i == this%nrec) then
             ! -- Not done and no more data, so try to read the next record
             if (.not. this%read_next_record()) then
               write(errmsg,10)trim(this%Name),time0,time1
               call store_error(errmsg)
               call ustop()
             endif
-          elseif (associated(currNode%nextNode)) then
-            currNode => currNode%nextNode
+          else
+            i = i + 1
           endif
         endif
       enddo
     endif
     !
     get_integrated_value = value
+    !
+    ! -- discard the records before the latest preceding record
     if (this%autoDeallocate) then
-      if (associated(tslNodePreceding)) then
-        if (associated(tslNodePreceding%prevNode))then
-          call this%list%DeallocateBackward(tslNodePreceding%prevNode)
-        endif
-      endif
+      call this%discard_records(iPreceding)
     endif
     return
   end function get_integrated_value
@@ -771,81 +744,6 @@ contains
     return
   end function get_average_value
 
-  subroutine get_latest_preceding_node(this, time, tslNode)
-! ******************************************************************************
-! get_latest_preceding_node -- get latest prececing node
-!   Return pointer to ListNodeType object for the node
-!   representing the latest preceding time in the time series
-! ******************************************************************************
-!
-!    SPECIFICATIONS:
-! ------------------------------------------------------------------------------
-    ! -- dummy
-    class(TimeSeriesType),      intent(inout) :: this
-    real(DP),            intent(in)    :: time
-    type(ListNodeType), pointer, intent(inout) :: tslNode
-    ! -- local
-    real(DP) :: time0
-    type(ListNodeType), pointer :: currNode => null()
-    type(ListNodeType), pointer :: tsNode0 => null()
-    type(TimeSeriesRecordType), pointer :: tsr => null()
-    type(TimeSeriesRecordType), pointer :: tsrec0 => null()
-    class(*),                   pointer :: obj => null()
-! ------------------------------------------------------------------------------
-    !
-    tslNode => null()
-    if (associated(this%list%firstNode)) then
-      currNode => this%list%firstNode
-    else
-      call store_error('probable programming error in get_latest_preceding_node')
-      call ustop()
-    endif
-    !
-    ! -- If the next node is earlier than time of interest, advance along
-    !    linked list until the next node is later than time of interest.
-    do
-      if (associated(currNode)) then
-        if (associated(currNode%nextNode)) then
-          obj => currNode%nextNode%GetItem()
-          tsr => CastAsTimeSeriesRecordType(obj)
-          if (tsr%tsrTime < time .or. IS_SAME(tsr%tsrTime, time)) then
-            currNode => currNode%nextNode
-          else
-            exit
-          endif
-        else
-          ! -- read another record
-          if (.not. this%read_next_record()) exit
-        endif
-      else
-        exit
-      endif
-    enddo
-    !
-    if (associated(currNode)) then
-      !
-      ! -- find earlier record
-      tsNode0 => currNode
-      obj => tsNode0%GetItem()
-      tsrec0 => CastAsTimeSeriesRecordType(obj)
-      time0 = tsrec0%tsrTime
-      do while (time0 > time)
-        if (associated(tsNode0%prevNode)) then
-          tsNode0 => tsNode0%prevNode
-          obj => tsNode0%GetItem()
-          tsrec0 => CastAsTimeSeriesRecordType(obj)
-          time0 = tsrec0%tsrTime
-        else
-          exit
-        endif
-      enddo
-    endif
-    !
-    if (time0 < time .or. IS_SAME(time0, time)) tslNode => tsNode0
-    !
-    return
-  end subroutine get_latest_preceding_node
-
   subroutine ts_da(this)
 ! ******************************************************************************
 ! ts_da -- deallocate
@@ -857,246 +755,11 @@ contains
     class(TimeSeriesType), intent(inout) :: this
 ! ------------------------------------------------------------------------------
     !
-    if (associated(this%list)) then
-      call this%list%Clear(.true.)
-      deallocate(this%list)
-    endif
+    call this%Clear(.true.)
     !
     return
   end subroutine ts_da
 
-  subroutine AddTimeSeriesRecord(this, tsr)
-! ******************************************************************************
-! AddTimeSeriesRecord -- add ts record
-! ******************************************************************************
-!
-!    SPECIFICATIONS:
-! ------------------------------------------------------------------------------
-    ! -- dummy
-    class(TimeSeriesType) :: this
-    type(TimeSeriesRecordType), pointer, intent(inout) :: tsr
-    ! -- local
-    class(*), pointer :: obj
-! ------------------------------------------------------------------------------
-    !
-    obj => tsr
-    call this%list%Add(obj)
-    !
-    return
-  end subroutine AddTimeSeriesRecord
-
-  function GetCurrentTimeSeriesRecord(this) result (res)
-! ******************************************************************************
-! GetCurrentTimeSeriesRecord -- get current ts record
-! ******************************************************************************
-!
-!    SPECIFICATIONS:
-! ------------------------------------------------------------------------------
-    ! -- dummy
-    class(TimeSeriesType) :: this
-    ! result
-    type(TimeSeriesRecordType), pointer :: res
-    ! -- local
-    class(*), pointer :: obj
-! ------------------------------------------------------------------------------
-    !
-    obj => null()
-    res => null()
-    obj => this%list%GetItem()
-    if (associated(obj)) then
-      res => CastAsTimeSeriesRecordType(obj)
-    endif
-    !
-    return
-  end function GetCurrentTimeSeriesRecord
-
-  function GetPreviousTimeSeriesRecord(this) result (res)
-! ******************************************************************************
-! GetPreviousTimeSeriesRecord -- get previous ts record
-! ******************************************************************************
-!
-!    SPECIFICATIONS:
-! ------------------------------------------------------------------------------
-    ! -- dummy
-    class(TimeSeriesType) :: this
-    ! result
-    type(TimeSeriesRecordType), pointer :: res
-    ! -- local
-    class(*), pointer :: obj
-! ------------------------------------------------------------------------------
-    !
-    obj => null()
-    res => null()
-    obj => this%list%GetPreviousItem()
-    if (associated(obj)) then
-      res => CastAsTimeSeriesRecordType(obj)
-    endif
-    !
-    return
-  end function GetPreviousTimeSeriesRecord
-
-  function GetNextTimeSeriesRecord(this) result (res)
-! ******************************************************************************
-! GetNextTimeSeriesRecord -- get next ts record
-! ******************************************************************************
-!
-!    SPECIFICATIONS:
-! ------------------------------------------------------------------------------
-    ! -- dummy
-    class(TimeSeriesType) :: this
-    ! result
-    type(TimeSeriesRecordType), pointer :: res
-    ! -- local
-    class(*), pointer :: obj
-! ------------------------------------------------------------------------------
-    !
-    obj => null()
-    res => null()
-    obj => this%list%GetNextItem()
-    if (associated(obj)) then
-      res => CastAsTimeSeriesRecordType(obj)
-    endif
-    !
-    return
-  end function GetNextTimeSeriesRecord
-
-  function GetTimeSeriesRecord(this, time, epsi)  result (res)
-! ******************************************************************************
-! GetTimeSeriesRecord -- get ts record
-! ******************************************************************************
-!
-!    SPECIFICATIONS:
-! ------------------------------------------------------------------------------
-    ! -- dummy
-    class(TimeSeriesType) :: this
-    double precision, intent(in) :: time
-    double precision, intent(in) :: epsi
-    ! result
-    type(TimeSeriesRecordType), pointer :: res
-    ! -- local
-    type(TimeSeriesRecordType), pointer :: tsr
-! ------------------------------------------------------------------------------
-    !
-    call this%list%Reset()
-    res => null()
-    do
-      tsr => this%GetNextTimeSeriesRecord()
-      if (associated(tsr)) then
-        if (IS_SAME(tsr%tsrTime, time)) then
-          res => tsr
-          exit
-        endif
-        if (tsr%tsrTime > time) exit
-      else
-        exit
-      endif
-    enddo
-    !
-    return
-  end function GetTimeSeriesRecord
-
-  subroutine Reset(this)
-! ******************************************************************************
-! Reset -- reset
-! ******************************************************************************
-!
-!    SPECIFICATIONS:
-! ------------------------------------------------------------------------------
-    ! -- dummy
-    class(TimeSeriesType) :: this
-! ------------------------------------------------------------------------------
-    !
-    call this%list%Reset()
-    !
-    return
-  end subroutine Reset
-
-  subroutine InsertTsr(this, tsr)
-! ******************************************************************************
-! InsertTsr -- insert ts record
-! ******************************************************************************
-!
-!    SPECIFICATIONS:
-! ------------------------------------------------------------------------------
-    ! -- dummy
-    class(TimeSeriesType),               intent(inout) :: this
-    type(TimeSeriesRecordType), pointer, intent(inout) :: tsr
-    ! -- local
-    double precision :: badtime, time, time0, time1
-    type(TimeSeriesRecordType), pointer :: tsrEarlier, tsrLater
-    type(ListNodeType), pointer :: nodeEarlier, nodeLater
-    class(*), pointer :: obj
-! ------------------------------------------------------------------------------
-    !
-    badtime = -9.0d30
-    time0 = badtime
-    time1 = badtime
-    time = tsr%tsrTime
-    call this%get_surrounding_nodes(time, nodeEarlier, nodeLater)
-    !
-    if (associated(nodeEarlier)) then
-      obj => nodeEarlier%GetItem()
-      tsrEarlier => CastAsTimeSeriesRecordType(obj)
-      if (associated(tsrEarlier)) then
-        time0 = tsrEarlier%tsrTime
-      endif
-    endif
-    !
-    if (associated(nodeLater)) then
-      obj => nodeLater%GetItem()
-      tsrLater => CastAsTimeSeriesRecordType(obj)
-      if (associated(tsrLater)) then
-        time1 = tsrLater%tsrTime
-      endif
-    endif
-    !
-    if (time0 > badtime) then
-      ! Time0 is valid
-      if (time1 > badtime) then
-        ! Both time0 and time1 are valid
-        if (time > time0 .and. time < time1) then
-          ! Insert record between two list nodes
-          obj => tsr
-          call this%list%InsertBefore(obj, nodeLater)
-        else
-          ! No need to insert a time series record, but if existing record
-          ! for time of interest has NODATA as tsrValue, replace tsrValue
-          if (time == time0 .and. tsrEarlier%tsrValue == DNODATA .and. &
-                  tsr%tsrValue /= DNODATA) then
-            tsrEarlier%tsrValue = tsr%tsrValue
-          elseif (time == time1 .and. tsrLater%tsrValue == DNODATA .and. &
-                  tsr%tsrValue /= DNODATA) then
-            tsrLater%tsrValue = tsr%tsrValue
-          endif
-        endif
-      else
-        ! Time0 is valid and time1 is invalid. Just add tsr to the list.
-        call this%AddTimeSeriesRecord(tsr)
-      endif
-    else
-      ! Time0 is invalid, so time1 must be for first node in list
-      if (time1 > badtime) then
-        ! Time 1 is valid
-        if (time < time1) then
-          ! Insert tsr at beginning of list
-          obj => tsr
-          call this%list%InsertBefore(obj, nodeLater)
-        elseif (time == time1) then
-          ! No need to insert a time series record, but if existing record
-          ! for time of interest has NODATA as tsrValue, replace tsrValue
-          if (tsrLater%tsrValue == DNODATA .and. tsr%tsrValue /= DNODATA) then
-            tsrLater%tsrValue = tsr%tsrValue
-          endif
-        endif
-      else
-        ! Both time0 and time1 are invalid. Just add tsr to the list.
-        call this%AddTimeSeriesRecord(tsr)
-      endif
-    endif
-    !
-    return
-  end subroutine InsertTsr
-
   function FindLatestTime(this) result (endtime)
 ! ******************************************************************************
 ! FindLatestTime -- find latest time
@@ -1107,23 +770,17 @@ contains
     ! -- dummy
     class(TimeSeriesType), intent(inout) :: this
     ! -- local
-    integer :: nrecords
     double precision :: endtime
-    type(TimeSeriesRecordType), pointer :: tsr
-    class(*), pointer :: obj
 ! ------------------------------------------------------------------------------
     !
-    nrecords = this%list%Count()
-    obj => this%list%GetItem(nrecords)
-    tsr => CastAsTimeSeriesRecordType(obj)
-    endtime = tsr%tsrTime
+    endtime = this%times(this%nrec)
     !
     return
   end function FindLatestTime
 
   subroutine Clear(this, destroy)
 ! ******************************************************************************
-! Clear -- Clear the list of time series records
+! Clear -- Clear the time series records
 ! ******************************************************************************
 !
 !    SPECIFICATIONS:
@@ -1133,7 +790,16 @@ contains
     logical, optional,     intent(in)    :: destroy
 ! ------------------------------------------------------------------------------
     !
-    call this%list%Clear(destroy)
+    this%nrec = 0
+    this%ifirst = 1
+    this%icur = 0
+    this%lcached = .false.
+    if (present(destroy)) then
+      if (destroy) then
+        if (allocated(this%times)) deallocate(this%times)
+        if (allocated(this%values)) deallocate(this%values)
+      endif
+    endif
     !
     return
   end subroutine Clear
@@ -1405,28 +1071,30 @@ contains
     ! -- local
     real(DP) :: tsrTime, tsrValue
     integer(I4B) :: i
-    logical :: eof, endOfBlock
-    type(TimeSeriesRecordType), pointer :: tsRecord => null()
+    logical :: endOfBlock
 ! ------------------------------------------------------------------------------
     !
-    eof = .false.
     read_tsfile_line = .false.
+    if (this%endOfData) return
     !
     ! -- Get an arbitrary length, non-comment, non-blank line
     !    from the input file.
     call this%parser%GetNextLine(endOfBlock)
+    if (endOfBlock) then
+      this%endOfData = .true.
+      return
+    endif
     !
     ! -- Get the time
     tsrTime = this%parser%GetDouble()
     !
-    ! -- Construct a new record and append a new node to each time series
+    ! -- Append a record to each time series
     tsloop: do i=1,this%nTimeSeries
       tsrValue = this%parser%GetDouble()
       if (tsrValue == DNODATA) cycle tsloop
       ! -- multiply value by sfac
       tsrValue = tsrValue * this%timeSeries(i)%sfac
-      call ConstructTimeSeriesRecord(tsRecord, tsrTime, tsrValue)
-      call AddTimeSeriesRecordToList(this%timeSeries(i)%list, tsRecord)
+      call this%timeSeries(i)%add_record(tsrTime, tsrValue)
     enddo tsloop
     read_tsfile_line = .true.
     !
@@ -181,9 +181,11 @@ contains
     integer(I4B) :: im
     integer(I4B) :: ic
     integer(I4B) :: is
+    integer(I4B) :: isg
     class(BaseSolutionType), pointer :: sp => null()
     class(BaseModelType), pointer :: mp => null()
     class(BaseExchangeType), pointer :: ep => null()
+    class(SolutionGroupType), pointer :: sgp => null()
     
     ! -- Define each model
     do im = 1, basemodellist%Count()
@@ -202,6 +204,12 @@ contains
       sp => GetBaseSolutionFromList(basesolutionlist, is)
       call sp%sln_df()
     enddo
+    !
+    ! -- Define each solution group
+    do isg = 1, solutiongrouplist%Count()
+      sgp => GetSolutionGroupFromList(solutiongrouplist, isg)
+      call sgp%sgp_df()
+    enddo
   
   end subroutine simulation_df
   
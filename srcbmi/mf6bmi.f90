@@ -26,6 +26,7 @@ module mf6bmi
   use SimVariablesModule, only: simstdout, istdout
   use InputOutputModule, only: getunit
   use GenericUtilitiesModule, only: sim_message
+  use mf6bmiGrid, only: BmiGridType, get_bmi_grid, bmi_grid_da
   implicit none
   
   ! Define global constants  
@@ -43,7 +44,7 @@ module mf6bmi
   ! NOTE: initialize should be matched with a call to finalize, but there
   ! is currently no reason to believe that we can reinitialize a model in
   ! the same memory space... currently you would have to create a new process
-  ! for that.
+  ! for that, or load another copy of the library (see set_file_unit_range).
   function bmi_initialize() result(bmi_status) bind(C, name="initialize")
   !DEC$ ATTRIBUTES DLLEXPORT :: bmi_initialize
     integer(kind=c_int) :: bmi_status
@@ -92,6 +93,7 @@ module mf6bmi
     
     ! we don't want a full stop() here, this disables it:    
     iforcestop = 0    
+    call bmi_grid_da()
     call Mf6Finalize()
       
     bmi_status = BMI_SUCCESS
@@ -264,6 +266,98 @@ module mf6bmi
     bmi_status = BMI_SUCCESS
     
   end function get_value_ptr_int
+
+  ! copy the values of the given double variable at the zero-based
+  ! (flattened, C-style) indices into the array values
+  function get_value_at_indices_double(c_var_name, values, inds, count) result(bmi_status) &
+    bind(C, name="get_value_at_indices_double")
+  !DEC$ ATTRIBUTES DLLEXPORT :: get_value_at_indices_double
+    character (kind=c_char), intent(in) :: c_var_name(*)
+    real(kind=c_double), intent(inout) :: values(*)
+    integer(kind=c_int), intent(in) :: inds(*)
+    integer(kind=c_int), intent(in) :: count
+    integer(kind=c_int) :: bmi_status
+    ! local
+    real(DP), dimension(:), pointer, contiguous :: arrayptr
+    integer(I4B) :: i
+    
+    call get_flat_ptr_double(c_var_name, arrayptr, count, inds, bmi_status)
+    if (bmi_status /= BMI_SUCCESS) return
+    
+    do i = 1, count
+      values(i) = arrayptr(inds(i) + 1)
+    end do
+    
+  end function get_value_at_indices_double
+  
+  ! set the values of the given double variable at the zero-based
+  ! (flattened, C-style) indices from the array values
+  function set_value_at_indices_double(c_var_name, inds, count, values) result(bmi_status) &
+    bind(C, name="set_value_at_indices_double")
+  !DEC$ ATTRIBUTES DLLEXPORT :: set_value_at_indices_double
+    character (kind=c_char), intent(in) :: c_var_name(*)
+    integer(kind=c_int), intent(in) :: inds(*)
+    integer(kind=c_int), intent(in) :: count
+    real(kind=c_double), intent(in) :: values(*)
+    integer(kind=c_int) :: bmi_status
+    ! local
+    real(DP), dimension(:), pointer, contiguous :: arrayptr
+    integer(I4B) :: i
+    
+    call get_flat_ptr_double(c_var_name, arrayptr, count, inds, bmi_status)
+    if (bmi_status /= BMI_SUCCESS) return
+    
+    do i = 1, count
+      arrayptr(inds(i) + 1) = values(i)
+    end do
+    
+  end function set_value_at_indices_double
+  
+  ! copy the values of the given integer variable at the zero-based
+  ! (flattened, C-style) indices into the array values
+  function get_value_at_indices_int(c_var_name, values, inds, count) result(bmi_status) &
+    bind(C, name="get_value_at_indices_int")
+  !DEC$ ATTRIBUTES DLLEXPORT :: get_value_at_indices_int
+    character (kind=c_char), intent(in) :: c_var_name(*)
+    integer(kind=c_int), intent(inout) :: values(*)
+    integer(kind=c_int), intent(in) :: inds(*)
+    integer(kind=c_int), intent(in) :: count
+    integer(kind=c_int) :: bmi_status
+    ! local
+    integer(I4B), dimension(:), pointer, contiguous :: arrayptr
+    integer(I4B) :: i
+    
+    call get_flat_ptr_int(c_var_name, arrayptr, count, inds, bmi_status)
+    if (bmi_status /= BMI_SUCCESS) return
+    
+    do i = 1, count
+      values(i) = arrayptr(inds(i) + 1)
+    end do
+    
+  end function get_value_at_indices_int
+  
+  ! set the values of the given integer variable at the zero-based
+  ! (flattened, C-style) indices from the array values
+  function set_value_at_indices_int(c_var_name, inds, count, values) result(bmi_status) &
+    bind(C, name="set_value_at_indices_int")
+  !DEC$ ATTRIBUTES DLLEXPORT :: set_value_at_indices_int
+    character (kind=c_char), intent(in) :: c_var_name(*)
+    integer(kind=c_int), intent(in) :: inds(*)
+    integer(kind=c_int), intent(in) :: count
+    integer(kind=c_int), intent(in) :: values(*)
+    integer(kind=c_int) :: bmi_status
+    ! local
+    integer(I4B), dimension(:), pointer, contiguous :: arrayptr
+    integer(I4B) :: i
+    
+    call get_flat_ptr_int(c_var_name, arrayptr, count, inds, bmi_status)
+    if (bmi_status /= BMI_SUCCESS) return
+    
+    do i = 1, count
+      arrayptr(inds(i) + 1) = values(i)
+    end do
+    
+  end function set_value_at_indices_int
   
   function get_var_type(c_var_name, c_var_type) result(bmi_status) bind(C, name="get_var_type")
   !DEC$ ATTRIBUTES DLLEXPORT :: get_var_type
@@ -525,9 +619,9 @@ module mf6bmi
     integer, dimension(:), pointer, contiguous :: grid_shape_ptr
     character(len=LENMODELNAME) :: model_name
     character(kind=c_char) :: grid_type(MAXSTRLEN)
-    real(DP), dimension(:,:), pointer, contiguous :: vertices_ptr
     character(len=MAXSTRLEN) :: grid_type_f
     integer(I4B) :: x_size
+    type(BmiGridType), pointer :: grid
     
     bmi_status = BMI_FAILURE
     ! make sure function is only used for implemented grid_types
@@ -542,10 +636,9 @@ module mf6bmi
       x_size = grid_shape_ptr(size(grid_shape_ptr)) + 1
       grid_x(1:x_size) = [ (i, i=0,x_size-1) ]
     else if (grid_type_f == "unstructured") then
-      call mem_setptr(vertices_ptr, "VERTICES", create_mem_path(model_name, 'DIS'))
-      ! x-coordinates are in the 1st column
-      x_size = size(vertices_ptr(1, :))
-      grid_x(1:x_size) = vertices_ptr(1, :)
+      call get_bmi_grid(model_name, grid)
+      if (.not. associated(grid)) return
+      grid_x(1:grid%nnodes) = grid%x
     else
       bmi_status = BMI_FAILURE
       return
@@ -564,9 +657,9 @@ module mf6bmi
     integer, dimension(:), pointer, contiguous :: grid_shape_ptr
     character(len=LENMODELNAME) :: model_name
     character(kind=c_char) :: grid_type(MAXSTRLEN)
-    real(DP), dimension(:,:), pointer, contiguous :: vertices_ptr
     character(len=MAXSTRLEN) :: grid_type_f
     integer(I4B) :: y_size
+    type(BmiGridType), pointer :: grid
     
     bmi_status = BMI_FAILURE
     ! make sure function is only used for implemented grid_types
@@ -578,19 +671,57 @@ module mf6bmi
       call mem_setptr(grid_shape_ptr, "MSHAPE", create_mem_path(model_name, 'DIS'))
       ! The dimension of y is in the second last element of the shape array.
       ! + 1 because we count corners, not centers.
-      y_size = grid_shape_ptr(size(grid_shape_ptr-1)) + 1
+      y_size = grid_shape_ptr(size(grid_shape_ptr)-1) + 1
       grid_y(1:y_size) = [ (i, i=y_size-1,0,-1) ]
     else if (grid_type_f == "unstructured") then
-      call mem_setptr(vertices_ptr, "VERTICES", create_mem_path(model_name, 'DIS'))
-      ! y-coordinates are in the 2nd column
-      y_size = size(vertices_ptr(2, :))
-      grid_y(1:y_size) = vertices_ptr(2, :)
+      call get_bmi_grid(model_name, grid)
+      if (.not. associated(grid)) return
+      grid_y(1:grid%nnodes) = grid%y
     else
       bmi_status = BMI_FAILURE
       return
     end if
     bmi_status = BMI_SUCCESS
   end function get_grid_y
+  
+  ! Provides an array (whose length is the number of layers) that gives the z-coordinate for each layer.
+  ! For unstructured grids, this is the highest top of the cells that share the node.
+  function get_grid_z(grid_id, grid_z) result(bmi_status) bind(C, name="get_grid_z")
+  !DEC$ ATTRIBUTES DLLEXPORT :: get_grid_z
+    integer(kind=c_int), intent(in) :: grid_id
+    real(kind=c_double), intent(out) :: grid_z(*)
+    integer(kind=c_int) :: bmi_status
+    ! local
+    integer(I4B) :: i
+    integer, dimension(:), pointer, contiguous :: grid_shape_ptr
+    character(len=LENMODELNAME) :: model_name
+    character(kind=c_char) :: grid_type(MAXSTRLEN)
+    character(len=MAXSTRLEN) :: grid_type_f
+    integer(I4B) :: z_size
+    type(BmiGridType), pointer :: grid
+    
+    bmi_status = BMI_FAILURE
+    ! make sure function is only used for implemented grid_types
+    if (get_grid_type(grid_id, grid_type) /= BMI_SUCCESS) return
+    grid_type_f = char_array_to_string(grid_type, strlen(grid_type))
+    
+    model_name = get_model_name(grid_id)
+    if (grid_type_f == "rectilinear") then      
+      call mem_setptr(grid_shape_ptr, "MSHAPE", create_mem_path(model_name, 'DIS'))
+      ! The number of layers is in the first element of the shape array.
+      ! + 1 because we count layer interfaces, not centers.
+      z_size = grid_shape_ptr(1) + 1
+      grid_z(1:z_size) = [ (i, i=z_size-1,0,-1) ]
+    else if (grid_type_f == "unstructured") then
+      call get_bmi_grid(model_name, grid)
+      if (.not. associated(grid)) return
+      grid_z(1:grid%nnodes) = grid%z
+    else
+      bmi_status = BMI_FAILURE
+      return
+    end if
+    bmi_status = BMI_SUCCESS
+  end function get_grid_z
     
   ! NOTE: node in BMI-terms is a vertex in Modflow terms
   ! Get the number of nodes in an unstructured grid.
@@ -600,64 +731,88 @@ module mf6bmi
     integer(kind=c_int), intent(out) :: count
     integer(kind=c_int) :: bmi_status
     ! local
-    character(len=LENMODELNAME) :: model_name
-    integer(I4B), pointer :: nvert_ptr
+    type(BmiGridType), pointer :: grid
     
-    ! make sure function is only used for unstructured grids
     bmi_status = BMI_FAILURE
-    if (.not. confirm_grid_type(grid_id, "unstructured")) return   
-    
-    model_name = get_model_name(grid_id)
-    call mem_setptr(nvert_ptr, "NVERT", create_mem_path(model_name, 'DIS'))
-    count = nvert_ptr
+    if (.not. get_unstructured_grid(grid_id, grid)) return
+    count = grid%nnodes
     bmi_status = BMI_SUCCESS  
   end function get_grid_node_count
   
-  ! TODO_JH: This is a simplified implementation which ignores vertical face
+  ! Get the number of edges in an unstructured grid.
+  function get_grid_edge_count(grid_id, count) result(bmi_status) bind(C, name="get_grid_edge_count")
+  !DEC$ ATTRIBUTES DLLEXPORT :: get_grid_edge_count
+    integer(kind=c_int), intent(in) :: grid_id
+    integer(kind=c_int), intent(out) :: count
+    integer(kind=c_int) :: bmi_status
+    ! local
+    type(BmiGridType), pointer :: grid
+    
+    bmi_status = BMI_FAILURE
+    if (.not. get_unstructured_grid(grid_id, grid)) return
+    count = grid%nedges
+    bmi_status = BMI_SUCCESS
+  end function get_grid_edge_count
+  
+  ! NOTE: face in BMI-terms is a cell in Modflow terms, the vertical 
+  ! faces of the cells are not counted
   ! Get the number of faces in an unstructured grid.
   function get_grid_face_count(grid_id, count) result(bmi_status) bind(C, name="get_grid_face_count")
   !DEC$ ATTRIBUTES DLLEXPORT :: get_grid_face_count
-    use ListsModule, only: basemodellist
-    use NumericalModelModule, only: NumericalModelType, GetNumericalModelFromList
     integer(kind=c_int), intent(in) :: grid_id
     integer(kind=c_int), intent(out) :: count
     integer(kind=c_int) :: bmi_status
     ! local
-    character(len=LENMODELNAME) :: model_name
-    integer(I4B) :: i
-    class(NumericalModelType), pointer :: numericalModel
+    type(BmiGridType), pointer :: grid
     
-    ! make sure function is only used for unstructured grids
     bmi_status = BMI_FAILURE
-    if (.not. confirm_grid_type(grid_id, "unstructured")) return
-    
-    model_name = get_model_name(grid_id)    
-    do i = 1,basemodellist%Count()
-      numericalModel => GetNumericalModelFromList(basemodellist, i)
-      if (numericalModel%name == model_name) then
-        count = numericalModel%dis%nodes 
-      end if
-    end do  
+    if (.not. get_unstructured_grid(grid_id, grid)) return
+    count = grid%nfaces
     bmi_status = BMI_SUCCESS  
   end function get_grid_face_count
   
+  ! Get the edge-node connectivity.
+  function get_grid_edge_nodes(grid_id, edge_nodes) result(bmi_status) bind(C, name="get_grid_edge_nodes")
+  !DEC$ ATTRIBUTES DLLEXPORT :: get_grid_edge_nodes
+    integer(kind=c_int), intent(in) :: grid_id
+    integer(kind=c_int), intent(out) :: edge_nodes(*)
+    integer(kind=c_int) :: bmi_status
+    ! local
+    type(BmiGridType), pointer :: grid
+    
+    bmi_status = BMI_FAILURE
+    if (.not. get_unstructured_grid(grid_id, grid)) return
+    edge_nodes(1:size(grid%edge_nodes)) = grid%edge_nodes
+    bmi_status = BMI_SUCCESS
+  end function get_grid_edge_nodes
+  
+  ! Get the face-edge connectivity.
+  function get_grid_face_edges(grid_id, face_edges) result(bmi_status) bind(C, name="get_grid_face_edges")
+  !DEC$ ATTRIBUTES DLLEXPORT :: get_grid_face_edges
+    integer(kind=c_int), intent(in) :: grid_id
+    integer(kind=c_int), intent(out) :: face_edges(*)
+    integer(kind=c_int) :: bmi_status
+    ! local
+    type(BmiGridType), pointer :: grid
+    
+    bmi_status = BMI_FAILURE
+    if (.not. get_unstructured_grid(grid_id, grid)) return
+    face_edges(1:size(grid%face_edges)) = grid%face_edges
+    bmi_status = BMI_SUCCESS
+  end function get_grid_face_edges
+  
   ! Get the face-node connectivity.
   function get_grid_face_nodes(grid_id, face_nodes) result(bmi_status) bind(C, name="get_grid_face_nodes")
   !DEC$ ATTRIBUTES DLLEXPORT :: get_grid_face_nodes
     integer(kind=c_int), intent(in) :: grid_id
-    type(c_ptr), intent(out) :: face_nodes
+    integer(kind=c_int), intent(out) :: face_nodes(*)
     integer(kind=c_int) :: bmi_status
     ! local
-    character(len=LENMODELNAME) :: model_name
-    integer, dimension(:), pointer, contiguous :: javert_ptr
+    type(BmiGridType), pointer :: grid
     
-    ! make sure function is only used for unstructured grids
     bmi_status = BMI_FAILURE
-    if (.not. confirm_grid_type(grid_id, "unstructured")) return
-    
-    model_name = get_model_name(grid_id)
-    call mem_setptr(javert_ptr, "JAVERT", create_mem_path(model_name, 'DIS'))
-    face_nodes = c_loc(javert_ptr)
+    if (.not. get_unstructured_grid(grid_id, grid)) return
+    face_nodes(1:size(grid%face_nodes)) = grid%face_nodes
     bmi_status = BMI_SUCCESS
   end function get_grid_face_nodes
   
@@ -665,25 +820,97 @@ module mf6bmi
   function get_grid_nodes_per_face(grid_id, nodes_per_face) result(bmi_status) bind(C, name="get_grid_nodes_per_face")
   !DEC$ ATTRIBUTES DLLEXPORT :: get_grid_nodes_per_face
     integer(kind=c_int), intent(in) :: grid_id
-    real(kind=c_double), intent(out) :: nodes_per_face(*)
+    integer(kind=c_int), intent(out) :: nodes_per_face(*)
     integer(kind=c_int) :: bmi_status
     ! local
-    integer(I4B) :: i
-    character(len=LENMODELNAME) :: model_name
-    integer, dimension(:), pointer, contiguous :: iavert_ptr
+    type(BmiGridType), pointer :: grid
     
-    ! make sure function is only used for unstructured grids
     bmi_status = BMI_FAILURE
-    if (.not. confirm_grid_type(grid_id, "unstructured")) return
+    if (.not. get_unstructured_grid(grid_id, grid)) return
+    nodes_per_face(1:grid%nfaces) = grid%nodes_per_face
+    bmi_status = BMI_SUCCESS
+  end function get_grid_nodes_per_face
+  
+  ! Get the offset of the nodes of each face in the face-node connectivity,
+  ! the nodes of face i are face_nodes(offset(i):offset(i+1)-1) (zero-based).
+  ! The offset array has face_count + 1 elements.
+  function get_grid_offset(grid_id, offset) result(bmi_status) bind(C, name="get_grid_offset")
+  !DEC$ ATTRIBUTES DLLEXPORT :: get_grid_offset
+    integer(kind=c_int), intent(in) :: grid_id
+    integer(kind=c_int), intent(out) :: offset(*)
+    integer(kind=c_int) :: bmi_status
+    ! local
+    type(BmiGridType), pointer :: grid
     
-    model_name = get_model_name(grid_id)
-    call mem_setptr(iavert_ptr, "IAVERT", create_mem_path(model_name, 'DIS'))
+    bmi_status = BMI_FAILURE
+    if (.not. get_unstructured_grid(grid_id, grid)) return
+    offset(1:grid%nfaces+1) = grid%face_offset
+    bmi_status = BMI_SUCCESS
+  end function get_grid_offset
+  
+  ! Get a pointer to an array of the unstructured grid, so it can be used
+  ! without copying it. The arrays are X, Y, and Z (node_count elements).
+  ! The pointer is valid until finalize.
+  function get_grid_ptr_double(grid_id, c_arr_name, x) result(bmi_status) bind(C, name="get_grid_ptr_double")
+  !DEC$ ATTRIBUTES DLLEXPORT :: get_grid_ptr_double
+    integer(kind=c_int), intent(in) :: grid_id
+    character(kind=c_char), intent(in) :: c_arr_name(*)
+    type(c_ptr), intent(inout) :: x
+    integer(kind=c_int) :: bmi_status
+    ! local
+    character(len=LENVARNAME) :: arr_name
+    type(BmiGridType), pointer :: grid
     
-    do i = 1, size(iavert_ptr)-1
-      nodes_per_face(i) = iavert_ptr(i+1) - iavert_ptr(i) - 1
-    end do
+    bmi_status = BMI_FAILURE
+    if (.not. get_unstructured_grid(grid_id, grid)) return
+    arr_name = char_array_to_string(c_arr_name, strlen(c_arr_name))
+    select case (arr_name)
+    case ('X')
+      x = c_loc(grid%x)
+    case ('Y')
+      x = c_loc(grid%y)
+    case ('Z')
+      x = c_loc(grid%z)
+    case default
+      return
+    end select
     bmi_status = BMI_SUCCESS
-  end function get_grid_nodes_per_face
+  end function get_grid_ptr_double
+  
+  ! Get a pointer to an integer array of the unstructured grid, so it can be 
+  ! used without copying it. The arrays are NODES_PER_FACE (face_count), 
+  ! FACE_OFFSET (face_count + 1), FACE_NODES and FACE_EDGES (sum of 
+  ! nodes_per_face), and EDGE_NODES (2 * edge_count elements). The pointer 
+  ! is valid until finalize.
+  function get_grid_ptr_int(grid_id, c_arr_name, x) result(bmi_status) bind(C, name="get_grid_ptr_int")
+  !DEC$ ATTRIBUTES DLLEXPORT :: get_grid_ptr_int
+    integer(kind=c_int), intent(in) :: grid_id
+    character(kind=c_char), intent(in) :: c_arr_name(*)
+    type(c_ptr), intent(inout) :: x
+    integer(kind=c_int) :: bmi_status
+    ! local
+    character(len=LENVARNAME) :: arr_name
+    type(BmiGridType), pointer :: grid
+    
+    bmi_status = BMI_FAILURE
+    if (.not. get_unstructured_grid(grid_id, grid)) return
+    arr_name = char_array_to_string(c_arr_name, strlen(c_arr_name))
+    select case (arr_name)
+    case ('NODES_PER_FACE')
+      x = c_loc(grid%nodes_per_face)
+    case ('FACE_OFFSET')
+      x = c_loc(grid%face_offset)
+    case ('FACE_NODES')
+      x = c_loc(grid%face_nodes)
+    case ('FACE_EDGES')
+      x = c_loc(grid%face_edges)
+    case ('EDGE_NODES')
+      x = c_loc(grid%edge_nodes)
+    case default
+      return
+    end select
+    bmi_status = BMI_SUCCESS
+  end function get_grid_ptr_int
   
   ! -----------------------------------------------------------------------
   ! convenience functions follow here, TODO_MJR: move to dedicated module?
@@ -721,6 +948,120 @@ module mf6bmi
     
   end function confirm_grid_type
   
+  ! Helper function to get the unstructured grid for a grid id, returns 
+  ! false if the grid is not unstructured or does not have vertices
+  function get_unstructured_grid(grid_id, grid) result(is_valid)
+    integer(kind=c_int), intent(in) :: grid_id
+    type(BmiGridType), pointer, intent(inout) :: grid
+    logical :: is_valid
+    ! local
+    character(len=LENMODELNAME) :: model_name
+    character(len=MAXSTRLEN) :: grid_type_f
+    
+    is_valid = .false.
+    grid => null()
+    model_name = get_model_name(grid_id)
+    call get_grid_type_model(model_name, grid_type_f)
+    if (grid_type_f /= "unstructured") return
+    
+    call get_bmi_grid(model_name, grid)
+    is_valid = associated(grid)
+    
+  end function get_unstructured_grid
+  
+  ! internal helper to set a rank-1 pointer to the memory of a double
+  ! variable of rank 0, 1, or 2 and check the zero-based indices
+  subroutine get_flat_ptr_double(c_var_name, arrayptr, count, inds, bmi_status)
+    use iso_c_binding, only: c_f_pointer
+    character (kind=c_char), intent(in) :: c_var_name(*)
+    real(DP), dimension(:), pointer, contiguous, intent(inout) :: arrayptr
+    integer(kind=c_int), intent(in) :: count
+    integer(kind=c_int), intent(in) :: inds(*)
+    integer(kind=c_int), intent(out) :: bmi_status
+    ! local
+    character(len=LENMEMPATH) :: memPath
+    character(len=LENVARNAME) :: var_name_only
+    real(DP), pointer :: dblptr
+    real(DP), dimension(:,:), pointer, contiguous :: arrayptr2D
+    integer(I4B) :: rank
+    
+    bmi_status = BMI_FAILURE
+    call split_c_var_name(c_var_name, memPath, var_name_only)
+    
+    rank = -1
+    call get_mem_rank(var_name_only, memPath, rank)
+    if (rank == 0) then
+      call mem_setptr(dblptr, var_name_only, memPath)
+      call c_f_pointer(c_loc(dblptr), arrayptr, (/1/))
+    else if (rank == 1) then
+      call mem_setptr(arrayptr, var_name_only, memPath)
+    else if (rank == 2) then
+      call mem_setptr(arrayptr2D, var_name_only, memPath)
+      call c_f_pointer(c_loc(arrayptr2D), arrayptr, (/size(arrayptr2D)/))
+    else
+      return
+    end if
+    
+    if (valid_indices(inds, count, size(arrayptr))) bmi_status = BMI_SUCCESS
+    
+  end subroutine get_flat_ptr_double
+  
+  ! internal helper to set a rank-1 pointer to the memory of an integer
+  ! variable of rank 0, 1, or 2 and check the zero-based indices
+  subroutine get_flat_ptr_int(c_var_name, arrayptr, count, inds, bmi_status)
+    use iso_c_binding, only: c_f_pointer
+    character (kind=c_char), intent(in) :: c_var_name(*)
+    integer(I4B), dimension(:), pointer, contiguous, intent(inout) :: arrayptr
+    integer(kind=c_int), intent(in) :: count
+    integer(kind=c_int), intent(in) :: inds(*)
+    integer(kind=c_int), intent(out) :: bmi_status
+    ! local
+    character(len=LENMEMPATH) :: memPath
+    character(len=LENVARNAME) :: var_name_only
+    integer(I4B), pointer :: scalarptr
+    integer(I4B), dimension(:,:), pointer, contiguous :: arrayptr2D
+    integer(I4B) :: rank
+    
+    bmi_status = BMI_FAILURE
+    call split_c_var_name(c_var_name, memPath, var_name_only)
+    
+    rank = -1
+    call get_mem_rank(var_name_only, memPath, rank)
+    if (rank == 0) then
+      call mem_setptr(scalarptr, var_name_only, memPath)
+      call c_f_pointer(c_loc(scalarptr), arrayptr, (/1/))
+    else if (rank == 1) then
+      call mem_setptr(arrayptr, var_name_only, memPath)
+    else if (rank == 2) then
+      call mem_setptr(arrayptr2D, var_name_only, memPath)
+      call c_f_pointer(c_loc(arrayptr2D), arrayptr, (/size(arrayptr2D)/))
+    else
+      return
+    end if
+    
+    if (valid_indices(inds, count, size(arrayptr))) bmi_status = BMI_SUCCESS
+    
+  end subroutine get_flat_ptr_int
+  
+  ! check that all zero-based indices are in the range [0, nsize)
+  pure function valid_indices(inds, count, nsize) result(is_valid)
+    integer(kind=c_int), intent(in) :: inds(*)
+    integer(kind=c_int), intent(in) :: count
+    integer(I4B), intent(in) :: nsize
+    logical :: is_valid
+    ! local
+    integer(I4B) :: i
+    
+    is_valid = (count >= 0)
+    do i = 1, count
+      if (inds(i) < 0 .or. inds(i) >= nsize) then
+        is_valid = .false.
+        exit
+      end if
+    end do
+    
+  end function valid_indices
+  
   ! splits the variable name from the full address string into
   ! an origin and name as used by the memory manager
   subroutine split_c_var_name(c_var_name, memPath, var_name_only)
@@ -0,0 +1,329 @@
+! Module description:
+!
+! This module holds the unstructured grid geometry that is returned by the
+! BMI grid functions for models with a DISV or DISU discretization. The
+! grid is built from the discretization when it is requested for the first
+! time and is kept until finalize, so the arrays can also be exposed as
+! pointers without copying them.
+!
+! The faces of the grid are the (reduced) model cells, so a face has the
+! same index as the cell in the model arrays (e.g. the head X). The nodes
+! are the vertices of the discretization, they are shared by all layers.
+! The z-coordinate of a node is the highest top of the cells that use it.
+! All node, edge, and face indices are zero-based.
+module mf6bmiGrid
+  use KindModule, only: DP, I4B
+  use ConstantsModule, only: LENMODELNAME, LINELENGTH, DNODATA
+  implicit none
+  private
+  public :: BmiGridType, get_bmi_grid, bmi_grid_da
+
+  type :: BmiGridType
+    character(len=LENMODELNAME) :: model_name = ''
+    integer(I4B) :: nnodes = 0                                                   ! number of nodes (vertices)
+    integer(I4B) :: nedges = 0                                                   ! number of unique edges
+    integer(I4B) :: nfaces = 0                                                   ! number of faces (cells)
+    real(DP), dimension(:), pointer, contiguous :: x => null()                   ! x-coordinate of the nodes
+    real(DP), dimension(:), pointer, contiguous :: y => null()                   ! y-coordinate of the nodes
+    real(DP), dimension(:), pointer, contiguous :: z => null()                   ! z-coordinate of the nodes
+    integer(I4B), dimension(:), pointer, contiguous :: nodes_per_face => null()  ! number of nodes of each face
+    integer(I4B), dimension(:), pointer, contiguous :: face_offset => null()     ! offset of the nodes of each face (nfaces + 1)
+    integer(I4B), dimension(:), pointer, contiguous :: face_nodes => null()      ! nodes of the faces
+    integer(I4B), dimension(:), pointer, contiguous :: face_edges => null()      ! edges of the faces
+    integer(I4B), dimension(:), pointer, contiguous :: edge_nodes => null()      ! the two nodes of each edge
+  end type BmiGridType
+
+  ! -- grids that have been built
+  type(BmiGridType), dimension(:), pointer :: grids => null()
+
+  contains
+
+  ! return a pointer to the grid for a DISV or DISU model, the grid is built
+  ! if it does not exist yet. The pointer is not associated if the model
+  ! does not have an unstructured grid with vertices.
+  subroutine get_bmi_grid(model_name, grid)
+    character(len=*), intent(in) :: model_name
+    type(BmiGridType), pointer, intent(inout) :: grid
+    ! local
+    type(BmiGridType) :: newgrid
+    type(BmiGridType), dimension(:), pointer :: tmp
+    integer(I4B) :: i
+    integer(I4B) :: n
+
+    grid => null()
+    n = 0
+    if (associated(grids)) then
+      n = size(grids)
+      do i = 1, n
+        if (grids(i)%model_name == model_name) then
+          grid => grids(i)
+          return
+        end if
+      end do
+    end if
+
+    ! build the grid and add it to the list, the arrays of the grids are
+    ! pointers so they do not move when the list is reallocated
+    if (.not. build_grid(model_name, newgrid)) then
+      call grid_da(newgrid)
+      return
+    end if
+    allocate(tmp(n + 1))
+    if (n > 0) then
+      tmp(1:n) = grids
+      deallocate(grids)
+    end if
+    tmp(n + 1) = newgrid
+    grids => tmp
+    grid => grids(n + 1)
+
+  end subroutine get_bmi_grid
+
+  ! deallocate all grids, should be called before the memory of the
+  ! models is deallocated
+  subroutine bmi_grid_da()
+    integer(I4B) :: i
+
+    if (.not. associated(grids)) return
+    do i = 1, size(grids)
+      call grid_da(grids(i))
+    end do
+    deallocate(grids)
+
+  end subroutine bmi_grid_da
+
+  ! build the grid from the discretization of the model, returns false when
+  ! the model does not exist or does not have an unstructured grid with
+  ! vertices
+  function build_grid(model_name, grid) result(success)
+    use ListsModule, only: basemodellist
+    use NumericalModelModule, only: NumericalModelType, GetNumericalModelFromList
+    use BaseDisModule, only: DisBaseType
+    use MemoryManagerModule, only: mem_setptr
+    character(len=*), intent(in) :: model_name
+    type(BmiGridType), intent(inout) :: grid
+    logical :: success
+    ! local
+    class(NumericalModelType), pointer :: numericalModel
+    class(DisBaseType), pointer :: dis
+    character(len=LINELENGTH) :: dis_type
+    integer(I4B), pointer :: nvert
+    integer(I4B), pointer :: ncpl
+    real(DP), dimension(:,:), pointer, contiguous :: vertices
+    integer(I4B), dimension(:), pointer, contiguous :: iavert
+    integer(I4B), dimension(:), pointer, contiguous :: javert
+    integer(I4B), dimension(:), allocatable :: icell2d
+    integer(I4B) :: i
+    integer(I4B) :: j
+    integer(I4B) :: n
+    integer(I4B) :: ivert
+    integer(I4B) :: nodeu
+    integer(I4B) :: nfacenodes
+
+    success = .false.
+    dis => null()
+    do i = 1, basemodellist%Count()
+      numericalModel => GetNumericalModelFromList(basemodellist, i)
+      if (numericalModel%name == model_name) then
+        dis => numericalModel%dis
+        exit
+      end if
+    end do
+    if (.not. associated(dis)) return
+
+    ! vertices are optional for a DISU grid
+    call dis%get_dis_type(dis_type)
+    if (dis_type /= 'DISV' .and. dis_type /= 'DISU') return
+    call mem_setptr(nvert, 'NVERT', dis%memoryPath)
+    if (nvert < 1) return
+    call mem_setptr(vertices, 'VERTICES', dis%memoryPath)
+    call mem_setptr(iavert, 'IAVERT', dis%memoryPath)
+    call mem_setptr(javert, 'JAVERT', dis%memoryPath)
+
+    ! the cell in the vertex arrays for each face, the cells of all layers
+    ! of a DISV grid share the same vertices
+    grid%model_name = model_name
+    grid%nnodes = nvert
+    grid%nfaces = dis%nodes
+    allocate(icell2d(grid%nfaces))
+    if (dis_type == 'DISV') then
+      call mem_setptr(ncpl, 'NCPL', dis%memoryPath)
+    end if
+    do n = 1, grid%nfaces
+      nodeu = dis%get_nodeuser(n)
+      if (dis_type == 'DISV') then
+        icell2d(n) = mod(nodeu - 1, ncpl) + 1
+      else
+        icell2d(n) = nodeu
+      end if
+    end do
+
+    ! node coordinates
+    allocate(grid%x(grid%nnodes))
+    allocate(grid%y(grid%nnodes))
+    allocate(grid%z(grid%nnodes))
+    do i = 1, grid%nnodes
+      grid%x(i) = vertices(1, i)
+      grid%y(i) = vertices(2, i)
+    end do
+
+    ! the cell polygons are closed, so the last vertex is not a node
+    ! of the face
+    allocate(grid%nodes_per_face(grid%nfaces))
+    allocate(grid%face_offset(grid%nfaces + 1))
+    grid%face_offset(1) = 0
+    do n = 1, grid%nfaces
+      i = icell2d(n)
+      grid%nodes_per_face(n) = iavert(i + 1) - iavert(i) - 1
+      grid%face_offset(n + 1) = grid%face_offset(n) + grid%nodes_per_face(n)
+    end do
+    nfacenodes = grid%face_offset(grid%nfaces + 1)
+    allocate(grid%face_nodes(nfacenodes))
+    grid%z(:) = -DNODATA
+    do n = 1, grid%nfaces
+      do j = 1, grid%nodes_per_face(n)
+        ivert = javert(iavert(icell2d(n)) + j - 1)
+        grid%face_nodes(grid%face_offset(n) + j) = ivert - 1
+        grid%z(ivert) = max(grid%z(ivert), dis%top(n))
+      end do
+    end do
+
+    ! nodes that are not used by an active cell
+    do i = 1, grid%nnodes
+      if (grid%z(i) == -DNODATA) grid%z(i) = DNODATA
+    end do
+
+    call build_edges(grid)
+    deallocate(icell2d)
+    success = .true.
+
+  end function build_grid
+
+  ! find the unique edges of the faces. Edge j of a face connects node j
+  ! and node j + 1 (and the last node to the first node) of the face. The
+  ! edges are collected at their lowest node, so duplicates can be found
+  ! by looking at the edges of one node at a time.
+  subroutine build_edges(grid)
+    type(BmiGridType), intent(inout) :: grid
+    ! local
+    integer(I4B), dimension(:), allocatable :: iaedge
+    integer(I4B), dimension(:), allocatable :: jaedge
+    integer(I4B), dimension(:), allocatable :: iedge
+    integer(I4B), dimension(:), allocatable :: ipos
+    integer(I4B), dimension(:), allocatable :: imark
+    integer(I4B), dimension(:), allocatable :: edge_nodes
+    integer(I4B) :: nfacenodes
+    integer(I4B) :: n
+    integer(I4B) :: j
+    integer(I4B) :: k
+    integer(I4B) :: i1
+    integer(I4B) :: i2
+    integer(I4B) :: ilo
+    integer(I4B) :: ihi
+
+    nfacenodes = size(grid%face_nodes)
+    allocate(iaedge(grid%nnodes + 1))
+    allocate(jaedge(nfacenodes))
+    allocate(iedge(nfacenodes))
+    allocate(ipos(nfacenodes))
+    allocate(imark(grid%nnodes))
+    allocate(edge_nodes(2 * nfacenodes))
+
+    ! count the face edges at their lowest node
+    iaedge(:) = 0
+    do n = 1, grid%nfaces
+      do j = 1, grid%nodes_per_face(n)
+        call get_face_edge(grid, n, j, ilo, ihi)
+        iaedge(ilo + 1) = iaedge(ilo + 1) + 1
+      end do
+    end do
+    iaedge(1) = 1
+    do i1 = 2, grid%nnodes + 1
+      iaedge(i1) = iaedge(i1) + iaedge(i1 - 1)
+    end do
+
+    ! fill the highest node of the face edges, ipos is the position of
+    ! the edge of the face node in jaedge
+    imark(:) = 0
+    do n = 1, grid%nfaces
+      do j = 1, grid%nodes_per_face(n)
+        call get_face_edge(grid, n, j, ilo, ihi)
+        k = grid%face_offset(n) + j
+        ipos(k) = iaedge(ilo) + imark(ilo)
+        jaedge(ipos(k)) = ihi
+        imark(ilo) = imark(ilo) + 1
+      end do
+    end do
+
+    ! number the unique edges
+    imark(:) = 0
+    grid%nedges = 0
+    do ilo = 1, grid%nnodes
+      do i1 = iaedge(ilo), iaedge(ilo + 1) - 1
+        ihi = jaedge(i1)
+        if (imark(ihi) == 0) then
+          grid%nedges = grid%nedges + 1
+          imark(ihi) = grid%nedges
+          edge_nodes(2 * grid%nedges - 1) = ilo - 1
+          edge_nodes(2 * grid%nedges) = ihi - 1
+        end if
+        iedge(i1) = imark(ihi)
+      end do
+      do i1 = iaedge(ilo), iaedge(ilo + 1) - 1
+        imark(jaedge(i1)) = 0
+      end do
+    end do
+
+    allocate(grid%edge_nodes(2 * grid%nedges))
+    grid%edge_nodes(:) = edge_nodes(1:2 * grid%nedges)
+    allocate(grid%face_edges(nfacenodes))
+    do i2 = 1, nfacenodes
+      grid%face_edges(i2) = iedge(ipos(i2)) - 1
+    end do
+
+    deallocate(iaedge, jaedge, iedge, ipos, imark, edge_nodes)
+
+  end subroutine build_edges
+
+  ! return the lowest and highest (one-based) node of edge j of face n
+  subroutine get_face_edge(grid, n, j, ilo, ihi)
+    type(BmiGridType), intent(in) :: grid
+    integer(I4B), intent(in) :: n
+    integer(I4B), intent(in) :: j
+    integer(I4B), intent(out) :: ilo
+    integer(I4B), intent(out) :: ihi
+    ! local
+    integer(I4B) :: i1
+    integer(I4B) :: i2
+
+    i1 = grid%face_nodes(grid%face_offset(n) + j) + 1
+    if (j < grid%nodes_per_face(n)) then
+      i2 = grid%face_nodes(grid%face_offset(n) + j + 1) + 1
+    else
+      i2 = grid%face_nodes(grid%face_offset(n) + 1) + 1
+    end if
+    ilo = min(i1, i2)
+    ihi = max(i1, i2)
+
+  end subroutine get_face_edge
+
+  ! deallocate the arrays of a grid
+  subroutine grid_da(grid)
+    type(BmiGridType), intent(inout) :: grid
+
+    if (associated(grid%x)) deallocate(grid%x)
+    if (associated(grid%y)) deallocate(grid%y)
+    if (associated(grid%z)) deallocate(grid%z)
+    if (associated(grid%nodes_per_face)) deallocate(grid%nodes_per_face)
+    if (associated(grid%face_offset)) deallocate(grid%face_offset)
+    if (associated(grid%face_nodes)) deallocate(grid%face_nodes)
+    if (associated(grid%face_edges)) deallocate(grid%face_edges)
+    if (associated(grid%edge_nodes)) deallocate(grid%edge_nodes)
+    grid%model_name = ''
+    grid%nnodes = 0
+    grid%nedges = 0
+    grid%nfaces = 0
+
+  end subroutine grid_da
+
+end module mf6bmiGrid
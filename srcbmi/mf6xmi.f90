@@ -3,6 +3,7 @@
 module mf6xmi
   use Mf6CoreModule
   use KindModule
+  use ConstantsModule, only: LINELENGTH
   use bmif, only: BMI_SUCCESS, BMI_FAILURE
   use iso_c_binding, only: c_int
   implicit none
@@ -167,6 +168,251 @@ module mf6xmi
     
   end function xmi_finalize_solve
   
+  ! set the range of file unit numbers that can be assigned to the 
+  ! simulation. This has to be called before initialize. Simulations in 
+  ! separate copies of the library that are loaded in the same process 
+  ! share the file units of the Fortran runtime library, so each 
+  ! simulation should be given a range that does not overlap the range of
+  ! the other simulations. Otherwise a unit that is closed and reassigned
+  ! to another simulation is closed again when the first simulation is 
+  ! finalized.
+  function xmi_set_file_unit_range(first, last) result(bmi_status)            &
+    bind(C, name="set_file_unit_range")
+  !DEC$ ATTRIBUTES DLLEXPORT :: xmi_set_file_unit_range
+    use ConstantsModule, only: IUSTART
+    use SimVariablesModule, only: istdout, iunitfirst, iunitlast, iunext
+    integer(kind=c_int), intent(in) :: first
+    integer(kind=c_int), intent(in) :: last
+    integer(kind=c_int) :: bmi_status
+    
+    if (iunext /= iunitfirst) then
+      write(istdout,*) 'Error: file unit range must be set before initialize'
+      bmi_status = BMI_FAILURE
+      return
+    end if
+    if (first < IUSTART .or. last < first) then
+      write(istdout,*) 'Error: invalid file unit range ', first, last
+      bmi_status = BMI_FAILURE
+      return
+    end if
+    
+    iunitfirst = first
+    iunitlast = last
+    iunext = first
+    bmi_status = BMI_SUCCESS
+    
+  end function xmi_set_file_unit_range
+  
+  ! returns the size (in bytes) of the buffer needed to save the 
+  ! simulation state with save_state_buffer
+  function xmi_get_state_size(nbytes) result(bmi_status) bind(C, name="get_state_size")
+  !DEC$ ATTRIBUTES DLLEXPORT :: xmi_get_state_size
+    use iso_c_binding, only: c_int64_t
+    use MemoryManagerModule, only: mem_state_size
+    integer(kind=c_int64_t), intent(out) :: nbytes
+    integer(kind=c_int) :: bmi_status
+    ! local
+    integer(I8B) :: n
+    
+    call mem_state_size(n)
+    nbytes = n
+    bmi_status = BMI_SUCCESS
+    
+  end function xmi_get_state_size
+  
+  ! save the values of all memory manager variables to a buffer
+  ! of at least get_state_size bytes. The state should be saved after
+  ! finalize_time_step (or before the first prepare_time_step).
+  function xmi_save_state_buffer(buffer, nbytes) result(bmi_status) bind(C, name="save_state_buffer")
+  !DEC$ ATTRIBUTES DLLEXPORT :: xmi_save_state_buffer
+    use iso_c_binding, only: c_int64_t, c_int8_t
+    use MemoryManagerModule, only: mem_state_size, mem_state_save
+    use SimVariablesModule, only: istdout
+    integer(kind=c_int8_t), intent(inout) :: buffer(*)
+    integer(kind=c_int64_t), intent(in) :: nbytes
+    integer(kind=c_int) :: bmi_status
+    ! local
+    integer(I8B) :: n
+    
+    call mem_state_size(n)
+    if (nbytes < n) then
+      write(istdout,*) 'Error: state buffer is smaller than get_state_size'
+      bmi_status = BMI_FAILURE
+      return
+    end if
+    call mem_state_save(buffer(1:n))
+    bmi_status = BMI_SUCCESS
+    
+  end function xmi_save_state_buffer
+  
+  ! restore the values of all memory manager variables from a buffer
+  ! created by save_state_buffer
+  function xmi_restore_state_buffer(buffer, nbytes) result(bmi_status) bind(C, name="restore_state_buffer")
+  !DEC$ ATTRIBUTES DLLEXPORT :: xmi_restore_state_buffer
+    use iso_c_binding, only: c_int64_t, c_int8_t
+    integer(kind=c_int8_t), intent(in) :: buffer(*)
+    integer(kind=c_int64_t), intent(in) :: nbytes
+    integer(kind=c_int) :: bmi_status
+    
+    bmi_status = restore_state(buffer(1:nbytes))
+    
+  end function xmi_restore_state_buffer
+  
+  ! save the values of all memory manager variables to a file
+  function xmi_save_state(c_file_name) result(bmi_status) bind(C, name="save_state")
+  !DEC$ ATTRIBUTES DLLEXPORT :: xmi_save_state
+    use iso_c_binding, only: c_char, c_int8_t
+    use MemoryManagerModule, only: mem_state_size, mem_state_save
+    use InputOutputModule, only: getunit
+    use SimVariablesModule, only: istdout
+    character(kind=c_char), intent(in) :: c_file_name(*)
+    integer(kind=c_int) :: bmi_status
+    ! local
+    character(len=LINELENGTH) :: fname
+    integer(c_int8_t), dimension(:), allocatable :: buf
+    integer(I8B) :: n
+    integer(I4B) :: iu
+    integer(I4B) :: istat
+    
+    bmi_status = BMI_FAILURE
+    fname = c_string_to_string(c_file_name)
+    call mem_state_size(n)
+    allocate(buf(n))
+    call mem_state_save(buf)
+    iu = getunit()
+    open(unit=iu, file=trim(fname), access='stream', form='unformatted',      &
+         action='write', status='replace', iostat=istat)
+    if (istat == 0) then
+      write(iu, iostat=istat) buf
+      close(iu)
+    end if
+    deallocate(buf)
+    if (istat /= 0) then
+      write(istdout,*) 'Error: could not write state file ', trim(fname)
+      return
+    end if
+    bmi_status = BMI_SUCCESS
+    
+  end function xmi_save_state
+  
+  ! restore the values of all memory manager variables from a file
+  ! created by save_state
+  function xmi_restore_state(c_file_name) result(bmi_status) bind(C, name="restore_state")
+  !DEC$ ATTRIBUTES DLLEXPORT :: xmi_restore_state
+    use iso_c_binding, only: c_char, c_int8_t
+    use InputOutputModule, only: getunit
+    use SimVariablesModule, only: istdout
+    character(kind=c_char), intent(in) :: c_file_name(*)
+    integer(kind=c_int) :: bmi_status
+    ! local
+    character(len=LINELENGTH) :: fname
+    integer(c_int8_t), dimension(:), allocatable :: buf
+    integer(I8B) :: n
+    integer(I4B) :: iu
+    integer(I4B) :: istat
+    
+    bmi_status = BMI_FAILURE
+    fname = c_string_to_string(c_file_name)
+    iu = getunit()
+    open(unit=iu, file=trim(fname), access='stream', form='unformatted',      &
+         action='read', status='old', iostat=istat)
+    if (istat == 0) then
+      inquire(unit=iu, size=n)
+      allocate(buf(n))
+      read(iu, iostat=istat) buf
+      close(iu)
+    end if
+    if (istat /= 0) then
+      write(istdout,*) 'Error: could not read state file ', trim(fname)
+      return
+    end if
+    bmi_status = restore_state(buf)
+    deallocate(buf)
+    
+  end function xmi_restore_state
+  
+  ! restore the simulation state from a buffer. Stress period input 
+  ! for the stress periods between the current stress period and the 
+  ! stress period of the saved state is read first so the input files 
+  ! are positioned as they were when the state was saved. A state saved
+  ! in an earlier stress period than the current stress period cannot be
+  ! restored because the input files cannot be rewound. Output files are
+  ! not rewound.
+  function restore_state(buf) result(bmi_status)
+    use iso_c_binding, only: c_int8_t
+    use MemoryManagerModule, only: mem_state_restore, mem_state_get_int
+    use TdisModule, only: kper, kstp, readnewdata
+    use ListsModule, only: basemodellist, baseexchangelist
+    use SimVariablesModule, only: istdout, errmsg
+    use GenericUtilitiesModule, only: sim_message
+    integer(c_int8_t), dimension(:), intent(in) :: buf
+    integer(kind=c_int) :: bmi_status
+    ! local
+    class(BaseModelType), pointer :: mp
+    class(BaseExchangeType), pointer :: ep
+    logical(LGP) :: found
+    integer(I4B) :: kper_state
+    integer(I4B) :: iper
+    integer(I4B) :: im
+    integer(I4B) :: ic
+    integer(I4B) :: ierr
+    
+    bmi_status = BMI_FAILURE
+    
+    call mem_state_get_int(buf, 'KPER', 'TDIS', kper_state, found)
+    if (.not. found) then
+      errmsg = 'State buffer does not contain the stress period.'
+      call sim_message(errmsg, iunit=istdout, skipbefore=1, skipafter=1)
+      return
+    end if
+    if (kper_state < kper) then
+      write(errmsg, '(a,i0,a,i0,a)') 'State saved in stress period ',          &
+        kper_state, ' cannot be restored after stress period ', kper,          &
+        ' has been read.'
+      call sim_message(errmsg, iunit=istdout, skipbefore=1, skipafter=1)
+      return
+    end if
+    
+    ! read the stress period input up to the stress period of the state
+    do iper = kper + 1, kper_state
+      kper = iper
+      kstp = 1
+      readnewdata = .true.
+      do im = 1, basemodellist%Count()
+        mp => GetBaseModelFromList(basemodellist, im)
+        call mp%model_rp()
+      end do
+      do ic = 1, baseexchangelist%Count()
+        ep => GetBaseExchangeFromList(baseexchangelist, ic)
+        call ep%exg_rp()
+      end do
+    end do
+    
+    call mem_state_restore(buf, ierr)
+    if (ierr /= 0) then
+      call sim_message(errmsg, iunit=istdout, skipbefore=1, skipafter=1)
+      return
+    end if
+    bmi_status = BMI_SUCCESS
+    
+  end function restore_state
+  
+  ! convert a null terminated C string to a Fortran string
+  function c_string_to_string(c_string) result(string)
+    use iso_c_binding, only: c_char, C_NULL_CHAR
+    character(kind=c_char), intent(in) :: c_string(*)
+    character(len=LINELENGTH) :: string
+    ! local
+    integer(I4B) :: i
+    
+    string = ' '
+    do i = 1, LINELENGTH
+      if (c_string(i) == C_NULL_CHAR) exit
+      string(i:i) = c_string(i)
+    end do
+    
+  end function c_string_to_string
+  
   ! the subcomponent_idx runs from 1 to the nr of 
   ! solutions in the solution group
   function getSolution(subcomponent_idx) result(solution)